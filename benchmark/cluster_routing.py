@@ -0,0 +1,115 @@
+"""
+Throughput benchmark of routing interactions across worker nodes.
+
+Starts worker node processes serving Unix domain sockets, and routes synthetic interactions of many guilds through
+InteractionRouter. Each command burns a fixed amount of cpu time, so throughput should scale near-linearly with
+worker count while cores are available.
+Usage : python benchmark/cluster_routing.py --nodes 1 2 4 --requests 4000 --work 2
+"""
+import argparse
+import asyncio
+import multiprocessing
+import os
+import tempfile
+import time
+from typing import List
+
+from discord_interactions.application_commands.client.application_command_client import BaseSlashApplication
+from discord_interactions.application_commands.models import SlashContext
+from discord_interactions.cluster import InteractionRouter, StreamTransport, WorkerNode
+from discord_interactions.utils.type_hints import JSON
+
+_context = multiprocessing.get_context('fork')
+
+
+def interaction_payload(index: int, guilds: int) -> JSON:
+    return {
+        'type': 2, 'id': str(index), 'token': 'token', 'version': 1, 'application_id': '1',
+        'guild_id': str(index % guilds + 1), 'channel_id': '2',
+        'member': {
+            'user': {'id': '3', 'username': 'user', 'discriminator': '0001', 'avatar': None},
+            'roles': [], 'permissions': '2147483647', 'joined_at': '2021-01-01T00:00:00+00:00'
+        },
+        'data': {'id': '1', 'name': 'work'}
+    }
+
+
+def run_node(address: str, work: float, ready) -> None:
+    application = BaseSlashApplication(1, low_memory=True)
+
+    @application.globalSlash(name='work', description='Burn cpu time.')
+    async def work_command(ctx: SlashContext):
+        deadline = time.perf_counter() + work
+        while time.perf_counter() < deadline:
+            pass
+        await ctx.send('done')
+
+    node = WorkerNode(application)
+
+    async def main() -> None:
+        await node.serve(address)
+        ready.set()
+        await asyncio.Event().wait()
+    asyncio.run(main())
+
+
+def measure(nodes: int, requests: int, guilds: int, concurrency: int, work: float, directory: str) -> float:
+    addresses: List[str] = ['unix:{}'.format(os.path.join(directory, 'node-{}-{}.sock'.format(nodes, i)))
+                            for i in range(nodes)]
+    processes = []
+    for address in addresses:
+        ready = _context.Event()
+        process = _context.Process(target=run_node, args=(address, work, ready), daemon=True)
+        process.start()
+        ready.wait()
+        processes.append(process)
+
+    async def flood() -> float:
+        router = InteractionRouter(StreamTransport(), addresses)
+        payloads = [interaction_payload(i, guilds) for i in range(requests)]
+        queue: asyncio.Queue = asyncio.Queue()
+        for payload in payloads:
+            queue.put_nowait(payload)
+
+        async def client() -> None:
+            while not queue.empty():
+                response = await router.route(queue.get_nowait())
+                assert response is not None and response['type'] == 4
+
+        start = time.perf_counter()
+        await asyncio.gather(*(client() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - start
+        await router.close()
+        print('  routed per node : {}'.format(sorted(router.stats.values())))
+        return requests / elapsed
+
+    try:
+        return asyncio.run(flood())
+    finally:
+        for process in processes:
+            process.terminate()
+            process.join()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--nodes', type=int, nargs='+', default=[1, 2, 4])
+    parser.add_argument('--requests', type=int, default=2000)
+    parser.add_argument('--guilds', type=int, default=1000)
+    parser.add_argument('--concurrency', type=int, default=64)
+    parser.add_argument('--work', type=float, default=2.0, help='milliseconds of cpu time per command')
+    args = parser.parse_args()
+
+    print('cpu cores={} requests={} guilds={} work={}ms'.format(
+        multiprocessing.cpu_count(), args.requests, args.guilds, args.work
+    ))
+    baseline = None
+    with tempfile.TemporaryDirectory() as directory:
+        for nodes in args.nodes:
+            rate = measure(nodes, args.requests, args.guilds, args.concurrency, args.work / 1000, directory)
+            baseline = baseline or rate
+            print('nodes={:<4} {:>10.1f} interactions/s {:>6.2f}x'.format(nodes, rate, rate / baseline))
+
+
+if __name__ == '__main__':
+    main()
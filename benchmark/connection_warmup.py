@@ -0,0 +1,98 @@
+"""
+Latency benchmark of the first api request after idle periods, with and without warm connections.
+
+Starts a local TLS stub server (self-signed certificate made with the `openssl` command) which closes idle
+connections after `--server-keepalive` seconds, like the api host does. Requests are sent in bursts separated by
+idle periods longer than that, so without keep-alive requests every burst pays for TCP and TLS setup again.
+Usage : python benchmark/connection_warmup.py --bursts 10 --idle 1.5 --connections 4
+"""
+import argparse
+import asyncio
+import os
+import ssl
+import statistics
+import subprocess
+import tempfile
+import time
+from typing import List
+
+from aiohttp import web
+
+from discord_interactions.utils.http import RequestScheduler, RequestPriority
+
+
+def make_certificate(directory: str) -> ssl.SSLContext:
+    cert, key = os.path.join(directory, 'cert.pem'), os.path.join(directory, 'key.pem')
+    subprocess.run(
+        ['openssl', 'req', '-x509', '-newkey', 'rsa:2048', '-nodes', '-days', '1', '-subj', '/CN=localhost',
+         '-keyout', key, '-out', cert],
+        check=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    context = ssl.create_default_context(ssl.Purpose.CLIENT_AUTH)
+    context.load_cert_chain(cert, key)
+    return context
+
+
+async def start_stub(context: ssl.SSLContext, port: int, keepalive: float) -> web.AppRunner:
+    async def handle(request: web.Request) -> web.Response:
+        return web.json_response({'url': 'wss://gateway.discord.gg'})
+
+    app = web.Application()
+    app.router.add_route('*', '/{tail:.*}', handle)
+    runner = web.AppRunner(app, keepalive_timeout=keepalive)
+    await runner.setup()
+    await web.TCPSite(runner, '127.0.0.1', port, ssl_context=context).start()
+    return runner
+
+
+async def measure(base: str, warm: int, bursts: int, idle: float, burst_size: int) -> dict:
+    scheduler = RequestScheduler(
+        warm_connections=warm, keepalive_interval=idle / 3, warm_url=base + 'gateway', ssl=False
+    )
+    await scheduler.start()
+    first: List[float] = []
+    for _ in range(bursts):
+        await asyncio.sleep(idle)
+        for i in range(burst_size):
+            start = time.perf_counter()
+            await scheduler.request(
+                'POST', base + 'interactions/1/token/callback', json={'type': 4}, priority=RequestPriority.INTERACTION
+            )
+            if i == 0:
+                first.append(time.perf_counter() - start)
+    stats = scheduler.connection_stats
+    await scheduler.close()
+    return {'first_avg': statistics.mean(first), 'first_max': max(first), **stats}
+
+
+async def run(args) -> None:
+    with tempfile.TemporaryDirectory() as directory:
+        runner = await start_stub(make_certificate(directory), args.port, args.server_keepalive)
+        base = 'https://127.0.0.1:{}/api/v9/'.format(args.port)
+        try:
+            for warm in (0, args.connections):
+                result = await measure(base, warm, args.bursts, args.idle, args.burst_size)
+                print('warm={:<3} first request avg {:>7.2f}ms max {:>7.2f}ms | connections created={} reused={} '
+                      'reuse={:.0%} setup avg {:.2f}ms | keep-alive sent={} failed={}'.format(
+                          warm, result['first_avg'] * 1000, result['first_max'] * 1000, result['created'],
+                          result['reused'], result['reuse_ratio'], result['setup_avg'] * 1000,
+                          result['keepalive_sent'], result['keepalive_failed']
+                      ))
+        finally:
+            await runner.cleanup()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--bursts', type=int, default=10)
+    parser.add_argument('--burst-size', type=int, default=5)
+    parser.add_argument('--idle', type=float, default=1.5, help='seconds between bursts')
+    parser.add_argument('--server-keepalive', type=float, default=1.0,
+                        help='seconds before the stub closes idle connections')
+    parser.add_argument('--connections', type=int, default=4, help='warm connections')
+    parser.add_argument('--port', type=int, default=18443)
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,86 @@
+"""
+End-to-end throughput of a SlashClient fed by the in-process fake gateway. (discord_interactions.testing.FakeGateway)
+
+Registers a demo set of commands (plain options, user options, subcommand groups), then dispatches synthetic
+INTERACTION_CREATE frames at --rate interactions per second with optional bursts, over --guilds guilds with zipf
+--skew. Responses are sent to a local stub of the api. Reports interactions per second and latency percentiles from
+frame arrival to interaction callback.
+Usage : python benchmark/fake_gateway.py --rate 500 --duration 10 --burst-size 200 --guilds 5000 --shards 4
+"""
+import argparse
+import asyncio
+import json
+
+from discord import User
+
+from discord_interactions.application_commands.client import SlashClient, AutoShardedSlashClient
+from discord_interactions.application_commands.models import ApplicationCommandOption, ApplicationCommandOptionType, \
+    SlashContext
+from discord_interactions.testing import FakeGateway, PayloadFactory, StubRESTServer
+
+
+def register(client: SlashClient) -> None:
+    @client.globalSlash(name='ping', description='Respond immediately.')
+    async def ping(ctx: SlashContext):
+        await ctx.send('pong')
+
+    @client.globalSlash(name='hello', description='Send greetings to user.', options=[
+        ApplicationCommandOption(name='user', option_type=ApplicationCommandOptionType.USER,
+                                 description='User to send greeting.', required=True),
+        ApplicationCommandOption(name='text', option_type=ApplicationCommandOptionType.STRING,
+                                 description='Text of greeting message.', required=False)
+    ])
+    async def hello(ctx: SlashContext, user: User, text: str = 'Hello!'):
+        await ctx.send(text)
+
+    @client.globalSlash(name='admin', description='Administration commands.')
+    async def admin(ctx: SlashContext):
+        pass
+
+    config = admin.subCommandGroup(name='config', description='Manage bot configurations.')
+
+    @config.subCommand(name='set', description='Set configuration value.', options=[
+        ApplicationCommandOption(name='key', option_type=ApplicationCommandOptionType.STRING,
+                                 description='Configuration key.', required=True),
+        ApplicationCommandOption(name='value', option_type=ApplicationCommandOptionType.INTEGER,
+                                 description='Configuration value.', required=True)
+    ])
+    async def config_set(ctx: SlashContext, key: str, value: int):
+        await ctx.send('{} = {}'.format(key, value))
+
+
+async def measure(args: argparse.Namespace) -> None:
+    client = AutoShardedSlashClient(low_memory=True) if args.shards else SlashClient(low_memory=True)
+    register(client)
+    async with StubRESTServer(latency=args.latency, jitter=args.jitter) as stub:
+        payloads = PayloadFactory(client, guilds=args.guilds, guild_skew=args.skew, dm_ratio=args.dm_ratio, seed=1)
+        report = await FakeGateway(
+            client, rate=args.rate, duration=args.duration, burst_size=args.burst_size,
+            burst_interval=args.burst_interval, payloads=payloads, shard_count=args.shards or None, stub=stub, seed=1
+        ).run()
+    await client.close()
+    print(json.dumps(report.toJson(), indent=2) if args.json else report.summary())
+    if not args.json and args.shards:
+        print('frames per shard : {}'.format(dict(sorted(report.shards.items()))))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rate', type=float, default=500.0, help='average interactions per second.')
+    parser.add_argument('--duration', type=float, default=10.0, help='seconds of arrivals.')
+    parser.add_argument('--burst-size', type=int, default=0, help='interactions arriving at once per burst.')
+    parser.add_argument('--burst-interval', type=float, default=1.0, help='seconds between bursts.')
+    parser.add_argument('--guilds', type=int, default=1000)
+    parser.add_argument('--skew', type=float, default=1.0, help='zipf exponent of guilds. (0 = uniform)')
+    parser.add_argument('--dm-ratio', type=float, default=0.0, help='fraction of interactions from direct messages.')
+    parser.add_argument('--shards', type=int, default=0, help='shard count of AutoShardedSlashClient. (0 = SlashClient)')
+    parser.add_argument('--latency', type=float, default=0.01, help='seconds of api latency.')
+    parser.add_argument('--jitter', type=float, default=0.005, help='maximum random seconds added to api latency.')
+    parser.add_argument('--json', action='store_true', help='print the report as json.')
+    args = parser.parse_args()
+
+    asyncio.get_event_loop().run_until_complete(measure(args))
+
+
+if __name__ == '__main__':
+    main()
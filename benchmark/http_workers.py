@@ -0,0 +1,125 @@
+"""
+Throughput benchmark of the multi-process http interactions server.
+
+Starts WorkerPool with increasing worker counts on a local port, and floods it with signed interaction requests from
+load generator processes. Compares requests/sec of each worker count.
+Usage : python benchmark/http_workers.py --workers 1 2 4 8 --clients 4 --duration 10
+"""
+import argparse
+import asyncio
+import json
+import multiprocessing
+import time
+from typing import List, Tuple
+
+import aiohttp
+from nacl.signing import SigningKey
+
+from discord_interactions.client import InteractionClient, WorkerPool
+from discord_interactions.application_commands.models import SlashContext
+from discord_interactions.utils.type_hints import JSON
+
+_context = multiprocessing.get_context('fork')
+
+
+def interaction_payload(index: int) -> JSON:
+    return {
+        'type': 2, 'id': str(index), 'token': 'token', 'version': 1, 'application_id': '1',
+        'guild_id': '1', 'channel_id': '2',
+        'member': {
+            'user': {'id': '3', 'username': 'user', 'discriminator': '0001', 'avatar': None},
+            'roles': [], 'permissions': '2147483647', 'joined_at': '2021-01-01T00:00:00+00:00'
+        },
+        'data': {'id': '1', 'name': 'ping'}
+    }
+
+
+def signed_requests(key: SigningKey, count: int) -> List[Tuple[bytes, dict]]:
+    # Sign in advance, so that load generators don't compete with workers for cpu.
+    requests = []
+    for index in range(count):
+        body = json.dumps(interaction_payload(index)).encode()
+        timestamp = str(int(time.time()))
+        signature = key.sign(timestamp.encode() + body).signature.hex()
+        requests.append((body, {
+            'X-Signature-Ed25519': signature, 'X-Signature-Timestamp': timestamp, 'Content-Type': 'application/json'
+        }))
+    return requests
+
+
+def generate_load(url: str, requests: List[Tuple[bytes, dict]], concurrency: int, duration: float, results) -> None:
+    async def flood() -> int:
+        done = 0
+        deadline = time.perf_counter() + duration
+
+        async def client(session: aiohttp.ClientSession, offset: int) -> None:
+            nonlocal done
+            index = offset
+            while time.perf_counter() < deadline:
+                body, headers = requests[index % len(requests)]
+                async with session.post(url, data=body, headers=headers) as resp:
+                    await resp.read()
+                    if resp.status == 200:
+                        done += 1
+                index += concurrency
+
+        # Without keep-alive, connections are distributed between workers by the kernel.
+        connector = aiohttp.TCPConnector(force_close=True, limit=concurrency)
+        async with aiohttp.ClientSession(connector=connector) as session:
+            await asyncio.gather(*(client(session, i) for i in range(concurrency)))
+        return done
+
+    results.put(asyncio.run(flood()))
+
+
+def measure(client: InteractionClient, workers: int, port: int, clients: int, concurrency: int, duration: float,
+            requests: List[Tuple[bytes, dict]]) -> float:
+    pool = WorkerPool(client.server, '127.0.0.1', port, workers)
+    pool.start()
+    try:
+        results = _context.Queue()
+        url = 'http://127.0.0.1:{}/interactions'.format(port)
+        generators = [
+            _context.Process(target=generate_load, args=(url, requests, concurrency, duration, results))
+            for _ in range(clients)
+        ]
+        for generator in generators:
+            generator.start()
+        total = sum(results.get() for _ in generators)
+        for generator in generators:
+            generator.join()
+    finally:
+        pool.stop()
+    return total / duration
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4])
+    parser.add_argument('--clients', type=int, default=2, help='load generator processes')
+    parser.add_argument('--concurrency', type=int, default=32, help='concurrent requests per load generator')
+    parser.add_argument('--duration', type=float, default=5.0, help='seconds to flood each configuration')
+    parser.add_argument('--port', type=int, default=18080)
+    args = parser.parse_args()
+
+    key = SigningKey.generate()
+    client = InteractionClient(1, key.verify_key.encode())
+
+    @client.globalSlash(name='ping', description='Respond pong.')
+    async def ping(ctx: SlashContext):
+        await ctx.send('Pong!')
+
+    requests = signed_requests(key, 1000)
+    print('cpu cores={} clients={} concurrency={}'.format(
+        multiprocessing.cpu_count(), args.clients, args.concurrency
+    ))
+    print('{:<10}{:>14}{:>12}'.format('workers', 'requests/s', 'scaling'))
+    baseline = None
+    for workers in args.workers:
+        rate = measure(client, workers, args.port, args.clients, args.concurrency, args.duration, requests)
+        baseline = baseline or rate
+        print('{:<10}{:>14.1f}{:>11.2f}x'.format(workers, rate, rate / baseline))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,120 @@
+"""
+Overhead benchmark of lifecycle latency instrumentation and tracing.
+
+Measures the instrumentation work done per interaction (clock reads and six phase records) in isolation, then
+dispatches synthetic interactions through the application command registry with LatencyTracker enabled and disabled,
+and with tracing disabled and exporting to memory.
+End-to-end numbers are noisy on shared machines : compare the best of several interleaved rounds.
+Usage : python benchmark/instrumentation_overhead.py --interactions 20000 --rounds 5
+"""
+import argparse
+import asyncio
+import time
+
+from discord_interactions.application_commands.client.application_command_client import BaseSlashApplication
+from discord_interactions.application_commands.models import SlashContext
+from discord_interactions.client.interaction_client import dispatch_interaction
+from discord_interactions.monitoring import Histogram, LatencyTracker, PARSE, LOOKUP, CONTEXT, INVOKE, FIRST_RESPONSE, \
+    TOTAL, InMemoryExporter, get_tracer
+from discord_interactions.utils.type_hints import JSON
+
+
+def interaction_payload(index: int) -> JSON:
+    return {
+        'type': 2, 'id': str(index), 'token': 'token', 'version': 1, 'application_id': '1',
+        'guild_id': '5', 'channel_id': '2',
+        'member': {
+            'user': {'id': '3', 'username': 'user', 'discriminator': '0001', 'avatar': None},
+            'roles': [], 'permissions': '2147483647', 'joined_at': '2021-01-01T00:00:00+00:00'
+        },
+        'data': {'id': '1', 'name': 'ping'}
+    }
+
+
+def make_application() -> BaseSlashApplication:
+    application = BaseSlashApplication(1, low_memory=True)
+
+    @application.globalSlash(name='ping', description='Pong.')
+    async def ping(ctx: SlashContext):
+        await ctx.send('pong')
+
+    return application
+
+
+def measure_isolated(count: int, enabled: bool) -> float:
+    tracker = LatencyTracker()
+    tracker.enabled = enabled
+    monotonic = time.monotonic
+    start = time.perf_counter()
+    for _ in range(count):
+        # Same clock reads & records as BaseSlashApplication.parse_interaction() and process_interaction().
+        received_at = monotonic()
+        tracker.record('ping', PARSE, monotonic() - received_at)
+        started_at = monotonic()
+        looked_up_at = monotonic()
+        tracker.record('ping', LOOKUP, looked_up_at - started_at)
+        invoked_at = monotonic()
+        tracker.record('ping', CONTEXT, invoked_at - looked_up_at)
+        finished_at = monotonic()
+        tracker.record('ping', INVOKE, finished_at - invoked_at)
+        tracker.record('ping', FIRST_RESPONSE, finished_at - received_at)
+        tracker.record('ping', TOTAL, finished_at - received_at)
+    return (time.perf_counter() - start) / count
+
+
+async def measure(application: BaseSlashApplication, interactions: int, enabled: bool, traced: bool = False) -> float:
+    application.latency_tracker.enabled = enabled
+    exporter = InMemoryExporter(max_spans=1000)
+    if traced:
+        get_tracer().addExporter(exporter)
+    payloads = [interaction_payload(i) for i in range(interactions)]
+    start = time.perf_counter()
+    for payload in payloads:
+        await dispatch_interaction(application, payload, 2.5)
+    elapsed = time.perf_counter() - start
+    if traced:
+        get_tracer().removeExporter(exporter)
+    return elapsed / interactions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--interactions', type=int, default=20000)
+    parser.add_argument('--rounds', type=int, default=5)
+    args = parser.parse_args()
+
+    histogram = Histogram()
+    values = [(i % 5000) / 1_000_000 for i in range(200000)]
+    start = time.perf_counter()
+    for value in values:
+        histogram.record(value)
+    print('Histogram.record() : {:.3f}us'.format((time.perf_counter() - start) / len(values) * 1_000_000))
+    isolated_enabled = min(measure_isolated(args.interactions, True) for _ in range(args.rounds))
+    isolated_disabled = min(measure_isolated(args.interactions, False) for _ in range(args.rounds))
+    print('instrumentation per interaction (isolated) : enabled {:.2f}us, disabled {:.2f}us'.format(
+        isolated_enabled * 1_000_000, isolated_disabled * 1_000_000
+    ))
+
+    application = make_application()
+    disabled, enabled = [], []
+    for _ in range(args.rounds):   # Interleaved, so that drift of the machine affects both equally.
+        disabled.append(asyncio.run(measure(application, args.interactions, False)))
+        enabled.append(asyncio.run(measure(application, args.interactions, True)))
+    best_disabled, best_enabled = min(disabled), min(enabled)
+    print('end-to-end per interaction : disabled {:.2f}us, enabled {:.2f}us, overhead {:.2f}us'.format(
+        best_disabled * 1_000_000, best_enabled * 1_000_000, (best_enabled - best_disabled) * 1_000_000
+    ))
+    print(application.latency_tracker.snapshot()['ping']['total'])
+
+    untraced, traced = [], []
+    for _ in range(args.rounds):
+        untraced.append(asyncio.run(measure(application, args.interactions, True)))
+        traced.append(asyncio.run(measure(application, args.interactions, True, traced=True)))
+    best_untraced, best_traced = min(untraced), min(traced)
+    print('end-to-end per interaction : tracing disabled {:.2f}us, enabled {:.2f}us, overhead {:.2f}us'.format(
+        best_untraced * 1_000_000, best_traced * 1_000_000, (best_traced - best_untraced) * 1_000_000
+    ))
+
+
+if __name__ == '__main__':
+    main()
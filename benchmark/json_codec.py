@@ -0,0 +1,120 @@
+"""
+Throughput benchmark of json codec backends.
+
+Encodes and decodes interaction payloads with each installed backend (orjson, ujson, json) through the codec of the
+library. Payloads are read from a file of captured payloads (one json per line), or built from representative
+interaction, response and command sync payloads if no file is given.
+Usage : python benchmark/json_codec.py --payloads captured.jsonl --rounds 2000
+"""
+import argparse
+import time
+from typing import List
+
+from discord_interactions.utils import codec
+from discord_interactions.utils.type_hints import JSON
+
+
+def sample_payloads() -> List[JSON]:
+    user = {'id': '80351110224678912', 'username': 'Nelly', 'discriminator': '1337',
+            'avatar': '8342729096ea3675442027381ff50dfe', 'public_flags': 131141}
+    interaction = {
+        'type': 2, 'id': '786008729715212338', 'application_id': '775799577604522054', 'token': 'A' * 160,
+        'version': 1, 'guild_id': '290926798626357999', 'channel_id': '645027906669510667',
+        'member': {'user': user, 'roles': ['539082325061664781', '290926798626357999'], 'premium_since': None,
+                   'permissions': '2147483647', 'pending': False, 'nick': None, 'mute': False,
+                   'joined_at': '2017-03-13T19:19:14.040000+00:00', 'deaf': False},
+        'data': {
+            'id': '771825006014889984', 'name': 'cardsearch', 'type': 1,
+            'options': [{'type': 3, 'name': 'cardname', 'value': 'The Gitrog Monster'},
+                        {'type': 6, 'name': 'target', 'value': '80351110224678912'}],
+            'resolved': {'users': {'80351110224678912': user},
+                         'members': {'80351110224678912': {'roles': [], 'permissions': '2147483647',
+                                                           'joined_at': '2017-03-13T19:19:14.040000+00:00'}}}
+        }
+    }
+    component = {
+        'type': 3, 'id': '846462639134605312', 'application_id': '775799577604522054', 'token': 'B' * 160,
+        'version': 1, 'guild_id': '290926798626357999', 'channel_id': '645027906669510667',
+        'member': interaction['member'],
+        'message': {'id': '846462636839993354', 'content': 'Pick one', 'components': [
+            {'type': 1, 'components': [{'type': 2, 'style': 1, 'label': 'Button {}'.format(i),
+                                        'custom_id': 'button_{}'.format(i)} for i in range(5)]}
+        ]},
+        'data': {'custom_id': 'button_3', 'component_type': 2}
+    }
+    response = {
+        'type': 4,
+        'data': {'content': 'Found 12 cards — showing first 3.', 'flags': 64, 'embeds': [
+            {'title': 'The Gitrog Monster', 'description': 'Deathtouch\n' * 6, 'color': 0x00ff00,
+             'fields': [{'name': 'Field {}'.format(i), 'value': 'Value {}'.format(i), 'inline': True}
+                        for i in range(6)]}
+        ], 'allowed_mentions': {'parse': []}}
+    }
+    command_sync = [
+        {'name': 'command_{}'.format(i), 'description': 'Description of command {}'.format(i), 'type': 1,
+         'options': [{'type': 3, 'name': 'option_{}'.format(j), 'description': 'Option {}'.format(j),
+                      'required': j == 0, 'choices': [{'name': 'c{}'.format(k), 'value': 'c{}'.format(k)}
+                                                      for k in range(5)]} for j in range(4)]}
+        for i in range(50)
+    ]
+    return [interaction, component, response, command_sync]
+
+
+def load_payloads(path: str) -> List[JSON]:
+    with open(path, 'rb') as f:
+        return [codec.loads(line) for line in f if line.strip()]
+
+
+def measure(payloads: List[JSON], rounds: int) -> dict:
+    encoded = [codec.dumpb(payload) for payload in payloads]
+    size = sum(len(body) for body in encoded)
+
+    dumpb, loads = codec.dumpb, codec.loads
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for payload in payloads:
+            dumpb(payload)
+    encode = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for body in encoded:
+            loads(body)
+    decode = time.perf_counter() - start
+
+    count = rounds * len(payloads)
+    return {
+        'encode_ops': count / encode,
+        'decode_ops': count / decode,
+        'encode_mb': size * rounds / encode / 2 ** 20,
+        'decode_mb': size * rounds / decode / 2 ** 20
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--payloads', help='file of captured payloads, one json per line')
+    parser.add_argument('--rounds', type=int, default=2000)
+    parser.add_argument('--codecs', nargs='+', default=codec.available_codecs()[::-1], help='first one is baseline')
+    args = parser.parse_args()
+
+    payloads = load_payloads(args.payloads) if args.payloads else sample_payloads()
+    print('payloads={} rounds={} codecs={}'.format(len(payloads), args.rounds, args.codecs))
+    selected = codec.get_codec()
+    baseline = None
+    try:
+        for name in args.codecs:
+            codec.set_codec(name)
+            result = measure(payloads, args.rounds)
+            baseline = baseline or result
+            print('{:<8} encode {:>9.0f} ops/s {:>7.1f} MB/s {:>6.2f}x  decode {:>9.0f} ops/s {:>7.1f} MB/s {:>6.2f}x'.format(
+                name,
+                result['encode_ops'], result['encode_mb'], result['encode_ops'] / baseline['encode_ops'],
+                result['decode_ops'], result['decode_mb'], result['decode_ops'] / baseline['decode_ops']
+            ))
+    finally:
+        codec.set_codec(selected)
+
+
+if __name__ == '__main__':
+    main()
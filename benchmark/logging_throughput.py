@@ -0,0 +1,72 @@
+"""
+Throughput benchmark of the logging pipeline with DEBUG enabled.
+
+Logs interaction-like debug records from the event loop thread, through a synchronous StreamHandler with eagerly
+formatted messages (the former get_stream_logger setup) and through the queue-based pipeline with lazy arguments.
+Reports the time the logging thread spends per record, which is what the event loop pays, and the time until every
+record is written.
+Usage : python benchmark/logging_throughput.py --records 100000 --output /tmp/bench.log
+"""
+import argparse
+import logging
+import os
+import time
+
+from discord_interactions.utils.log import setup_logging, shutdown_logging, dropped_records, DEBUG, TEXT_FORMAT
+
+
+PAYLOAD = {'id': '775799577604522054', 'type': 2, 'data': {'id': '1', 'name': 'ping', 'options': [{'name': 'x'}]}}
+
+
+def run_sync(records: int, output: str):
+    logger = logging.getLogger('benchmark.sync')
+    logger.setLevel(DEBUG)
+    logger.propagate = False
+    handler = logging.StreamHandler(open(output, 'w'))
+    handler.setFormatter(logging.Formatter(style='{', fmt=TEXT_FORMAT))
+    logger.addHandler(handler)
+    start = time.perf_counter()
+    for i in range(records):
+        logger.debug('Dispatching interaction {} : {}'.format(i, PAYLOAD))
+    elapsed = time.perf_counter() - start
+    logger.removeHandler(handler)
+    handler.close()
+    return elapsed, elapsed
+
+
+def run_pipeline(records: int, output: str, json_lines: bool):
+    stream = open(output, 'w')
+    setup_logging(DEBUG, stream=stream, json_lines=json_lines, queue_size=records)
+    logger = logging.getLogger('discord_interactions.benchmark')
+    start = time.perf_counter()
+    for i in range(records):
+        logger.debug('Dispatching interaction %s : %s', i, PAYLOAD)
+    logged = time.perf_counter() - start
+    shutdown_logging()      # Waits until the listener wrote every record.
+    return logged, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--records', type=int, default=100000)
+    parser.add_argument('--rounds', type=int, default=3)
+    parser.add_argument('--output', default=os.devnull, help='file receiving log output.')
+    args = parser.parse_args()
+
+    cases = {
+        'sync StreamHandler, eager format': lambda: run_sync(args.records, args.output),
+        'queue pipeline, text': lambda: run_pipeline(args.records, args.output, False),
+        'queue pipeline, json lines': lambda: run_pipeline(args.records, args.output, True),
+    }
+    for name, case in cases.items():
+        results = [case() for _ in range(args.rounds)]
+        logged = min(result[0] for result in results)
+        written = min(result[1] for result in results)
+        print('{:<34} : {:6.2f}us per record on the logging thread, {:8.0f} records/s written'.format(
+            name, logged / args.records * 1_000_000, args.records / written
+        ))
+    print('dropped records : {}'.format(dropped_records()))
+
+
+if __name__ == '__main__':
+    main()
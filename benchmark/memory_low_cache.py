@@ -0,0 +1,127 @@
+"""
+Memory benchmark of low-memory mode.
+
+Feeds synthetic GUILD_CREATE payloads into discord.py's ConnectionState configured like SlashClient with and without
+`low_memory=True`, then builds contexts of synthetic interactions, and compares traced memory.
+Usage : python benchmark/memory_low_cache.py --guilds 1000 --members 200 --shards 16
+"""
+import argparse
+import asyncio
+import gc
+import tracemalloc
+from typing import Any, Dict, List
+
+from discord import Intents, MemberCacheFlags
+from discord.state import ConnectionState
+
+from discord_interactions import Interaction
+from discord_interactions.application_commands.client import low_memory_options
+from discord_interactions.application_commands.models import SlashContextBuilder
+from discord_interactions.utils.type_hints import JSON
+
+
+def guild_payload(guild_id: int, members: int, channels: int = 30, roles: int = 20) -> JSON:
+    base = guild_id * 1_000_000
+    return {
+        'id': str(guild_id),
+        'name': 'guild-{}'.format(guild_id),
+        'member_count': members,
+        'features': [],
+        'emojis': [],
+        'roles': [
+            {'id': str(base + r), 'name': 'role-{}'.format(r), 'permissions': '104324673', 'position': r,
+             'color': 0, 'hoist': False, 'managed': False, 'mentionable': False}
+            for r in range(roles)
+        ],
+        'channels': [
+            {'id': str(base + 1000 + c), 'type': 0, 'name': 'channel-{}'.format(c), 'position': c,
+             'permission_overwrites': []}
+            for c in range(channels)
+        ],
+        'members': [
+            {'user': {'id': str(base + 10000 + m), 'username': 'user-{}'.format(m), 'discriminator': '0001',
+                      'avatar': None},
+             'roles': [str(base + (m % roles))], 'joined_at': '2021-01-01T00:00:00+00:00', 'deaf': False,
+             'mute': False}
+            for m in range(members)
+        ]
+    }
+
+
+def interaction_payload(guild_id: int, index: int) -> JSON:
+    base = guild_id * 1_000_000
+    return {
+        'type': 2, 'id': str(index), 'token': 'token', 'version': 1,
+        'guild_id': str(guild_id), 'channel_id': str(base + 1000),
+        'member': {
+            'user': {'id': str(base + 10000 + index), 'username': 'user', 'discriminator': '0001', 'avatar': None},
+            'roles': [], 'permissions': '2147483647', 'joined_at': '2021-01-01T00:00:00+00:00'
+        },
+        'data': {'id': '1', 'name': 'ping'}
+    }
+
+
+class _Client:
+    """Minimal stand-in of SlashClient, exposing only what SlashContextBuilder reads."""
+    def __init__(self, state: ConnectionState):
+        self._connection = state
+
+    def get_guild(self, guild_id: int):
+        return self._connection._get_guild(guild_id)
+
+    def getCommand(self, command_id: int):
+        return None
+
+    def get_command_by_name(self, name: str):
+        return None
+
+
+def measure(options: Dict[str, Any], low_memory: bool, guilds: int, members: int, interactions: int) -> int:
+    gc.collect()
+    tracemalloc.start()
+    state = ConnectionState(dispatch=lambda *args: None, handlers={}, hooks={}, syncer=None, http=None, loop=None,
+                            **options)
+    if state._intents.guilds:
+        # Gateway only sends GUILD_CREATE when guilds intent is enabled.
+        for guild_id in range(1, guilds + 1):
+            state._add_guild_from_data(guild_payload(guild_id, members))
+
+    client = _Client(state)
+    builder = SlashContextBuilder(client, payload_only=low_memory)
+
+    async def build_contexts() -> List:
+        return [await builder.build(Interaction.fromJson(interaction_payload(i % guilds + 1, i)))
+                for i in range(interactions)]
+
+    asyncio.run(build_contexts())
+    gc.collect()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del state, client, builder
+    return current
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--guilds', type=int, default=200, help='guilds per shard')
+    parser.add_argument('--members', type=int, default=200, help='cached members per guild')
+    parser.add_argument('--interactions', type=int, default=1000)
+    parser.add_argument('--shards', type=int, default=16, help='shard count used to extrapolate totals')
+    args = parser.parse_args()
+
+    full = measure(
+        {'intents': Intents.all(), 'member_cache_flags': MemberCacheFlags.all(), 'chunk_guilds_at_startup': False},
+        False, args.guilds, args.members, args.interactions
+    )
+    low = measure(low_memory_options({}), True, args.guilds, args.members, args.interactions)
+
+    mib = 1024 * 1024
+    print('guilds/shard={} members/guild={} interactions={}'.format(args.guilds, args.members, args.interactions))
+    print('{:<12}{:>16}{:>24}'.format('mode', 'MiB/shard', 'MiB/{} shards'.format(args.shards)))
+    for name, value in (('full', full), ('low_memory', low)):
+        print('{:<12}{:>16.2f}{:>24.2f}'.format(name, value / mib, value * args.shards / mib))
+    print('saved : {:.2f} MiB over {} shards'.format((full - low) * args.shards / mib, args.shards))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,52 @@
+"""
+Replay captured traffic against the commands of an application, with a local stub of the discord api.
+
+The application is imported from `module:attribute`, and must be a BaseSlashApplication (SlashClient, SlashBot, ...).
+Interactions are sent at the captured pace multiplied by --rate, and the report shows throughput, latency percentiles
+from arrival to the interaction callback and to the end of processing, errors, and api calls per route compared to the
+capture.
+Usage : python benchmark/replay_capture.py capture.jsonl.gz --app mybot:client --rate 5 [--repeat 3] [--json report.json]
+"""
+import argparse
+import asyncio
+import importlib
+import json
+import math
+
+from discord_interactions.testing import TrafficReplayer
+from discord_interactions.utils.http import get_scheduler
+
+
+def load_application(path: str):
+    module, _, attribute = path.partition(':')
+    return getattr(importlib.import_module(module), attribute or 'client')
+
+
+async def replay(args: argparse.Namespace):
+    application = load_application(args.app)
+    try:
+        return await TrafficReplayer(
+            application, args.capture, rate=math.inf if args.rate == 0 else args.rate, repeat=args.repeat
+        ).run()
+    finally:
+        await get_scheduler().close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('capture', help='capture file written by TrafficRecorder.')
+    parser.add_argument('--app', required=True, help='application to replay against, as module:attribute.')
+    parser.add_argument('--rate', type=float, default=1.0, help='multiplier of the captured rate. 0 sends all at once.')
+    parser.add_argument('--repeat', type=int, default=1)
+    parser.add_argument('--json', help='path of the json report.')
+    args = parser.parse_args()
+
+    report = asyncio.get_event_loop().run_until_complete(replay(args))
+    print(report.summary())
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(report.toJson(), f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,78 @@
+"""
+Throughput benchmark of interaction signature verification.
+
+Compares verifications/sec of verifying with a public key parsed on every request, SignatureVerifier with a pre-parsed
+key, and SignatureVerifier offloading to a thread pool while the event loop is saturated.
+Usage : python benchmark/signature_verify.py --requests 20000 --threads 4
+"""
+import argparse
+import asyncio
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Tuple
+
+from nacl.signing import SigningKey, VerifyKey
+from nacl.exceptions import BadSignatureError
+
+from discord_interactions.client import SignatureVerifier
+
+
+def signed_requests(key: SigningKey, count: int) -> List[Tuple[str, str, bytes]]:
+    requests = []
+    for index in range(count):
+        body = json.dumps({'type': 2, 'id': str(index), 'token': 'token', 'data': {'id': '1', 'name': 'ping'}}).encode()
+        timestamp = str(int(time.time()))
+        requests.append((key.sign(timestamp.encode() + body).signature.hex(), timestamp, body))
+    return requests
+
+
+def naive(public_key: str, requests: List[Tuple[str, str, bytes]]) -> float:
+    start = time.perf_counter()
+    for signature, timestamp, body in requests:
+        try:
+            VerifyKey(bytes.fromhex(public_key)).verify(timestamp.encode() + body, bytes.fromhex(signature))
+        except BadSignatureError:
+            raise AssertionError('invalid signature')
+    return len(requests) / (time.perf_counter() - start)
+
+
+def preparsed(verifier: SignatureVerifier, requests: List[Tuple[str, str, bytes]]) -> float:
+    start = time.perf_counter()
+    for signature, timestamp, body in requests:
+        assert verifier.verify(signature, timestamp, body)
+    return len(requests) / (time.perf_counter() - start)
+
+
+def offloaded(verifier: SignatureVerifier, requests: List[Tuple[str, str, bytes]]) -> float:
+    async def run() -> float:
+        # Pretend the loop is saturated, so that every verification is offloaded.
+        verifier._offload_lag = -1.0
+        start = time.perf_counter()
+        results = await asyncio.gather(*(verifier.verifyAsync(*request) for request in requests))
+        assert all(results)
+        return len(requests) / (time.perf_counter() - start)
+    return asyncio.run(run())
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--requests', type=int, default=10000)
+    parser.add_argument('--threads', type=int, default=4, help='threads of the offloading pool')
+    args = parser.parse_args()
+
+    key = SigningKey.generate()
+    public_key = key.verify_key.encode().hex()
+    requests = signed_requests(key, args.requests)
+
+    print('requests={} threads={}'.format(args.requests, args.threads))
+    print('{:<28}{:>18}'.format('method', 'verifications/s'))
+    print('{:<28}{:>18.0f}'.format('parse key per request', naive(public_key, requests)))
+    print('{:<28}{:>18.0f}'.format('pre-parsed key', preparsed(SignatureVerifier(public_key), requests)))
+    verifier = SignatureVerifier(public_key, executor=ThreadPoolExecutor(args.threads))
+    print('{:<28}{:>18.0f}'.format('thread pool offload', offloaded(verifier, requests)))
+    verifier.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,75 @@
+"""
+End-to-end benchmark of the http layer against the local stub api. (discord_interactions.testing.StubRESTServer)
+
+Sends interaction callbacks and followups through RequestScheduler, over --tokens interactions, with the given
+server latency, rate limits and injected 429 responses. Reports throughput, latency percentiles per priority class,
+429 responses and failed requests, for each connection pool size.
+Usage : python benchmark/stub_api.py --requests 2000 --tokens 200 --latency 0.01 --rate-limit 5 --error-rate 0.01
+"""
+import argparse
+import asyncio
+import time
+from typing import Dict
+
+from discord_interactions.monitoring.histogram import Histogram
+from discord_interactions.testing import StubRESTServer
+from discord_interactions.utils.http import RequestScheduler, RequestPriority
+from discord_interactions.utils.interaction_route import get_api_base, set_api_base
+
+
+async def measure(args: argparse.Namespace, max_connections: int) -> None:
+    async with StubRESTServer(
+            latency=args.latency, jitter=args.jitter, rate_limit=args.rate_limit, error_rate=args.error_rate, seed=1
+    ) as stub:
+        set_api_base(stub.url)
+        base = get_api_base()
+        scheduler = RequestScheduler(max_connections)
+        latency: Dict[RequestPriority, Histogram] = {priority: Histogram() for priority in RequestPriority}
+        failed = 0
+
+        async def send(i: int) -> None:
+            nonlocal failed
+            token, priority = i % args.tokens, RequestPriority.INTERACTION if i < args.tokens else RequestPriority.FOLLOWUP
+            url = base + ('interactions/{}/token{}/callback' if priority == RequestPriority.INTERACTION
+                          else 'webhooks/775799577604522054/token{1}').format(786008729715212338 + token, token)
+            start = time.perf_counter()
+            try:
+                await scheduler.request('POST', url, json={'type': 4, 'data': {'content': str(i)}}, priority=priority)
+            except Exception:
+                failed += 1
+            latency[priority].record(time.perf_counter() - start)
+
+        start = time.perf_counter()
+        await asyncio.gather(*(send(i) for i in range(args.requests)))
+        elapsed = time.perf_counter() - start
+        await scheduler.close()
+        set_api_base()
+
+    print('connections={:<4} {:>8.0f} req/s | 429 limited={} injected={} | failed={}'.format(
+        max_connections, args.requests / elapsed, stub.limited, stub.injected, failed
+    ))
+    for priority, histogram in latency.items():
+        if histogram.count:
+            percentiles = histogram.percentiles(50, 99, 100)
+            print('    {:<12} p50 {:>8.2f}ms  p99 {:>8.2f}ms  max {:>8.2f}ms'.format(
+                priority.name.lower(), percentiles[50] * 1000, percentiles[99] * 1000, percentiles[100] * 1000
+            ))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--requests', type=int, default=2000)
+    parser.add_argument('--tokens', type=int, default=200, help='count of interactions. (callback, then followups)')
+    parser.add_argument('--latency', type=float, default=0.01, help='seconds of server latency.')
+    parser.add_argument('--jitter', type=float, default=0.005, help='maximum random seconds added to latency.')
+    parser.add_argument('--rate-limit', type=int, default=None, help='requests per route per second.')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='probability of injected 429 responses.')
+    parser.add_argument('--connections', type=int, nargs='+', default=[8, 32, 100])
+    args = parser.parse_args()
+
+    for max_connections in args.connections:
+        asyncio.get_event_loop().run_until_complete(measure(args, max_connections))
+
+
+if __name__ == '__main__':
+    main()
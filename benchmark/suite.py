@@ -0,0 +1,307 @@
+"""
+Benchmark suite of the library's hot paths.
+
+Scenarios :
+  - interaction_decode : Interaction.fromJson() of a command interaction with options and resolved data.
+  - process_slash : command lookup and dispatch of an interaction payload through BaseSlashApplication.process_slash().
+  - option_binding : subcommand resolution and OptionBinder.bind() of option values.
+  - component_to_dict : to_dict() serialization of action rows of buttons and of a select menu.
+  - xml_load[N] : XMLComponentParser.load_xml_components() of a generated library of N components.
+  - send_payload : payload build of the patched discord.py send. (parse_components_into_json() and send_message())
+
+Each scenario is timed in rounds of calls, like timeit : per-call min, median, mean and standard deviation are
+reported. Results are written as json with the environment, so that runs of different releases can be compared.
+Usage : python benchmark/suite.py --output results.json [--compare baseline.json] [--filter xml] [--max-components 10000]
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Callable, Dict, List, Tuple, Any
+
+from discord_interactions.application_commands.client.application_command_client import BaseSlashApplication
+from discord_interactions.application_commands.models import Interaction, SlashContext, ApplicationCommandOptionType
+from discord_interactions.ui import ActionRow, Button, ButtonStyle, SelectMenu, SelectOption, XMLComponentParser
+from discord_interactions.ui.patch_dpy import parse_components_into_json, send_message
+from discord_interactions.utils import codec
+from discord_interactions.utils.type_hints import JSON
+
+SCHEMA_VERSION = 1
+XML_SIZES = (100, 1000, 10000, 100000)
+
+Setup = Callable[[argparse.Namespace], Callable[[], Any]]
+
+# name -> (setup, operations per call)
+SCENARIOS: Dict[str, Tuple[Setup, int]] = {}
+
+
+def scenario(name: str, batch: int = 1):
+    """Register scenario. Decorated function prepares state and returns the callable to time.
+
+    Args:
+        name (str): name of the scenario in results.
+        batch (int): operations done per call of the callable. Timings are reported per operation.
+    """
+    def wrapper(setup: Setup) -> Setup:
+        SCENARIOS[name] = (setup, batch)
+        return setup
+    return wrapper
+
+
+def interaction_payload(interaction_id: int = 786008729715212338, name: str = 'cardsearch') -> JSON:
+    user = {'id': '80351110224678912', 'username': 'Nelly', 'discriminator': '1337',
+            'avatar': '8342729096ea3675442027381ff50dfe', 'public_flags': 131141}
+    return {
+        'type': 2, 'id': str(interaction_id), 'application_id': '775799577604522054', 'token': 'A' * 160,
+        'version': 1, 'guild_id': '290926798626357999', 'channel_id': '645027906669510667',
+        'member': {'user': user, 'roles': ['539082325061664781'], 'premium_since': None, 'permissions': '2147483647',
+                   'pending': False, 'nick': None, 'mute': False, 'deaf': False,
+                   'joined_at': '2017-03-13T19:19:14.040000+00:00'},
+        'data': {
+            'id': '771825006014889984', 'name': name, 'type': 1,
+            'options': [{'type': 3, 'name': 'cardname', 'value': 'The Gitrog Monster'},
+                        {'type': 6, 'name': 'target', 'value': '80351110224678912'}],
+            'resolved': {'users': {'80351110224678912': user}}
+        }
+    }
+
+
+@scenario('interaction_decode')
+def interaction_decode(args: argparse.Namespace) -> Callable[[], Any]:
+    payload = interaction_payload()
+    return lambda: Interaction.fromJson(payload)
+
+
+@scenario('process_slash', batch=100)
+def process_slash(args: argparse.Namespace) -> Callable[[], Any]:
+    application = BaseSlashApplication(775799577604522054, low_memory=True)
+    application.latency_tracker.enabled = False
+
+    @application.globalSlash(name='cardsearch', description='Search a card.', options=[
+        {'type': 3, 'name': 'cardname', 'description': 'name of the card.', 'required': True},
+        {'type': 6, 'name': 'target', 'description': 'user to show.'}
+    ])
+    async def cardsearch(ctx: SlashContext, cardname: str, target=None):
+        pass    # Not responding : the scenario measures dispatch without network.
+
+    # Interactions are deduplicated by id : every call dispatches a batch of new payloads.
+    counter = iter(range(10 ** 12))
+    loop = asyncio.new_event_loop()
+
+    async def dispatch():
+        for _ in range(100):
+            await application.process_slash(interaction_payload(next(counter)))
+
+    return lambda: loop.run_until_complete(dispatch())
+
+
+@scenario('option_binding')
+def option_binding(args: argparse.Namespace) -> Callable[[], Any]:
+    application = BaseSlashApplication(775799577604522054, low_memory=True)
+
+    @application.globalSlash(name='cards', description='Card commands.')
+    async def cards(ctx: SlashContext):
+        pass
+
+    @cards.subCommand(name='search', description='Search a card.', options=[
+        {'type': 3, 'name': 'cardname', 'description': 'name of the card.', 'required': True},
+        {'type': 4, 'name': 'count', 'description': 'count of results.'},
+        {'type': 5, 'name': 'exact', 'description': 'exact match.'}
+    ])
+    async def search(ctx: SlashContext, cardname: str, count: int = 1, exact: bool = False):
+        pass
+
+    options = [{'type': ApplicationCommandOptionType.SUB_COMMAND.value, 'name': 'search', 'options': [
+        {'type': 3, 'name': 'cardname', 'value': 'The Gitrog Monster'},
+        {'type': 4, 'name': 'count', 'value': 3},
+        {'type': 5, 'name': 'exact', 'value': True}
+    ]}]
+
+    def bind():
+        target, leaf_options = cards.resolve(options)
+        return target.binder.bind({o['name']: o.get('value') for o in leaf_options})
+    return bind
+
+
+def sample_rows(rows: int) -> List[ActionRow]:
+    return [
+        ActionRow([
+            Button(ButtonStyle.parse(1 + i % 4), label='button {}-{}'.format(row, i), custom_id='b{}.{}'.format(row, i))
+            for i in range(5)
+        ])
+        for row in range(rows)
+    ]
+
+
+def sample_select() -> ActionRow:
+    return ActionRow([SelectMenu(
+        options=[SelectOption(label='option {}'.format(i), value=str(i), description='description') for i in range(25)],
+        custom_id='select', placeholder='Choose'
+    )])
+
+
+@scenario('component_to_dict')
+def component_to_dict(args: argparse.Namespace) -> Callable[[], Any]:
+    rows = sample_rows(4) + [sample_select()]
+    return lambda: [row.to_dict() for row in rows]
+
+
+def generate_library(path: str, components: int) -> None:
+    """Write xml library of about `components` components : action rows of buttons, and select menus of options."""
+    lines = ['<Components>']
+    count, index = 0, 0
+    while count < components:
+        if index % 2:
+            lines.append('    <ActionRow name="row{}">'.format(index))
+            lines.extend(
+                '        <Button name="button{0}.{1}" style="Primary" label="Button {1}" custom_id="b{0}.{1}"/>'.format(
+                    index, i
+                ) for i in range(5)
+            )
+            lines.append('    </ActionRow>')
+            count += 6
+        else:
+            lines.append('    <SelectMenu name="select{0}" custom_id="s{0}" placeholder="Choose">'.format(index))
+            lines.extend(
+                '        <SelectOption label="Option {0}" value="{0}" description="option {0}"/>'.format(i)
+                for i in range(4)
+            )
+            lines.append('    </SelectMenu>')
+            count += 5
+        index += 1
+    lines.append('</Components>')
+    with open(path, 'w') as f:
+        f.write('\n'.join(lines))
+
+
+def xml_load(components: int) -> Setup:
+    def setup(args: argparse.Namespace) -> Callable[[], Any]:
+        path = os.path.join(tempfile.mkdtemp(), 'components_{}.xml'.format(components))
+        generate_library(path, components)
+        return lambda: XMLComponentParser().load_xml_components(path)
+    return setup
+
+
+for _size in XML_SIZES:
+    SCENARIOS['xml_load[{}]'.format(_size)] = (xml_load(_size), 1)
+
+
+class _PayloadHTTPClient:
+    """Stands in for discord.http.HTTPClient : returns the built payload instead of sending it."""
+
+    @staticmethod
+    def request(route, *, json: JSON) -> JSON:
+        return codec.dumpb(json)
+
+
+@scenario('send_payload')
+def send_payload(args: argparse.Namespace) -> Callable[[], Any]:
+    http, rows = _PayloadHTTPClient(), sample_rows(3)
+    return lambda: send_message(
+        http, 645027906669510667, 'Choose a card', components=parse_components_into_json(rows)
+    )
+
+
+def measure(function: Callable[[], Any], rounds: int, min_time: float, batch: int = 1) -> Dict[str, Any]:
+    """Time the function in rounds. Calls per round are calibrated, so that each round lasts about `min_time`."""
+    function()  # Warm up caches & lazy imports.
+    number = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(number):
+            function()
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time or number >= 1_000_000:
+            break
+        number = max(number * 2, int(number * min_time / max(elapsed, 1e-9)))
+    timings = [elapsed / number / batch]
+    for _ in range(rounds - 1):
+        start = time.perf_counter()
+        for _ in range(number):
+            function()
+        timings.append((time.perf_counter() - start) / number / batch)
+    return {
+        'unit': 'seconds',
+        'number': number * batch,
+        'rounds': len(timings),
+        'min': min(timings),
+        'median': statistics.median(timings),
+        'mean': statistics.mean(timings),
+        'stdev': statistics.stdev(timings) if len(timings) > 1 else 0.0
+    }
+
+
+def environment() -> Dict[str, Any]:
+    try:
+        commit = subprocess.run(
+            ['git', 'rev-parse', 'HEAD'], capture_output=True, text=True, check=True,
+            cwd=os.path.dirname(os.path.abspath(__file__))
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        'python': sys.version.split()[0],
+        'implementation': platform.python_implementation(),
+        'platform': platform.platform(),
+        'machine': platform.machine(),
+        'cpu_count': os.cpu_count(),
+        'json_codec': codec.get_codec().name,
+        'commit': commit
+    }
+
+
+def compare(results: Dict[str, Dict[str, Any]], baseline_path: str) -> None:
+    with open(baseline_path) as f:
+        baseline = json.load(f)['results']
+    print('\n{:<22} {:>14} {:>14} {:>8}'.format('scenario', 'baseline', 'current', 'ratio'))
+    for name, result in results.items():
+        if name not in baseline:
+            continue
+        before, after = baseline[name]['min'], result['min']
+        print('{:<22} {:>12.2f}us {:>12.2f}us {:>7.2f}x'.format(name, before * 1e6, after * 1e6, after / before))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--output', help='path of the json results file.')
+    parser.add_argument('--compare', help='json results file of a previous run, to print ratios against.')
+    parser.add_argument('--filter', default='', help='run only scenarios whose name contains this text.')
+    parser.add_argument('--rounds', type=int, default=5)
+    parser.add_argument('--min-time', type=float, default=0.2, help='seconds per round.')
+    parser.add_argument('--max-components', type=int, default=max(XML_SIZES), help='largest xml library to load.')
+    args = parser.parse_args()
+
+    results: Dict[str, Dict[str, Any]] = {}
+    for name, (setup, batch) in SCENARIOS.items():
+        if args.filter not in name:
+            continue
+        if name.startswith('xml_load[') and int(name[len('xml_load['):-1]) > args.max_components:
+            continue
+        result = results[name] = measure(setup(args), args.rounds, args.min_time, batch)
+        print('{:<22} min {:>12.2f}us  median {:>12.2f}us  stdev {:>6.1f}%'.format(
+            name, result['min'] * 1e6, result['median'] * 1e6, result['stdev'] / result['mean'] * 100
+        ))
+
+    report = {
+        'schema': SCHEMA_VERSION,
+        'suite': 'discord_interactions',
+        'created': time.time(),
+        'environment': environment(),
+        'results': results
+    }
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+        print('Results written to {}'.format(args.output))
+    if args.compare:
+        compare(results, args.compare)
+
+
+if __name__ == '__main__':
+    main()
@@ -1,12 +1,14 @@
 """
 Wrapper of discord interactions api.
 """
-from .utils.log import get_stream_logger, DEBUG
+from .utils.log import get_stream_logger, setup_logging, set_level
 from .utils.abstracts import SingletonMeta, JsonObject
 from .utils.type_hints import JSON, EMOJI, FileMode, Class, RestMethod
-from .utils.interaction_route import InteractionRoute
+from .utils.interaction_route import InteractionRoute, get_api_base, set_api_base
 from .application_commands.client import SlashClient, SlashBot, AutoShardedSlashClient, AutoShardedSlashBot
+from .client import InteractionClient, InteractionServer
 from .application_commands.models import *
+from .application_commands.errors import *
 from .ui import Component, ComponentType, ActionRow, Button, ButtonStyle
 
-slash_logger = get_stream_logger('discord_interactions', DEBUG)
+slash_logger = get_stream_logger('discord_interactions')
@@ -4,5 +4,7 @@ discord_interactions.client
 client class for slash-command usage.
 """
 
-from .application_command_client import SlashClient, AutoShardedSlashClient, SlashBot, AutoShardedSlashBot
-# Future : http-only client implementation. (only use application command oauth2 scope)
+from .application_command_client import SlashClient, AutoShardedSlashClient, SlashBot, AutoShardedSlashBot, low_memory_options
+from .shard_dispatch import ShardDispatcher, ShardQueue, shard_id_of
+from .dedupe import InteractionDeduplicator, DedupeStore, RedisDedupeStore
+# http-only client implementation is in discord_interactions.client
@@ -1,31 +1,136 @@
 import asyncio
 import inspect
+import itertools
+import logging
+import time
+import weakref
 from typing import Callable, Optional, Any, Dict, Tuple, Union, List
 
 from discord.ext.commands.bot import BotBase
-from discord import Client, AutoShardedClient
-
-from discord_interactions.application_commands.models import ApplicationCommand, ApplicationCommandOption, Interaction
+from discord import Client, AutoShardedClient, Intents, MemberCacheFlags
+
+from discord_interactions.application_commands.models import ApplicationCommand, ApplicationCommandOption, Interaction, \
+    SlashContext, SlashContextBuilder, OptionResolver, ExecutionPolicy, CommandExecutor
+from discord_interactions.application_commands.models.execution import check_poolable
+from discord_interactions.utils.http import get_scheduler
+from discord_interactions.monitoring.latency import LatencyTracker, UNKNOWN_COMMAND, PARSE, LOOKUP, CONTEXT, INVOKE, \
+    FIRST_RESPONSE, TOTAL
+from discord_interactions.monitoring.metrics import REGISTRY
+from discord_interactions.monitoring.instruments import INTERACTIONS_RECEIVED, INTERACTIONS_DISPATCHED, \
+    INTERACTIONS_TIMED_OUT, INTERACTIONS_FAILED
+from discord_interactions.monitoring.tracing import current_span, get_tracer
+from discord_interactions.monitoring.watchdog import SlowCallbackWatchdog
+from discord_interactions.monitoring.loop_lag import LoopLagMonitor
+from discord_interactions.monitoring.capture import TrafficRecorder
+from discord_interactions.ui.cache import ComponentCache
 from discord_interactions.utils.type_hints import CoroutineFunction, JSON
+from .shard_dispatch import ShardDispatcher, INTERACTION_DEADLINE
+from .dedupe import InteractionDeduplicator, DedupeStore
 
 # type hints
 ApplicationCommandWrapper = Callable[..., ApplicationCommand]
 
+slash_logger: logging.Logger = logging.getLogger('discord_interactions.commands')
+
 
 __all__ = (
     'SlashClient',
     'AutoShardedSlashClient',
     'SlashBot',
-    'AutoShardedSlashBot'
+    'AutoShardedSlashBot',
+    'low_memory_options'
 )
 
 
+def low_memory_options(options: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Fill discord.py client options to run with minimal gateway cache.
+    Interactions carry member, permissions and resolved objects by themselves, so guild, member and message caches
+    are not required to process them. Options given explicitly are kept.
+
+    Args:
+        options (Dict[str, Any]): keyword options of discord.Client.
+
+    Returns:
+        Given options, filled with low-memory defaults.
+    """
+    options.setdefault('intents', Intents.none())
+    options.setdefault('member_cache_flags', MemberCacheFlags.none())
+    options.setdefault('chunk_guilds_at_startup', False)
+    options.setdefault('max_messages', None)
+    options.setdefault('guild_subscriptions', False)
+    return options
+
+
+# Live clients, keyed by the `client` label of their metrics : index of the client in creation order.
+# Held weakly, so that the metrics registry doesn't keep clients alive.
+_clients: weakref.WeakValueDictionary = weakref.WeakValueDictionary()
+_client_ids = itertools.count()
+
+
+def _clientSamples(cls: type, method: Callable[[Any], List[Tuple[Tuple, int]]]) -> Callable[[], List[Tuple]]:
+    """Collect samples of every live client of the class, labeled by client."""
+    def samples() -> List[Tuple[Tuple, int]]:
+        return [
+            ((label,) + labels, value)
+            for label, client in list(_clients.items()) if isinstance(client, cls)
+            for labels, value in method(client)
+        ]
+    return samples
+
+
 class BaseSlashApplication:
     """Base Class of Slash command clients"""
-    def __init__(self, application_id: int = 0) -> None:
+    def __init__(
+            self,
+            application_id: int = 0,
+            low_memory: bool = False,
+            dedupe_store: Optional[DedupeStore] = None,
+            loop_monitor: Optional[LoopLagMonitor] = None
+    ) -> None:
+        """
+        Args:
+            application_id (int): id of the application.
+            low_memory (bool): build every context from interaction payloads, without gateway caches and api calls.
+            dedupe_store (Optional[DedupeStore]): shared store of seen interaction ids, for multi-process deployments.
+            loop_monitor (Optional[LoopLagMonitor]): monitor of event loop lag. Default settings if None.
+        """
         # Slash Command storage
         self.__application_commands__: Dict[int, ApplicationCommand] = {}
+        # Commands by (guild_id, name), guild_id being None for global commands. Interactions of commands created on
+        # code have ids unknown to the client, so they are looked up by name.
+        self.__command_names__: Dict[Tuple[Optional[int], str], ApplicationCommand] = {}
         self._application_id: int = application_id
+        self._low_memory: bool = low_memory
+        self.context_builder: SlashContextBuilder = SlashContextBuilder(self, payload_only=low_memory)
+        self.option_resolver: OptionResolver = OptionResolver(self.context_builder)
+        self.command_executor: CommandExecutor = CommandExecutor()
+        self.deduplicator: InteractionDeduplicator = InteractionDeduplicator(store=dedupe_store)
+        self.latency_tracker: LatencyTracker = LatencyTracker()
+        self.watchdog: Optional[SlowCallbackWatchdog] = None     # Opt-in : assign SlowCallbackWatchdog to enable.
+        self.recorder: Optional[TrafficRecorder] = None         # Opt-in : assign TrafficRecorder to capture traffic.
+        self.loop_monitor: LoopLagMonitor = loop_monitor if loop_monitor is not None else LoopLagMonitor()
+        self.metrics_label: str = str(next(_client_ids))    # `client` label of metrics sampled from this client.
+        _clients[self.metrics_label] = self
+
+    def _loopLag(self) -> List[Tuple[Tuple[str], float]]:
+        if not self.loop_monitor.running:
+            return []
+        percentiles = self.loop_monitor.distribution().percentiles(50, 99, 100)
+        return [(('0.5',), percentiles[50]), (('0.99',), percentiles[99]), (('1',), percentiles[100])]
+
+    @property
+    def low_memory(self) -> bool:
+        return self._low_memory
+
+    def _cacheSizes(self) -> List[Tuple[Tuple[str], int]]:
+        return [
+            (('commands',), len(self.__application_commands__)),
+            (('components',), sum(len(components) for components in ComponentCache().cache.values())),
+            (('channels',), len(self.context_builder.channel_cache)),
+            (('options',), len(self.option_resolver.cache)),
+            (('dedupe',), len(self.deduplicator))
+        ]
 
     @property
     def application_id(self) -> int:
@@ -44,11 +149,22 @@ class BaseSlashApplication:
     def getCommand(self, command_id: int) -> Optional[ApplicationCommand]:
         return self.__application_commands__.get(command_id)
 
-    def get_command_by_name(self, name: str) -> Optional[ApplicationCommand]:
-        return next(filter(
-            lambda c: c.name == name,
-            self.__application_commands__.values()
-        ))
+    def get_command_by_name(self, name: str, guild_id: Optional[int] = None) -> Optional[ApplicationCommand]:
+        """
+        Get application command by name. Guild command of the given guild is preferred over global command.
+
+        Args:
+            name (str): name of the command.
+            guild_id (Optional[int]): id of the guild where the command is invoked. None in direct messages.
+
+        Returns:
+            Matching ApplicationCommand object, or None if not found.
+        """
+        if guild_id is not None:
+            command = self.__command_names__.get((guild_id, name))
+            if command is not None:
+                return command
+        return self.__command_names__.get((None, name))
 
     async def process_slash(self, data: JSON):
         """
@@ -57,9 +173,82 @@ class BaseSlashApplication:
         Args:
             data (JSON): Gateway message.
         """
-        interaction: Interaction = Interaction.fromJson(data)
-        command: ApplicationCommand = interaction.getCommand(client=self)
-        await command.invoke()
+        received_at: float = time.monotonic()
+        with get_tracer().span('interaction', id=data['id']) as span:
+            if not await self.deduplicator.firstSeen(data['id']):
+                span.set('duplicate', True)
+                slash_logger.debug('Dropped duplicated interaction %s', data['id'])
+                return
+            await self.process_interaction(self.parse_interaction(data, received_at))
+
+    def parse_interaction(self, data: JSON, received_at: Optional[float] = None) -> Interaction:
+        """
+        Parse interaction payload, recording parse latency.
+
+        Args:
+            data (JSON): interaction payload.
+            received_at (Optional[float]): monotonic time when the payload is received. Defaults to now.
+
+        Returns:
+            Parsed Interaction object.
+        """
+        started_at: float = time.monotonic()
+        if self.recorder is not None:
+            self.recorder.interaction(data)
+        interaction: Interaction = Interaction.fromJson(data, received_at if received_at is not None else started_at)
+        name: str = interaction.data.name if interaction.data is not None else UNKNOWN_COMMAND
+        self.latency_tracker.record(name, PARSE, time.monotonic() - started_at)
+        INTERACTIONS_RECEIVED.labels(name).inc()
+        return interaction
+
+    async def process_interaction(self, interaction: Interaction) -> None:
+        """
+        Invoke application command of the interaction.
+
+        Args:
+            interaction (Interaction): interaction received through gateway or http endpoint.
+        """
+        tracker: LatencyTracker = self.latency_tracker
+        started_at: float = time.monotonic()
+        command: Optional[ApplicationCommand] = interaction.getCommand(client=self)
+        looked_up_at: float = time.monotonic()
+        if command is None:
+            tracker.record(UNKNOWN_COMMAND, LOOKUP, looked_up_at - started_at)
+            slash_logger.warning(
+                'Received interaction of unknown application command : %s',
+                interaction.data.name if interaction.data is not None else None
+            )
+            return
+        name: str = command.name
+        tracker.record(name, LOOKUP, looked_up_at - started_at)
+        span = current_span()
+        if span is not None:
+            span.set('command', name)
+        ctx: SlashContext = await SlashContext.fromInteraction(self, interaction, command)
+        invoked_at: float = time.monotonic()
+        tracker.record(name, CONTEXT, invoked_at - looked_up_at)
+        INTERACTIONS_DISPATCHED.labels(name).inc()
+        watchdog: Optional[SlowCallbackWatchdog] = self.watchdog
+        if watchdog is not None:
+            watchdog.enter(name)
+        self.loop_monitor.enter(name)
+        try:
+            await command.invoke(ctx, interaction.data.options)
+        except Exception:
+            INTERACTIONS_FAILED.labels(name).inc()
+            raise
+        finally:
+            if watchdog is not None:
+                watchdog.exit()
+            self.loop_monitor.exit(name)
+            finished_at: float = time.monotonic()
+            tracker.record(name, INVOKE, finished_at - invoked_at)
+            responded_at: Optional[float] = interaction.responded_at
+            if responded_at is not None:
+                tracker.record(name, FIRST_RESPONSE, responded_at - interaction.received_at)
+            if responded_at is None or responded_at - interaction.received_at > INTERACTION_DEADLINE:
+                INTERACTIONS_TIMED_OUT.labels(name).inc()  # Never responded, or too late : failed for the user.
+            tracker.record(name, TOTAL, finished_at - interaction.received_at)
 
     def __createSlash(
             self,
@@ -69,12 +258,13 @@ class BaseSlashApplication:
             options: Optional[List[Union[ApplicationCommandOption, JSON]]] = None,
             callback: Optional[CoroutineFunction] = None,
             is_guild_command: bool = False,
-            guild_id: Optional[int] = None
+            guild_id: Optional[int] = None,
+            execution: ExecutionPolicy = ExecutionPolicy.LOOP
     ) -> ApplicationCommand:
 
         parsed_options: List[ApplicationCommandOption] = list(map(
             lambda o: o if isinstance(o, ApplicationCommandOption) else ApplicationCommandOption.fromJson(o),
-            options
+            options or []
         ))
 
         if is_guild_command:
@@ -82,26 +272,35 @@ class BaseSlashApplication:
                 application_id=application_id,
                 name=name,
                 description=description,
-                options=options,
+                options=parsed_options,
                 callback=callback,
-                guild_id=guild_id
+                guild_id=guild_id,
+                execution=execution
             )
         else:
-            return ApplicationCommand(
+            command = ApplicationCommand(
                 application_id=application_id,
                 name=name,
                 description=description,
-                options=options,
-                callback=callback
+                options=parsed_options,
+                callback=callback,
+                execution=execution
             )
-        self.__application_commands__.update({command.id: command})
+        scoped_name = (command.guild_id, name)
+        if scoped_name in self.__command_names__:
+            raise ValueError('Application command `{}` is already registered.'.format(name))
+        # Commands created on code don't have id until they are synced, so use its scope and name as a temporary key.
+        key = command.id if command.id is not None else scoped_name
+        self.__application_commands__.update({key: command})
+        self.__command_names__[scoped_name] = command
         return command
 
     def globalSlash(
             self,
             name: Optional[str],
             description: Optional[str] = None,  # If None, read from docstring.
-            options: Optional[List[Union[ApplicationCommandOption, JSON]]] = None
+            options: Optional[List[Union[ApplicationCommandOption, JSON]]] = None,
+            execution: Union[ExecutionPolicy, str] = ExecutionPolicy.LOOP
     ) -> Callable[[CoroutineFunction], ApplicationCommand]:
         """
         Create and register ApplicationCommand object
@@ -110,14 +309,14 @@ class BaseSlashApplication:
             name (str):
             description (Optional[str]):
             options (Optional[List[Union[ApplicationCommandOption, JSON]]]:
+            execution (Union[ExecutionPolicy, str]): where the callback is executed. (loop, thread or process)
 
         Returns:
             Created ApplicationCommand object.
         """
 
         def wrapper(coro: CoroutineFunction) -> ApplicationCommand:
-            if not asyncio.iscoroutinefunction(coro):
-                raise TypeError("Callback function of ApplicationCommand must be a coroutine function!")
+            check_poolable(coro, ExecutionPolicy.parse(execution))
 
             command_name = name if name is not None else coro.__name__
             command_description = description if description is not None else inspect.getdoc(coro)  # Use inspect.getdoc() to clean code block indentation.
@@ -128,7 +327,8 @@ class BaseSlashApplication:
                 description=command_description,
                 options=options,
                 callback=coro,
-                is_guild_command=False
+                is_guild_command=False,
+                execution=ExecutionPolicy.parse(execution)
             )
 
             return command
@@ -141,7 +341,8 @@ class BaseSlashApplication:
             guild_id: int,
             name: Optional[str] = None,
             description: Optional[str] = None,
-            options: Optional[List[Union[ApplicationCommandOption, JSON]]] = None
+            options: Optional[List[Union[ApplicationCommandOption, JSON]]] = None,
+            execution: Union[ExecutionPolicy, str] = ExecutionPolicy.LOOP
     ) -> Callable[[CoroutineFunction], ApplicationCommand]:
         """
         Create and register ApplicationCommand object
@@ -151,14 +352,14 @@ class BaseSlashApplication:
             name (str): name of the slash command.
             description (Optional[str]): description of the slash command
             options (Optional[List[Union[ApplicationCommandOption, JSON]]: options of the slash command.
+            execution (Union[ExecutionPolicy, str]): where the callback is executed. (loop, thread or process)
 
         Returns:
             Created ApplicationCommand object.
         """
 
         def wrapper(coro: CoroutineFunction) -> ApplicationCommand:
-            if not asyncio.iscoroutinefunction(coro):
-                raise TypeError("Callback function of ApplicationCommand must be a coroutine function!")
+            check_poolable(coro, ExecutionPolicy.parse(execution))
 
             command_name = name if name is not None else coro.__name__
             command_description = description if description is not None else inspect.getdoc(coro)  # Use inspect.getdoc() to clean code block indentation.
@@ -170,18 +371,38 @@ class BaseSlashApplication:
                 options=options,
                 callback=coro,
                 is_guild_command=True,
-                guild_id=guild_id
+                guild_id=guild_id,
+                execution=ExecutionPolicy.parse(execution)
             )
 
             return command
         return wrapper
 
 
+REGISTRY.gaugeFunction(
+    'discord_interactions_cache_entries', 'Entries in caches of the client.', ('client', 'cache'),
+    _clientSamples(BaseSlashApplication, BaseSlashApplication._cacheSizes)
+)
+REGISTRY.gaugeFunction(
+    'discord_interactions_loop_lag_seconds', 'Scheduling lag of the event loop, in the rolling window.',
+    ('client', 'quantile'), _clientSamples(BaseSlashApplication, BaseSlashApplication._loopLag)
+)
+
+
 class SlashClient(Client, BaseSlashApplication):
     """Client class supporting Slash Command features"""
 
-    def __init__(self, **options):
+    def __init__(self, *, low_memory: bool = False, dedupe_store: Optional[DedupeStore] = None, **options):
+        """
+        Args:
+            low_memory (bool): run with minimal intents and caches, building contexts from interaction payloads.
+            dedupe_store (Optional[DedupeStore]): shared store of seen interaction ids, for multi-process deployments.
+            **options (Any): options of discord.Client.
+        """
+        if low_memory:
+            low_memory_options(options)
         super(SlashClient, self).__init__(**options)
+        BaseSlashApplication.__init__(self, low_memory=low_memory, dedupe_store=dedupe_store)   # discord.Client does not call super().__init__()
 
         async def get_application_id():
             self.application_id = (await self.application_info()).id
@@ -191,6 +412,18 @@ class SlashClient(Client, BaseSlashApplication):
             name='SlashClient.get_application_id'
         )
 
+    async def start(self, *args, **kwargs):
+        await get_scheduler().start()   # Open warm connections to the api host, if configured.
+        self.loop_monitor.start()
+        await super().start(*args, **kwargs)
+
+    async def close(self):
+        if self.watchdog is not None:
+            self.watchdog.stop()
+        self.loop_monitor.stop()
+        await get_scheduler().close()
+        await super().close()
+
     async def on_socket_response(self, msg: JSON):
         """
         Event handler for websocket response.
@@ -198,9 +431,6 @@ class SlashClient(Client, BaseSlashApplication):
         Args:
             msg (JSON): Gateway message.
         """
-        # Temporary debug code for future development
-        print(f'[on_socket_response]msg={msg}')
-
         if msg['op'] != 0 or msg['t'] != 'INTERACTION_CREATE':
             # Not a slash command related websocket response.
             return
@@ -211,8 +441,40 @@ class SlashClient(Client, BaseSlashApplication):
 class AutoShardedSlashClient(AutoShardedClient, BaseSlashApplication):
     """AutoSharded version of SlashClient."""
 
-    def __init__(self, *args, loop=None, **kwargs):
+    def __init__(
+            self,
+            *args,
+            loop=None,
+            low_memory: bool = False,
+            shard_concurrency: int = 16,
+            shard_backlog: int = 1000,
+            dedupe_store: Optional[DedupeStore] = None,
+            shed_lag: Optional[float] = None,
+            **kwargs
+    ):
+        """
+        Args:
+            low_memory (bool): run with minimal intents and caches, building contexts from interaction payloads.
+            shard_concurrency (int): maximum interactions processed concurrently per shard.
+            shard_backlog (int): maximum queued interactions per shard.
+            dedupe_store (Optional[DedupeStore]): shared store of seen interaction ids, for multi-process deployments.
+            shed_lag (Optional[float]): smoothed loop lag in seconds over which interactions arriving on shards with
+                backlog are rejected. Never shed if None.
+            **kwargs (Any): options of discord.AutoShardedClient.
+        """
+        if low_memory:
+            low_memory_options(kwargs)
         super().__init__(*args, loop=loop, **kwargs)
+        BaseSlashApplication.__init__(
+            self, low_memory=low_memory, dedupe_store=dedupe_store, loop_monitor=LoopLagMonitor(shed_threshold=shed_lag)
+        )   # discord.Client does not call super().__init__()
+        self.shard_dispatcher: ShardDispatcher = ShardDispatcher(
+            self.process_slash,
+            lambda: self.shard_count,
+            concurrency=shard_concurrency,
+            maxsize=shard_backlog,
+            overloaded=self.loop_monitor.overloaded if shed_lag is not None else None
+        )
 
         async def get_application_id():
             self.application_id = (await self.application_info()).id
@@ -222,14 +484,46 @@ class AutoShardedSlashClient(AutoShardedClient, BaseSlashApplication):
             name='SlashClient.get_application_id'
         )
 
-    async def on_socket_response(self, msg: Any):
-        """Event handler for websocket response.
+    async def start(self, *args, **kwargs):
+        await get_scheduler().start()   # Open warm connections to the api host, if configured.
+        self.loop_monitor.start()
+        await super().start(*args, **kwargs)
+
+    def _queueDepths(self) -> List[Tuple[Tuple[int], int]]:
+        return [((shard_id,), queue.backlog) for shard_id, queue in self.shard_dispatcher.queues.items()]
+
+    async def on_socket_response(self, msg: JSON):
+        """Event handler for websocket response. Interactions are enqueued to the queue of the shard received them.
         Args:
-            msg (Any): socket response
+            msg (JSON): Gateway message.
         """
-        # Temporary debug code for future development
-        print(f'[on_socket_response]msg={msg}')
-        await self.process_slash(msg)
+        if msg['op'] != 0 or msg['t'] != 'INTERACTION_CREATE':
+            # Not a slash command related websocket response.
+            return
+        self.shard_dispatcher.submit(msg['d'])
+
+    async def on_shard_disconnect(self, shard_id: int):
+        self.shard_dispatcher.setConnected(shard_id, False)
+
+    async def on_shard_connect(self, shard_id: int):
+        self.shard_dispatcher.setConnected(shard_id, True)
+
+    async def on_shard_resumed(self, shard_id: int):
+        self.shard_dispatcher.setConnected(shard_id, True)
+
+    async def close(self):
+        if self.watchdog is not None:
+            self.watchdog.stop()
+        self.loop_monitor.stop()
+        self.shard_dispatcher.close()
+        await get_scheduler().close()
+        await super().close()
+
+
+REGISTRY.gaugeFunction(
+    'discord_interactions_dispatch_queue_depth', 'Interactions waiting in the queue of each shard.', ('client', 'shard'),
+    _clientSamples(AutoShardedSlashClient, AutoShardedSlashClient._queueDepths)
+)
 
 
 class SlashBot(BotBase, SlashClient):
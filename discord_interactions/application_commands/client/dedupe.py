@@ -0,0 +1,129 @@
+from __future__ import annotations
+
+import logging
+from abc import ABC, abstractmethod
+from typing import Optional, Union, Dict, Final
+
+from discord_interactions.utils.cache import TimeBucketedSet
+
+__all__ = (
+    'DedupeStore',
+    'RedisDedupeStore',
+    'InteractionDeduplicator'
+)
+
+
+slash_logger: logging.Logger = logging.getLogger('discord_interactions.commands')
+
+# Interaction tokens are valid for 15 minutes, so duplicates can't be answered after this window anyway.
+DEDUPE_WINDOW: Final[float] = 15 * 60.0
+# Maximum count of remembered ids. Over it, ids of the oldest minutes are forgotten early.
+DEDUPE_MAXSIZE: Final[int] = 250000
+
+
+class DedupeStore(ABC):
+    """Shared store of seen interaction ids, used to drop duplicates across processes."""
+
+    @abstractmethod
+    async def add(self, interaction_id: int, ttl: float) -> bool:
+        """Add interaction id to the store, if absent.
+
+        Args:
+            interaction_id (int): id of the interaction.
+            ttl (float): seconds to keep the id.
+
+        Returns:
+            True if the id is newly added. False if another process already added it.
+        """
+        ...
+
+
+class RedisDedupeStore(DedupeStore):
+    """
+    DedupeStore backed by redis, using atomic `SET key 1 NX EX ttl`.
+    Accepts any asyncio redis client whose `set()` supports `nx` and `ex` keyword arguments. (ex: redis.asyncio)
+    """
+
+    def __init__(self, redis, prefix: str = 'discord_interactions:seen:') -> None:
+        """
+        Args:
+            redis: asyncio redis client.
+            prefix (str): prefix of keys.
+        """
+        self._redis = redis
+        self._prefix: str = prefix
+
+    async def add(self, interaction_id: int, ttl: float) -> bool:
+        return bool(await self._redis.set('{}{}'.format(self._prefix, interaction_id), 1, nx=True, ex=int(ttl)))
+
+
+class InteractionDeduplicator:
+    """
+    Drop interactions delivered more than once, such as those replayed on gateway resumes or failovers.
+    Ids are kept for 15 minutes in a ring of per-minute buckets, up to `maxsize` ids : over it, the oldest buckets are
+    dropped early. If a shared store is given, ids new to this process are also checked against the store.
+    """
+
+    def __init__(
+            self,
+            window: float = DEDUPE_WINDOW,
+            buckets: int = 15,
+            store: Optional[DedupeStore] = None,
+            maxsize: Optional[int] = DEDUPE_MAXSIZE
+    ) -> None:
+        """
+        Args:
+            window (float): seconds to remember interaction ids.
+            buckets (int): count of time buckets in the window.
+            store (Optional[DedupeStore]): shared store for multi-process deployments.
+            maxsize (Optional[int]): maximum count of remembered ids. Not bounded if None.
+        """
+        self._window: float = window
+        self._seen: TimeBucketedSet = TimeBucketedSet(window, buckets, maxsize)
+        self._store: Optional[DedupeStore] = store
+        self._counts: Dict[str, int] = {'checked': 0, 'duplicates': 0, 'store_errors': 0}
+
+    @property
+    def store(self) -> Optional[DedupeStore]:
+        return self._store
+
+    @property
+    def stats(self) -> Dict[str, int]:
+        stats = dict(self._counts)
+        stats['tracked'] = len(self._seen)
+        stats['evicted'] = self._seen.evicted
+        return stats
+
+    @property
+    def duplicates(self) -> int:
+        return self._counts['duplicates']
+
+    def __len__(self) -> int:
+        return len(self._seen)
+
+    async def firstSeen(self, interaction_id: Union[int, str]) -> bool:
+        """Check whether the interaction is delivered for the first time, and remember it.
+
+        Args:
+            interaction_id (Union[int, str]): id of the interaction.
+
+        Returns:
+            True if the interaction should be processed. False if it is a duplicate.
+        """
+        self._counts['checked'] += 1
+        interaction_id = int(interaction_id)
+        if not self._seen.add(interaction_id):
+            self._counts['duplicates'] += 1
+            return False
+        if self._store is not None:
+            try:
+                fresh: bool = await self._store.add(interaction_id, self._window)
+            except Exception as e:
+                # Fail open : processing twice is better than dropping interactions while the store is down.
+                self._counts['store_errors'] += 1
+                slash_logger.warning('Failed to check interaction %s in dedupe store : %r', interaction_id, e)
+                return True
+            if not fresh:
+                self._counts['duplicates'] += 1
+                return False
+        return True
@@ -0,0 +1,273 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from typing import Callable, Awaitable, Dict, List, Optional, Union, Final
+
+from discord_interactions.utils.type_hints import JSON
+from discord_interactions.monitoring.instruments import INTERACTIONS_TIMED_OUT
+from discord_interactions.monitoring.latency import UNKNOWN_COMMAND
+
+__all__ = (
+    'ShardQueue',
+    'ShardDispatcher',
+    'shard_id_of'
+)
+
+
+slash_logger: logging.Logger = logging.getLogger('discord_interactions.commands')
+
+# Interactions must be responded in 3 seconds. Interactions waited longer in queues are dropped.
+INTERACTION_DEADLINE: Final[float] = 3.0
+
+
+def shard_id_of(guild_id: Optional[Union[int, str]], shard_count: int) -> int:
+    """Calculate id of the shard which receives events of the guild. Events of DMs are received on shard 0."""
+    if guild_id is None or shard_count <= 1:
+        return 0
+    return (int(guild_id) >> 22) % shard_count
+
+
+class ShardQueue:
+    """
+    Queue of interactions received on a shard, consumed by its own workers.
+    Each shard has its own concurrency limit, so a hot shard can't delay interactions arriving on other shards.
+    While the shard is disconnected, its backlog is held and bounded to `held_maxsize` : interactions piled up while
+    reconnecting don't take resources of other shards, and are released on reconnection (or dropped if expired).
+    """
+
+    def __init__(
+            self,
+            shard_id: int,
+            process: Callable[[JSON], Awaitable[None]],
+            concurrency: int,
+            maxsize: int,
+            deadline: float,
+            overloaded: Optional[Callable[[], bool]] = None,
+            held_maxsize: int = 100
+    ) -> None:
+        self.shard_id: int = shard_id
+        self._process: Callable[[JSON], Awaitable[None]] = process
+        self._concurrency: int = concurrency
+        self._deadline: float = deadline
+        self._overloaded: Optional[Callable[[], bool]] = overloaded
+        self._held_maxsize: int = held_maxsize
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize)
+        self._workers: List[asyncio.Task] = []
+        self._held: int = 0    # Taken off the queue by workers, and held until the shard is connected.
+        self._connected: asyncio.Event = asyncio.Event()
+        self._connected.set()
+        self.in_flight: int = 0
+        # Metrics
+        self.received: int = 0
+        self.processed: int = 0
+        self.failed: int = 0
+        self.expired: int = 0
+        self.rejected: int = 0
+        self.shed: int = 0
+        self._wait_total: float = 0.0
+        self._wait_max: float = 0.0
+        self._run_total: float = 0.0
+
+    @property
+    def backlog(self) -> int:
+        return self._queue.qsize() + self._held
+
+    @property
+    def connected(self) -> bool:
+        return self._connected.is_set()
+
+    @connected.setter
+    def connected(self, connected: bool) -> None:
+        if connected == self._connected.is_set():
+            return
+        if connected:
+            slash_logger.info('Shard %s is connected. Releasing %s held interactions.', self.shard_id, self.backlog)
+            self._connected.set()
+        else:
+            slash_logger.info('Shard %s is disconnected. Holding its backlog.', self.shard_id)
+            self._connected.clear()
+
+    def put(self, data: JSON) -> bool:
+        """Enqueue interaction payload.
+
+        Returns:
+            False if the queue is full or the loop is overloaded, and the interaction is rejected.
+        """
+        if not self._workers:
+            self._workers = [asyncio.ensure_future(self._work()) for _ in range(self._concurrency)]
+        self.received += 1
+        if not self._connected.is_set() and self.backlog >= self._held_maxsize:
+            self.rejected += 1
+            slash_logger.warning(
+                'Shard %s is disconnected with %s held interactions. Dropping interaction %s.',
+                self.shard_id, self.backlog, data.get('id')
+            )
+            return False
+        if self._overloaded is not None and self.backlog and self._overloaded():
+            # Queued interactions already wait behind a lagging loop : new ones would miss their deadline.
+            self.shed += 1
+            slash_logger.warning(
+                'Event loop is overloaded. Shedding interaction %s of shard %s.', data.get('id'), self.shard_id
+            )
+            return False
+        try:
+            self._queue.put_nowait((time.monotonic(), data))
+        except asyncio.QueueFull:
+            self.rejected += 1
+            slash_logger.warning(
+                'Interaction queue of shard %s is full. Dropping interaction %s.', self.shard_id, data.get('id')
+            )
+            return False
+        return True
+
+    async def _work(self) -> None:
+        queue = self._queue
+        while True:
+            await self._connected.wait()    # Hold the backlog in the queue until the shard is connected again.
+            enqueued_at, data = await queue.get()
+            if not self._connected.is_set():
+                # Disconnected while this worker was waiting for the queue : hold the interaction, still counted.
+                self._held += 1
+                try:
+                    await self._connected.wait()
+                finally:
+                    self._held -= 1
+            started_at = time.monotonic()
+            waited = started_at - enqueued_at
+            self._wait_total += waited
+            if waited > self._wait_max:
+                self._wait_max = waited
+            if waited > self._deadline:
+                # Can't be responded anymore. (ex: backlog piled up while the shard was reconnecting)
+                self.expired += 1
+                INTERACTIONS_TIMED_OUT.labels((data.get('data') or {}).get('name', UNKNOWN_COMMAND)).inc()
+                queue.task_done()
+                continue
+            self.in_flight += 1
+            try:
+                await self._process(data)
+            except Exception as e:
+                self.failed += 1
+                slash_logger.error(
+                    'Exception while processing interaction %s on shard %s', data.get('id'), self.shard_id, exc_info=e
+                )
+            else:
+                self.processed += 1
+            finally:
+                self.in_flight -= 1
+                self._run_total += time.monotonic() - started_at
+                queue.task_done()
+
+    @property
+    def metrics(self) -> Dict[str, Union[int, float, bool]]:
+        dequeued = self.processed + self.failed + self.expired
+        finished = self.processed + self.failed
+        return {
+            'connected': self.connected,
+            'backlog': self.backlog,
+            'in_flight': self.in_flight,
+            'received': self.received,
+            'processed': self.processed,
+            'failed': self.failed,
+            'expired': self.expired,
+            'rejected': self.rejected,
+            'shed': self.shed,
+            'queue_latency_avg': self._wait_total / dequeued if dequeued else 0.0,
+            'queue_latency_max': self._wait_max,
+            'process_latency_avg': self._run_total / finished if finished else 0.0
+        }
+
+    async def join(self) -> None:
+        await self._queue.join()
+
+    def close(self) -> None:
+        for worker in self._workers:
+            worker.cancel()
+        self._workers.clear()
+
+
+class ShardDispatcher:
+    """
+    Shard-aware interaction intake of AutoShardedSlashClient.
+    Interactions are enqueued to the queue of the shard which received them, and each queue is consumed by its own
+    workers with an independent concurrency limit.
+    """
+
+    def __init__(
+            self,
+            process: Callable[[JSON], Awaitable[None]],
+            shard_count: Callable[[], Optional[int]],
+            *,
+            concurrency: int = 16,
+            maxsize: int = 1000,
+            deadline: float = INTERACTION_DEADLINE,
+            overloaded: Optional[Callable[[], bool]] = None,
+            held_maxsize: int = 100
+    ) -> None:
+        """
+        Args:
+            process (Callable[[JSON], Awaitable[None]]): coroutine function processing interaction payloads.
+            shard_count (Callable[[], Optional[int]]): function returning current shard count of the client.
+            concurrency (int): maximum interactions processed concurrently per shard.
+            maxsize (int): maximum backlog per shard. Interactions over it are rejected.
+            deadline (float): seconds after which queued interactions are dropped, since they can't be responded.
+            overloaded (Optional[Callable[[], bool]]): function telling the loop is overloaded. (ex: LoopLagMonitor)
+                While it returns True, interactions arriving on a shard with backlog are rejected.
+            held_maxsize (int): maximum backlog of disconnected shards, held until they are connected again.
+        """
+        if concurrency <= 0:
+            raise ValueError('ShardDispatcher.concurrency must be positive integer.')
+        self._process: Callable[[JSON], Awaitable[None]] = process
+        self._shard_count: Callable[[], Optional[int]] = shard_count
+        self._concurrency: int = concurrency
+        self._maxsize: int = maxsize
+        self._deadline: float = deadline
+        self._overloaded: Optional[Callable[[], bool]] = overloaded
+        self._held_maxsize: int = held_maxsize
+        self._queues: Dict[int, ShardQueue] = {}
+
+    @property
+    def queues(self) -> Dict[int, ShardQueue]:
+        return dict(self._queues)
+
+    def queue(self, shard_id: int) -> ShardQueue:
+        queue = self._queues.get(shard_id)
+        if queue is None:
+            queue = self._queues[shard_id] = ShardQueue(
+                shard_id, self._process, self._concurrency, self._maxsize, self._deadline, self._overloaded,
+                self._held_maxsize
+            )
+        return queue
+
+    def shardOf(self, data: JSON) -> int:
+        return shard_id_of(data.get('guild_id'), self._shard_count() or 1)
+
+    def submit(self, data: JSON, shard_id: Optional[int] = None) -> bool:
+        """Enqueue interaction payload to the queue of its shard.
+
+        Args:
+            data (JSON): interaction payload.
+            shard_id (Optional[int]): id of the shard which received the interaction. Calculated from guild id if None.
+
+        Returns:
+            False if the queue of the shard is full or the loop is overloaded, and the interaction is rejected.
+        """
+        return self.queue(shard_id if shard_id is not None else self.shardOf(data)).put(data)
+
+    def setConnected(self, shard_id: int, connected: bool) -> None:
+        self.queue(shard_id).connected = connected
+
+    @property
+    def metrics(self) -> Dict[int, Dict[str, Union[int, float, bool]]]:
+        """Metrics of each shard queue, keyed by shard id."""
+        return {shard_id: queue.metrics for shard_id, queue in sorted(self._queues.items())}
+
+    async def join(self) -> None:
+        """Wait until every queued interaction is processed."""
+        await asyncio.gather(*(queue.join() for queue in self._queues.values()))
+
+    def close(self) -> None:
+        for queue in self._queues.values():
+            queue.close()
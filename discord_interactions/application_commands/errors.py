@@ -0,0 +1,19 @@
+__all__ = (
+    'ApplicationCommandError',
+    'SubCommandNotFound',
+)
+
+
+class ApplicationCommandError(Exception):
+    """Parent class for all application command errors"""
+    pass
+
+
+class SubCommandNotFound(ApplicationCommandError):
+    """Raised when an interaction refers to a subcommand path which is not registered on the command."""
+    def __init__(self, command: str, path: str):
+        super(SubCommandNotFound, self).__init__(
+            'Subcommand path `{}` is not registered on command `{}`.'.format(path, command)
+        )
+        self.command = command
+        self.path = path
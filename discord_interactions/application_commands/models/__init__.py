@@ -4,4 +4,9 @@ discord_interactions.models
 models for slash-command usage.
 """
 from .slash import *
+from .execution import *
+from .coalesce import *
 from .annotations import *
+from .partial import *
+from .context import *
+from .resolver import *
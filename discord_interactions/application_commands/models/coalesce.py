@@ -0,0 +1,140 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from typing import Callable, Awaitable, Dict, List, Optional, Union, Final
+
+from discord_interactions.utils.type_hints import JSON
+
+__all__ = (
+    'EditCoalescer',
+)
+
+
+slash_logger: logging.Logger = logging.getLogger('discord_interactions.commands')
+
+# Minimum seconds between edits of the same message.
+EDIT_COALESCE_WINDOW: Final[float] = 0.5
+
+MessageID = Union[int, str]
+
+
+class _MessageEdits:
+    __slots__ = ('pending', 'waiters', 'task', 'last_sent', 'expiry')
+
+    def __init__(self) -> None:
+        self.pending: Optional[JSON] = None
+        self.waiters: List[asyncio.Future] = []
+        self.task: Optional[asyncio.Task] = None
+        self.last_sent: float = 0.0
+        self.expiry: Optional[asyncio.TimerHandle] = None
+
+
+class EditCoalescer:
+    """
+    Merge rapid edits of the same message, so only the latest state is sent.
+    Edits of a message are sent one at a time, and at most once per window. Edits queued while waiting are merged
+    into a single payload (later fields override earlier ones). The last queued edit is always delivered.
+    State of a message is kept until the window passed since its last edit, so spaced edits are throttled too.
+    """
+
+    def __init__(
+            self,
+            send: Callable[[MessageID, JSON], Awaitable[JSON]],
+            window: float = EDIT_COALESCE_WINDOW
+    ) -> None:
+        """
+        Args:
+            send (Callable[[MessageID, JSON], Awaitable[JSON]]): coroutine function sending edit of the message.
+            window (float): minimum seconds between edits of the same message.
+        """
+        if window < 0:
+            raise ValueError('EditCoalescer.window must not be negative.')
+        self._send: Callable[[MessageID, JSON], Awaitable[JSON]] = send
+        self._window: float = window
+        self._messages: Dict[MessageID, _MessageEdits] = {}
+        self._counts: Dict[str, int] = {'queued': 0, 'sent': 0, 'failed': 0, 'merged': 0}
+
+    @property
+    def window(self) -> float:
+        return self._window
+
+    @property
+    def stats(self) -> Dict[str, int]:
+        """Count of queued edits, edit requests actually sent, and edits merged into another request."""
+        return dict(self._counts)
+
+    @property
+    def pending(self) -> int:
+        """Count of queued edits which are not sent yet."""
+        return sum(len(edits.waiters) for edits in self._messages.values())
+
+    def edit(self, message_id: MessageID, data: JSON) -> asyncio.Future:
+        """Queue edit of the message.
+
+        Args:
+            message_id (MessageID): id of the message to edit. ('@original' for initial response)
+            data (JSON): message payload to edit.
+
+        Returns:
+            Future which receives json of the edited message, once the edit carrying this payload is sent.
+        """
+        edits = self._messages.get(message_id)
+        if edits is None:
+            edits = self._messages[message_id] = _MessageEdits()
+        elif edits.expiry is not None:
+            edits.expiry.cancel()
+            edits.expiry = None
+        edits.pending = dict(data) if edits.pending is None else {**edits.pending, **data}
+        future = asyncio.get_event_loop().create_future()
+        edits.waiters.append(future)
+        self._counts['queued'] += 1
+        if edits.task is None:
+            edits.task = asyncio.ensure_future(self._drain(message_id, edits))
+        return future
+
+    async def _drain(self, message_id: MessageID, edits: _MessageEdits) -> None:
+        try:
+            while edits.pending is not None:
+                delay = edits.last_sent + self._window - time.monotonic()
+                if delay > 0:
+                    await asyncio.sleep(delay)   # Edits queued meanwhile are merged into the pending payload.
+                data, waiters = edits.pending, edits.waiters
+                edits.pending, edits.waiters = None, []
+                self._counts['merged'] += len(waiters) - 1
+                try:
+                    result = await self._send(message_id, data)
+                except Exception as e:
+                    self._counts['failed'] += 1
+                    slash_logger.warning('Failed to edit message %s : %r', message_id, e)
+                    for waiter in waiters:
+                        if not waiter.done():
+                            waiter.set_exception(e)
+                            waiter.exception()  # Mark retrieved : progress edits are usually not awaited.
+                else:
+                    self._counts['sent'] += 1
+                    for waiter in waiters:
+                        if not waiter.done():
+                            waiter.set_result(result)
+                finally:
+                    edits.last_sent = time.monotonic()
+        finally:
+            edits.task = None
+            if edits.pending is None:
+                edits.expiry = asyncio.get_event_loop().call_later(
+                    max(edits.last_sent + self._window - time.monotonic(), 0.0), self._expire, message_id, edits
+                )
+
+    def _expire(self, message_id: MessageID, edits: _MessageEdits) -> None:
+        edits.expiry = None
+        if edits.task is None and edits.pending is None and self._messages.get(message_id) is edits:
+            del self._messages[message_id]
+
+    async def flush(self) -> None:
+        """Wait until every queued edit is sent."""
+        while True:
+            tasks = [edits.task for edits in self._messages.values() if edits.task is not None]
+            if not tasks:
+                return
+            await asyncio.gather(*tasks, return_exceptions=True)
@@ -0,0 +1,173 @@
+from __future__ import annotations
+
+import logging
+from typing import Optional, Union
+
+from discord import Guild, Member, Role
+from discord.abc import GuildChannel
+
+from discord_interactions.utils.cache import TTLCache, SingleFlight
+from discord_interactions.utils.type_hints import JSON
+from .slash import ApplicationCommand, Interaction, SlashContext
+from .partial import PartialMember, PartialRole, PartialChannel
+
+__all__ = (
+    'SlashContextBuilder',
+)
+
+
+slash_logger: logging.Logger = logging.getLogger('discord_interactions.commands')
+
+
+class SlashContextBuilder:
+    """
+    Build SlashContext objects from interaction payloads.
+    Author and roles are built from the interaction's own `member` and `resolved` payload, and only the channel
+    missing in the client's cache is fetched. Concurrent fetches of the same channel are collapsed into one request,
+    and fetched channels are cached for `ttl` seconds.
+    With `payload_only`, gateway caches are never read and nothing is fetched : every object is built from payload.
+    """
+
+    def __init__(self, client, ttl: float = 300.0, maxsize: int = 10000, payload_only: bool = False) -> None:
+        """
+        Args:
+            client (BaseSlashApplication): client which owns this builder.
+            ttl (float): seconds to keep fetched channels.
+            maxsize (int): maximum count of fetched channels to keep.
+            payload_only (bool): build objects only from interaction payloads. Used in low-memory mode.
+        """
+        self._client = client
+        self._payload_only: bool = payload_only
+        self._channels: TTLCache = TTLCache(ttl, maxsize)
+        self._fetches: SingleFlight = SingleFlight()
+
+    @property
+    def client(self):
+        return self._client
+
+    @property
+    def payload_only(self) -> bool:
+        return self._payload_only
+
+    @property
+    def channel_cache(self) -> TTLCache:
+        return self._channels
+
+    @property
+    def state(self):
+        """discord.py's ConnectionState of the client. None if the client is not a discord.py client."""
+        return getattr(self._client, '_connection', None)
+
+    def getGuild(self, guild_id: Optional[Union[int, str]]) -> Optional[Guild]:
+        if guild_id is None or self._payload_only:
+            return None
+        get_guild = getattr(self._client, 'get_guild', None)
+        return get_guild(int(guild_id)) if get_guild is not None else None
+
+    def buildAuthor(
+            self,
+            guild: Optional[Guild],
+            raw_member: JSON,
+            guild_id: Optional[int] = None
+    ) -> Union[Member, PartialMember]:
+        """Build author of the interaction from `member` payload.
+
+        Args:
+            guild (Optional[Guild]): guild of the interaction, if cached.
+            raw_member (JSON): `member` object of the interaction.
+            guild_id (Optional[int]): id of the guild of the interaction.
+
+        Returns:
+            Cached Member object if exists. Otherwise, Member (or PartialMember, when guild is not cached) built from
+            payload.
+        """
+        if guild is not None:
+            member: Optional[Member] = guild.get_member(int(raw_member['user']['id']))
+            if member is not None:
+                return member
+            if self.state is not None:
+                return Member(data=raw_member, guild=guild, state=self.state)
+        return PartialMember(self.state, guild_id, raw_member)
+
+    def buildRole(self, guild: Optional[Guild], guild_id: Optional[int], raw_role: JSON) -> Union[Role, PartialRole]:
+        """Build role from `resolved` payload.
+
+        Args:
+            guild (Optional[Guild]): guild of the interaction, if cached.
+            guild_id (Optional[int]): id of the guild of the interaction.
+            raw_role (JSON): role object in `resolved.roles`.
+
+        Returns:
+            Cached Role object if exists. Otherwise, PartialRole built from payload.
+        """
+        if guild is not None:
+            role: Optional[Role] = guild.get_role(int(raw_role['id']))
+            if role is not None:
+                return role
+        return PartialRole(guild_id, raw_role)
+
+    async def getChannel(
+            self,
+            guild: Optional[Guild],
+            channel_id: Union[int, str],
+            resolved: Optional[JSON] = None
+    ) -> Union[GuildChannel, PartialChannel]:
+        """Get channel of the interaction, fetching only that channel when it is missing in caches.
+
+        Args:
+            guild (Optional[Guild]): guild of the interaction, if cached.
+            channel_id (Union[int, str]): id of the channel.
+            resolved (Optional[JSON]): `resolved` object of the interaction, if exists.
+
+        Returns:
+            Channel object. PartialChannel if the channel cannot be fetched.
+        """
+        channel_id = int(channel_id)
+        if guild is not None:
+            channel = guild.get_channel(channel_id)
+            if channel is not None:
+                return channel
+
+        channel = self._channels.get(channel_id)
+        if channel is not None:
+            return channel
+
+        raw_channel: Optional[JSON] = resolved.get('channels', {}).get(str(channel_id)) if resolved else None
+        if raw_channel is not None:
+            return PartialChannel(self.state, channel_id, guild.id if guild is not None else None, raw_channel)
+
+        if self._payload_only or getattr(self._client, 'fetch_channel', None) is None:
+            return PartialChannel(self.state, channel_id, guild.id if guild is not None else None)
+
+        try:
+            channel = await self._fetches.do(channel_id, self._client.fetch_channel, channel_id)
+        except Exception as e:
+            slash_logger.warning('Failed to fetch channel %s : %r', channel_id, e)
+            return PartialChannel(self.state, channel_id, guild.id if guild is not None else None)
+        self._channels.set(channel_id, channel)
+        return channel
+
+    async def build(self, interaction: Interaction, command: Optional[ApplicationCommand] = None) -> SlashContext:
+        """Build SlashContext of the interaction.
+
+        Args:
+            interaction (Interaction): interaction to build context.
+            command (Optional[ApplicationCommand]): command of the interaction, if already looked up.
+
+        Returns:
+            Built SlashContext object.
+        """
+        guild: Optional[Guild] = self.getGuild(interaction.guild_id)
+        resolved: Optional[JSON] = interaction.data.resolved if interaction.data is not None else None
+        return SlashContext(
+            client=self._client,
+            author=self.buildAuthor(
+                guild,
+                interaction.raw_member,
+                int(interaction.guild_id) if interaction.guild_id is not None else None
+            ),
+            guild=guild,
+            channel=await self.getChannel(guild, interaction.channel_id, resolved),
+            command=command if command is not None else interaction.getCommand(self._client),
+            interaction=interaction
+        )
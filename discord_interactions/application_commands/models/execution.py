@@ -0,0 +1,223 @@
+from __future__ import annotations
+
+import asyncio
+import collections.abc
+import functools
+import importlib
+import logging
+import time
+from concurrent.futures import Executor, ThreadPoolExecutor, ProcessPoolExecutor
+from enum import Enum
+from typing import Optional, Dict, Any, Callable, Final
+
+__all__ = (
+    'ExecutionPolicy',
+    'ContextSnapshot',
+    'CommandExecutor'
+)
+
+
+slash_logger: logging.Logger = logging.getLogger('discord_interactions.commands')
+
+# Seconds after receiving the interaction, before offloaded commands are deferred. Discord waits 3 seconds.
+DEFER_AFTER: Final[float] = 2.0
+
+
+class ExecutionPolicy(Enum):
+    """Where callback of the application command is executed."""
+    LOOP = 'loop'           # Coroutine function awaited on the event loop.
+    THREAD = 'thread'       # Plain function called in a thread pool.
+    PROCESS = 'process'     # Plain function called in a process pool. Must be importable by module and qualified name.
+
+    @classmethod
+    def parse(cls, value) -> ExecutionPolicy:
+        return value if isinstance(value, cls) else cls(value)
+
+
+def _snapshotValue(value: Any) -> Any:
+    """Convert option value into a picklable value. Discord objects are replaced with their ids."""
+    if value is None or isinstance(value, (str, int, float, bool)):
+        return value
+    return getattr(value, 'id', value)
+
+
+class ContextSnapshot:
+    """
+    Picklable snapshot of SlashContext, passed to callbacks executed in thread or process pools.
+    Callbacks in pools can't touch discord objects bound to the event loop, so only ids and names are kept.
+    """
+    __slots__ = (
+        'interaction_id', 'application_id', 'command_name', 'guild_id', 'channel_id', 'author_id', 'author_name',
+        'author_display_name'
+    )
+
+    @classmethod
+    def fromContext(cls, ctx) -> ContextSnapshot:
+        interaction = ctx.interaction
+        author = ctx.author
+        return cls(
+            interaction_id=int(interaction.id) if interaction is not None else None,
+            application_id=int(interaction.application_id) if getattr(interaction, 'application_id', None) else None,
+            command_name=ctx.command.name if ctx.command is not None else None,
+            guild_id=int(interaction.guild_id) if interaction is not None and interaction.guild_id is not None else None,
+            channel_id=getattr(ctx.channel, 'id', None),
+            author_id=getattr(author, 'id', None),
+            author_name=getattr(author, 'name', None),
+            author_display_name=getattr(author, 'display_name', None)
+        )
+
+    def __init__(
+            self,
+            interaction_id: Optional[int],
+            application_id: Optional[int],
+            command_name: Optional[str],
+            guild_id: Optional[int],
+            channel_id: Optional[int],
+            author_id: Optional[int],
+            author_name: Optional[str],
+            author_display_name: Optional[str]
+    ) -> None:
+        self.interaction_id: Optional[int] = interaction_id
+        self.application_id: Optional[int] = application_id
+        self.command_name: Optional[str] = command_name
+        self.guild_id: Optional[int] = guild_id
+        self.channel_id: Optional[int] = channel_id
+        self.author_id: Optional[int] = author_id
+        self.author_name: Optional[str] = author_name
+        self.author_display_name: Optional[str] = author_display_name
+
+    def __getstate__(self) -> Dict[str, Any]:
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        for name, value in state.items():
+            setattr(self, name, value)
+
+    def __repr__(self) -> str:
+        return 'ContextSnapshot(interaction_id={}, command_name={}, author_id={})'.format(
+            self.interaction_id, self.command_name, self.author_id
+        )
+
+
+def _callPooled(module: str, qualname: str, snapshot: ContextSnapshot, kwargs: Dict[str, Any]) -> Any:
+    """Entrypoint of process pool workers. Look up the callback by name, since decorated names refer to commands."""
+    target: Any = importlib.import_module(module)
+    for name in qualname.split('.'):
+        target = getattr(target, name)
+    # Module attribute is replaced with ApplicationCommand (or subcommand) by registration decorators.
+    callback: Callable[..., Any] = getattr(target, 'callback', target)
+    return callback(snapshot, **kwargs)
+
+
+def check_poolable(callback: Callable[..., Any], policy: ExecutionPolicy) -> None:
+    """Check whether the callback can be executed with the policy.
+
+    Args:
+        callback (Callable[..., Any]): callback function of the application command.
+        policy (ExecutionPolicy): execution policy of the application command.
+    """
+    if policy is ExecutionPolicy.LOOP:
+        if not asyncio.iscoroutinefunction(callback):
+            raise TypeError('Callback function of ApplicationCommand must be a coroutine function!')
+        return
+    if asyncio.iscoroutinefunction(callback):
+        raise TypeError('Callback function executed in {} pool must be a plain function.'.format(policy.value))
+    if policy is ExecutionPolicy.PROCESS and '<locals>' in callback.__qualname__:
+        raise ValueError('Callback function executed in process pool must be defined at module level : {}'.format(
+            callback.__qualname__
+        ))
+
+
+class CommandExecutor:
+    """
+    Run callbacks of application commands in thread or process pools, and respond with their results on the loop.
+    If the result is not ready before the interaction's deadline, the interaction is deferred, and the result edits
+    the deferred response. Results are routed to SlashContext : strings are sent as content, mappings are passed as
+    keyword arguments of SlashContext.send(), and None sends nothing.
+    """
+
+    def __init__(
+            self,
+            thread_workers: Optional[int] = None,
+            process_workers: Optional[int] = None,
+            defer_after: float = DEFER_AFTER,
+            mp_context=None
+    ) -> None:
+        """
+        Args:
+            thread_workers (Optional[int]): maximum threads of the thread pool. If None, python's default is used.
+            process_workers (Optional[int]): maximum processes of the process pool. If None, count of cpu cores is used.
+            defer_after (float): seconds after receiving the interaction, before deferring.
+            mp_context: multiprocessing context of the process pool.
+        """
+        self._thread_workers: Optional[int] = thread_workers
+        self._process_workers: Optional[int] = process_workers
+        self._defer_after: float = defer_after
+        self._mp_context = mp_context
+        self._thread_pool: Optional[Executor] = None
+        self._process_pool: Optional[Executor] = None
+
+    @property
+    def thread_pool(self) -> Executor:
+        if self._thread_pool is None:
+            self._thread_pool = ThreadPoolExecutor(self._thread_workers, thread_name_prefix='discord_interactions')
+        return self._thread_pool
+
+    @property
+    def process_pool(self) -> Executor:
+        if self._process_pool is None:
+            self._process_pool = ProcessPoolExecutor(self._process_workers, mp_context=self._mp_context)
+        return self._process_pool
+
+    def submit(self, policy: ExecutionPolicy, callback: Callable[..., Any], snapshot: ContextSnapshot,
+               kwargs: Dict[str, Any]) -> asyncio.Future:
+        loop = asyncio.get_running_loop()
+        if policy is ExecutionPolicy.THREAD:
+            return loop.run_in_executor(self.thread_pool, functools.partial(callback, snapshot, **kwargs))
+        return loop.run_in_executor(
+            self.process_pool, _callPooled, callback.__module__, callback.__qualname__, snapshot, kwargs
+        )
+
+    async def run(self, policy: ExecutionPolicy, callback: Callable[..., Any], ctx, kwargs: Dict[str, Any]) -> Any:
+        """Execute the callback in the pool of the policy, and respond to the interaction with its result.
+
+        Args:
+            policy (ExecutionPolicy): THREAD or PROCESS.
+            callback (Callable[..., Any]): plain function to execute.
+            ctx (SlashContext): context of the interaction.
+            kwargs (Dict[str, Any]): bound option values of the callback.
+
+        Returns:
+            Result of the callback.
+        """
+        snapshot = ContextSnapshot.fromContext(ctx)
+        future = self.submit(policy, callback, snapshot, {k: _snapshotValue(v) for k, v in kwargs.items()})
+
+        interaction = ctx.interaction
+        received_at: float = getattr(interaction, 'received_at', None) or time.monotonic()
+        remaining: float = max(0.0, self._defer_after - (time.monotonic() - received_at))
+        deferred: bool = False
+        done, _ = await asyncio.wait((future,), timeout=remaining)
+        if not done and interaction is not None and not interaction.responded:
+            await ctx.defer()
+            deferred = True
+        result = await future
+        await self.deliver(ctx, result, deferred)
+        return result
+
+    @staticmethod
+    async def deliver(ctx, result: Any, deferred: bool) -> None:
+        if result is None:
+            return
+        payload: Dict[str, Any] = dict(result) if isinstance(result, collections.abc.Mapping) else {'content': str(result)}
+        if deferred:
+            payload.pop('ephemeral', None)  # Visibility is fixed when deferred.
+            await ctx.edit(**payload)
+        else:
+            await ctx.send(**payload)
+
+    def shutdown(self, wait: bool = True) -> None:
+        for pool in (self._thread_pool, self._process_pool):
+            if pool is not None:
+                pool.shutdown(wait=wait)
+        self._thread_pool = self._process_pool = None
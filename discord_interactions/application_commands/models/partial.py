@@ -0,0 +1,131 @@
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Optional, List, Any
+
+from discord import Permissions, User, utils
+from discord.enums import ChannelType, try_enum
+from discord.abc import Messageable
+
+from discord_interactions.utils.type_hints import JSON
+
+__all__ = (
+    'PartialMember',
+    'PartialRole',
+    'PartialChannel'
+)
+
+
+class PartialMember:
+    """
+    Member object built from the `member` payload of the interaction. Used when the guild of the interaction is not
+    cached. Attributes of discord.User are also available on this object.
+    """
+    __slots__ = ('_user', 'guild_id', 'nick', 'role_ids', 'permissions', 'joined_at', 'premium_since', 'pending')
+
+    def __init__(self, state, guild_id: Optional[int], data: JSON, user: Optional[User] = None) -> None:
+        self._user: User = user if user is not None else User(state=state, data=data['user'])
+        self.guild_id: Optional[int] = guild_id
+        self.nick: Optional[str] = data.get('nick')
+        self.role_ids: List[int] = [int(r) for r in data.get('roles', [])]
+        # Interactions contain total permissions of the member in the channel.
+        self.permissions: Optional[Permissions] = Permissions(int(data['permissions'])) if 'permissions' in data else None
+        self.joined_at: Optional[datetime] = utils.parse_time(data.get('joined_at'))
+        self.premium_since: Optional[datetime] = utils.parse_time(data.get('premium_since'))
+        self.pending: bool = data.get('pending', False)
+
+    @property
+    def user(self) -> User:
+        return self._user
+
+    @property
+    def display_name(self) -> str:
+        return self.nick or self._user.name
+
+    @property
+    def mention(self) -> str:
+        return '<@!{}>'.format(self._user.id) if self.nick else self._user.mention
+
+    def __getattr__(self, item: str) -> Any:
+        # Delegate user attributes. (id, name, discriminator, avatar, ...)
+        return getattr(self._user, item)
+
+    def __eq__(self, other) -> bool:
+        return getattr(other, 'id', None) == self._user.id
+
+    def __hash__(self) -> int:
+        return hash(self._user)
+
+    def __str__(self) -> str:
+        return str(self._user)
+
+    def __repr__(self) -> str:
+        return 'PartialMember(id={}, name={}, nick={})'.format(self._user.id, self._user.name, self.nick)
+
+
+class PartialRole:
+    """
+    Role object built from the interaction payload. Used when the guild of the interaction is not cached.
+    """
+    __slots__ = ('id', 'guild_id', 'name', 'permissions', 'position', 'color', 'hoist', 'managed', 'mentionable')
+
+    def __init__(self, guild_id: Optional[int], data: JSON) -> None:
+        self.id: int = int(data['id'])
+        self.guild_id: Optional[int] = guild_id
+        self.name: Optional[str] = data.get('name')
+        self.permissions: Permissions = Permissions(int(data.get('permissions', 0)))
+        self.position: int = data.get('position', 0)
+        self.color: int = data.get('color', 0)
+        self.hoist: bool = data.get('hoist', False)
+        self.managed: bool = data.get('managed', False)
+        self.mentionable: bool = data.get('mentionable', False)
+
+    @property
+    def mention(self) -> str:
+        return '<@&{}>'.format(self.id)
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, PartialRole) and other.id == self.id
+
+    def __hash__(self) -> int:
+        return self.id >> 22
+
+    def __repr__(self) -> str:
+        return 'PartialRole(id={}, name={})'.format(self.id, self.name)
+
+
+class PartialChannel(Messageable):
+    """
+    Channel object built from the interaction payload. Used when the channel of the interaction is not cached.
+    Messages can be sent through this object, since sending messages only requires the channel id.
+    """
+    __slots__ = ('id', 'guild_id', 'name', 'type', 'permissions', '_state')
+
+    def __init__(self, state, channel_id: int, guild_id: Optional[int] = None, data: Optional[JSON] = None) -> None:
+        data = data or {}
+        self._state = state
+        self.id: int = int(channel_id)
+        self.guild_id: Optional[int] = guild_id
+        self.name: Optional[str] = data.get('name')
+        self.type: Optional[ChannelType] = try_enum(ChannelType, data['type']) if 'type' in data else None
+        self.permissions: Optional[Permissions] = Permissions(int(data['permissions'])) if 'permissions' in data else None
+
+    @property
+    def guild(self) -> None:
+        return None
+
+    @property
+    def mention(self) -> str:
+        return '<#{}>'.format(self.id)
+
+    async def _get_channel(self) -> PartialChannel:
+        return self
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, PartialChannel) and other.id == self.id
+
+    def __hash__(self) -> int:
+        return self.id >> 22
+
+    def __repr__(self) -> str:
+        return 'PartialChannel(id={}, name={})'.format(self.id, self.name)
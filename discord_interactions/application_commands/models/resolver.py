@@ -0,0 +1,239 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+from typing import Optional, List, Dict, Any, Tuple, Union, Final
+
+from discord import Guild, User
+
+from discord_interactions.utils.cache import LRUCache, SingleFlight
+from discord_interactions.utils.type_hints import JSON
+from .slash import Interaction, ApplicationCommandOptionType
+from .partial import PartialChannel
+from .context import SlashContextBuilder
+
+__all__ = (
+    'OptionResolver',
+)
+
+
+slash_logger: logging.Logger = logging.getLogger('discord_interactions.commands')
+
+# Option types, compared as raw integers on hot path.
+STRING: Final[int] = ApplicationCommandOptionType.STRING.value
+INTEGER: Final[int] = ApplicationCommandOptionType.INTEGER.value
+BOOLEAN: Final[int] = ApplicationCommandOptionType.BOOLEAN.value
+USER: Final[int] = ApplicationCommandOptionType.USER.value
+CHANNEL: Final[int] = ApplicationCommandOptionType.CHANNEL.value
+ROLE: Final[int] = ApplicationCommandOptionType.ROLE.value
+
+# Sources of resolved entities, used in OptionResolver.stats
+RESOLVED: Final[str] = 'resolved'
+CACHE: Final[str] = 'cache'
+FETCHED: Final[str] = 'fetched'
+UNRESOLVED: Final[str] = 'unresolved'
+
+
+class OptionResolver:
+    """
+    Convert option values of interactions into typed python objects.
+    USER, CHANNEL and ROLE options are resolved from the interaction's `resolved` block first, then from a LRU cache
+    of recently resolved entities shared across interactions. Users are cached per guild, since members carry nick,
+    roles and permissions of their guild, and cached entities expire after `ttl` seconds so that they don't go stale.
+    Remaining entities are fetched together in one batch, unless the context builder is payload-only. Entities which
+    cannot be resolved are passed as integer snowflakes, and are not cached.
+    """
+
+    def __init__(self, builder: SlashContextBuilder, maxsize: int = 10000, ttl: Optional[float] = 60.0) -> None:
+        """
+        Args:
+            builder (SlashContextBuilder): context builder of the client. Used to access caches of the client.
+            maxsize (int): maximum count of entities kept in the LRU cache.
+            ttl (Optional[float]): seconds to keep entities in the cache. If None, entities don't expire.
+        """
+        self._builder: SlashContextBuilder = builder
+        self._cache: LRUCache = LRUCache(maxsize, ttl)
+        self._fetches: SingleFlight = SingleFlight()
+        self._counts: Dict[str, int] = {RESOLVED: 0, CACHE: 0, FETCHED: 0, UNRESOLVED: 0}
+
+    @property
+    def cache(self) -> LRUCache:
+        return self._cache
+
+    @property
+    def stats(self) -> Dict[str, Union[int, float]]:
+        """Count of entities resolved by each source, and hit rate of payload & cache lookups."""
+        counts = self._counts
+        total = sum(counts.values())
+        stats: Dict[str, Union[int, float]] = dict(counts)
+        stats.update(
+            total=total,
+            hit_rate=(counts[RESOLVED] + counts[CACHE]) / total if total else 0.0,
+            cache_hit_rate=self._cache.hit_rate
+        )
+        return stats
+
+    def resetStats(self) -> None:
+        for key in self._counts:
+            self._counts[key] = 0
+        self._cache.hits = self._cache.misses = 0
+
+    async def resolve(self, interaction: Interaction, options: Optional[List[JSON]]) -> Dict[str, Any]:
+        """Resolve option values of the interaction.
+
+        Args:
+            interaction (Interaction): interaction which contains the options.
+            options (Optional[List[JSON]]): option payloads to resolve. (options of the invoked (sub)command)
+
+        Returns:
+            Typed option values, keyed by option names.
+        """
+        values: Dict[str, Any] = {}
+        if not options:
+            return values
+
+        resolved: JSON = (interaction.data.resolved if interaction.data is not None else None) or {}
+        guild_id: Optional[int] = int(interaction.guild_id) if interaction.guild_id is not None else None
+        guild: Optional[Guild] = self._builder.getGuild(guild_id)
+        counts = self._counts
+        cache = self._cache
+        missing: List[Tuple[str, int, int]] = []
+
+        for option in options:
+            option_type: Optional[int] = option.get('type')
+            value: Any = option.get('value')
+            if option_type == STRING or option_type is None:
+                values[option['name']] = value
+            elif option_type == INTEGER:
+                values[option['name']] = int(value)
+            elif option_type == BOOLEAN:
+                values[option['name']] = bool(value)
+            elif option_type in (USER, CHANNEL, ROLE):
+                snowflake = int(value)
+                entity = self._fromResolved(option_type, snowflake, resolved, guild, guild_id)
+                if entity is not None:
+                    counts[RESOLVED] += 1
+                    cache.set(self._key(option_type, snowflake, guild_id), entity)
+                else:
+                    entity = cache.get(self._key(option_type, snowflake, guild_id))
+                    if entity is None:
+                        missing.append((option['name'], option_type, snowflake))
+                        continue
+                    counts[CACHE] += 1
+                values[option['name']] = entity
+            else:
+                values[option['name']] = value
+
+        if missing:
+            values.update(await self._fetchMissing(missing, guild, guild_id))
+        return values
+
+    @staticmethod
+    def _key(option_type: int, snowflake: int, guild_id: Optional[int]) -> Tuple[Optional[int], ...]:
+        """Cache key of an entity. Users are keyed with the guild of the interaction, None in direct messages."""
+        return (USER, guild_id, snowflake) if option_type == USER else (option_type, snowflake)
+
+    def _fromResolved(
+            self,
+            option_type: int,
+            snowflake: int,
+            resolved: JSON,
+            guild: Optional[Guild],
+            guild_id: Optional[int]
+    ) -> Any:
+        key = str(snowflake)
+        builder = self._builder
+        if option_type == USER:
+            raw_user: Optional[JSON] = resolved.get('users', {}).get(key)
+            if raw_user is None:
+                return None
+            raw_member: Optional[JSON] = resolved.get('members', {}).get(key)
+            if raw_member is None:
+                return User(state=builder.state, data=raw_user)
+            # Members in `resolved` don't contain `user` object.
+            return builder.buildAuthor(guild, dict(raw_member, user=raw_user), guild_id)
+        elif option_type == CHANNEL:
+            raw_channel: Optional[JSON] = resolved.get('channels', {}).get(key)
+            if raw_channel is None:
+                return None
+            channel = guild.get_channel(snowflake) if guild is not None else None
+            return channel if channel is not None else PartialChannel(builder.state, snowflake, guild_id, raw_channel)
+        else:
+            raw_role: Optional[JSON] = resolved.get('roles', {}).get(key)
+            return builder.buildRole(guild, guild_id, raw_role) if raw_role is not None else None
+
+    async def _fetchMissing(
+            self,
+            missing: List[Tuple[str, int, int]],
+            guild: Optional[Guild],
+            guild_id: Optional[int]
+    ) -> Dict[str, Any]:
+        """Fetch entities missing in both payload and cache, in a single batch.
+
+        Args:
+            missing (List[Tuple[str, int, int]]): list of (option name, option type, snowflake).
+            guild (Optional[Guild]): guild of the interaction, if cached.
+            guild_id (Optional[int]): id of the guild of the interaction.
+
+        Returns:
+            Fetched option values, keyed by option names. Entities failed to fetch are left as snowflakes.
+        """
+        values: Dict[str, Any] = {name: snowflake for name, _, snowflake in missing}
+        if self._builder.payload_only:
+            self._counts[UNRESOLVED] += len(missing)
+            return values
+
+        roles: Optional[Dict[int, Any]] = None
+        if any(option_type == ROLE for _, option_type, _ in missing) and guild_id is not None:
+            # Roles can't be fetched one by one, so fetch every role of the guild in one request.
+            try:
+                roles = await self._fetches.do(('roles', guild_id), self._fetchRoles, guild, guild_id)
+            except Exception as e:
+                slash_logger.warning('Failed to fetch roles of guild %s : %r', guild_id, e)
+
+        fetching: List[Tuple[str, int, int]] = []
+        tasks: List[asyncio.Future] = []
+        for name, option_type, snowflake in missing:
+            if option_type == ROLE:
+                role = roles.get(snowflake) if roles is not None else None
+                if role is None:
+                    self._counts[UNRESOLVED] += 1
+                    continue
+                self._counts[FETCHED] += 1
+                self._cache.set(self._key(ROLE, snowflake, guild_id), role)
+                values[name] = role
+            else:
+                fetching.append((name, option_type, snowflake))
+                tasks.append(asyncio.ensure_future(self._fetches.do(
+                    self._key(option_type, snowflake, guild_id),
+                    self._fetchEntity, option_type, snowflake, guild, guild_id
+                )))
+
+        for (name, option_type, snowflake), result in zip(fetching, await asyncio.gather(*tasks, return_exceptions=True)):
+            if isinstance(result, BaseException) or result is None:
+                slash_logger.warning('Failed to fetch option `%s` (%s) : %r', name, snowflake, result)
+                self._counts[UNRESOLVED] += 1
+                continue
+            self._counts[FETCHED] += 1
+            self._cache.set(self._key(option_type, snowflake, guild_id), result)
+            values[name] = result
+        return values
+
+    async def _fetchEntity(self, option_type: int, snowflake: int, guild: Optional[Guild], guild_id: Optional[int]) -> Any:
+        client = self._builder.client
+        if option_type == CHANNEL:
+            # Not through SlashContextBuilder.getChannel(), which falls back to a PartialChannel on failure.
+            fetch_channel = getattr(client, 'fetch_channel', None)
+            return await fetch_channel(snowflake) if fetch_channel is not None else None
+        if guild is not None:
+            return await guild.fetch_member(snowflake)
+        fetch_user = getattr(client, 'fetch_user', None)
+        return await fetch_user(snowflake) if fetch_user is not None else None
+
+    async def _fetchRoles(self, guild: Optional[Guild], guild_id: int) -> Dict[int, Any]:
+        if guild is not None:
+            return {role.id: role for role in await guild.fetch_roles()}
+        http = getattr(self._builder.client, 'http', None)
+        if http is None:
+            return {}
+        return {int(raw['id']): self._builder.buildRole(None, guild_id, raw) for raw in await http.get_roles(guild_id)}
@@ -1,18 +1,28 @@
 from __future__ import annotations
 
 import asyncio
-import collections
+import collections.abc
+import inspect
 import logging
+import re
+import time
 import types
 from enum import IntFlag, Enum
-from typing import Union, Optional, List, Callable, Coroutine, NoReturn, Tuple, Any, Dict
+from typing import Union, Optional, List, Callable, Coroutine, NoReturn, Tuple, Any, Dict, Final, Mapping
 
-import aiohttp
-from discord import Member, Guild, TextChannel, User, Message, File
+from discord import Member, Guild, TextChannel, User, Message, File, Embed, AllowedMentions
 
 from discord_interactions.utils.type_hints import JSON, CoroutineFunction
 from discord_interactions.utils.abstracts import JsonObject
 from discord_interactions.utils.interaction_route import InteractionRoute
+from discord_interactions.utils.http import RequestPriority, get_scheduler
+from discord_interactions.monitoring.instruments import INTERACTIONS_DEFERRED
+from discord_interactions.monitoring.latency import UNKNOWN_COMMAND
+from discord_interactions.monitoring.tracing import Tracer, get_tracer
+from discord_interactions.ui.components import ComponentType, Component, ActionRow
+from ..errors import SubCommandNotFound
+from .execution import ExecutionPolicy, CommandExecutor, check_poolable
+from .coalesce import EditCoalescer, EDIT_COALESCE_WINDOW
 
 __all__ = (
     'InteractionType',
@@ -22,17 +32,19 @@ __all__ = (
     'InteractionResponseType',
     'InteractionResponseFlags',
     'InteractionResponse',
+    'message_payload',
     'ApplicationCommand', 'SlashCommand',
     'ApplicationCommandOption', 'SlashCommandOption',
     'ApplicationCommandOptionType', 'SlashCommandOptionType',
     'ApplicationSubCommand', 'SlashSubCommand',
     'ApplicationSubCommandGroup', 'SlashSubCommandGroup',
+    'OptionBinder',
     'ApplicationCommandOptionChoice', 'SlashCommandOptionChoice',
     'SlashContext'
 )
 
 
-slash_logger: logging.Logger = logging.getLogger('discord_interactions')
+slash_logger: logging.Logger = logging.getLogger('discord_interactions.commands')
 
 
 class InteractionType(Enum):
@@ -48,47 +60,61 @@ class ApplicationCommandInteractionDataOption(JsonObject):
     @classmethod
     def fromJson(cls, data: JSON) -> ApplicationCommandInteractionDataOption:
         value = data.get('value')
-        raw_option = data.get('option')
-        if value is not None and raw_option is not None:
-            raise ValueError('ApplicationCommandInteractionDataOption cannot have both value and option.')
+        raw_options: Optional[List[JSON]] = data.get('options')
+        if value is not None and raw_options is not None:
+            raise ValueError('ApplicationCommandInteractionDataOption cannot have both value and options.')
 
-        option = ApplicationCommandInteractionDataOption.fromJson(raw_option) if raw_option is not None else None
+        options = [cls.fromJson(o) for o in raw_options] if raw_options is not None else None
 
         return cls(
             name=data['name'],
+            option_type=data.get('type'),
             value=value,
-            option=option
+            options=options
         )
 
     def __init__(
         self,
         name: str,
+        option_type: Optional[int] = None,
         value: Optional[Any] = None,
-        option: Optional[List[ApplicationCommandInteractionDataOption]] = None
+        options: Optional[List[ApplicationCommandInteractionDataOption]] = None
     ) -> None:
         self._name: str = name
+        self._type: Optional[int] = option_type
         self._value: Optional[Any] = value
-        self._option: Optional[List[ApplicationCommandInteractionDataOption]] = option
+        self._options: Optional[List[ApplicationCommandInteractionDataOption]] = options
 
     @property
     def name(self) -> str:
         return self._name
 
+    @property
+    def type(self) -> Optional[ApplicationCommandOptionType]:
+        return ApplicationCommandOptionType.parse(self._type) if self._type is not None else None
+
     @property
     def value(self) -> Any:
         return self._value
 
     @property
-    def option(self) -> Optional[List[ApplicationCommandInteractionDataOption]]:
-        return self._option
+    def options(self) -> Optional[List[ApplicationCommandInteractionDataOption]]:
+        return self._options
+
+    option = options    # Alias
 
     def toJson(self) -> JSON:
         data = {'name': self._name}
+        if self._type is not None:
+            data.update(type=self._type)
+
         if self._value is not None:
             data.update(value=self._value)
 
-        if self._option is not None:
-            data.update(option=[o.toJson() for o in self._option])
+        if self._options is not None:
+            data.update(options=[o.toJson() for o in self._options])
+
+        return data
 
 
 class ApplicationCommandInteractionData(JsonObject):
@@ -97,25 +123,42 @@ class ApplicationCommandInteractionData(JsonObject):
         return cls(
             command_id=data['id'],
             name=data['name'],
-            options=data.get('options')
+            options=data.get('options'),
+            resolved=data.get('resolved')
         )
 
     def __init__(
         self,
         command_id: int,
         name: str,
-        options: Optional[List[ApplicationCommandInteractionDataOption]] = None
+        options: Optional[List[JSON]] = None,
+        resolved: Optional[JSON] = None
     ):
         self._id: int = command_id
         self._name: str = name
-        self._options: Optional[List[ApplicationCommandInteractionDataOption]] = options
+        self._options: Optional[List[JSON]] = options
+        self._resolved: Optional[JSON] = resolved
+
+    @property
+    def id(self) -> int:
+        return self._id
+
+    @property
+    def name(self) -> str:
+        return self._name
+
+    @property
+    def options(self) -> Optional[List[JSON]]:
+        return self._options
+
+    @property
+    def resolved(self) -> Optional[JSON]:
+        """Users, members, roles and channels referred by options, keyed by their ids."""
+        return self._resolved
 
     def getOptions(self) -> Optional[Dict[str, ApplicationCommandInteractionDataOption]]:
         if self._options is not None:
-            options_map = {o.name: o for o in self._options}
-            # TODO : Implement command invoke logic.
-            # TODO : Finish parsing options of interaction to Dict[str, ApplicationCommandInteractionDataOption]
-            return options_map
+            return {o['name']: ApplicationCommandInteractionDataOption.fromJson(o) for o in self._options}
         else:
             return None
 
@@ -126,7 +169,9 @@ class ApplicationCommandInteractionData(JsonObject):
             name=self._name
         )
         if self._options is not None:
-            data.update(options=[o.toJson() for o in self._options])
+            data.update(options=self._options)
+        if self._resolved is not None:
+            data.update(resolved=self._resolved)
 
         return data
 
@@ -172,18 +217,23 @@ class Interaction(JsonObject):
     """
 
     @classmethod
-    def fromJson(cls, data: JSON) -> Interaction:
-        if not isinstance(data, types.MappingProxyType):
-            raise TypeError('ApplicationCommandOptionChoice.fromJson() expects json data, not {}.'.format(type(data)))
-        raw_member: JSON = data['member']
+    def fromJson(cls, data: JSON, received_at: Optional[float] = None) -> Interaction:
+        if not isinstance(data, collections.abc.Mapping):
+            raise TypeError('Interaction.fromJson() expects json data, not {}.'.format(type(data)))
+        # Interactions in DM channels have `user` instead of `member`.
+        raw_member: JSON = data['member'] if 'member' in data else {'user': data['user']}
+        raw_data: Optional[JSON] = data.get('data')
         return cls(
             interaction_type=InteractionType.parse(data['type']),
             interaction_id=data['id'],
-            guild_id=data['guild_id'],
+            guild_id=data.get('guild_id'),
             channel_id=data['channel_id'],
             raw_member=raw_member,
             token=data['token'],
-            application_command_data=data['data']
+            version=data.get('version', 1),
+            application_command_data=ApplicationCommandInteractionData.fromJson(raw_data) if raw_data is not None else None,
+            application_id=data.get('application_id'),
+            received_at=received_at
         )
 
     def __init__(
@@ -191,23 +241,35 @@ class Interaction(JsonObject):
         # Common properties
         interaction_type: InteractionType,
         interaction_id: int,
-        guild_id: int,
+        guild_id: Optional[int],
         channel_id: int,
         raw_member: JSON,
         token: str,
         version: int,
         # Optional properties
-        application_command_data: Optional[ApplicationCommandInteractionData] = None
+        application_command_data: Optional[ApplicationCommandInteractionData] = None,
+        application_id: Optional[int] = None,
+        received_at: Optional[float] = None
     ) -> None:
         self._id: int = interaction_id
         self._type: InteractionType = interaction_type
-        self._guild_id: int = guild_id
+        self._guild_id: Optional[int] = guild_id
         self._channel_id: int = channel_id
         self._member_id: int = raw_member['user']['id']
         self._raw_member: JSON = raw_member
         self._token: str = token
         self._version: int = version
         self._application_command_data: Optional[ApplicationCommandInteractionData] = application_command_data
+        self._application_id: Optional[int] = application_id
+        self._received_at: float = received_at if received_at is not None else time.monotonic()
+
+        # Response state
+        self._responded: bool = False
+        self._responded_at: Optional[float] = None
+        # When interactions are received through http endpoint, initial response is sent as the http reply.
+        self._response_future: Optional[asyncio.Future] = None
+        # Created on the first queued edit.
+        self._coalescer: Optional[EditCoalescer] = None
 
     @property
     def id(self) -> int:
@@ -237,6 +299,41 @@ class Interaction(JsonObject):
     def version(self) -> int:
         return self._version
 
+    @property
+    def token(self) -> str:
+        return self._token
+
+    @property
+    def data(self) -> Optional[ApplicationCommandInteractionData]:
+        return self._application_command_data
+
+    @property
+    def application_id(self) -> Optional[int]:
+        return self._application_id
+
+    @property
+    def received_at(self) -> float:
+        """Monotonic time when this interaction is received. Used to keep deadline of the initial response."""
+        return self._received_at
+
+    @property
+    def responded(self) -> bool:
+        """Whether initial response of this interaction is sent."""
+        return self._responded
+
+    @property
+    def responded_at(self) -> Optional[float]:
+        """Monotonic time when initial response of this interaction is sent. None if not responded yet."""
+        return self._responded_at
+
+    def setResponseFuture(self, future: asyncio.Future) -> None:
+        """Send initial response through given future instead of the interaction callback endpoint.
+
+        Args:
+            future (asyncio.Future): future which receives json of the initial response.
+        """
+        self._response_future = future
+
     def getCommand(self, client) -> Optional[ApplicationCommand]:
         """
         "data": {
@@ -254,7 +351,15 @@ class Interaction(JsonObject):
         Returns:
             Parsed ApplicationCommand object.
         """
-        command = client.getCommand(self._id)
+        if self._application_command_data is None:
+            return None
+        command = client.getCommand(int(self._application_command_data.id))
+        if command is None:
+            # Commands created on code are not synced with discord yet, so they don't have id.
+            command = client.get_command_by_name(
+                self._application_command_data.name,
+                int(self._guild_id) if self._guild_id is not None else None
+            )
 
         return command
 
@@ -264,14 +369,105 @@ class Interaction(JsonObject):
     async def respond(
         self,
         response: InteractionResponse
-    ):
-        url = 'https://discord.com/api/v8/interactions/{0}/{1}/callback'.format(self._id, self._token)
-        async with aiohttp.ClientSession() as s:
-            async with s.post(
-                url,
-                json=response.toJson()
-            ) as resp:
-                pass
+    ) -> None:
+        """Send initial response of the interaction.
+
+        Args:
+            response (InteractionResponse): response to send.
+        """
+        if self._responded:
+            raise RuntimeError('Interaction {} is already responded.'.format(self._id))
+        self._responded = True
+        self._responded_at = time.monotonic()
+        if response.type == InteractionResponseType.ACKNOWLEDGE_WITH_SOURCE:
+            data = self._application_command_data
+            INTERACTIONS_DEFERRED.labels(data.name if data is not None else UNKNOWN_COMMAND).inc()
+        future = self._response_future
+        if future is not None and not future.done():
+            # Received through http endpoint : initial response is sent as the http reply.
+            future.set_result(response.toJson())
+            return
+
+        await get_scheduler().request(
+            'POST',
+            InteractionRoute.APIBase + 'interactions/{0}/{1}/callback'.format(self._id, self._token),
+            json=response.toJson(),
+            priority=RequestPriority.INTERACTION
+        )
+
+    def _webhookURL(self, message_id: Union[int, str, None] = None) -> str:
+        url = InteractionRoute.APIBase + 'webhooks/{0}/{1}'.format(self._application_id, self._token)
+        if message_id is not None:
+            url += '/messages/{}'.format(message_id)
+        return url
+
+    async def editOriginal(self, data: JSON) -> JSON:
+        """Edit initial response message of the interaction.
+
+        Args:
+            data (JSON): message payload to edit.
+
+        Returns:
+            Json of the edited message.
+        """
+        return await self.editMessage('@original', data)
+
+    async def editMessage(self, message_id: Union[int, str], data: JSON) -> JSON:
+        """Edit initial response or followup message of the interaction.
+
+        Args:
+            message_id (Union[int, str]): id of the message to edit. ('@original' for initial response)
+            data (JSON): message payload to edit.
+
+        Returns:
+            Json of the edited message.
+        """
+        return await get_scheduler().request(
+            'PATCH', self._webhookURL(message_id), json=data, priority=RequestPriority.FOLLOWUP
+        )
+
+    def queueEdit(
+            self,
+            data: JSON,
+            message_id: Union[int, str] = '@original',
+            window: float = EDIT_COALESCE_WINDOW
+    ) -> asyncio.Future:
+        """Queue edit of the message without waiting. Rapid edits of the same message are merged, so only the latest
+        state is sent at most once per window. Use for frequently updated messages, such as progress bars.
+
+        Args:
+            data (JSON): message payload to edit.
+            message_id (Union[int, str]): id of the message to edit. ('@original' for initial response)
+            window (float): minimum seconds between edits of the same message. Applied on the first queued edit.
+
+        Returns:
+            Future which receives json of the edited message.
+        """
+        if self._coalescer is None:
+            self._coalescer = EditCoalescer(self.editMessage, window)
+        return self._coalescer.edit(message_id, data)
+
+    async def flushEdits(self) -> None:
+        """Wait until every queued edit is sent."""
+        if self._coalescer is not None:
+            await self._coalescer.flush()
+
+    async def deleteOriginal(self) -> None:
+        """Delete initial response message of the interaction."""
+        await get_scheduler().request('DELETE', self._webhookURL('@original'), priority=RequestPriority.FOLLOWUP)
+
+    async def followup(self, data: JSON) -> JSON:
+        """Send followup message of the interaction.
+
+        Args:
+            data (JSON): message payload to send.
+
+        Returns:
+            Json of the sent message.
+        """
+        return await get_scheduler().request(
+            'POST', self._webhookURL(), json=data, params={'wait': 'true'}, priority=RequestPriority.FOLLOWUP
+        )
 
     def toJson(self) -> JSON:
         """
@@ -317,7 +513,7 @@ class Interaction(JsonObject):
             member=self._raw_member,
             id=self._id,
             guild_id=self._guild_id,
-            data=self._application_command_data,
+            data=self._application_command_data.toJson() if self._application_command_data is not None else None,
             channel_id=self._channel_id
         )
         return data
@@ -356,24 +552,94 @@ class InteractionResponseFlags(IntFlag):
     EPHEMERAL = 1 << 6
 
 
+def message_payload(
+        content: Optional[str] = None,
+        *,
+        embed: Optional[Embed] = None,
+        embeds: Optional[List[Embed]] = None,
+        tts: bool = False,
+        allowed_mentions: Optional[AllowedMentions] = None,
+        flags: Optional[List[InteractionResponseFlags]] = None,
+        components: Optional[List[Component]] = None
+) -> JSON:
+    """Build message payload used in interaction responses & webhook messages.
+
+    Args:
+        content (Optional[str]): content of the message.
+        embed (Optional[Embed]): embed of the message.
+        embeds (Optional[List[Embed]]): embeds of the message. (up to 10)
+        tts (bool): whether the message is tts message.
+        allowed_mentions (Optional[AllowedMentions]): allowed mentions of the message.
+        flags (Optional[List[InteractionResponseFlags]]): flags of the message.
+        components (Optional[List[Component]]): components of the message.
+
+    Returns:
+        Json of the message payload.
+    """
+    data: JSON = {}
+    if content is not None:
+        data['content'] = str(content)
+    if embed is not None:
+        embeds = [embed] + list(embeds or [])
+    if embeds is not None:
+        data['embeds'] = [e.to_dict() for e in embeds]
+    if tts:
+        data['tts'] = True
+    if allowed_mentions is not None:
+        data['allowed_mentions'] = allowed_mentions.to_dict()
+    if flags:
+        value = 0
+        for flag in flags:
+            value |= flag
+        data['flags'] = int(value)
+    if components is not None:
+        if components and all(c.type != ComponentType.ActionRow for c in components):
+            # Not a nested component array : wrap components with an ActionRow.
+            data['components'] = [ActionRow(list(components)).to_dict()]
+        else:
+            data['components'] = [c.to_dict() for c in components]
+    return data
+
+
 class InteractionResponse(JsonObject):
-    # TODO : Finish InteractionResponse model
-    # TODO : Finish Interaction Response sending logic on command invoke
     @classmethod
     def fromJson(cls, data: JSON) -> InteractionResponse:
         return cls(
-
+            response_type=InteractionResponseType.parse(data['type']),
+            data=data.get('data')
         )
 
     def __init__(
         self,
         response_type: InteractionResponseType,
-        response_flags: Optional[List[InteractionResponseFlags]] = None
+        response_flags: Optional[List[InteractionResponseFlags]] = None,
+        data: Optional[JSON] = None,
+        **message: Any
     ) -> None:
-        pass
+        """
+        Args:
+            response_type (InteractionResponseType): type of the response.
+            response_flags (Optional[List[InteractionResponseFlags]]): flags of the response message.
+            data (Optional[JSON]): message payload of the response. Built from `message` if not given.
+            **message (Any): keyword arguments of message_payload().
+        """
+        self._type: InteractionResponseType = response_type
+        if data is None and (message or response_flags):
+            data = message_payload(flags=response_flags, **message)
+        self._data: Optional[JSON] = data
+
+    @property
+    def type(self) -> InteractionResponseType:
+        return self._type
+
+    @property
+    def data(self) -> Optional[JSON]:
+        return self._data
 
     def toJson(self) -> JSON:
-        data = {}
+        data = {'type': self._type.value}
+        if self._data is not None:
+            data['data'] = self._data
         return data
 
 
@@ -419,7 +685,6 @@ class ApplicationCommandOptionType(Enum):
 
     @classmethod
     def parse(cls, value) -> ApplicationCommandOptionType:
-        print(cls.__members__.values())
         return tuple(filter(lambda m: m.value == value, cls.__members__.values()))[0]
 
 
@@ -463,7 +728,9 @@ class ApplicationCommandOption(JsonObject):
     @classmethod
     def fromJson(cls, data: JSON) -> ApplicationCommandOption:
         # TODO : Maybe OptionType check can be occurred in fromJson to reduce time cost when invalid parameters are passed?
-        if not isinstance(data, types.MappingProxyType):
+        if isinstance(data, ApplicationCommandOption):
+            return data
+        if not isinstance(data, collections.abc.Mapping):
             raise TypeError('ApplicationCommandOption.fromJson() expects json data, not {}.'.format(type(data)))
 
         raw_choices: Optional[List[JSON]] = data.get('choices')
@@ -545,42 +812,108 @@ class ApplicationCommandOption(JsonObject):
     def required(self) -> bool:
         return self._required
 
-    @classmethod
-    def fromJson(cls, data: JSON) -> ApplicationCommandOption:
-        return cls(data)
-
     def toJson(self) -> JSON:
         data = {}
         data.update({'name': self._name})
         data.update({'type': self._type.value})
         data.update({'description': self._description})
+        if self._default:
+            data.update({'default': self._default})
+        if self._required:
+            data.update({'required': self._required})
+        if self.choices is not None:
+            data.update({'choices': [c.toJson() for c in self.choices]})
+        if self.options is not None:
+            data.update({'options': [o.toJson() for o in self.options]})
+        return data
 
 
 SlashCommandOption = ApplicationCommandOption  # Alias
 
 
-class ApplicationSubCommandGroup(ApplicationCommandOption):
-    """
-    SubCommandGroup of Slash Command
+# Limits of application command structure, applied when commands are registered.
+COMMAND_NAME_PATTERN: Final[re.Pattern] = re.compile(r'^[\w-]{1,32}$')
+MAX_OPTIONS: Final[int] = 25
+SUB_COMMAND_TYPES: Final[Tuple[ApplicationCommandOptionType, ...]] = (
+    ApplicationCommandOptionType.SUB_COMMAND,
+    ApplicationCommandOptionType.SUB_COMMAND_GROUP
+)
+
+
+def _validate_name(name: str) -> str:
+    """Check application command & subcommand names at registration time.
+
+    Args:
+        name (str): name to check.
+
+    Returns:
+        The name itself, when it is valid.
     """
+    if not isinstance(name, str) or COMMAND_NAME_PATTERN.match(name) is None or name.lower() != name:
+        raise ValueError('Application command names must be 1-32 lowercase characters, not {!r}.'.format(name))
+    return name
 
-    def __init__(self, data: JSON) -> None:
-        data.patch_dpy(type=ApplicationCommandOptionType.SUB_COMMAND_GROUP.value)
-        super().__init__(data.patch_dpy())
-        self.subcommands: List[ApplicationSubCommand] = []
 
-    def subCommand(self, data: JSON) -> ApplicationSubCommand:
-        return ApplicationSubCommand(data, subcommandGroup=self)
+def _validate_options(owner: str, options: List[ApplicationCommandOption]) -> None:
+    """Check options of the command (or subcommand) at registration time.
 
-    @classmethod
-    def fromJson(cls, data: JSON) -> ApplicationCommandOption:
-        pass
+    Args:
+        owner (str): name of the command which owns the options. Used in error messages.
+        options (List[ApplicationCommandOption]): options to check.
+    """
+    if len(options) > MAX_OPTIONS:
+        raise ValueError('`{}` can have up to {} options, not {}.'.format(owner, MAX_OPTIONS, len(options)))
+    names = set()
+    for option in options:
+        if option.name in names:
+            raise ValueError('`{}` has duplicated option `{}`.'.format(owner, option.name))
+        names.add(option.name)
 
-    def toJson(self) -> JSON:
-        return self._data
 
+class OptionBinder:
+    """
+    Precompiled mapping between application command option names and keyword parameters of the callback.
+    Binders are created once when callbacks are registered, so interactions only do a dictionary lookup per option.
+    """
+    __slots__ = ('_parameters', '_accepts_any')
+
+    def __init__(self, callback: CoroutineFunction, options: List[ApplicationCommandOption]) -> None:
+        parameters: Dict[str, str] = {}
+        accepts_any: bool = False
+        # First parameter of callback is always a SlashContext.
+        for parameter in list(inspect.signature(callback).parameters.values())[1:]:
+            if parameter.kind == inspect.Parameter.VAR_KEYWORD:
+                accepts_any = True
+                continue
+            if parameter.kind in (inspect.Parameter.VAR_POSITIONAL, inspect.Parameter.POSITIONAL_ONLY):
+                continue
+            # Option annotations (annotations.ApplicationCommandOptionAnnotation) carry their own option name.
+            annotation = parameter.annotation
+            option_name = getattr(annotation, 'name', None) if not isinstance(annotation, (str, type)) else None
+            parameters[option_name or parameter.name] = parameter.name
+
+        for option in options:
+            if option.type not in SUB_COMMAND_TYPES and option.name not in parameters and not accepts_any:
+                raise TypeError('Callback {} does not have any parameter for option `{}`.'.format(
+                    callback.__qualname__, option.name
+                ))
+
+        self._parameters: Dict[str, str] = parameters
+        self._accepts_any: bool = accepts_any
+
+    def bind(self, values: Mapping[str, Any]) -> Dict[str, Any]:
+        """Map option values of interaction into keyword arguments of the callback.
+
+        Args:
+            values (Mapping[str, Any]): option values, keyed by option name.
 
-SlashSubCommandGroup = ApplicationSubCommandGroup  # Alias
+        Returns:
+            Keyword arguments to call the callback with.
+        """
+        parameters = self._parameters
+        if self._accepts_any:
+            return {parameters.get(name, name): value for name, value in values.items()}
+        return {parameters[name]: value for name, value in values.items() if name in parameters}
 
 
 class ApplicationSubCommand(ApplicationCommandOption):
@@ -590,16 +923,148 @@ class ApplicationSubCommand(ApplicationCommandOption):
 
     def __init__(
             self,
-            data: JSON,
-            subcommandGroup: Optional[ApplicationSubCommandGroup] = None
-    ) -> NoReturn:
-        data.patch_dpy(type=ApplicationCommandOptionType.SUB_COMMAND.value)
-        super().__init__(data)
+            name: str,
+            description: str = '',
+            options: Optional[List[Union[ApplicationCommandOption, JSON]]] = None,
+            callback: Optional[CoroutineFunction] = None,
+            parent: Optional[Union[ApplicationCommand, ApplicationSubCommandGroup]] = None
+    ) -> None:
+        parsed_options: List[ApplicationCommandOption] = [
+            ApplicationCommandOption.fromJson(o) for o in (options or [])
+        ]
+        super(ApplicationSubCommand, self).__init__(
+            name=_validate_name(name),
+            option_type=ApplicationCommandOptionType.SUB_COMMAND,
+            description=description if description is not None else '',
+            options=parsed_options
+        )
+        for option in parsed_options:
+            if option.type in SUB_COMMAND_TYPES:
+                raise ValueError('Subcommand `{}` cannot have nested subcommands or subcommand groups.'.format(name))
+        _validate_options(name, parsed_options)
+
+        self._parent: Optional[Union[ApplicationCommand, ApplicationSubCommandGroup]] = parent
+        self._callback: Optional[CoroutineFunction] = None
+        self._binder: Optional[OptionBinder] = None
+        if callback is not None:
+            self.callback = callback
+
+    @property
+    def parent(self) -> Optional[Union[ApplicationCommand, ApplicationSubCommandGroup]]:
+        return self._parent
+
+    @property
+    def callback(self) -> Optional[CoroutineFunction]:
+        return self._callback
+
+    @callback.setter
+    def callback(self, coro: CoroutineFunction) -> None:
+        if not asyncio.iscoroutinefunction(coro):
+            raise TypeError('Callback function must be coroutine function')
+        # Binder is compiled here, so invalid callbacks are rejected on registration instead of on interactions.
+        self._binder = OptionBinder(coro, list(self.options))
+        self._callback = coro
+
+    @property
+    def binder(self) -> Optional[OptionBinder]:
+        return self._binder
+
+    def __repr__(self) -> str:
+        return 'ApplicationSubCommand(name={})'.format(self._name)
 
 
 SlashSubCommand = ApplicationSubCommand  # Alias
 
 
+class ApplicationSubCommandGroup(ApplicationCommandOption):
+    """
+    SubCommandGroup of Slash Command
+    """
+
+    def __init__(
+            self,
+            name: str,
+            description: str = '',
+            parent: Optional[ApplicationCommand] = None
+    ) -> None:
+        super(ApplicationSubCommandGroup, self).__init__(
+            name=_validate_name(name),
+            option_type=ApplicationCommandOptionType.SUB_COMMAND_GROUP,
+            description=description if description is not None else ''
+        )
+        self._parent: Optional[ApplicationCommand] = parent
+        self._subcommands: Dict[str, ApplicationSubCommand] = {}
+
+    @property
+    def parent(self) -> Optional[ApplicationCommand]:
+        return self._parent
+
+    @property
+    def options(self) -> Optional[Tuple[ApplicationSubCommand, ...]]:
+        return tuple(self._subcommands.values())
+
+    @options.setter
+    def options(self, new: Optional[Tuple[ApplicationCommandOption, ...]]) -> None:
+        # ApplicationCommandOption.__init__ assigns options. Subcommands are only added through subCommand().
+        if new:
+            raise ValueError('Subcommand groups can only have subcommands added by subCommand().')
+
+    @property
+    def subcommands(self) -> Dict[str, ApplicationSubCommand]:
+        return self._subcommands
+
+    def addSubCommand(self, subcommand: ApplicationSubCommand) -> ApplicationSubCommand:
+        """Register subcommand object into this group.
+
+        Args:
+            subcommand (ApplicationSubCommand): subcommand to register.
+
+        Returns:
+            Registered subcommand.
+        """
+        if subcommand.name in self._subcommands:
+            raise ValueError('Subcommand group `{}` already has subcommand `{}`.'.format(self._name, subcommand.name))
+        if len(self._subcommands) >= MAX_OPTIONS:
+            raise ValueError('Subcommand group `{}` can have up to {} subcommands.'.format(self._name, MAX_OPTIONS))
+        subcommand._parent = self
+        self._subcommands[subcommand.name] = subcommand
+        if self._parent is not None:
+            self._parent._compileTree()
+        return subcommand
+
+    def subCommand(
+            self,
+            name: Optional[str] = None,
+            description: Optional[str] = None,
+            options: Optional[List[Union[ApplicationCommandOption, JSON]]] = None
+    ) -> Callable[[CoroutineFunction], ApplicationSubCommand]:
+        """
+        Create and register ApplicationSubCommand object in this group.
+
+        Args:
+            name (Optional[str]): name of the subcommand. If None, name of the callback is used.
+            description (Optional[str]): description of the subcommand. If None, read from docstring.
+            options (Optional[List[Union[ApplicationCommandOption, JSON]]]): options of the subcommand.
+
+        Returns:
+            Decorator which receives callback and returns created ApplicationSubCommand object.
+        """
+        def wrapper(coro: CoroutineFunction) -> ApplicationSubCommand:
+            return self.addSubCommand(ApplicationSubCommand(
+                name=name if name is not None else coro.__name__,
+                description=description if description is not None else inspect.getdoc(coro),
+                options=options,
+                callback=coro
+            ))
+        return wrapper
+
+    def __repr__(self) -> str:
+        return 'ApplicationSubCommandGroup(name={})'.format(self._name)
+
+
+SlashSubCommandGroup = ApplicationSubCommandGroup  # Alias
+
+
 class ApplicationCommand(JsonObject):
     """
     V5 Application Command(a.k.a Slash Command) object.
@@ -679,7 +1144,8 @@ class ApplicationCommand(JsonObject):
             command_id: Optional[int] = None,   # Can be set later : code-based creation
             options: Optional[List[Union[ApplicationCommandOption, JSON]]] = None,  # Options are selective argument.
             guild_id: Optional[int] = None,     # Only required to make guild-specific slash commands
-            callback: Optional[CoroutineFunction] = None    # Callback functions can be set later (when fetching existing slash commands from api)
+            callback: Optional[CoroutineFunction] = None,    # Callback functions can be set later (when fetching existing slash commands from api)
+            execution: Union[ExecutionPolicy, str] = ExecutionPolicy.LOOP
     ):
         """Initialize Slash Command object. Must be called in SlashCommand.create()
         Args:
@@ -688,7 +1154,13 @@ class ApplicationCommand(JsonObject):
             command_id (Optional[int]): id of ApplicationCommand
             application_id (int): id of V5 Application where this Slash Command is registered.
             callback (CoroutineFunction): Callback function of this Slash Command.  (Can be optional to set later - fetching from api)
+            execution (Union[ExecutionPolicy, str]): where the callback is executed. Callbacks executed in thread or
+                process pools are plain functions receiving ContextSnapshot, and their results are sent as responses.
+                Subcommand callbacks are always awaited on the event loop.
         """
+        self._execution: ExecutionPolicy = ExecutionPolicy.parse(execution)
+        if callback is not None:
+            check_poolable(callback, self._execution)
         self._callback: Optional[CoroutineFunction] = callback  # Register Callback function. Can be set later.
         # if application_id is None:
         #     raise ValueError("ApplicationCommand.application_id must be integer value of the application's snowflake id.")
@@ -700,15 +1172,26 @@ class ApplicationCommand(JsonObject):
         # Guild-specific Application Command
         if guild_id is not None:
             self.__guild_command__: bool = True
-            self._guild_id: int = guild_id if isinstance(guild_id, int) else 0
+            self._guild_id: Optional[int] = guild_id if isinstance(guild_id, int) else 0
         else:
             self.__guild_command__: bool = False
+            self._guild_id: Optional[int] = None
 
         # Parse options
         options: Optional[List[JSON]] = options if isinstance(options, collections.abc.Iterable) else []
         self._options: Optional[List[ApplicationCommandOption]] = []
         for option_json in options:
             self._options.append(ApplicationCommandOption.fromJson(option_json))
+        _validate_options(self._name, self._options)
+
+        # Invoke hooks
+        self._before_invoke: Optional[CoroutineFunction] = None
+        self._after_invoke: Optional[CoroutineFunction] = None
+
+        # Precompiled subcommand tree. Maps subcommand names to subcommands, and subcommand group names to
+        # dictionaries of their subcommands. Compiled on registration, so dispatch resolves the path in one walk.
+        self._tree: Dict[str, Union[ApplicationSubCommand, Dict[str, ApplicationSubCommand]]] = {}
+        self._binder: Optional[OptionBinder] = OptionBinder(callback, self._options) if callback is not None else None
 
     @property
     def id(self) -> int:
@@ -767,25 +1250,45 @@ class ApplicationCommand(JsonObject):
             sorted(self._options, key=lambda opt: opt.name.lower())
         ), None)
 
+    @property
+    def callback(self) -> Optional[CoroutineFunction]:
+        return self._callback
+
+    @property
+    def binder(self) -> Optional[OptionBinder]:
+        return self._binder
+
+    @property
+    def execution(self) -> ExecutionPolicy:
+        return self._execution
+
+    @property
+    def subcommands(self) -> Dict[str, Union[ApplicationSubCommand, ApplicationSubCommandGroup]]:
+        return {
+            o.name: o
+            for o in self._options
+            if isinstance(o, (ApplicationSubCommand, ApplicationSubCommandGroup))
+        }
+
     @property
     def before_invoke_hook(self) -> Optional[CoroutineFunction]:
-        return getattr(self, 'before_invoke', None)
+        return self._before_invoke
 
     @before_invoke_hook.setter
     def before_invoke_hook(self, coro: CoroutineFunction):
         if not asyncio.iscoroutinefunction(coro):
             raise TypeError('Command invoke hooks must be a coroutine function!')
-        setattr(self, 'before_invoke', coro)
+        self._before_invoke = coro
 
     @property
     def after_invoke_hook(self) -> Optional[CoroutineFunction]:
-        return getattr(self, 'after_invoke', None)
+        return self._after_invoke
 
     @after_invoke_hook.setter
     def after_invoke_hook(self, coro: CoroutineFunction):
         if not asyncio.iscoroutinefunction(coro):
             raise TypeError('Command invoke hooks must be a coroutine function!')
-        setattr(self, 'after_invoke', coro)
+        self._after_invoke = coro
 
     def before_invoke(self, coro: CoroutineFunction) -> CoroutineFunction:
         self.before_invoke_hook = coro
@@ -797,18 +1300,106 @@ class ApplicationCommand(JsonObject):
 
         return coro
 
-    async def invoke(self, *args, **kwargs) -> None:
-        """Safe call _func + patch additional hooks (check, before&after invoke)
+    # Aliases
+    before_hook = before_invoke
+    after_hook = after_invoke
+
+    def resolve(
+            self,
+            options: Optional[List[JSON]]
+    ) -> Tuple[Union[ApplicationCommand, ApplicationSubCommand], List[JSON]]:
+        """Resolve subcommand path of the interaction using precompiled subcommand tree.
+
+        Args:
+            options (Optional[List[JSON]]): 'options' array of the interaction data.
+
         Returns:
-            Coroutine object of callback function.
+            Tuple of the invoke target (this command or leaf subcommand), and options of the target.
         """
-        before_invoke = getattr(self, 'before_invoke', False)
-        if before_invoke:
-            await before_invoke()
-        result = await self._callback(*args, **kwargs)
-        after_invoke = getattr(self, 'after_invoke', False)
-        if after_invoke:
-            await after_invoke()
+        if not self._tree:
+            return self, options or []
+
+        if not options:
+            raise SubCommandNotFound(self._name, '')
+        option: JSON = options[0]
+        node = self._tree.get(option['name'])
+        if node.__class__ is dict:
+            # Subcommand group : walk down one more level.
+            group_options: Optional[List[JSON]] = option.get('options')
+            if not group_options:
+                raise SubCommandNotFound(self._name, option['name'])
+            option = group_options[0]
+            node = node.get(option['name'])
+        if node is None:
+            raise SubCommandNotFound(self._name, option['name'])
+        return node, option.get('options') or []
+
+    async def invoke(self, ctx: SlashContext, options: Optional[List[JSON]] = None) -> None:
+        """Safe call _func + patch additional hooks (check, before&after invoke)
+
+        Args:
+            ctx (SlashContext): context of the interaction.
+            options (Optional[List[JSON]]): 'options' array of the interaction data.
+        """
+        target, leaf_options = self.resolve(options)
+        if target.callback is None:
+            raise TypeError('Application command `{}` does not have callback function.'.format(self._name))
+        tracer = get_tracer()
+        if tracer.enabled:
+            return await self._invokeTraced(tracer, ctx, target, leaf_options)
+
+        kwargs: Dict[str, Any] = await self._bind(ctx, target, leaf_options)
+        if self._before_invoke is not None:
+            await self._before_invoke(ctx)
+        await self._call(ctx, target, kwargs)
+        if self._after_invoke is not None:
+            await self._after_invoke(ctx)
+
+    async def _invokeTraced(
+            self,
+            tracer: Tracer,
+            ctx: SlashContext,
+            target: Union[ApplicationCommand, ApplicationSubCommand],
+            leaf_options: List[JSON]
+    ) -> None:
+        """Same as invoke(), with spans of option binding, hooks and the callback."""
+        with tracer.span('bind', command=target.name):
+            kwargs: Dict[str, Any] = await self._bind(ctx, target, leaf_options)
+        if self._before_invoke is not None:
+            with tracer.span('before_invoke', command=self._name):
+                await self._before_invoke(ctx)
+        with tracer.span('callback', command=target.name, execution=self._execution.value):
+            await self._call(ctx, target, kwargs)
+        if self._after_invoke is not None:
+            with tracer.span('after_invoke', command=self._name):
+                await self._after_invoke(ctx)
+
+    @staticmethod
+    async def _bind(
+            ctx: SlashContext,
+            target: Union[ApplicationCommand, ApplicationSubCommand],
+            leaf_options: List[JSON]
+    ) -> Dict[str, Any]:
+        resolver = getattr(ctx.client, 'option_resolver', None) if ctx is not None else None
+        if resolver is not None:
+            values: Dict[str, Any] = await resolver.resolve(ctx.interaction, leaf_options)
+        else:
+            values: Dict[str, Any] = {o['name']: o.get('value') for o in leaf_options}
+        return target.binder.bind(values)
+
+    async def _call(
+            self,
+            ctx: SlashContext,
+            target: Union[ApplicationCommand, ApplicationSubCommand],
+            kwargs: Dict[str, Any]
+    ) -> None:
+        if target is self and self._execution is not ExecutionPolicy.LOOP:
+            executor: Optional[CommandExecutor] = getattr(ctx.client, 'command_executor', None)
+            await (executor if executor is not None else _default_executor()).run(
+                self._execution, self._callback, ctx, kwargs
+            )
+        else:
+            await target.callback(ctx, **kwargs)
 
     def toJson(self) -> JSON:
         data = {}
@@ -836,36 +1427,37 @@ class ApplicationCommand(JsonObject):
             Args:
                 coro (coroutine function): coroutine function object to be used as command's callback.
             """
-            if not asyncio.iscoroutinefunction(coro):
-                raise TypeError('Callback function must be coroutine function')
+            check_poolable(coro, self._execution)
+            self._binder = OptionBinder(coro, self._options)
             self._callback = coro
             return coro
 
         return wrapper
 
     # Register Helpers
+    def _route(self) -> InteractionRoute:
+        """Route of the commands endpoint where this command is registered. (global or guild commands)"""
+        route: InteractionRoute = InteractionRoute().application(self._application_id)
+        if self.__guild_command__:
+            route.guilds(self._guild_id)
+        return route
+
     async def _register_command(self) -> JSON:
         """Post Slash Command's JSON data to V5's Slash Command endpoint. (Slash Command Creation)
         Returns:
             interaction (JSON) data used in SlashCommand._patch to update initial information (id, ...)
         """
-        loop = asyncio.get_event_loop()
-        async with aiohttp.ClientSession() as session:
-            async with session.post(
-                    url=InteractionRoute().application(self._application_id).commands(self._id).url,
-                    json=self._data
-            ) as response:
-                interaction: JSON = await response.json(encoding='utf-8')
-                return interaction
+        data: JSON = self.toJson()
+        del data['id'], data['application_id']  # Assigned by discord.
+        interaction: JSON = await self._route().commands().send('POST', json=data, priority=RequestPriority.BACKGROUND)
+        return interaction
 
     def _patch(self, interaction: JSON) -> NoReturn:
         """Patch interaction (response from discord api call) to SlashCommand.
         Args:
             interaction (JSON):
         """
-        self._id = interaction['id']
-
-        self._data.patch_dpy(interaction)  # Update data.
+        self._id = int(interaction['id'])
 
     # Code-based creation
     @classmethod
@@ -899,52 +1491,131 @@ class ApplicationCommand(JsonObject):
             self,
             **kwargs
     ) -> NoReturn:
-        async with aiohttp.ClientSession() as session:
-            resp = await session.patch(
-                url=InteractionRoute().application(self._application_id).commands(self._id).url,
-                data=self.toJson()
-            )
-            resp_json: JSON = await resp.json()
+        await self._route().commands(self._id).send(
+            'PATCH',
+            json=self.toJson(),
+            priority=RequestPriority.BACKGROUND
+        )
+
+    # Subcommand Helpers
+    def _checkSubCommandSlot(self, name: str) -> None:
+        """Check whether new subcommand (or subcommand group) can be registered with given name."""
+        if any(o.type not in SUB_COMMAND_TYPES for o in self._options):
+            raise ValueError('Application command `{}` has options, so it cannot have subcommands.'.format(self._name))
+        if any(o.name == name for o in self._options):
+            raise ValueError('Application command `{}` already has subcommand `{}`.'.format(self._name, name))
+        if len(self._options) >= MAX_OPTIONS:
+            raise ValueError('Application command `{}` can have up to {} subcommands.'.format(self._name, MAX_OPTIONS))
+
+    def _compileTree(self) -> None:
+        """Compile subcommand tree used in ApplicationCommand.resolve()."""
+        tree: Dict[str, Union[ApplicationSubCommand, Dict[str, ApplicationSubCommand]]] = {}
+        for option in self._options:
+            if isinstance(option, ApplicationSubCommandGroup):
+                tree[option.name] = dict(option.subcommands)
+            elif isinstance(option, ApplicationSubCommand):
+                tree[option.name] = option
+        self._tree = tree
+
+    def subCommandGroup(
+            self,
+            name: str,
+            description: str = ''
+    ) -> ApplicationSubCommandGroup:
+        """
+        Create and register ApplicationSubCommandGroup object in this command.
 
-    def subCommandGroup(self) -> ApplicationSubCommandGroup:
-        pass
+        Args:
+            name (str): name of the subcommand group.
+            description (str): description of the subcommand group.
 
-    def subCommand(self) -> ApplicationSubCommand:
-        pass
+        Returns:
+            Created ApplicationSubCommandGroup object. Use ApplicationSubCommandGroup.subCommand() to add subcommands.
+        """
+        self._checkSubCommandSlot(name)
+        group = ApplicationSubCommandGroup(name=name, description=description, parent=self)
+        self._options.append(group)
+        self._compileTree()
+        return group
+
+    def subCommand(
+            self,
+            name: Optional[str] = None,
+            description: Optional[str] = None,
+            options: Optional[List[Union[ApplicationCommandOption, JSON]]] = None
+    ) -> Callable[[CoroutineFunction], ApplicationSubCommand]:
+        """
+        Create and register ApplicationSubCommand object in this command.
+
+        Args:
+            name (Optional[str]): name of the subcommand. If None, name of the callback is used.
+            description (Optional[str]): description of the subcommand. If None, read from docstring.
+            options (Optional[List[Union[ApplicationCommandOption, JSON]]]): options of the subcommand.
+
+        Returns:
+            Decorator which receives callback and returns created ApplicationSubCommand object.
+        """
+        def wrapper(coro: CoroutineFunction) -> ApplicationSubCommand:
+            subcommand_name = name if name is not None else coro.__name__
+            self._checkSubCommandSlot(subcommand_name)
+            subcommand = ApplicationSubCommand(
+                name=subcommand_name,
+                description=description if description is not None else inspect.getdoc(coro),
+                options=options,
+                callback=coro,
+                parent=self
+            )
+            self._options.append(subcommand)
+            self._compileTree()
+            return subcommand
+
+        return wrapper
 
 
 SlashCommand = ApplicationCommand   # Alias
 
 
+_executor: Optional[CommandExecutor] = None
+
+
+def _default_executor() -> CommandExecutor:
+    """Executor used when the client does not own one."""
+    global _executor
+    if _executor is None:
+        _executor = CommandExecutor()
+    return _executor
+
+
 class SlashContext:
     """Context object similar with Context in discord.ext.commands (currently targeting on discord.py)"""
     @classmethod
-    async def fromInteraction(cls, client, interaction: Interaction) -> SlashContext:
-        guild: Optional[Guild] = client.get_guild(interaction.guild_id)
-        if guild is not None:
-            channel: Optional[TextChannel] = guild.get_channel(interaction.channel_id)
-            if channel is None:
-                await guild.fetch_channels()
-            author: Optional[Member] = guild.get_member(interaction.member_id)
-
-            command = interaction.getCommand(client)
-
-            if channel is not None and author is not None:
-                return cls(client, author, guild, channel, command)
+    async def fromInteraction(
+            cls,
+            client,
+            interaction: Interaction,
+            command: Optional[ApplicationCommand] = None
+    ) -> SlashContext:
+        builder = getattr(client, 'context_builder', None)
+        if builder is None:
+            from .context import SlashContextBuilder
+            builder = SlashContextBuilder(client)
+        return await builder.build(interaction, command)
 
     def __init__(
         self,
         client,
         author: Union[User, Member],
-        guild: Guild,
+        guild: Optional[Guild],
         channel: TextChannel,
-        command: ApplicationCommand
+        command: ApplicationCommand,
+        interaction: Optional[Interaction] = None
     ):
         self._client = client
         self._author: Member = author
-        self._guild: Guild = guild
+        self._guild: Optional[Guild] = guild
         self._channel: TextChannel = channel
         self._command: ApplicationCommand = command
+        self._interaction: Optional[Interaction] = interaction
 
     @property
     def client(self):
@@ -962,9 +1633,74 @@ class SlashContext:
     def channel(self) -> Optional[TextChannel]:
         return self._channel
 
-    async def send(self, *args, **kwargs) -> Message:
+    @property
+    def command(self) -> ApplicationCommand:
+        return self._command
+
+    @property
+    def interaction(self) -> Optional[Interaction]:
+        return self._interaction
+
+    async def defer(self, ephemeral: bool = False) -> None:
+        """Acknowledge the interaction to respond later. Users will see loading state of the response.
+
+        Args:
+            ephemeral (bool): whether the response should be visible only to the author.
+        """
+        await self._interaction.respond(InteractionResponse(
+            InteractionResponseType.ACKNOWLEDGE_WITH_SOURCE,
+            response_flags=[InteractionResponseFlags.EPHEMERAL] if ephemeral else None
+        ))
+
+    async def send(
+            self,
+            content: Optional[str] = None,
+            *,
+            ephemeral: bool = False,
+            **kwargs: Any
+    ) -> Optional[JSON]:
+        """Send message as a response of the interaction.
+        Initial response is sent if the interaction is not responded yet. Otherwise, followup message is sent.
+
+        Args:
+            content (Optional[str]): content of the message.
+            ephemeral (bool): whether the message should be visible only to the author.
+            **kwargs (Any): keyword arguments of message_payload(). (embed, embeds, tts, allowed_mentions, components)
+
+        Returns:
+            Json of the sent message when followup message is sent. Otherwise, None.
+        """
         # TODO : Think about file send. Use discord.py's implementation? (discord.File)
-        pass
+        flags = [InteractionResponseFlags.EPHEMERAL] if ephemeral else None
+        if not self._interaction.responded:
+            await self._interaction.respond(InteractionResponse(
+                InteractionResponseType.CHANNEL_MESSAGE_WITH_SOURCE,
+                data=message_payload(content, flags=flags, **kwargs)
+            ))
+            return None
+        return await self._interaction.followup(message_payload(content, flags=flags, **kwargs))
+
+    async def edit(self, content: Optional[str] = None, **kwargs: Any) -> JSON:
+        """Edit initial response message of the interaction.
+
+        Args:
+            content (Optional[str]): new content of the message.
+            **kwargs (Any): keyword arguments of message_payload(). (embed, embeds, allowed_mentions, components)
 
-    async def edit(self, *args, **kwargs) -> None:
-        pass
+        Returns:
+            Json of the edited message.
+        """
+        return await self._interaction.editOriginal(message_payload(content, **kwargs))
+
+    def progress(self, content: Optional[str] = None, **kwargs: Any) -> asyncio.Future:
+        """Edit initial response message of the interaction, merging rapid updates. Doesn't wait for the edit.
+        Edits within `Interaction.queueEdit()` window are merged, and only the latest state is sent.
+
+        Args:
+            content (Optional[str]): new content of the message.
+            **kwargs (Any): keyword arguments of message_payload(). (embed, embeds, allowed_mentions, components)
+
+        Returns:
+            Future which receives json of the edited message.
+        """
+        return self._interaction.queueEdit(message_payload(content, **kwargs))
@@ -0,0 +1,9 @@
+"""
+discord_interactions.client
+~~~~~~
+http-only client, receiving interactions through the interactions endpoint.
+"""
+
+from .verifier import SignatureVerifier, verify_signature, load_verify_key
+from .interaction_client import InteractionClient, InteractionServer
+from .workers import WorkerPool
@@ -1,2 +1,276 @@
-class InteractionClient():
-    pass
\ No newline at end of file
+from __future__ import annotations
+
+import asyncio
+import logging
+from typing import Optional, Union, Final
+
+from aiohttp import web
+
+from discord_interactions.application_commands.client.application_command_client import BaseSlashApplication
+from discord_interactions.application_commands.client.dedupe import DedupeStore
+from discord_interactions.application_commands.models import Interaction, InteractionType, InteractionResponse, \
+    InteractionResponseType
+from discord_interactions.utils import codec
+from discord_interactions.monitoring.metrics import add_metrics_route
+from discord_interactions.monitoring.tracing import get_tracer
+from discord_interactions.utils.http import get_scheduler
+from discord_interactions.utils.type_hints import JSON
+from .verifier import SignatureVerifier
+
+__all__ = (
+    'dispatch_interaction',
+    'InteractionServer',
+    'InteractionClient'
+)
+
+
+slash_logger: logging.Logger = logging.getLogger('discord_interactions.client')
+
+# Headers of signed interaction requests
+SIGNATURE_HEADER: Final[str] = 'X-Signature-Ed25519'
+TIMESTAMP_HEADER: Final[str] = 'X-Signature-Timestamp'
+
+PONG: Final[JSON] = {'type': InteractionResponseType.PONG.value}
+_PONG_BODY: Final[bytes] = codec.dumpb(PONG)
+
+
+def _jsonResponse(body: bytes) -> web.Response:
+    return web.Response(body=body, content_type='application/json')
+
+
+def _logTaskException(task: asyncio.Task) -> None:
+    if not task.cancelled() and task.exception() is not None:
+        slash_logger.error('Exception while processing interaction', exc_info=task.exception())
+
+
+async def dispatch_interaction(application: BaseSlashApplication, data: JSON, timeout: float) -> Optional[JSON]:
+    """Process interaction payload, and capture its initial response instead of sending it to the callback endpoint.
+
+    Args:
+        application (BaseSlashApplication): application which owns application commands to invoke.
+        data (JSON): interaction payload.
+        timeout (float): seconds to wait initial response. If the command is still running, the interaction is deferred.
+
+    Returns:
+        Json of the initial response. None if the command failed or finished without responding.
+    """
+    with get_tracer().span('interaction', id=data['id']) as span:
+        interaction: Interaction = application.parse_interaction(data)
+        future: asyncio.Future = asyncio.get_event_loop().create_future()
+        interaction.setResponseFuture(future)
+        # The task copies the current context : spans of the command are children of the interaction span.
+        task: asyncio.Task = asyncio.ensure_future(application.process_interaction(interaction))
+
+        done, _ = await asyncio.wait((future, task), timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+        if future.done():
+            if not task.done():
+                task.add_done_callback(_logTaskException)
+            return future.result()
+        if task in done:
+            exc = task.exception()
+            if exc is not None:
+                slash_logger.error('Exception while processing interaction %s', interaction.id, exc_info=exc)
+            else:
+                slash_logger.warning('Interaction %s is not responded by its command.', interaction.id)
+            return None
+
+        # Command is still running : defer the interaction, so that the command can edit the original response later.
+        span.set('deferred', True)
+        await interaction.respond(InteractionResponse(InteractionResponseType.ACKNOWLEDGE_WITH_SOURCE))
+        task.add_done_callback(_logTaskException)
+        return future.result()
+
+
+class InteractionServer:
+    """
+    Receive interactions through http endpoint, without gateway connection.
+    Requests are verified with the public key of the application, duplicated deliveries are dropped, and dispatched to the application command registry of
+    the given application. Initial responses are sent as the http reply itself, instead of calling the interaction
+    callback endpoint. If the command does not respond in time, the interaction is deferred and the command can edit the
+    original response later.
+    """
+
+    def __init__(
+            self,
+            application: Optional[BaseSlashApplication],
+            public_key: Union[str, bytes, SignatureVerifier],
+            *,
+            path: str = '/interactions',
+            response_timeout: float = 2.5,
+            metrics_path: Optional[str] = None
+    ) -> None:
+        """
+        Args:
+            application (Optional[BaseSlashApplication]): application which owns application commands to invoke.
+                None if dispatch() is overridden to process interactions elsewhere. (ex: RoutedInteractionServer)
+            public_key (Union[str, bytes, SignatureVerifier]): public key of the application, or a configured verifier.
+            path (str): path of the interactions endpoint.
+            response_timeout (float): seconds to wait initial response before deferring. Discord waits 3 seconds.
+            metrics_path (Optional[str]): path to serve metrics in Prometheus text format. Not served if None.
+        """
+        self._application: Optional[BaseSlashApplication] = application
+        self._verifier: SignatureVerifier = public_key if isinstance(public_key, SignatureVerifier) \
+            else SignatureVerifier(public_key)
+        self._path: str = path
+        self._response_timeout: float = response_timeout
+        self._metrics_path: Optional[str] = metrics_path
+        self._runner: Optional[web.AppRunner] = None
+
+    @property
+    def application(self) -> Optional[BaseSlashApplication]:
+        return self._application
+
+    @property
+    def path(self) -> str:
+        return self._path
+
+    @property
+    def verifier(self) -> SignatureVerifier:
+        return self._verifier
+
+    async def verify(self, request: web.Request, body: bytes) -> bool:
+        signature: Optional[str] = request.headers.get(SIGNATURE_HEADER)
+        timestamp: Optional[str] = request.headers.get(TIMESTAMP_HEADER)
+        if signature is None or timestamp is None:
+            return False
+        return await self._verifier.verifyAsync(signature, timestamp, body)
+
+    async def handle(self, request: web.Request) -> web.Response:
+        """Handle http request of the interactions endpoint.
+
+        Args:
+            request (web.Request): received request.
+
+        Returns:
+            Http response containing initial response of the interaction.
+        """
+        body: bytes = await request.read()
+        if not await self.verify(request, body):
+            return web.Response(status=401, text='invalid request signature')
+
+        try:
+            data: JSON = codec.loads(body)
+        except ValueError:
+            return web.Response(status=400, text='invalid json body')
+
+        if data.get('type') == InteractionType.PING.value:
+            return _jsonResponse(_PONG_BODY)
+
+        if not self._verifier.firstSeen(data['id']):
+            return web.Response(status=409, text='duplicated interaction')
+        application = self._application
+        if application is not None and not await application.deduplicator.firstSeen(data['id']):
+            # Delivered to another worker process, or a gateway connection. (shared dedupe store)
+            return web.Response(status=409, text='duplicated interaction')
+
+        response: Optional[JSON] = await self.dispatch(data, body)
+        if response is None:
+            return web.Response(status=500)
+        return _jsonResponse(codec.dumpb(response))
+
+    async def dispatch(self, data: JSON, body: Optional[bytes] = None) -> Optional[JSON]:
+        """Dispatch verified interaction payload to the application.
+
+        Args:
+            data (JSON): interaction payload.
+            body (Optional[bytes]): raw json of the payload, as received.
+
+        Returns:
+            Json of the initial response. None if the interaction failed without responding.
+        """
+        return await dispatch_interaction(self._application, data, self._response_timeout)
+
+    def makeApp(self, app: Optional[web.Application] = None) -> web.Application:
+        """Add interactions endpoint route to the aiohttp application.
+
+        Args:
+            app (Optional[web.Application]): application to add the route. If None, new application is created.
+
+        Returns:
+            aiohttp application serving the interactions endpoint.
+        """
+        app = app if app is not None else web.Application()
+        app.router.add_post(self._path, self.handle)
+        if self._metrics_path is not None:
+            add_metrics_route(app, self._metrics_path)
+        # Every entry point (start(), run(), workers, or an application of the user) starts and stops the same way.
+        app.on_startup.append(self._onStartup)
+        app.on_cleanup.append(self._onCleanup)
+        return app
+
+    async def _onStartup(self, app: web.Application) -> None:
+        await get_scheduler().start()   # Open warm connections to the api host, if configured.
+        if self._application is not None:   # Servers forwarding interactions elsewhere have no application.
+            self._application.loop_monitor.start()
+
+    async def _onCleanup(self, app: web.Application) -> None:
+        self._verifier.close()
+        application = self._application
+        if application is not None:
+            if application.watchdog is not None:
+                application.watchdog.stop()
+            application.loop_monitor.stop()
+            application.command_executor.shutdown(wait=False)
+        await get_scheduler().close()
+
+    async def start(self, host: str = '0.0.0.0', port: int = 8080) -> None:
+        """Start serving the interactions endpoint in the running event loop."""
+        self._runner = web.AppRunner(self.makeApp())
+        await self._runner.setup()
+        await web.TCPSite(self._runner, host, port).start()
+        slash_logger.info('Serving interactions endpoint on http://%s:%s%s', host, port, self._path)
+
+    async def close(self) -> None:
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    def run(self, host: str = '0.0.0.0', port: int = 8080, workers: int = 1) -> None:
+        """Serve the interactions endpoint until interrupted. Blocking call.
+
+        Args:
+            host (str): host to listen.
+            port (int): port to listen.
+            workers (int): count of worker processes. If larger than 1, requests are served by WorkerPool.
+        """
+        if workers > 1:
+            from .workers import WorkerPool
+            WorkerPool(self, host, port, workers).run()
+        else:
+            web.run_app(self.makeApp(), host=host, port=port)
+
+
+class InteractionClient(BaseSlashApplication):
+    """
+    Http-only client, which receives interactions through the interactions endpoint instead of the gateway.
+    Application commands are registered with the same decorators as SlashClient.
+    """
+
+    def __init__(
+            self,
+            application_id: int,
+            public_key: Union[str, bytes, SignatureVerifier],
+            *,
+            path: str = '/interactions',
+            response_timeout: float = 2.5,
+            metrics_path: Optional[str] = None,
+            dedupe_store: Optional[DedupeStore] = None
+    ) -> None:
+        """
+        Args:
+            application_id (int): id of the application.
+            public_key (Union[str, bytes, SignatureVerifier]): public key of the application, or a configured verifier.
+            path (str): path of the interactions endpoint.
+            response_timeout (float): seconds to wait initial response before deferring.
+            metrics_path (Optional[str]): path to serve metrics in Prometheus text format. Not served if None.
+            dedupe_store (Optional[DedupeStore]): shared store of seen interaction ids, to drop deliveries already
+                received by other worker processes.
+        """
+        # There's no gateway cache : every context is built from interaction payloads.
+        super().__init__(application_id, low_memory=True, dedupe_store=dedupe_store)
+        self.server: InteractionServer = InteractionServer(
+            self, public_key, path=path, response_timeout=response_timeout, metrics_path=metrics_path
+        )
+
+    def run(self, host: str = '0.0.0.0', port: int = 8080, workers: int = 1) -> None:
+        self.server.run(host, port, workers)
@@ -0,0 +1,203 @@
+from __future__ import annotations
+
+import asyncio
+import functools
+import time
+from concurrent.futures import Executor, ThreadPoolExecutor
+from typing import Optional, Union, Dict, Final
+
+from discord_interactions.utils.cache import TimeBucketedSet
+
+try:
+    from nacl.signing import VerifyKey
+    from nacl.exceptions import BadSignatureError
+except ImportError:     # PyNaCl is an optional dependency, only required by http interactions.
+    VerifyKey = BadSignatureError = None
+
+__all__ = (
+    'load_verify_key',
+    'verify_signature',
+    'SignatureVerifier'
+)
+
+
+# Interval of heartbeats measuring event loop lag.
+HEARTBEAT_INTERVAL: Final[float] = 0.05
+
+
+@functools.lru_cache(maxsize=16)
+def load_verify_key(public_key: Union[str, bytes]) -> VerifyKey:
+    """Parse public key of the application. Parsed keys are cached.
+
+    Args:
+        public_key (Union[str, bytes]): public key of the application. (hex string in developer portal, or raw bytes)
+
+    Returns:
+        PyNaCl VerifyKey object.
+    """
+    if VerifyKey is None:
+        raise RuntimeError('PyNaCl is required to verify interaction requests. Install with `pip install discord_slash.py[http]`.')
+    return VerifyKey(bytes.fromhex(public_key) if isinstance(public_key, str) else public_key)
+
+
+def verify_signature(
+        public_key: Union[str, bytes, VerifyKey],
+        signature: str,
+        timestamp: str,
+        body: bytes
+) -> bool:
+    """Verify Ed25519 signature of the interaction request.
+
+    Args:
+        public_key (Union[str, bytes, VerifyKey]): public key of the application. (hex string in developer portal)
+        signature (str): hex encoded signature, in `X-Signature-Ed25519` header.
+        timestamp (str): timestamp in `X-Signature-Timestamp` header.
+        body (bytes): raw body of the request.
+
+    Returns:
+        True if the signature is valid. Otherwise, False.
+    """
+    verify_key = public_key if VerifyKey is not None and isinstance(public_key, VerifyKey) else load_verify_key(public_key)
+    try:
+        verify_key.verify(timestamp.encode() + body, bytes.fromhex(signature))
+    except (BadSignatureError, ValueError):
+        return False
+    return True
+
+
+class SignatureVerifier:
+    """
+    Verify signed interaction requests with a pre-parsed public key.
+    Requests whose timestamp differs from local time more than `max_skew` seconds are rejected, and ids of verified
+    interactions are remembered in a time-bucketed index to drop duplicated or replayed deliveries. Since stale
+    requests are already rejected by timestamp, the index only needs to cover the skew window.
+    The index is kept per process : with WorkerPool, a redelivery reaching another worker process is only detected by
+    the deduplicator of the application, when it has a shared DedupeStore.
+    While the event loop is saturated, verification is offloaded to a thread pool. (libsodium releases the GIL)
+    """
+
+    def __init__(
+            self,
+            public_key: Union[str, bytes],
+            *,
+            max_skew: float = 60.0,
+            offload_lag: float = 0.01,
+            executor: Optional[Executor] = None
+    ) -> None:
+        """
+        Args:
+            public_key (Union[str, bytes]): public key of the application.
+            max_skew (float): maximum seconds between request timestamp and local time.
+            offload_lag (float): event loop lag in seconds, over which verification is offloaded to threads.
+            executor (Optional[Executor]): executor to offload verification. If None, a thread pool is created on demand.
+        """
+        self._verify_key: VerifyKey = load_verify_key(public_key)
+        self._max_skew: float = max_skew
+        self._offload_lag: float = offload_lag
+        self._executor: Optional[Executor] = executor
+        self._owns_executor: bool = executor is None
+        # Remember ids for both sides of the skew window.
+        self._seen: TimeBucketedSet = TimeBucketedSet(max_skew * 2, buckets=16)
+        self._lag: float = 0.0
+        self._heartbeat: Optional[asyncio.TimerHandle] = None
+        self._counts: Dict[str, int] = {'verified': 0, 'invalid': 0, 'stale': 0, 'replayed': 0, 'offloaded': 0}
+
+    @property
+    def verify_key(self) -> VerifyKey:
+        return self._verify_key
+
+    @property
+    def lag(self) -> float:
+        """Last measured lag of the event loop, in seconds."""
+        return self._lag
+
+    @property
+    def saturated(self) -> bool:
+        return self._lag > self._offload_lag
+
+    @property
+    def stats(self) -> Dict[str, int]:
+        return dict(self._counts)
+
+    def _check(self, signature: str, timestamp: str, body: bytes, now: float) -> str:
+        """Verify the request without side effects, so that it can run in threads.
+
+        Returns:
+            'verified', 'stale' or 'invalid'.
+        """
+        try:
+            if abs(now - int(timestamp)) > self._max_skew:
+                return 'stale'
+        except ValueError:
+            return 'stale'
+        try:
+            self._verify_key.verify(timestamp.encode() + body, bytes.fromhex(signature))
+        except (BadSignatureError, ValueError):
+            return 'invalid'
+        return 'verified'
+
+    def verify(self, signature: str, timestamp: str, body: bytes, now: Optional[float] = None) -> bool:
+        """Verify timestamp and signature of the request.
+
+        Args:
+            signature (str): hex encoded signature, in `X-Signature-Ed25519` header.
+            timestamp (str): timestamp in `X-Signature-Timestamp` header.
+            body (bytes): raw body of the request.
+            now (Optional[float]): current unix time. If None, time.time() is used.
+
+        Returns:
+            True if the request is fresh and the signature is valid. Otherwise, False.
+        """
+        result = self._check(signature, timestamp, body, now if now is not None else time.time())
+        self._counts[result] += 1
+        return result == 'verified'
+
+    async def verifyAsync(self, signature: str, timestamp: str, body: bytes) -> bool:
+        """Verify the request inline, or in the thread pool while the event loop is saturated.
+
+        Args:
+            signature (str): hex encoded signature, in `X-Signature-Ed25519` header.
+            timestamp (str): timestamp in `X-Signature-Timestamp` header.
+            body (bytes): raw body of the request.
+
+        Returns:
+            True if the request is fresh and the signature is valid. Otherwise, False.
+        """
+        loop = asyncio.get_running_loop()
+        if self._heartbeat is None:
+            self._beat(loop, loop.time())
+        if not self.saturated:
+            return self.verify(signature, timestamp, body)
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(thread_name_prefix='discord_interactions.verifier')
+        self._counts['offloaded'] += 1
+        result = await loop.run_in_executor(self._executor, self._check, signature, timestamp, body, time.time())
+        self._counts[result] += 1     # Counted on the loop : counters are not thread-safe.
+        return result == 'verified'
+
+    def _beat(self, loop: asyncio.AbstractEventLoop, scheduled: float) -> None:
+        now = loop.time()
+        self._lag = max(0.0, now - scheduled)
+        self._heartbeat = loop.call_at(now + HEARTBEAT_INTERVAL, self._beat, loop, now + HEARTBEAT_INTERVAL)
+
+    def firstSeen(self, interaction_id: Union[int, str]) -> bool:
+        """Remember id of the verified interaction.
+
+        Args:
+            interaction_id (Union[int, str]): id of the interaction.
+
+        Returns:
+            True if the interaction is delivered for the first time. False if it is a duplicate or replay.
+        """
+        if self._seen.add(int(interaction_id)):
+            return True
+        self._counts['replayed'] += 1
+        return False
+
+    def close(self) -> None:
+        if self._heartbeat is not None:
+            self._heartbeat.cancel()
+            self._heartbeat = None
+        if self._executor is not None and self._owns_executor:
+            self._executor.shutdown(wait=False)
+            self._executor = None
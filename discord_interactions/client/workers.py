@@ -0,0 +1,171 @@
+from __future__ import annotations
+
+import asyncio
+import gc
+import logging
+import multiprocessing
+import os
+import signal
+import socket
+from multiprocessing.connection import wait
+from typing import Optional, List, Final
+
+from aiohttp import web
+
+from .interaction_client import InteractionServer
+
+__all__ = (
+    'WorkerPool',
+)
+
+
+slash_logger: logging.Logger = logging.getLogger('discord_interactions.client')
+
+# Workers are forked, so that the application command registry loaded in the master process is shared copy-on-write.
+_context = multiprocessing.get_context('fork')
+
+READY_TIMEOUT: Final[float] = 30.0
+
+
+def _serve(server: InteractionServer, host: str, port: int, ready, shutdown_timeout: float) -> None:
+    """Entrypoint of worker processes."""
+    signal.signal(signal.SIGINT, signal.SIG_IGN)    # Master process handles Ctrl+C, and stops workers with SIGTERM.
+    asyncio.run(_serveAsync(server, host, port, ready, shutdown_timeout))
+
+
+async def _serveAsync(server: InteractionServer, host: str, port: int, ready, shutdown_timeout: float) -> None:
+    stopping: asyncio.Event = asyncio.Event()
+    asyncio.get_running_loop().add_signal_handler(signal.SIGTERM, stopping.set)
+
+    runner = web.AppRunner(server.makeApp(), handle_signals=False)
+    # Starts the request scheduler and the loop monitor in this process : connections of the master are not shared.
+    await runner.setup()
+    # Each worker binds its own listening socket on the same port, and the kernel balances connections between them.
+    site = web.TCPSite(runner, host, port, reuse_port=True, shutdown_timeout=shutdown_timeout)
+    await site.start()
+    ready.set()
+    slash_logger.debug('Worker %s is serving on %s:%s', os.getpid(), host, port)
+
+    await stopping.wait()
+    # Stop accepting new connections, and wait for in-flight interactions to be answered.
+    await runner.cleanup()
+
+
+class WorkerPool:
+    """
+    Run InteractionServer on multiple worker processes, sharing a port with SO_REUSEPORT.
+    Each worker runs its own event loop, so signature verification, json decoding and dispatch scale with cores.
+    Application commands must be registered before the pool starts : workers are forked from the master process, and
+    share the registry copy-on-write.
+    Send SIGHUP to the master process to restart workers one by one, without refusing connections.
+    """
+
+    def __init__(
+            self,
+            server: InteractionServer,
+            host: str = '0.0.0.0',
+            port: int = 8080,
+            workers: Optional[int] = None,
+            shutdown_timeout: float = 10.0
+    ) -> None:
+        """
+        Args:
+            server (InteractionServer): server to run on workers.
+            host (str): host to listen.
+            port (int): port to listen.
+            workers (Optional[int]): count of worker processes. If None, count of cpu cores is used.
+            shutdown_timeout (float): seconds to wait in-flight interactions when stopping workers.
+        """
+        if not hasattr(signal, 'SIGHUP') or not hasattr(socket, 'SO_REUSEPORT'):
+            raise RuntimeError('WorkerPool requires fork and SO_REUSEPORT, which are not supported on this platform.')
+        self._server: InteractionServer = server
+        self._host: str = host
+        self._port: int = port
+        self._count: int = workers if workers is not None else (os.cpu_count() or 1)
+        if self._count <= 0:
+            raise ValueError('WorkerPool.workers must be positive integer.')
+        self._shutdown_timeout: float = shutdown_timeout
+        self._workers: List[multiprocessing.Process] = []
+        self._stopping: bool = False
+        self._restart_requested: bool = False
+
+    @property
+    def pids(self) -> List[int]:
+        return [w.pid for w in self._workers]
+
+    def _spawn(self) -> multiprocessing.Process:
+        ready = _context.Event()
+        worker = _context.Process(
+            target=_serve,
+            args=(self._server, self._host, self._port, ready, self._shutdown_timeout),
+            daemon=True
+        )
+        worker.start()
+        if not ready.wait(READY_TIMEOUT):
+            worker.kill()
+            worker.join()
+            raise RuntimeError('Worker {} failed to start in {} seconds.'.format(worker.pid, READY_TIMEOUT))
+        return worker
+
+    def _retire(self, worker: multiprocessing.Process) -> None:
+        worker.terminate()      # SIGTERM : graceful shutdown
+        worker.join(self._shutdown_timeout + 5.0)
+        if worker.is_alive():
+            slash_logger.warning('Worker %s did not stop in time. Killing it.', worker.pid)
+            worker.kill()
+            worker.join()
+
+    def start(self) -> None:
+        """Fork worker processes, and wait until every worker is listening."""
+        # Move objects loaded so far out of gc tracking, so that gc passes in workers don't touch (and copy) their pages.
+        gc.collect()
+        gc.freeze()
+        for _ in range(self._count):
+            self._workers.append(self._spawn())
+        slash_logger.info('Started %s workers on %s:%s : %s', self._count, self._host, self._port, self.pids)
+
+    def restart(self) -> None:
+        """Rolling restart : start a new worker before stopping each old one, so the port keeps accepting connections."""
+        for index, old in enumerate(list(self._workers)):
+            self._workers[index] = self._spawn()
+            self._retire(old)
+        slash_logger.info('Restarted workers : %s', self.pids)
+
+    def stop(self) -> None:
+        """Stop every worker gracefully."""
+        for worker in self._workers:
+            worker.terminate()
+        for worker in self._workers:
+            self._retire(worker)
+        self._workers.clear()
+
+    def _onStop(self, *_) -> None:
+        self._stopping = True
+
+    def _onRestart(self, *_) -> None:
+        self._restart_requested = True
+
+    def run(self) -> None:
+        """Start workers and supervise them until SIGINT or SIGTERM. Blocking call.
+        Workers exited unexpectedly are replaced, and SIGHUP triggers rolling restart.
+        """
+        self.start()
+        signal.signal(signal.SIGINT, self._onStop)
+        signal.signal(signal.SIGTERM, self._onStop)
+        signal.signal(signal.SIGHUP, self._onRestart)
+        try:
+            while not self._stopping:
+                wait([w.sentinel for w in self._workers], timeout=1.0)
+                if self._stopping:
+                    break
+                if self._restart_requested:
+                    self._restart_requested = False
+                    self.restart()
+                for index, worker in enumerate(self._workers):
+                    if not worker.is_alive():
+                        slash_logger.warning(
+                            'Worker %s exited with code %s. Replacing it.', worker.pid, worker.exitcode
+                        )
+                        self._workers[index] = self._spawn()
+        finally:
+            self.stop()
@@ -0,0 +1,9 @@
+"""
+discord_interactions.cluster
+~~~~~~
+routing interactions across multiple worker nodes.
+"""
+
+from .ring import HashRing
+from .transport import Transport, LocalTransport, StreamTransport, serve_stream
+from .router import InteractionRouter, WorkerNode, RoutedInteractionServer
@@ -0,0 +1,82 @@
+from __future__ import annotations
+
+import bisect
+import hashlib
+from typing import Dict, List, Iterable, Optional, Hashable
+
+__all__ = (
+    'HashRing',
+)
+
+
+def _hash(key: str) -> int:
+    return int.from_bytes(hashlib.blake2b(key.encode(), digest_size=8).digest(), 'big')
+
+
+class HashRing:
+    """
+    Consistent hash ring mapping keys (guild ids) to nodes.
+    Each node is placed on the ring as `replicas` virtual points, so keys are spread evenly, and adding or removing a
+    node only moves keys between that node and its neighbours.
+    """
+    __slots__ = ('_replicas', '_points', '_owners', '_nodes')
+
+    def __init__(self, nodes: Iterable[Hashable] = (), replicas: int = 160) -> None:
+        """
+        Args:
+            nodes (Iterable[Hashable]): initial nodes.
+            replicas (int): count of virtual points per node.
+        """
+        if replicas <= 0:
+            raise ValueError('HashRing.replicas must be positive integer.')
+        self._replicas: int = replicas
+        self._points: List[int] = []            # Sorted hashes of virtual points.
+        self._owners: Dict[int, Hashable] = {}  # Hash of virtual point -> node
+        self._nodes: List[Hashable] = []
+        for node in nodes:
+            self.add(node)
+
+    @property
+    def nodes(self) -> List[Hashable]:
+        return list(self._nodes)
+
+    def add(self, node: Hashable) -> None:
+        if node in self._nodes:
+            raise ValueError('Node {!r} is already in the ring.'.format(node))
+        self._nodes.append(node)
+        for replica in range(self._replicas):
+            point = _hash('{}#{}'.format(node, replica))
+            if point in self._owners:
+                continue    # Hash collision. Keep the first owner, so that routing stays deterministic.
+            self._owners[point] = node
+            bisect.insort(self._points, point)
+
+    def remove(self, node: Hashable) -> None:
+        if node not in self._nodes:
+            raise ValueError('Node {!r} is not in the ring.'.format(node))
+        self._nodes.remove(node)
+        points = [p for p, owner in self._owners.items() if owner == node]
+        for point in points:
+            del self._owners[point]
+        removed = set(points)
+        self._points = [p for p in self._points if p not in removed]
+
+    def get(self, key: Hashable) -> Optional[Hashable]:
+        """Get node owning the key.
+
+        Args:
+            key (Hashable): key to route. (guild id)
+
+        Returns:
+            Node owning the key. None if the ring is empty.
+        """
+        if not self._points:
+            return None
+        index = bisect.bisect(self._points, _hash(str(key)))
+        return self._owners[self._points[index % len(self._points)]]
+
+    def __contains__(self, node: Hashable) -> bool:
+        return node in self._nodes
+
+    def __len__(self) -> int:
+        return len(self._nodes)
@@ -0,0 +1,264 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from typing import Optional, Dict, Iterable, Union
+
+from discord_interactions.application_commands.client.application_command_client import BaseSlashApplication
+from discord_interactions.client.interaction_client import InteractionServer, dispatch_interaction
+from discord_interactions.client.verifier import SignatureVerifier
+from discord_interactions.utils import codec
+from discord_interactions.utils.type_hints import JSON
+from .ring import HashRing
+from .transport import Transport, serve_stream
+
+__all__ = (
+    'InteractionRouter',
+    'WorkerNode',
+    'RoutedInteractionServer'
+)
+
+
+slash_logger: logging.Logger = logging.getLogger('discord_interactions.cluster')
+
+
+def _logFailure(interaction_id: Optional[str], task: asyncio.Future) -> None:
+    if not task.cancelled() and task.exception() is not None:
+        slash_logger.error('Exception while processing interaction %s', interaction_id, exc_info=task.exception())
+
+
+class InteractionRouter:
+    """
+    Front door forwarding raw interaction payloads to worker nodes.
+    Interactions are routed by consistent hashing on guild id (channel id for DMs), so each guild is always processed
+    by the same node and its caches stay local. Nodes can join or leave at runtime, and only the guilds owned by the
+    changed node move. Nodes which can't be reached are ejected from the ring, and re-admitted after a backoff
+    doubling on each consecutive failure.
+
+    Use with gateway clients :
+        async def on_socket_response(self, msg):
+            if msg['op'] == 0 and msg['t'] == 'INTERACTION_CREATE':
+                await router.forward(msg['d'])
+    Use with http endpoint : RoutedInteractionServer(router, public_key).
+    """
+
+    def __init__(
+            self,
+            transport: Transport,
+            nodes: Iterable[str] = (),
+            *,
+            replicas: int = 160,
+            eject_on_failure: bool = True,
+            request_timeout: Optional[float] = 2.5,
+            readmit_after: float = 1.0,
+            max_readmit_after: float = 30.0
+    ) -> None:
+        """
+        Args:
+            transport (Transport): transport carrying frames to nodes.
+            nodes (Iterable[str]): names of initial nodes.
+            replicas (int): count of virtual points of each node on the hash ring.
+            eject_on_failure (bool): eject nodes which can't be reached from the ring, and retry on the next owner.
+            request_timeout (Optional[float]): seconds to wait the reply of a node. Nodes which time out are ejected,
+                and the interaction is not retried since the node may still process it. No timeout if None.
+            readmit_after (float): seconds until an ejected node is re-admitted to the ring. Doubled on each
+                consecutive failure of the node.
+            max_readmit_after (float): maximum seconds until an ejected node is re-admitted.
+        """
+        self._transport: Transport = transport
+        self._ring: HashRing = HashRing(nodes, replicas)
+        self._eject_on_failure: bool = eject_on_failure
+        self._request_timeout: Optional[float] = request_timeout
+        self._readmit_after: float = readmit_after
+        self._max_readmit_after: float = max_readmit_after
+        self._counts: Dict[str, int] = {}
+        self._failures: Dict[str, int] = {}     # Consecutive failures of nodes.
+        self._ejected: Dict[str, float] = {}    # Ejected node -> monotonic time of its re-admission.
+
+    @property
+    def ring(self) -> HashRing:
+        return self._ring
+
+    @property
+    def transport(self) -> Transport:
+        return self._transport
+
+    @property
+    def stats(self) -> Dict[str, int]:
+        """Count of interactions routed to each node."""
+        return dict(self._counts)
+
+    @property
+    def ejected(self) -> Dict[str, float]:
+        """Ejected nodes, with seconds until their re-admission."""
+        now = time.monotonic()
+        return {node: max(at - now, 0.0) for node, at in self._ejected.items()}
+
+    def addNode(self, node: str) -> None:
+        self._ejected.pop(node, None)
+        self._failures.pop(node, None)
+        self._ring.add(node)
+        slash_logger.info('Node %s joined. Nodes : %s', node, self._ring.nodes)
+
+    def removeNode(self, node: str) -> None:
+        self._failures.pop(node, None)
+        if self._ejected.pop(node, None) is None:
+            self._ring.remove(node)
+        slash_logger.info('Node %s left. Nodes : %s', node, self._ring.nodes)
+
+    def _eject(self, node: str, error: BaseException) -> None:
+        if node not in self._ring:
+            return  # Concurrent requests have ejected it already.
+        failures = self._failures[node] = self._failures.get(node, 0) + 1
+        backoff = min(self._readmit_after * 2 ** (failures - 1), self._max_readmit_after)
+        self._ring.remove(node)
+        self._ejected[node] = time.monotonic() + backoff
+        slash_logger.warning(
+            'Node %s is unreachable : %r. Ejected for %.1fs. Nodes : %s', node, error, backoff, self._ring.nodes
+        )
+
+    def _readmit(self) -> None:
+        now = time.monotonic()
+        for node, at in list(self._ejected.items()):
+            if at <= now:
+                del self._ejected[node]
+                self._ring.add(node)
+                slash_logger.info('Node %s is re-admitted. Nodes : %s', node, self._ring.nodes)
+
+    @staticmethod
+    def routingKey(data: JSON) -> Union[str, int]:
+        guild_id = data.get('guild_id')
+        return guild_id if guild_id is not None else data.get('channel_id', 0)
+
+    def nodeOf(self, data: JSON) -> Optional[str]:
+        return self._ring.get(self.routingKey(data))
+
+    async def route(self, data: JSON, *, reply: bool = True, body: Optional[bytes] = None) -> Optional[JSON]:
+        """Forward the interaction payload to its owner node.
+
+        Args:
+            data (JSON): interaction payload.
+            reply (bool): whether the node should reply with the initial response, instead of sending it itself.
+            body (Optional[bytes]): raw json of the payload, if already encoded. It is forwarded without re-encoding.
+
+        Returns:
+            Json of the initial response if `reply` is True and the node responded. Otherwise, None.
+        """
+        if body is None:
+            body = codec.dumpb(data)
+        frame: bytes = (b'{"reply":true,"d":' if reply else b'{"reply":false,"d":') + body + b'}'
+        if self._ejected:
+            self._readmit()
+        while True:
+            node: Optional[str] = self.nodeOf(data)
+            if node is None:
+                raise RuntimeError('No worker node is available to route interaction {}.'.format(data.get('id')))
+            try:
+                reply_frame: bytes = await asyncio.wait_for(self._transport.request(node, frame), self._request_timeout)
+            except asyncio.TimeoutError as e:
+                # The node may still process the interaction : don't send it twice.
+                if self._eject_on_failure:
+                    self._eject(node, e)
+                raise
+            except (ConnectionError, OSError) as e:
+                if not self._eject_on_failure:
+                    raise
+                self._eject(node, e)
+                continue
+            self._failures.pop(node, None)
+            self._counts[node] = self._counts.get(node, 0) + 1
+            return codec.loads(reply_frame)
+
+    async def forward(self, data: JSON) -> None:
+        """Forward the interaction payload received from the gateway. The node responds through the REST api."""
+        await self.route(data, reply=False)
+
+    async def close(self) -> None:
+        await self._transport.close()
+
+
+class WorkerNode:
+    """
+    Worker side of InteractionRouter. Receives frames forwarded by the router, and processes them with the
+    application command registry of the application.
+    """
+
+    def __init__(self, application: BaseSlashApplication, response_timeout: float = 2.5) -> None:
+        """
+        Args:
+            application (BaseSlashApplication): application which owns application commands to invoke.
+            response_timeout (float): seconds to wait initial response before deferring.
+        """
+        self._application: BaseSlashApplication = application
+        self._response_timeout: float = response_timeout
+        self._server: Optional[asyncio.AbstractServer] = None
+
+    @property
+    def application(self) -> BaseSlashApplication:
+        return self._application
+
+    async def handle(self, frame: bytes) -> bytes:
+        """Process a frame forwarded by the router.
+
+        Args:
+            frame (bytes): frame containing the interaction payload.
+
+        Returns:
+            Reply frame containing the initial response, if the router requested it.
+        """
+        message: JSON = codec.loads(frame)
+        if message['reply']:
+            response = await dispatch_interaction(self._application, message['d'], self._response_timeout)
+            return codec.dumpb(response)
+        task = asyncio.ensure_future(self._application.process_slash(message['d']))
+        task.add_done_callback(lambda t: _logFailure(message['d'].get('id'), t))
+        return b'null'
+
+    async def serve(self, address: str) -> None:
+        """Start serving frames on the address. (`host:port` or `unix:/path/to/socket`)"""
+        self._server = await serve_stream(address, self.handle)
+        slash_logger.info('Worker node is serving on %s', address)
+
+    async def close(self) -> None:
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+
+    def run(self, address: str) -> None:
+        """Serve frames on the address until interrupted. Blocking call."""
+        async def main() -> None:
+            await self.serve(address)
+            try:
+                await self._server.serve_forever()
+            finally:
+                await self.close()
+        asyncio.run(main())
+
+
+class RoutedInteractionServer(InteractionServer):
+    """
+    Http interactions endpoint which verifies requests, then forwards them to worker nodes with InteractionRouter.
+    """
+
+    def __init__(self, router: InteractionRouter, public_key: Union[str, bytes, SignatureVerifier], **kwargs) -> None:
+        """
+        Args:
+            router (InteractionRouter): router forwarding interactions to worker nodes.
+            public_key (Union[str, bytes, SignatureVerifier]): public key of the application, or a configured verifier.
+            **kwargs: keyword arguments of InteractionServer.
+        """
+        super().__init__(None, public_key, **kwargs)
+        self._router: InteractionRouter = router
+
+    @property
+    def router(self) -> InteractionRouter:
+        return self._router
+
+    async def dispatch(self, data: JSON, body: Optional[bytes] = None) -> Optional[JSON]:
+        return await self._router.route(data, body=body)
+
+    async def close(self) -> None:
+        await super().close()
+        await self._router.close()
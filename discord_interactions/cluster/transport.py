@@ -0,0 +1,204 @@
+from __future__ import annotations
+
+import asyncio
+import itertools
+import logging
+import struct
+from abc import ABC, abstractmethod
+from typing import Dict, Optional, Callable, Awaitable, Tuple, Final
+
+__all__ = (
+    'Transport',
+    'LocalTransport',
+    'StreamTransport',
+    'serve_stream'
+)
+
+
+slash_logger: logging.Logger = logging.getLogger('discord_interactions.cluster')
+
+# Frame header : length of the body, and id of the request. Replies carry the id of their request.
+HEADER: Final[struct.Struct] = struct.Struct('!II')
+
+FrameHandler = Callable[[bytes], Awaitable[bytes]]
+
+
+class Transport(ABC):
+    """Carry interaction frames from the router to worker nodes, and their replies back."""
+
+    @abstractmethod
+    async def request(self, node: str, frame: bytes) -> bytes:
+        """Send the frame to the node, and wait its reply.
+
+        Args:
+            node (str): name of the node.
+            frame (bytes): frame to send.
+
+        Returns:
+            Reply frame of the node.
+        """
+        ...
+
+    async def close(self) -> None:
+        pass
+
+
+class LocalTransport(Transport):
+    """In-process transport calling handlers of nodes directly. Stand-in of network transports in tests."""
+
+    def __init__(self) -> None:
+        self._handlers: Dict[str, FrameHandler] = {}
+
+    def register(self, node: str, handler: FrameHandler) -> None:
+        self._handlers[node] = handler
+
+    def unregister(self, node: str) -> None:
+        self._handlers.pop(node, None)
+
+    async def request(self, node: str, frame: bytes) -> bytes:
+        handler: Optional[FrameHandler] = self._handlers.get(node)
+        if handler is None:
+            raise ConnectionRefusedError('Node {} is not registered in LocalTransport.'.format(node))
+        return await handler(frame)
+
+
+def _parseAddress(address: str) -> Tuple[Optional[str], Optional[str], Optional[int]]:
+    """Parse `unix:/path/to/socket` or `host:port` address into (unix path, host, port)."""
+    if address.startswith('unix:'):
+        return address[5:], None, None
+    host, _, port = address.rpartition(':')
+    return None, host or '127.0.0.1', int(port)
+
+
+async def _readFrame(reader: asyncio.StreamReader) -> Tuple[int, bytes]:
+    length, request_id = HEADER.unpack(await reader.readexactly(HEADER.size))
+    return request_id, await reader.readexactly(length)
+
+
+def _writeFrame(writer: asyncio.StreamWriter, request_id: int, body: bytes) -> None:
+    writer.write(HEADER.pack(len(body), request_id) + body)
+
+
+class _Connection:
+    """Multiplexed connection to a node. Requests are matched with replies by their ids."""
+
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self.writer: asyncio.StreamWriter = writer
+        self.pending: Dict[int, asyncio.Future] = {}
+        self.ids = itertools.count()
+        self.reader_task: asyncio.Task = asyncio.ensure_future(self._readReplies(reader))
+
+    @property
+    def closed(self) -> bool:
+        return self.reader_task.done()
+
+    async def _readReplies(self, reader: asyncio.StreamReader) -> None:
+        try:
+            while True:
+                request_id, body = await _readFrame(reader)
+                future = self.pending.pop(request_id, None)
+                if future is not None and not future.done():
+                    future.set_result(body)
+        except (asyncio.IncompleteReadError, ConnectionError) as e:
+            error = ConnectionResetError('Connection to the node is closed : {!r}'.format(e))
+        except asyncio.CancelledError:
+            error = ConnectionResetError('Connection to the node is closed.')
+        for future in self.pending.values():
+            if not future.done():
+                future.set_exception(error)
+        self.pending.clear()
+
+    async def request(self, frame: bytes) -> bytes:
+        request_id = next(self.ids) & 0xFFFFFFFF
+        future = asyncio.get_event_loop().create_future()
+        self.pending[request_id] = future
+        try:
+            _writeFrame(self.writer, request_id, frame)
+            await self.writer.drain()
+            return await future
+        finally:
+            self.pending.pop(request_id, None)     # Not replied when the caller timed out or was cancelled.
+
+    def close(self) -> None:
+        self.reader_task.cancel()
+        self.writer.close()
+
+
+class StreamTransport(Transport):
+    """
+    Transport over TCP or Unix domain sockets. Node names are their addresses : `host:port` or `unix:/path/to/socket`.
+    One persistent connection is kept per node, and concurrent requests are multiplexed over it.
+    """
+
+    def __init__(self, connect_timeout: float = 5.0) -> None:
+        """
+        Args:
+            connect_timeout (float): seconds to wait connecting to nodes.
+        """
+        self._connect_timeout: float = connect_timeout
+        self._connections: Dict[str, _Connection] = {}
+        self._locks: Dict[str, asyncio.Lock] = {}
+
+    async def _connect(self, node: str) -> _Connection:
+        connection = self._connections.get(node)
+        if connection is not None and not connection.closed:
+            return connection
+        lock = self._locks.setdefault(node, asyncio.Lock())
+        async with lock:
+            connection = self._connections.get(node)
+            if connection is not None and not connection.closed:
+                return connection   # Connected while waiting the lock.
+            path, host, port = _parseAddress(node)
+            opening = asyncio.open_unix_connection(path) if path is not None else asyncio.open_connection(host, port)
+            reader, writer = await asyncio.wait_for(opening, self._connect_timeout)
+            connection = self._connections[node] = _Connection(reader, writer)
+            return connection
+
+    async def request(self, node: str, frame: bytes) -> bytes:
+        connection = await self._connect(node)
+        return await connection.request(frame)
+
+    async def disconnect(self, node: str) -> None:
+        connection = self._connections.pop(node, None)
+        if connection is not None:
+            connection.close()
+
+    async def close(self) -> None:
+        for node in list(self._connections):
+            await self.disconnect(node)
+
+
+async def serve_stream(address: str, handler: FrameHandler) -> asyncio.AbstractServer:
+    """Serve frames received on the address with the handler. Counterpart of StreamTransport.
+
+    Args:
+        address (str): `host:port` or `unix:/path/to/socket` to listen.
+        handler (FrameHandler): coroutine function receiving a frame and returning its reply.
+
+    Returns:
+        Started asyncio server.
+    """
+    async def reply(writer: asyncio.StreamWriter, request_id: int, frame: bytes) -> None:
+        try:
+            body = await handler(frame)
+        except Exception as e:
+            slash_logger.error('Exception while handling frame %s', request_id, exc_info=e)
+            body = b'null'
+        if not writer.is_closing():
+            _writeFrame(writer, request_id, body)
+
+    async def serve(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while True:
+                request_id, frame = await _readFrame(reader)
+                # Handle frames concurrently : a slow interaction must not block others on the same connection.
+                asyncio.ensure_future(reply(writer, request_id, frame))
+        except (asyncio.IncompleteReadError, ConnectionError, asyncio.CancelledError):
+            pass    # Connection closed by the router, or the server is shutting down.
+        finally:
+            writer.close()
+
+    path, host, port = _parseAddress(address)
+    if path is not None:
+        return await asyncio.start_unix_server(serve, path)
+    return await asyncio.start_server(serve, host, port)
@@ -0,0 +1,14 @@
+"""
+discord_interactions.monitoring
+~~~~~~
+instrumentation of interaction processing.
+"""
+from .histogram import Histogram
+from .latency import LatencyTracker, PARSE, LOOKUP, CONTEXT, INVOKE, FIRST_RESPONSE, TOTAL
+from .metrics import Counter, Gauge, GaugeFunction, MetricsRegistry, REGISTRY, metrics_handler, add_metrics_route, \
+    start_metrics_server
+from .tracing import Span, SpanExporter, InMemoryExporter, JsonLinesExporter, Tracer, current_span, get_tracer, \
+    set_tracer
+from .watchdog import SlowCallbackReport, SlowCallbackWatchdog
+from .loop_lag import LoopLagMonitor
+from .capture import TrafficRecorder, read_capture
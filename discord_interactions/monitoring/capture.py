@@ -0,0 +1,148 @@
+"""
+Capture of live traffic for load testing.
+Incoming interaction payloads and outgoing api calls are appended to a json lines file, with their time offset from the
+start of the capture. Files ending with `.gz` are compressed. Captures are replayed with
+discord_interactions.testing.TrafficReplayer.
+
+Record format, one json object per line :
+    {"capture": 1, "started": <epoch seconds>}                                          header
+    {"t": <offset>, "i": <interaction payload>}                                         interaction
+    {"t": <offset>, "m": <method>, "r": <route template>, "s": <status>, "d": <seconds>}   api call
+"""
+from __future__ import annotations
+
+import gzip
+import threading
+import time
+from typing import IO, Iterator, List, Optional, Any, Dict, Final
+
+from discord_interactions.utils import codec
+from discord_interactions.utils.type_hints import JSON
+
+__all__ = (
+    'CAPTURE_VERSION',
+    'TrafficRecorder',
+    'read_capture'
+)
+
+
+CAPTURE_VERSION: Final[int] = 1
+
+# Interaction tokens are credentials for 15 minutes : they are replaced unless kept explicitly.
+REDACTED_TOKEN: Final[str] = 'redacted'
+
+
+def _open(path: str, mode: str) -> IO[bytes]:
+    return gzip.open(path, mode) if path.endswith('.gz') else open(path, mode)
+
+
+class TrafficRecorder:
+    """
+    Opt-in recorder of interactions and api calls. Assign it to `client.recorder` to capture incoming interactions,
+    and to `get_scheduler().recorder` to capture api calls.
+    """
+
+    def __init__(self, path: str, flush_every: int = 64, keep_tokens: bool = False) -> None:
+        """
+        Args:
+            path (str): path of the capture file. Overwritten if it exists. Compressed if it ends with `.gz`.
+            flush_every (int): count of records buffered before writing to the file.
+            keep_tokens (bool): keep interaction tokens in captured payloads. Replaced by a placeholder otherwise.
+        """
+        self._path: str = path
+        self._flush_every: int = flush_every
+        self._keep_tokens: bool = keep_tokens
+        self._buffer: List[bytes] = []
+        self._lock: threading.Lock = threading.Lock()
+        self._file: IO[bytes] = _open(path, 'wb')
+        self._started: float = time.monotonic()
+        self._interactions: int = 0
+        self._requests: int = 0
+        self._write([codec.dumpb({'capture': CAPTURE_VERSION, 'started': time.time()}) + b'\n'])
+
+    @property
+    def path(self) -> str:
+        return self._path
+
+    @property
+    def interactions(self) -> int:
+        """Count of captured interactions."""
+        return self._interactions
+
+    @property
+    def requests(self) -> int:
+        """Count of captured api calls."""
+        return self._requests
+
+    def interaction(self, data: JSON) -> None:
+        """Capture interaction payload. Called by BaseSlashApplication.parse_interaction()."""
+        if not self._keep_tokens and 'token' in data:
+            data = {**data, 'token': REDACTED_TOKEN}
+        self._interactions += 1
+        self._append({'t': time.monotonic() - self._started, 'i': data})
+
+    def request(self, method: str, route: str, status: int, duration: float) -> None:
+        """Capture api call. Called by RequestScheduler.request() for every response, retries included.
+
+        Args:
+            method (str): http method.
+            route (str): url path of the request, with ids and tokens replaced. (see route_template())
+            status (int): status of the response.
+            duration (float): seconds from sending the request to receiving the response.
+        """
+        self._requests += 1
+        self._append({'t': time.monotonic() - self._started, 'm': method, 'r': route, 's': status, 'd': duration})
+
+    def _append(self, record: Dict[str, Any]) -> None:
+        line = codec.dumpb(record) + b'\n'
+        with self._lock:
+            self._buffer.append(line)
+            if len(self._buffer) >= self._flush_every:
+                self._write(self._buffer)
+                self._buffer = []
+
+    def _write(self, lines: List[bytes]) -> None:
+        if lines and not self._file.closed:
+            self._file.write(b''.join(lines))
+            self._file.flush()
+
+    def flush(self) -> None:
+        with self._lock:
+            self._write(self._buffer)
+            self._buffer = []
+
+    def close(self) -> None:
+        self.flush()
+        self._file.close()
+
+    def __enter__(self) -> TrafficRecorder:
+        return self
+
+    def __exit__(self, exc_type, exc, traceback) -> None:
+        self.close()
+
+
+def read_capture(path: str) -> Iterator[Dict[str, Any]]:
+    """Read records of a capture file, header excluded.
+
+    Args:
+        path (str): path of the capture file, written by TrafficRecorder.
+
+    Returns:
+        Iterator of records, in capture order.
+
+    Raises:
+        ValueError: the file is not a capture, or of an unsupported version.
+    """
+    with _open(path, 'rb') as f:
+        header: Optional[Dict[str, Any]] = None
+        for line in f:
+            if not line.strip():
+                continue
+            record = codec.loads(line)
+            if header is None:
+                header = record
+                if header.get('capture') != CAPTURE_VERSION:
+                    raise ValueError('{} is not a capture of version {}.'.format(path, CAPTURE_VERSION))
+                continue
+            yield record
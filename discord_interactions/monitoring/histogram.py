@@ -0,0 +1,164 @@
+from __future__ import annotations
+
+from typing import Dict, List, Final
+
+__all__ = (
+    'Histogram',
+)
+
+
+# Values are recorded in microseconds, up to 2^26us (about 67 seconds). Larger values are clamped.
+MAX_BITS: Final[int] = 26
+
+
+class Histogram:
+    """
+    HDR-style latency histogram with fixed memory.
+    Values are counted in log-linear buckets : each power of two is split into 2^(precision - 1) linear buckets, so
+    relative error of percentiles is below 1 / 2^(precision - 1). Recording is a few integer operations, and memory
+    doesn't grow with the count of values. (1344 buckets in default precision)
+    """
+    __slots__ = ('_precision', '_half', '_counts', '_count', '_total', '_min', '_max', '_limit')
+
+    def __init__(self, precision: int = 7) -> None:
+        """
+        Args:
+            precision (int): bits of linear buckets per power of two. Relative error is below 1 / 2^(precision - 1).
+        """
+        if not 2 <= precision < MAX_BITS:
+            raise ValueError('Histogram.precision must be between 2 and {}.'.format(MAX_BITS - 1))
+        self._precision: int = precision
+        self._half: int = 1 << (precision - 1)
+        self._limit: int = (1 << MAX_BITS) - 1
+        self._counts: List[int] = [0] * (self._index(self._limit) + 1)    # list increments are faster than array's.
+        self._count: int = 0
+        self._total: int = 0
+        self._min: int = self._limit
+        self._max: int = 0
+
+    def _index(self, value: int) -> int:
+        shift = value.bit_length() - self._precision
+        if shift <= 0:
+            return value
+        return shift * self._half + (value >> shift)
+
+    def _value(self, index: int) -> int:
+        """Representative value (middle) of the bucket."""
+        if index < self._half << 1:
+            return index
+        shift = (index >> (self._precision - 1)) - 1
+        return ((index - shift * self._half) << shift) + (1 << (shift - 1))
+
+    def record(self, seconds: float) -> None:
+        """Record latency value.
+
+        Args:
+            seconds (float): latency in seconds.
+        """
+        value = int(seconds * 1_000_000)
+        if value > self._limit:
+            value = self._limit
+        elif value < 0:
+            value = 0
+        shift = value.bit_length() - self._precision    # Inlined _index() : this is the hot path.
+        self._counts[value if shift <= 0 else shift * self._half + (value >> shift)] += 1
+        self._count += 1
+        self._total += value
+        if value > self._max:
+            self._max = value
+        if value < self._min:
+            self._min = value
+
+    @property
+    def count(self) -> int:
+        return self._count
+
+    @property
+    def max(self) -> float:
+        """Maximum recorded value in seconds. (exact)"""
+        return self._max / 1_000_000
+
+    @property
+    def min(self) -> float:
+        """Minimum recorded value in seconds. (exact)"""
+        return self._min / 1_000_000 if self._count else 0.0
+
+    @property
+    def mean(self) -> float:
+        return self._total / self._count / 1_000_000 if self._count else 0.0
+
+    def percentile(self, percent: float) -> float:
+        """Value at the percentile in seconds.
+
+        Args:
+            percent (float): percentile between 0 and 100.
+
+        Returns:
+            Latency in seconds. 0 if nothing is recorded.
+        """
+        if not self._count:
+            return 0.0
+        rank = max(1, round(self._count * percent / 100))
+        seen = 0
+        for index, count in enumerate(self._counts):
+            if count:
+                seen += count
+                if seen >= rank:
+                    # Bucket middles may overshoot exact extremes.
+                    return min(max(self._value(index), self._min), self._max) / 1_000_000
+        return self.max
+
+    def percentiles(self, *percents: float) -> Dict[float, float]:
+        """Values of several percentiles in seconds, computed in a single pass."""
+        result: Dict[float, float] = {}
+        if not self._count:
+            return {percent: 0.0 for percent in percents}
+        ranks = sorted((max(1, round(self._count * percent / 100)), percent) for percent in percents)
+        seen, position = 0, 0
+        for index, count in enumerate(self._counts):
+            if not count:
+                continue
+            seen += count
+            while position < len(ranks) and seen >= ranks[position][0]:
+                result[ranks[position][1]] = min(max(self._value(index), self._min), self._max) / 1_000_000
+                position += 1
+            if position == len(ranks):
+                break
+        return result
+
+    def snapshot(self) -> Dict[str, float]:
+        """Summary of recorded values. Latencies are in seconds."""
+        p = self.percentiles(50, 95, 99)
+        return {
+            'count': self._count,
+            'mean': self.mean,
+            'p50': p[50],
+            'p95': p[95],
+            'p99': p[99],
+            'max': self.max
+        }
+
+    def merge(self, other: Histogram) -> None:
+        """Add values recorded in another histogram of the same precision."""
+        if other._precision != self._precision:
+            raise ValueError('Can not merge histograms of different precision.')
+        counts = self._counts
+        for index, count in enumerate(other._counts):
+            if count:
+                counts[index] += count
+        self._count += other._count
+        self._total += other._total
+        self._max = max(self._max, other._max)
+        self._min = min(self._min, other._min)
+
+    def reset(self) -> None:
+        self._counts = [0] * len(self._counts)
+        self._count = 0
+        self._total = 0
+        self._min = self._limit
+        self._max = 0
+
+    def __repr__(self) -> str:
+        return 'Histogram(count={}, p50={:.6f}, p99={:.6f}, max={:.6f})'.format(
+            self._count, self.percentile(50), self.percentile(99), self.max
+        )
@@ -0,0 +1,61 @@
+"""
+Standard metrics of the library, registered in the default registry.
+"""
+from __future__ import annotations
+
+import re
+from typing import Final
+
+from .metrics import REGISTRY, Counter
+
+__all__ = (
+    'INTERACTIONS_RECEIVED',
+    'INTERACTIONS_DISPATCHED',
+    'INTERACTIONS_DEFERRED',
+    'INTERACTIONS_TIMED_OUT',
+    'INTERACTIONS_FAILED',
+    'REST_REQUESTS',
+    'RATELIMIT_WAITS',
+    'RATELIMIT_WAIT_SECONDS',
+    'route_template'
+)
+
+
+INTERACTIONS_RECEIVED: Final[Counter] = REGISTRY.counter(
+    'discord_interactions_received_total', 'Interactions received, per command.', ('command',)
+)
+INTERACTIONS_DISPATCHED: Final[Counter] = REGISTRY.counter(
+    'discord_interactions_dispatched_total', 'Interactions dispatched to their command callback.', ('command',)
+)
+INTERACTIONS_DEFERRED: Final[Counter] = REGISTRY.counter(
+    'discord_interactions_deferred_total', 'Interactions acknowledged with a deferred response.', ('command',)
+)
+INTERACTIONS_TIMED_OUT: Final[Counter] = REGISTRY.counter(
+    'discord_interactions_timed_out_total', 'Interactions not responded within 3 seconds.', ('command',)
+)
+INTERACTIONS_FAILED: Final[Counter] = REGISTRY.counter(
+    'discord_interactions_failed_total', 'Interactions whose command raised an exception.', ('command',)
+)
+REST_REQUESTS: Final[Counter] = REGISTRY.counter(
+    'discord_interactions_rest_requests_total', 'Api requests, per route and response status.',
+    ('method', 'route', 'status')
+)
+RATELIMIT_WAITS: Final[Counter] = REGISTRY.counter(
+    'discord_interactions_rest_ratelimit_waits_total', 'Api requests delayed by rate limits, per route.', ('route',)
+)
+RATELIMIT_WAIT_SECONDS: Final[Counter] = REGISTRY.counter(
+    'discord_interactions_rest_ratelimit_wait_seconds_total', 'Seconds waited for rate limits, per route.', ('route',)
+)
+
+
+_SNOWFLAKE = re.compile(r'/\d{15,21}(?=/|$)')
+_TOKEN = re.compile(r'/(webhooks|interactions)/(:id|@me)/[^/]+')
+
+
+def route_template(path: str) -> str:
+    """Replace ids and tokens in the url path, so that each route is a single label value.
+
+    Example: /api/v9/webhooks/775799577604522054/aW50ZXJhY3Rpb24/messages/@original
+             -> /api/v9/webhooks/:id/:token/messages/@original
+    """
+    return _TOKEN.sub(r'/\1/\2/:token', _SNOWFLAKE.sub('/:id', path))
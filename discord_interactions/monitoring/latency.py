@@ -0,0 +1,95 @@
+from __future__ import annotations
+
+import time
+from typing import Dict, Optional, Final
+
+from .histogram import Histogram
+
+__all__ = (
+    'LatencyTracker',
+    'PARSE',
+    'LOOKUP',
+    'CONTEXT',
+    'INVOKE',
+    'FIRST_RESPONSE',
+    'TOTAL'
+)
+
+
+# Phases of the interaction lifecycle.
+PARSE: Final[str] = 'parse'                     # Interaction.fromJson()
+LOOKUP: Final[str] = 'lookup'                   # Interaction.getCommand()
+CONTEXT: Final[str] = 'context'                 # SlashContext.fromInteraction()
+INVOKE: Final[str] = 'invoke'                   # ApplicationCommand.invoke()
+FIRST_RESPONSE: Final[str] = 'first_response'   # Receipt to initial response.
+TOTAL: Final[str] = 'total'                     # Receipt to completion.
+
+# Key of interactions whose command is not known.
+UNKNOWN_COMMAND: Final[str] = '<unknown>'
+
+
+class LatencyTracker:
+    """
+    Latency histograms of interaction lifecycle phases, kept per command.
+    Recording costs one dictionary lookup and a histogram update. Histograms are reset every `reset_interval` seconds,
+    checked lazily on record, so percentiles reflect recent traffic.
+    """
+
+    def __init__(self, reset_interval: Optional[float] = None, precision: int = 7) -> None:
+        """
+        Args:
+            reset_interval (Optional[float]): seconds after which histograms are reset. Never reset if None.
+            precision (int): precision of histograms. (see Histogram)
+        """
+        self._reset_interval: Optional[float] = reset_interval
+        self._precision: int = precision
+        self._histograms: Dict[str, Dict[str, Histogram]] = {}
+        self._reset_at: float = time.monotonic() + reset_interval if reset_interval else 0.0
+        self.enabled: bool = True
+
+    @property
+    def reset_interval(self) -> Optional[float]:
+        return self._reset_interval
+
+    def record(self, command: str, phase: str, seconds: float) -> None:
+        """Record latency of the lifecycle phase.
+
+        Args:
+            command (str): name of the command.
+            phase (str): lifecycle phase. (PARSE, LOOKUP, CONTEXT, INVOKE, FIRST_RESPONSE, TOTAL)
+            seconds (float): latency in seconds.
+        """
+        if not self.enabled:
+            return
+        if self._reset_interval and time.monotonic() >= self._reset_at:
+            self.reset()
+        phases = self._histograms.get(command)
+        if phases is None:
+            phases = self._histograms[command] = {}
+        histogram = phases.get(phase)
+        if histogram is None:
+            histogram = phases[phase] = Histogram(self._precision)
+        histogram.record(seconds)
+
+    def histogram(self, command: str, phase: str) -> Optional[Histogram]:
+        return self._histograms.get(command, {}).get(phase)
+
+    def phase(self, phase: str) -> Histogram:
+        """Histogram of the phase, merged across commands."""
+        merged = Histogram(self._precision)
+        for phases in self._histograms.values():
+            if phase in phases:
+                merged.merge(phases[phase])
+        return merged
+
+    def snapshot(self) -> Dict[str, Dict[str, Dict[str, float]]]:
+        """Summaries (count, mean, p50, p95, p99, max in seconds) keyed by command, then phase."""
+        return {
+            command: {phase: histogram.snapshot() for phase, histogram in phases.items()}
+            for command, phases in sorted(self._histograms.items())
+        }
+
+    def reset(self) -> None:
+        self._histograms.clear()
+        if self._reset_interval:
+            self._reset_at = time.monotonic() + self._reset_interval
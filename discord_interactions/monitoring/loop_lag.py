@@ -0,0 +1,171 @@
+"""
+Scheduling lag of the event loop.
+Interactions time out mostly because the loop is saturated, not because of the command itself. A callback scheduled at
+a fixed interval measures how late the loop runs it. Lag spikes are attributed to the commands running at that time,
+and smoothed lag can be used to shed load before queued interactions miss their deadline anyway.
+"""
+from __future__ import annotations
+
+import asyncio
+import math
+import time
+from collections import Counter, deque
+from typing import Deque, Dict, List, Optional, Set, Tuple, Any
+
+from .histogram import Histogram
+
+__all__ = (
+    'LoopLagMonitor',
+)
+
+
+class LoopLagMonitor:
+    """
+    Measure scheduling lag of the event loop at high frequency, keeping a rolling distribution.
+    The distribution covers the last `window` to 1.5 * `window` seconds : two histograms are rotated every half window.
+    """
+
+    def __init__(
+            self,
+            interval: float = 0.01,
+            window: float = 60.0,
+            spike_threshold: float = 0.05,
+            shed_threshold: Optional[float] = None,
+            smoothing: float = 1.0,
+            max_spikes: int = 100
+    ) -> None:
+        """
+        Args:
+            interval (float): seconds between measurements.
+            window (float): seconds of the rolling distribution.
+            spike_threshold (float): lag in seconds over which running commands are blamed.
+            shed_threshold (Optional[float]): smoothed lag in seconds over which the loop is overloaded. Never if None.
+            smoothing (float): time constant in seconds of the smoothed lag.
+            max_spikes (int): count of recent spikes kept.
+        """
+        if interval <= 0:
+            raise ValueError('LoopLagMonitor.interval must be positive.')
+        self._interval: float = interval
+        self._window: float = window
+        self._spike_threshold: float = spike_threshold
+        self._shed_threshold: Optional[float] = shed_threshold
+        self._smoothing: float = smoothing
+        self._current: Histogram = Histogram()
+        self._previous: Histogram = Histogram()
+        self._rotate_at: float = 0.0
+        self._smoothed: float = 0.0
+        self._running: Counter[str] = Counter()     # Commands running now.
+        self._ran: Set[str] = set()                 # Commands running since the last measurement.
+        self._blamed: Dict[str, List[float]] = {}   # command -> [spike count, lag total, lag max]
+        self._spikes: Deque[Tuple[float, float, Tuple[str, ...]]] = deque(maxlen=max_spikes)
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._handle: Optional[asyncio.TimerHandle] = None
+        self._expected: float = 0.0
+
+    @property
+    def running(self) -> bool:
+        return self._handle is not None
+
+    @property
+    def lag(self) -> float:
+        """Smoothed lag in seconds. (exponential moving average of measurements, weighted by time)"""
+        return self._smoothed
+
+    @property
+    def shed_threshold(self) -> Optional[float]:
+        return self._shed_threshold
+
+    def overloaded(self) -> bool:
+        """Whether smoothed lag is over the shedding threshold. Used by ShardDispatcher to reject interactions."""
+        return self._shed_threshold is not None and self._smoothed > self._shed_threshold
+
+    def start(self, loop: Optional[asyncio.AbstractEventLoop] = None) -> None:
+        """Start measuring in the loop. Restarts if measuring another loop."""
+        loop = loop or asyncio.get_event_loop()
+        if self._loop is loop and self.running:
+            return
+        self.stop()
+        self._loop = loop
+        self._rotate_at = loop.time() + self._window / 2
+        self._expected = loop.time() + self._interval
+        self._handle = loop.call_at(self._expected, self._measure)
+
+    def stop(self) -> None:
+        if self._handle is not None:
+            self._handle.cancel()
+            self._handle = None
+
+    def enter(self, command: str) -> None:
+        """Mark the command as running. Called before ApplicationCommand.invoke()."""
+        self._running[command] += 1
+        self._ran.add(command)
+
+    def exit(self, command: str) -> None:
+        running = self._running
+        if running[command] <= 1:
+            del running[command]
+        else:
+            running[command] -= 1
+
+    def _measure(self) -> None:
+        loop = self._loop
+        now = loop.time()
+        lag = now - self._expected
+        if lag < 0:
+            lag = 0.0
+        if now >= self._rotate_at:
+            self._previous, self._current = self._current, self._previous
+            self._current.reset()
+            self._rotate_at = now + self._window / 2
+        self._current.record(lag)
+        # Measurements are sparse while the loop is blocked : weight them by the time they cover.
+        self._smoothed += (lag - self._smoothed) * (1 - math.exp(-(lag + self._interval) / self._smoothing))
+        ran, self._ran = self._ran, set(self._running)
+        if lag > self._spike_threshold:
+            # Commands which ran since the last measurement, including those which finished in the meantime.
+            commands = tuple(sorted(ran))
+            self._spikes.append((time.time(), lag, commands))
+            for command in commands:
+                blamed = self._blamed.get(command)
+                if blamed is None:
+                    self._blamed[command] = [1, lag, lag]
+                else:
+                    blamed[0] += 1
+                    blamed[1] += lag
+                    if lag > blamed[2]:
+                        blamed[2] = lag
+        self._expected = now + self._interval
+        self._handle = loop.call_at(self._expected, self._measure)
+
+    def distribution(self) -> Histogram:
+        """Lag histogram of the rolling window."""
+        merged = Histogram()
+        merged.merge(self._previous)
+        merged.merge(self._current)
+        return merged
+
+    def spikes(self) -> List[Dict[str, Any]]:
+        """Recent lag spikes, with commands running at that time."""
+        return [{'time': at, 'lag': lag, 'commands': list(commands)} for at, lag, commands in self._spikes]
+
+    def blame(self) -> Dict[str, Dict[str, float]]:
+        """Lag spikes per command running at that time, most frequent first."""
+        return {
+            command: {'spikes': count, 'lag_total': total, 'lag_max': maximum}
+            for command, (count, total, maximum) in sorted(self._blamed.items(), key=lambda item: -item[1][0])
+        }
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Rolling lag distribution (seconds), smoothed lag and spikes per command."""
+        return {
+            'lag': self._smoothed,
+            'overloaded': self.overloaded(),
+            'distribution': self.distribution().snapshot(),
+            'blame': self.blame()
+        }
+
+    def reset(self) -> None:
+        self._current.reset()
+        self._previous.reset()
+        self._blamed.clear()
+        self._spikes.clear()
@@ -0,0 +1,227 @@
+from __future__ import annotations
+
+from typing import Callable, ClassVar, Dict, Iterable, List, Optional, Tuple, Union
+
+from aiohttp import web
+
+__all__ = (
+    'Counter',
+    'Gauge',
+    'GaugeFunction',
+    'MetricsRegistry',
+    'REGISTRY',
+    'metrics_handler',
+    'add_metrics_route',
+    'start_metrics_server'
+)
+
+
+LabelValues = Tuple[str, ...]
+Sample = Tuple[LabelValues, float]
+
+CONTENT_TYPE: str = 'text/plain; version=0.0.4; charset=utf-8'
+
+
+def _escape(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _formatValue(value: float) -> str:
+    if value != value:
+        return 'NaN'
+    if value in (float('inf'), float('-inf')):
+        return '+Inf' if value > 0 else '-Inf'
+    return repr(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+class _Value:
+    """Value of a metric with bound label values. Updates are plain attribute writes : no locks on the hot path."""
+    __slots__ = ('value',)
+
+    def __init__(self) -> None:
+        self.value: float = 0
+
+    def inc(self, amount: float = 1) -> None:
+        self.value += amount
+
+    def dec(self, amount: float = 1) -> None:
+        self.value -= amount
+
+    def set(self, value: float) -> None:
+        self.value = value
+
+
+class _Metric:
+    type: ClassVar[str]
+
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = ()) -> None:
+        """
+        Args:
+            name (str): name of the metric.
+            documentation (str): help text of the metric.
+            labelnames (Iterable[str]): names of labels.
+        """
+        self.name: str = name
+        self.documentation: str = documentation
+        self.labelnames: LabelValues = tuple(labelnames)
+        self._values: Dict[LabelValues, _Value] = {}
+        if not self.labelnames:
+            self._default: _Value = self._values.setdefault((), _Value())
+
+    def labels(self, *values: Union[str, int]) -> _Value:
+        """Value of the metric for label values. Created on first use."""
+        key = tuple(str(value) for value in values)
+        value = self._values.get(key)
+        if value is None:
+            if len(key) != len(self.labelnames):
+                raise ValueError('Metric {} expects labels {}, received {}.'.format(self.name, self.labelnames, key))
+            value = self._values[key] = _Value()
+        return value
+
+    def samples(self) -> Iterable[Sample]:
+        return [(key, value.value) for key, value in list(self._values.items())]
+
+    def clear(self) -> None:
+        self._values.clear()
+        if not self.labelnames:
+            self._default = self._values.setdefault((), _Value())
+
+
+class Counter(_Metric):
+    """Monotonically increasing value. (ex: count of received interactions)"""
+    type = 'counter'
+
+    def inc(self, amount: float = 1) -> None:
+        self._default.inc(amount)
+
+
+class Gauge(_Metric):
+    """Value which can go up and down. (ex: count of running commands)"""
+    type = 'gauge'
+
+    def inc(self, amount: float = 1) -> None:
+        self._default.inc(amount)
+
+    def dec(self, amount: float = 1) -> None:
+        self._default.dec(amount)
+
+    def set(self, value: float) -> None:
+        self._default.set(value)
+
+
+class GaugeFunction(_Metric):
+    """Gauge computed when metrics are collected, so the hot path doesn't pay for it. (ex: queue depth, cache size)"""
+    type = 'gauge'
+
+    def __init__(
+            self,
+            name: str,
+            documentation: str,
+            labelnames: Iterable[str],
+            function: Callable[[], Iterable[Sample]]
+    ) -> None:
+        """
+        Args:
+            name (str): name of the metric.
+            documentation (str): help text of the metric.
+            labelnames (Iterable[str]): names of labels.
+            function (Callable[[], Iterable[Sample]]): function returning (label values, value) pairs.
+        """
+        super().__init__(name, documentation, labelnames)
+        self._function: Callable[[], Iterable[Sample]] = function
+
+    def samples(self) -> Iterable[Sample]:
+        return [(tuple(str(v) for v in labels), value) for labels, value in self._function()]
+
+
+class MetricsRegistry:
+    """Collection of metrics, rendered in Prometheus text exposition format."""
+
+    def __init__(self) -> None:
+        self._metrics: Dict[str, _Metric] = {}
+
+    def register(self, metric: _Metric) -> _Metric:
+        """Register the metric. Metric of the same name is replaced."""
+        self._metrics[metric.name] = metric
+        return metric
+
+    def unregister(self, name: str) -> None:
+        self._metrics.pop(name, None)
+
+    def get(self, name: str) -> Optional[_Metric]:
+        return self._metrics.get(name)
+
+    def counter(self, name: str, documentation: str, labelnames: Iterable[str] = ()) -> Counter:
+        """Get registered counter of the name, or register new one."""
+        metric = self._metrics.get(name)
+        if metric is None:
+            metric = self.register(Counter(name, documentation, labelnames))
+        return metric
+
+    def gauge(self, name: str, documentation: str, labelnames: Iterable[str] = ()) -> Gauge:
+        """Get registered gauge of the name, or register new one."""
+        metric = self._metrics.get(name)
+        if metric is None:
+            metric = self.register(Gauge(name, documentation, labelnames))
+        return metric
+
+    def gaugeFunction(
+            self,
+            name: str,
+            documentation: str,
+            labelnames: Iterable[str],
+            function: Callable[[], Iterable[Sample]]
+    ) -> GaugeFunction:
+        """Register gauge computed by the function on collection. Replaces gauge of the same name."""
+        return self.register(GaugeFunction(name, documentation, labelnames, function))
+
+    def render(self) -> str:
+        """Render every metric in Prometheus text exposition format."""
+        lines: List[str] = []
+        for metric in list(self._metrics.values()):
+            lines.append('# HELP {} {}'.format(metric.name, metric.documentation.replace('\n', ' ')))
+            lines.append('# TYPE {} {}'.format(metric.name, metric.type))
+            for labels, value in metric.samples():
+                if labels:
+                    lines.append('{}{{{}}} {}'.format(metric.name, ','.join(
+                        '{}="{}"'.format(name, _escape(label)) for name, label in zip(metric.labelnames, labels)
+                    ), _formatValue(value)))
+                else:
+                    lines.append('{} {}'.format(metric.name, _formatValue(value)))
+        lines.append('')
+        return '\n'.join(lines)
+
+
+# Default registry, fed by the client and http layers.
+REGISTRY: MetricsRegistry = MetricsRegistry()
+
+
+def metrics_handler(registry: MetricsRegistry = REGISTRY) -> Callable[[web.Request], web.Response]:
+    """Build aiohttp request handler rendering the registry."""
+    async def handle(request: web.Request) -> web.Response:
+        return web.Response(body=registry.render().encode(), headers={'Content-Type': CONTENT_TYPE})
+    return handle
+
+
+def add_metrics_route(app: web.Application, path: str = '/metrics', registry: MetricsRegistry = REGISTRY) -> None:
+    """Expose the registry on the aiohttp application."""
+    app.router.add_get(path, metrics_handler(registry))
+
+
+async def start_metrics_server(
+        host: str = '0.0.0.0',
+        port: int = 9090,
+        path: str = '/metrics',
+        registry: MetricsRegistry = REGISTRY
+) -> web.AppRunner:
+    """Serve the registry on a separate port, in the running event loop.
+
+    Returns:
+        Runner of the server. Call `await runner.cleanup()` to stop it.
+    """
+    app = web.Application()
+    add_metrics_route(app, path, registry)
+    runner = web.AppRunner(app, access_log=None)
+    await runner.setup()
+    await web.TCPSite(runner, host, port).start()
+    return runner
@@ -0,0 +1,274 @@
+"""
+Tracing of interaction processing.
+A span is opened per interaction, with child spans of option binding, invoke hooks, the callback and api requests.
+The current span is kept in a context variable, so that api requests sent by a callback are linked to the
+interaction, through awaits and spawned tasks. Tracing is disabled until an exporter is added : disabled tracer
+hands out a shared no-op span, without allocations or context switches.
+"""
+from __future__ import annotations
+
+import contextvars
+import random
+import threading
+import time
+from collections import deque
+from typing import Any, Deque, Dict, IO, List, Optional, Type
+from types import TracebackType
+
+from discord_interactions.utils import codec
+
+__all__ = (
+    'Span',
+    'SpanExporter',
+    'InMemoryExporter',
+    'JsonLinesExporter',
+    'Tracer',
+    'current_span',
+    'get_tracer',
+    'set_tracer'
+)
+
+
+_current_span: contextvars.ContextVar[Optional[Span]] = contextvars.ContextVar(
+    'discord_interactions_span', default=None
+)
+
+
+def current_span() -> Optional[Span]:
+    """Span of the running context. None if tracing is disabled or no span is open."""
+    return _current_span.get()
+
+
+class Span:
+    """Timed operation of a trace. Used as a context manager : it becomes the current span until exited."""
+    __slots__ = (
+        '_tracer', 'name', 'trace_id', 'span_id', 'parent_id', 'attributes', 'start_time', 'duration', 'error',
+        '_started_at', '_token'
+    )
+
+    def __init__(self, tracer: Tracer, name: str, parent: Optional[Span], attributes: Dict[str, Any]) -> None:
+        self._tracer: Tracer = tracer
+        self.name: str = name
+        self.trace_id: str = parent.trace_id if parent is not None else '{:032x}'.format(random.getrandbits(128))
+        self.span_id: str = '{:016x}'.format(random.getrandbits(64))
+        self.parent_id: Optional[str] = parent.span_id if parent is not None else None
+        self.attributes: Dict[str, Any] = attributes
+        self.start_time: float = time.time()
+        self.duration: Optional[float] = None
+        self.error: Optional[str] = None
+        self._started_at: float = time.perf_counter()
+        self._token: Optional[contextvars.Token] = None
+
+    def set(self, key: str, value: Any) -> None:
+        """Set attribute of the span."""
+        self.attributes[key] = value
+
+    def finish(self, error: Optional[BaseException] = None) -> None:
+        """End the span and hand it to exporters. Spans used as context manager are finished on exit."""
+        if self.duration is not None:
+            return
+        self.duration = time.perf_counter() - self._started_at
+        if error is not None:
+            self.error = '{}: {}'.format(type(error).__name__, error)
+        self._tracer.export(self)
+
+    def __enter__(self) -> Span:
+        self._token = _current_span.set(self)
+        return self
+
+    def __exit__(
+            self,
+            exc_type: Optional[Type[BaseException]],
+            exc: Optional[BaseException],
+            traceback: Optional[TracebackType]
+    ) -> None:
+        if self._token is not None:
+            try:
+                _current_span.reset(self._token)
+            except ValueError:
+                # Exited in another context. (ex: span closed by a done callback)
+                _current_span.set(None)
+            self._token = None
+        self.finish(exc)
+
+    def toJson(self) -> Dict[str, Any]:
+        return {
+            'name': self.name,
+            'trace_id': self.trace_id,
+            'span_id': self.span_id,
+            'parent_id': self.parent_id,
+            'start_time': self.start_time,
+            'duration': self.duration,
+            'error': self.error,
+            'attributes': self.attributes
+        }
+
+    def __repr__(self) -> str:
+        return 'Span(name={!r}, trace_id={}, span_id={}, parent_id={}, duration={})'.format(
+            self.name, self.trace_id, self.span_id, self.parent_id, self.duration
+        )
+
+
+class _NoopSpan:
+    """Span handed out while tracing is disabled. Shared, and does nothing."""
+    __slots__ = ()
+
+    name = trace_id = span_id = parent_id = error = duration = None
+
+    def set(self, key: str, value: Any) -> None:
+        pass
+
+    def finish(self, error: Optional[BaseException] = None) -> None:
+        pass
+
+    def __enter__(self) -> _NoopSpan:
+        return self
+
+    def __exit__(self, exc_type, exc, traceback) -> None:
+        pass
+
+
+_NOOP_SPAN: _NoopSpan = _NoopSpan()
+
+
+class SpanExporter:
+    """Receives finished spans. Subclasses override export()."""
+
+    def export(self, span: Span) -> None:
+        raise NotImplementedError
+
+    def flush(self) -> None:
+        pass
+
+    def close(self) -> None:
+        self.flush()
+
+
+class InMemoryExporter(SpanExporter):
+    """Keep finished spans in memory. (ex: assertions in tests, debugging sessions)"""
+
+    def __init__(self, max_spans: Optional[int] = 10000) -> None:
+        """
+        Args:
+            max_spans (Optional[int]): count of spans to keep. Oldest spans are dropped first. Unbounded if None.
+        """
+        self._spans: Deque[Span] = deque(maxlen=max_spans)
+
+    @property
+    def spans(self) -> List[Span]:
+        return list(self._spans)
+
+    def export(self, span: Span) -> None:
+        self._spans.append(span)
+
+    def trace(self, trace_id: str) -> List[Span]:
+        """Spans of the trace, in the order they finished."""
+        return [span for span in self._spans if span.trace_id == trace_id]
+
+    def find(self, name: str) -> List[Span]:
+        return [span for span in self._spans if span.name == name]
+
+    def clear(self) -> None:
+        self._spans.clear()
+
+
+class JsonLinesExporter(SpanExporter):
+    """Append finished spans to a file, one json object per line."""
+
+    def __init__(self, path: str, flush_every: int = 64) -> None:
+        """
+        Args:
+            path (str): path of the file. Spans are appended if it exists.
+            flush_every (int): count of spans buffered before writing to the file.
+        """
+        self._path: str = path
+        self._flush_every: int = flush_every
+        self._buffer: List[bytes] = []
+        self._lock: threading.Lock = threading.Lock()    # Spans may finish in executor threads.
+        self._file: IO[bytes] = open(path, 'ab')
+
+    @property
+    def path(self) -> str:
+        return self._path
+
+    def export(self, span: Span) -> None:
+        line = codec.dumpb(span.toJson()) + b'\n'
+        with self._lock:
+            self._buffer.append(line)
+            if len(self._buffer) >= self._flush_every:
+                self._write()
+
+    def _write(self) -> None:
+        if self._buffer and not self._file.closed:
+            self._file.write(b''.join(self._buffer))
+            self._file.flush()
+        self._buffer.clear()
+
+    def flush(self) -> None:
+        with self._lock:
+            self._write()
+
+    def close(self) -> None:
+        self.flush()
+        self._file.close()
+
+
+class Tracer:
+    """Open spans and hand finished ones to exporters. Disabled while it has no exporter."""
+
+    def __init__(self, exporters: Optional[List[SpanExporter]] = None) -> None:
+        self._exporters: List[SpanExporter] = list(exporters or [])
+        self.enabled: bool = bool(self._exporters)
+
+    @property
+    def exporters(self) -> List[SpanExporter]:
+        return list(self._exporters)
+
+    def addExporter(self, exporter: SpanExporter) -> None:
+        self._exporters.append(exporter)
+        self.enabled = True
+
+    def removeExporter(self, exporter: SpanExporter) -> None:
+        self._exporters.remove(exporter)
+        self.enabled = bool(self._exporters)
+
+    def span(self, name: str, **attributes: Any) -> Span:
+        """Open a span, child of the current span of the context.
+
+        Args:
+            name (str): name of the operation.
+            **attributes: attributes of the span.
+
+        Returns:
+            Span to use as a context manager. Shared no-op span if tracing is disabled.
+        """
+        if not self.enabled:
+            return _NOOP_SPAN
+        return Span(self, name, _current_span.get(), attributes)
+
+    def export(self, span: Span) -> None:
+        for exporter in self._exporters:
+            exporter.export(span)
+
+    def flush(self) -> None:
+        for exporter in self._exporters:
+            exporter.flush()
+
+    def close(self) -> None:
+        for exporter in self._exporters:
+            exporter.close()
+        self._exporters.clear()
+        self.enabled = False
+
+
+_tracer: Tracer = Tracer()
+
+
+def get_tracer() -> Tracer:
+    """Tracer used by the library."""
+    return _tracer
+
+
+def set_tracer(tracer: Tracer) -> None:
+    global _tracer
+    _tracer = tracer
@@ -0,0 +1,239 @@
+"""
+Detection of application commands blocking the event loop.
+A heartbeat callback runs on the loop, and a watchdog thread checks that it keeps beating. When the loop is blocked
+longer than the threshold while a command runs, the stack of the loop thread (the blocking command itself) is captured.
+Blocking commands can be profiled for their next invocations, by sampling the loop thread stack at low frequency while
+they run.
+"""
+from __future__ import annotations
+
+import asyncio
+import sys
+import threading
+import time
+import traceback
+from collections import Counter, deque
+from types import FrameType
+from typing import Dict, Optional, Any, Final
+
+__all__ = (
+    'SlowCallbackReport',
+    'SlowCallbackWatchdog'
+)
+
+
+# Distinct stacks kept per command. Further distinct stacks are counted but not kept.
+MAX_STACKS: Final[int] = 32
+# Profile samples waiting for the loop. Older samples are dropped while the loop stays blocked.
+MAX_PENDING_SAMPLES: Final[int] = 1024
+
+
+def _collapse(frame: Optional[FrameType], limit: int) -> str:
+    """Stack in collapsed format (outermost first, separated by ';'), as used by flame graph tools."""
+    names = []
+    while frame is not None and len(names) < limit:
+        code = frame.f_code
+        names.append('{}:{}:{}'.format(code.co_filename.rsplit('/', 1)[-1], code.co_name, frame.f_lineno))
+        frame = frame.f_back
+    return ';'.join(reversed(names))
+
+
+class SlowCallbackReport:
+    """Loop blocks and profile samples of an application command."""
+    __slots__ = ('command', 'count', 'total_blocked', 'max_blocked', 'stacks', 'dropped_stacks', 'profile',
+                 'profiled_invocations')
+
+    def __init__(self, command: str) -> None:
+        self.command: str = command
+        self.count: int = 0
+        self.total_blocked: float = 0.0
+        self.max_blocked: float = 0.0
+        self.stacks: Counter[str] = Counter()
+        self.dropped_stacks: int = 0
+        self.profile: Counter[str] = Counter()
+        self.profiled_invocations: int = 0
+
+    def add(self, blocked: float, stack: str) -> None:
+        self.count += 1
+        self.total_blocked += blocked
+        self.max_blocked = max(self.max_blocked, blocked)
+        if stack in self.stacks or len(self.stacks) < MAX_STACKS:
+            self.stacks[stack] += 1
+        else:
+            self.dropped_stacks += 1
+
+    def toJson(self) -> Dict[str, Any]:
+        return {
+            'command': self.command,
+            'count': self.count,
+            'total_blocked': self.total_blocked,
+            'max_blocked': self.max_blocked,
+            'stacks': [{'stack': stack, 'count': count} for stack, count in self.stacks.most_common()],
+            'dropped_stacks': self.dropped_stacks,
+            'profiled_invocations': self.profiled_invocations,
+            'profile': dict(self.profile.most_common())
+        }
+
+    def __repr__(self) -> str:
+        return 'SlowCallbackReport(command={!r}, count={}, max_blocked={:.3f})'.format(
+            self.command, self.count, self.max_blocked
+        )
+
+
+class SlowCallbackWatchdog:
+    """
+    Opt-in watchdog of command invocations. Assign it to `client.watchdog`, and it starts with the first invocation.
+    Commands are only observed from the watchdog thread : the loop pays for a heartbeat callback and two dictionary
+    updates per invocation. Reports are only written on the loop : the thread hands its captures over to the heartbeat.
+    """
+
+    def __init__(
+            self,
+            threshold: float = 0.1,
+            profile_invocations: int = 0,
+            sample_interval: float = 0.01,
+            stack_limit: int = 32
+    ) -> None:
+        """
+        Args:
+            threshold (float): seconds the loop must be blocked to report the running command.
+            profile_invocations (int): count of next invocations of a blocking command to profile. Disabled if 0.
+            sample_interval (float): seconds between stack samples of profiled invocations.
+            stack_limit (int): maximum frames of captured stacks.
+        """
+        if threshold <= 0:
+            raise ValueError('SlowCallbackWatchdog.threshold must be positive.')
+        self._threshold: float = threshold
+        self._check_interval: float = threshold / 2
+        self._profile_invocations: int = profile_invocations
+        self._sample_interval: float = sample_interval
+        self._stack_limit: int = stack_limit
+        self._reports: Dict[str, SlowCallbackReport] = {}
+        self._active: Dict[asyncio.Task, str] = {}         # Running invocations, written on the loop only.
+        self._sampling: Dict[asyncio.Task, str] = {}       # Invocations being profiled, written on the loop only.
+        self._profiling: Dict[str, int] = {}               # Invocations left to profile per command.
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_thread: Optional[int] = None
+        self._thread: Optional[threading.Thread] = None
+        self._stopped: threading.Event = threading.Event()
+        self._heartbeat: float = 0.0
+        self._expected: float = 0.0
+        self._handle: Optional[asyncio.TimerHandle] = None
+        self._pending: Optional[tuple] = None    # (command, stack, profiled) captured by the thread.
+        self._samples: deque = deque(maxlen=MAX_PENDING_SAMPLES)   # (command, stack) sampled by the thread.
+
+    @property
+    def threshold(self) -> float:
+        return self._threshold
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self, loop: Optional[asyncio.AbstractEventLoop] = None) -> None:
+        """Start watching the loop. Must be called in the loop thread. Restarts if watching another loop."""
+        loop = loop or asyncio.get_event_loop()
+        if self._loop is loop and self.running:
+            return
+        self.stop()
+        self._loop, self._loop_thread = loop, threading.get_ident()
+        self._stopped = threading.Event()
+        self._heartbeat = self._expected = loop.time()
+        self._beat()
+        self._thread = threading.Thread(
+            target=self._watch, args=(self._stopped,), name='discord_interactions-watchdog', daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stopped.set()
+        if self._handle is not None:
+            self._handle.cancel()
+            self._handle = None
+        self._thread = None
+        self._active.clear()
+        self._sampling.clear()
+        self._samples.clear()
+
+    def enter(self, command: str) -> None:
+        """Mark the current task as running the command. Called before ApplicationCommand.invoke()."""
+        loop = asyncio.get_event_loop()
+        if self._loop is not loop or not self.running:
+            self.start(loop)
+        task = asyncio.current_task()
+        self._active[task] = command
+        remaining = self._profiling.get(command)
+        if remaining:
+            self._profiling[command] = remaining - 1
+            self._sampling[task] = command
+            self._report(command).profiled_invocations += 1
+
+    def exit(self) -> None:
+        """Unmark the current task. Called after ApplicationCommand.invoke()."""
+        task = asyncio.current_task()
+        self._active.pop(task, None)
+        self._sampling.pop(task, None)
+
+    def _report(self, command: str) -> SlowCallbackReport:
+        report = self._reports.get(command)
+        if report is None:
+            report = self._reports[command] = SlowCallbackReport(command)
+        return report
+
+    def _beat(self) -> None:
+        now = self._loop.time()
+        lag = now - self._expected
+        self._heartbeat = now
+        pending, self._pending = self._pending, None
+        if pending is not None:
+            command, stack, profiled = pending
+            self._report(command).add(max(lag, self._threshold), stack)
+            # Profile next invocations, unless the blocking one was already profiled.
+            if self._profile_invocations and not profiled and not self._profiling.get(command):
+                self._profiling[command] = self._profile_invocations
+        self._drainSamples()
+        self._expected = now + self._check_interval
+        self._handle = self._loop.call_at(self._expected, self._beat)
+
+    def _drainSamples(self) -> None:
+        samples = self._samples
+        while samples:
+            command, stack = samples.popleft()
+            self._report(command).profile[stack] += 1
+
+    def _frame(self) -> Optional[FrameType]:
+        return sys._current_frames().get(self._loop_thread)
+
+    def _watch(self, stopped: threading.Event) -> None:
+        loop = self._loop
+        captured_at: float = 0.0
+        while not stopped.wait(self._sample_interval if self._sampling else self._check_interval):
+            if loop.is_closed():
+                return
+            heartbeat = self._heartbeat
+            task = asyncio.current_task(loop)   # Plain dictionary read : safe from another thread.
+            if self._sampling:
+                command = self._sampling.get(task)
+                if command is not None:
+                    self._samples.append((command, _collapse(self._frame(), self._stack_limit)))
+            if time.monotonic() - heartbeat > self._threshold and captured_at != heartbeat:
+                command = self._active.get(task)
+                if command is not None:
+                    captured_at = heartbeat     # Once per block.
+                    stack = ''.join(traceback.format_stack(self._frame(), self._stack_limit))
+                    if self._heartbeat == heartbeat:    # Discard the stack if the loop moved on while capturing.
+                        self._pending = (command, stack, task in self._sampling)
+
+    def report(self, command: str) -> Optional[SlowCallbackReport]:
+        self._drainSamples()
+        return self._reports.get(command)
+
+    def reports(self) -> Dict[str, Dict[str, Any]]:
+        """Reports of every command which blocked the loop, keyed by command."""
+        self._drainSamples()
+        return {command: report.toJson() for command, report in sorted(self._reports.items())}
+
+    def reset(self) -> None:
+        self._samples.clear()
+        self._reports.clear()
+        self._profiling.clear()
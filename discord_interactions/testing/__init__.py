@@ -0,0 +1,9 @@
+"""
+discord_interactions.testing
+~~~~~~
+load testing without discord : local stub of the api, replay of captured traffic, and fake gateway.
+"""
+
+from .stub import StubRESTServer
+from .replay import ReplayReport, TrafficReplayer
+from .gateway import PayloadFactory, GatewayReport, FakeGateway
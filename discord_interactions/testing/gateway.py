@@ -0,0 +1,362 @@
+"""
+In-process fake gateway for end-to-end throughput tests.
+Synthetic INTERACTION_CREATE frames for the commands registered on a client are dispatched as socket responses, the
+way discord.py dispatches frames received from the gateway, without a connection. Payload shapes, the distribution of
+guilds and arrival rates (including bursts) are configurable. Api calls of the commands are answered by a local stub
+server, and latency is measured from the scheduled arrival of each frame to its interaction callback.
+"""
+from __future__ import annotations
+
+import asyncio
+import bisect
+import itertools
+import logging
+import random
+import time
+from collections import Counter
+from typing import Dict, List, Mapping, Optional, Tuple, Any, Union, Final
+
+from discord import Client
+
+from discord_interactions.application_commands.client.application_command_client import BaseSlashApplication
+from discord_interactions.application_commands.client.shard_dispatch import shard_id_of
+from discord_interactions.application_commands.models import ApplicationCommand, ApplicationCommandOptionType
+from discord_interactions.monitoring.histogram import Histogram
+from discord_interactions.utils import codec
+from discord_interactions.utils.interaction_route import get_api_base, set_api_base
+from discord_interactions.utils.type_hints import JSON
+from .stub import StubRESTServer
+
+__all__ = (
+    'PayloadFactory',
+    'GatewayReport',
+    'FakeGateway'
+)
+
+
+testing_logger: logging.Logger = logging.getLogger('discord_interactions.testing')
+
+# Snowflake timestamp (milliseconds since the discord epoch) of generated ids.
+_SNOWFLAKE_TIME: Final[int] = 180000000000
+# Bot token sent to the stub server on login.
+STUB_TOKEN: Final[str] = 'stub-token'
+
+
+def _snowflake(index: int, worker: int = 0) -> str:
+    # Consecutive indexes get consecutive timestamps : guilds spread evenly over shards.
+    return str(((_SNOWFLAKE_TIME + index) << 22) | (worker << 17) | (index & 0xFFF))
+
+
+class PayloadFactory:
+    """Build interaction payloads of the commands registered on an application, with random options and members."""
+
+    def __init__(
+            self,
+            application: BaseSlashApplication,
+            *,
+            weights: Optional[Mapping[str, float]] = None,
+            guilds: int = 1000,
+            guild_skew: float = 1.0,
+            users: int = 10000,
+            dm_ratio: float = 0.0,
+            optional_ratio: float = 0.5,
+            seed: Optional[int] = None
+    ) -> None:
+        """
+        Args:
+            application (BaseSlashApplication): application whose registered commands are invoked.
+            weights (Optional[Mapping[str, float]]): relative frequency of commands by name. Uniform if None.
+            guilds (int): count of guilds interactions come from.
+            guild_skew (float): exponent of the zipf distribution of guilds. Uniform if 0, a few hot guilds if over 1.
+            users (int): count of users invoking commands.
+            dm_ratio (float): fraction of interactions from direct messages, without guild.
+            optional_ratio (float): probability that each optional option is filled.
+            seed (Optional[int]): seed of the random generator, for reproducible payloads.
+        """
+        commands: List[ApplicationCommand] = list(application.applicationCommands)
+        if weights is not None:
+            commands = [command for command in commands if weights.get(command.name, 0) > 0]
+        if not commands:
+            raise ValueError('PayloadFactory requires at least one registered application command to invoke.')
+        if guilds <= 0:
+            raise ValueError('PayloadFactory.guilds must be positive integer.')
+        self._application: BaseSlashApplication = application
+        self._random: random.Random = random.Random(seed)
+        self._commands: List[Tuple[JSON, Optional[int]]] = [(command.toJson(), command.guild_id) for command in commands]
+        self._command_weights: List[float] = list(itertools.accumulate(
+            weights[command.name] if weights is not None else 1.0 for command in commands
+        ))
+        self._guild_weights: List[float] = list(itertools.accumulate(
+            1.0 / (rank ** guild_skew) for rank in range(1, guilds + 1)
+        ))
+        self._users: int = users
+        self._dm_ratio: float = dm_ratio
+        self._optional_ratio: float = optional_ratio
+        self._ids = itertools.count()
+
+    def _pick(self, cumulative: List[float]) -> int:
+        return bisect.bisect_right(cumulative, self._random.random() * cumulative[-1])
+
+    def _user(self) -> JSON:
+        index = self._random.randrange(self._users)
+        return {'id': _snowflake(index, 1), 'username': 'user{}'.format(index), 'discriminator': '{:04d}'.format(
+            index % 10000), 'avatar': None, 'public_flags': 0}
+
+    def _value(self, option: JSON, resolved: JSON) -> Any:
+        option_type = option['type']
+        choices = option.get('choices')
+        if choices:
+            return self._random.choice(choices)['value']
+        if option_type == ApplicationCommandOptionType.STRING.value:
+            return 'value {}'.format(self._random.randrange(1000))
+        if option_type == ApplicationCommandOptionType.INTEGER.value:
+            return self._random.randrange(1000)
+        if option_type == ApplicationCommandOptionType.BOOLEAN.value:
+            return self._random.random() < 0.5
+        if option_type == ApplicationCommandOptionType.USER.value:
+            user = self._user()
+            resolved.setdefault('users', {})[user['id']] = user
+            return user['id']
+        if option_type == ApplicationCommandOptionType.CHANNEL.value:
+            channel_id = _snowflake(self._random.randrange(1000), 2)
+            resolved.setdefault('channels', {})[channel_id] = {
+                'id': channel_id, 'name': 'channel', 'type': 0, 'permissions': '2147483647'
+            }
+            return channel_id
+        role_id = _snowflake(self._random.randrange(100), 3)
+        resolved.setdefault('roles', {})[role_id] = {
+            'id': role_id, 'name': 'role', 'color': 0, 'hoist': False, 'position': 1, 'permissions': '0',
+            'managed': False, 'mentionable': False
+        }
+        return role_id
+
+    def _options(self, options: Optional[List[JSON]], resolved: JSON) -> List[JSON]:
+        if not options:
+            return []
+        nested = [o for o in options if o['type'] in (ApplicationCommandOptionType.SUB_COMMAND.value,
+                                                      ApplicationCommandOptionType.SUB_COMMAND_GROUP.value)]
+        if nested:
+            # Exactly one subcommand or group is invoked.
+            option = self._random.choice(nested)
+            return [{'type': option['type'], 'name': option['name'],
+                     'options': self._options(option.get('options'), resolved)}]
+        return [
+            {'type': option['type'], 'name': option['name'], 'value': self._value(option, resolved)}
+            for option in options
+            if option.get('required') or self._random.random() < self._optional_ratio
+        ]
+
+    def payload(self) -> JSON:
+        """Build interaction payload of a random command, in a random guild."""
+        command, guild_id = self._commands[self._pick(self._command_weights)]
+        resolved: JSON = {}
+        data: JSON = {
+            'id': str(command['id'] or 0), 'name': command['name'], 'type': 1,
+            'options': self._options(command.get('options'), resolved)
+        }
+        if resolved:
+            data['resolved'] = resolved
+        interaction_id = _snowflake(next(self._ids), 4)
+        payload: JSON = {
+            'type': 2, 'id': interaction_id, 'application_id': str(self._application.application_id),
+            'token': 'token{}'.format(interaction_id), 'version': 1, 'data': data,
+            'channel_id': _snowflake(self._random.randrange(1000), 2)
+        }
+        user = self._user()
+        if guild_id is None and self._random.random() >= self._dm_ratio:
+            guild_id = _snowflake(self._pick(self._guild_weights))
+        if guild_id is None:
+            payload['user'] = user
+        else:
+            payload['guild_id'] = str(guild_id)
+            payload['member'] = {
+                'user': user, 'roles': [], 'permissions': '2147483647', 'nick': None, 'premium_since': None,
+                'pending': False, 'mute': False, 'deaf': False, 'joined_at': '2021-01-01T00:00:00.000000+00:00'
+            }
+        return payload
+
+
+class GatewayReport:
+    """End-to-end throughput and latency of a fake gateway run."""
+
+    def __init__(self) -> None:
+        self.frames: int = 0
+        self.answered: int = 0
+        self.errors: int = 0
+        self.duration: float = 0.0
+        self.latency: Histogram = Histogram()       # Scheduled arrival -> interaction callback received.
+        self.commands: Counter[str] = Counter()
+        self.shards: Counter[int] = Counter()
+
+    @property
+    def throughput(self) -> float:
+        """Answered interactions per second."""
+        return self.answered / self.duration if self.duration else 0.0
+
+    @property
+    def unanswered(self) -> int:
+        """Count of frames without callback. (rejected, dropped, failed or too slow)"""
+        return self.frames - self.answered
+
+    def toJson(self) -> Dict[str, Any]:
+        return {
+            'frames': self.frames,
+            'answered': self.answered,
+            'unanswered': self.unanswered,
+            'errors': self.errors,
+            'duration': self.duration,
+            'throughput': self.throughput,
+            'latency': self.latency.snapshot(),
+            'commands': dict(self.commands.most_common()),
+            'shards': dict(sorted(self.shards.items()))
+        }
+
+    def summary(self) -> str:
+        """Human readable report, in milliseconds."""
+        percentiles = self.latency.percentiles(50, 90, 99, 100)
+        return '{} frames in {:.2f}s : {:.1f} interactions/s, {} unanswered, {} errors\n' \
+               'latency : p50 {:.2f}ms  p90 {:.2f}ms  p99 {:.2f}ms  max {:.2f}ms'.format(
+                   self.frames, self.duration, self.throughput, self.unanswered, self.errors,
+                   *(percentiles[p] * 1000 for p in (50, 90, 99, 100))
+               )
+
+
+class FakeGateway:
+    """
+    Dispatch synthetic interactions to a client, at Poisson distributed arrivals with optional bursts.
+    discord.py clients (SlashClient, AutoShardedSlashClient, ...) receive `socket_response` events, and are logged in
+    to the stub server if they aren't. Other applications have their payloads processed with process_slash().
+    Must run in the event loop of the client.
+    """
+
+    def __init__(
+            self,
+            client: Union[Client, BaseSlashApplication],
+            *,
+            rate: float = 100.0,
+            duration: float = 10.0,
+            burst_size: int = 0,
+            burst_interval: float = 1.0,
+            payloads: Optional[PayloadFactory] = None,
+            shard_count: Optional[int] = None,
+            stub: Optional[StubRESTServer] = None,
+            drain_timeout: float = 5.0,
+            seed: Optional[int] = None
+    ) -> None:
+        """
+        Args:
+            client (Union[Client, BaseSlashApplication]): client receiving the interactions.
+            rate (float): average interactions per second, excluding bursts.
+            duration (float): seconds of arrivals.
+            burst_size (int): interactions arriving at once every `burst_interval` seconds, on top of `rate`.
+            burst_interval (float): seconds between bursts.
+            payloads (Optional[PayloadFactory]): builder of interaction payloads. Default shape if None.
+            shard_count (Optional[int]): shard count set on sharded clients which have none. (not connected)
+            stub (Optional[StubRESTServer]): running stub server to send api calls to. A new one is started if None.
+            drain_timeout (float): seconds to wait for callbacks after the last arrival.
+            seed (Optional[int]): seed of arrival times.
+        """
+        if rate <= 0:
+            raise ValueError('FakeGateway.rate must be positive.')
+        if burst_size and burst_interval <= 0:
+            raise ValueError('FakeGateway.burst_interval must be positive.')
+        self._client: Union[Client, BaseSlashApplication] = client
+        self._rate: float = rate
+        self._duration: float = duration
+        self._burst_size: int = burst_size
+        self._burst_interval: float = burst_interval
+        self._payloads: Optional[PayloadFactory] = payloads
+        self._shard_count: Optional[int] = shard_count
+        self._stub: Optional[StubRESTServer] = stub
+        self._drain_timeout: float = drain_timeout
+        self._random: random.Random = random.Random(seed)
+        self._arrivals: Dict[str, float] = {}   # interaction id -> scheduled arrival, until its callback.
+        self._report: GatewayReport = GatewayReport()
+
+    def arrivals(self) -> List[float]:
+        """Arrival offsets in seconds : Poisson process of `rate`, merged with bursts."""
+        offsets: List[float] = []
+        at = self._random.expovariate(self._rate)
+        while at < self._duration:
+            offsets.append(at)
+            at += self._random.expovariate(self._rate)
+        if self._burst_size:
+            bursts = itertools.takewhile(lambda t: t < self._duration, itertools.count(0.0, self._burst_interval))
+            offsets.extend(t for t in bursts for _ in range(self._burst_size))
+        offsets.sort()
+        return offsets
+
+    def _onRequest(self, method: str, path: str, received_at: float) -> None:
+        if path.endswith('/callback'):
+            # /api/v9/interactions/{interaction.id}/{interaction.token}/callback
+            arrival = self._arrivals.pop(path.rsplit('/', 3)[1], None)
+            if arrival is not None:
+                self._report.answered += 1
+                self._report.latency.record(received_at - arrival)
+
+    async def _process(self, data: JSON) -> None:
+        try:
+            await self._client.process_slash(data)
+        except Exception as e:
+            self._report.errors += 1
+            testing_logger.debug('Interaction %s failed : %r', data['id'], e)
+
+    def _deliver(self, frame: bytes) -> None:
+        message: JSON = codec.loads(frame)     # Frames are decoded by the receiving side, like the gateway client does.
+        if isinstance(self._client, Client):
+            self._client.dispatch('socket_response', message)
+        else:
+            asyncio.ensure_future(self._process(message['d']))
+
+    async def _connect(self, stub: StubRESTServer) -> None:
+        client = self._client
+        if isinstance(client, Client):
+            if client.loop is not asyncio.get_event_loop():
+                raise RuntimeError('FakeGateway must run in the event loop of the client.')
+            if client.http.token is None:
+                await client.login(STUB_TOKEN)
+        if not client.application_id:
+            client.application_id = stub.application_id
+        if self._shard_count is not None and getattr(client, 'shard_count', 0) is None:
+            client.shard_count = self._shard_count
+
+    async def run(self) -> GatewayReport:
+        """Dispatch interactions for `duration` seconds, and wait for their callbacks.
+
+        Returns:
+            Report of the run.
+        """
+        stub = self._stub if self._stub is not None else StubRESTServer()
+        if self._stub is None:
+            await stub.start()
+        api_base = get_api_base()
+        set_api_base(stub.url)
+        stub.listener = self._onRequest
+        report = self._report
+        try:
+            await self._connect(stub)
+            payloads = self._payloads if self._payloads is not None else PayloadFactory(self._client)
+            shard_count = getattr(self._client, 'shard_count', None) or 1
+            started_at = time.monotonic()
+            for offset in self.arrivals():
+                data = payloads.payload()
+                frame = codec.dumpb({'op': 0, 't': 'INTERACTION_CREATE', 's': report.frames + 1, 'd': data})
+                arrival = started_at + offset
+                delay = arrival - time.monotonic()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                self._arrivals[data['id']] = arrival
+                report.frames += 1
+                report.commands[data['data']['name']] += 1
+                report.shards[shard_id_of(data.get('guild_id'), shard_count)] += 1
+                self._deliver(frame)
+            drain_until = time.monotonic() + self._drain_timeout
+            while self._arrivals and time.monotonic() < drain_until:
+                await asyncio.sleep(0.01)
+            report.duration = time.monotonic() - started_at
+        finally:
+            stub.listener = None
+            set_api_base(api_base)
+            if self._stub is None:
+                await stub.close()
+        return report
@@ -0,0 +1,206 @@
+"""
+Replay of captured traffic for load testing.
+Interactions of a capture (see discord_interactions.monitoring.TrafficRecorder) are fed to an application at their
+captured pace, scaled by a rate multiplier, while its api calls are answered by a local stub server.
+Latency is measured from the scheduled arrival of each interaction, so that delays of a saturated loop are included
+instead of silently slowing down the replay.
+"""
+from __future__ import annotations
+
+import asyncio
+import itertools
+import logging
+import math
+import time
+from collections import Counter
+from typing import Dict, List, Optional, Tuple, Any
+
+from discord_interactions.application_commands.client.application_command_client import BaseSlashApplication
+from discord_interactions.monitoring.capture import read_capture
+from discord_interactions.monitoring.histogram import Histogram
+from discord_interactions.monitoring.instruments import route_template
+from discord_interactions.utils.interaction_route import get_api_base, set_api_base
+from discord_interactions.utils.type_hints import JSON
+from .stub import StubRESTServer
+
+__all__ = (
+    'ReplayReport',
+    'TrafficReplayer'
+)
+
+
+testing_logger: logging.Logger = logging.getLogger('discord_interactions.testing')
+
+
+class ReplayReport:
+    """Throughput, latency and errors of a replay."""
+
+    def __init__(self, rate: float) -> None:
+        self.rate: float = rate
+        self.interactions: int = 0
+        self.completed: int = 0
+        self.errors: int = 0
+        self.duration: float = 0.0
+        self.response_latency: Histogram = Histogram()      # Scheduled arrival -> interaction callback received.
+        self.processing_latency: Histogram = Histogram()    # Scheduled arrival -> process_slash() finished.
+        self.captured_requests: Counter[Tuple[str, str]] = Counter()
+        self.replayed_requests: Counter[Tuple[str, str]] = Counter()
+
+    @property
+    def throughput(self) -> float:
+        """Processed interactions per second."""
+        return self.completed / self.duration if self.duration else 0.0
+
+    @property
+    def error_rate(self) -> float:
+        return self.errors / self.interactions if self.interactions else 0.0
+
+    @property
+    def unanswered(self) -> int:
+        """Count of interactions without callback. (not responded, or responded after the end of the replay)"""
+        return self.interactions - self.response_latency.count
+
+    def toJson(self) -> Dict[str, Any]:
+        routes = sorted(set(self.captured_requests) | set(self.replayed_requests))
+        return {
+            'rate': self.rate,
+            'interactions': self.interactions,
+            'completed': self.completed,
+            'errors': self.errors,
+            'error_rate': self.error_rate,
+            'unanswered': self.unanswered,
+            'duration': self.duration,
+            'throughput': self.throughput,
+            'response_latency': self.response_latency.snapshot(),
+            'processing_latency': self.processing_latency.snapshot(),
+            'requests': [
+                {'method': method, 'route': route, 'captured': self.captured_requests[(method, route)],
+                 'replayed': self.replayed_requests[(method, route)]}
+                for method, route in routes
+            ]
+        }
+
+    def summary(self) -> str:
+        """Human readable report, in milliseconds."""
+        lines = ['{} interactions in {:.2f}s at x{} rate : {:.1f}/s, {} errors ({:.2%}), {} unanswered'.format(
+            self.interactions, self.duration, self.rate, self.throughput, self.errors, self.error_rate, self.unanswered
+        )]
+        for name, histogram in (('response', self.response_latency), ('processing', self.processing_latency)):
+            percentiles = histogram.percentiles(50, 90, 99, 100)
+            lines.append('{:<10} latency : p50 {:.2f}ms  p90 {:.2f}ms  p99 {:.2f}ms  max {:.2f}ms'.format(
+                name, *(percentiles[p] * 1000 for p in (50, 90, 99, 100))
+            ))
+        for method, route in sorted(set(self.captured_requests) | set(self.replayed_requests)):
+            lines.append('{:<6} {:<60} captured {:>6}  replayed {:>6}'.format(
+                method, route, self.captured_requests[(method, route)], self.replayed_requests[(method, route)]
+            ))
+        return '\n'.join(lines)
+
+
+class TrafficReplayer:
+    """Feed captured interactions to an application, against a local stub of the api."""
+
+    def __init__(
+            self,
+            application: BaseSlashApplication,
+            path: str,
+            *,
+            rate: float = 1.0,
+            repeat: int = 1,
+            stub: Optional[StubRESTServer] = None,
+            timeout: float = 30.0
+    ) -> None:
+        """
+        Args:
+            application (BaseSlashApplication): application whose commands process the interactions.
+            path (str): path of the capture file.
+            rate (float): multiplier of the captured arrival rate. `math.inf` sends every interaction at once.
+            repeat (int): count of replays of the capture, one after another. Ids are rewritten after the first one.
+            stub (Optional[StubRESTServer]): running stub server to send api calls to. A new one is started if None.
+            timeout (float): seconds to wait for interactions still running after the last arrival.
+        """
+        if rate <= 0:
+            raise ValueError('TrafficReplayer.rate must be positive.')
+        if repeat < 1:
+            raise ValueError('TrafficReplayer.repeat must be positive integer.')
+        self._application: BaseSlashApplication = application
+        self._path: str = path
+        self._rate: float = rate
+        self._repeat: int = repeat
+        self._stub: Optional[StubRESTServer] = stub
+        self._timeout: float = timeout
+        self._arrivals: Dict[str, float] = {}   # interaction id -> scheduled arrival, until its callback.
+        self._report: ReplayReport = ReplayReport(rate)
+
+    def _onRequest(self, method: str, path: str, received_at: float) -> None:
+        report = self._report
+        report.replayed_requests[(method, route_template(path))] += 1
+        if path.endswith('/callback'):
+            # /api/v9/interactions/{interaction.id}/{interaction.token}/callback
+            arrival = self._arrivals.pop(path.rsplit('/', 3)[1], None)
+            if arrival is not None:
+                report.response_latency.record(received_at - arrival)
+
+    async def _dispatch(self, data: JSON, arrival: float) -> None:
+        report = self._report
+        try:
+            await self._application.process_slash(data)
+            report.completed += 1
+        except Exception as e:
+            report.errors += 1
+            testing_logger.debug('Interaction %s failed : %r', data['id'], e)
+        report.processing_latency.record(time.monotonic() - arrival)
+
+    def _load(self) -> List[Tuple[float, JSON]]:
+        interactions: List[Tuple[float, JSON]] = []
+        for record in read_capture(self._path):
+            if 'i' in record:
+                interactions.append((record['t'], record['i']))
+            else:
+                self._report.captured_requests[(record['m'], record['r'])] += self._repeat
+        return interactions
+
+    async def run(self) -> ReplayReport:
+        """Replay the capture, and wait until the interactions are processed.
+
+        Returns:
+            Report of the replay.
+        """
+        interactions = self._load()
+        report = self._report
+        stub = self._stub if self._stub is not None else StubRESTServer()
+        if self._stub is None:
+            await stub.start()
+        api_base = get_api_base()
+        set_api_base(stub.url)
+        stub.listener = self._onRequest
+        tasks: List[asyncio.Task] = []
+        try:
+            first = interactions[0][0] if interactions else 0.0
+            span = interactions[-1][0] - first if interactions else 0.0
+            ids = itertools.count(1 << 60)
+            started_at = time.monotonic()
+            for round_ in range(self._repeat):
+                rewritten: Dict[str, str] = {}   # Duplicated deliveries of the capture stay duplicated.
+                for offset, data in interactions:
+                    arrival = started_at + (round_ * span + offset - first) / self._rate if math.isfinite(self._rate) \
+                        else started_at
+                    delay = arrival - time.monotonic()
+                    if delay > 0:
+                        await asyncio.sleep(delay)
+                    if round_:
+                        data = {**data, 'id': rewritten.setdefault(data['id'], str(next(ids)))}
+                    self._arrivals.setdefault(data['id'], arrival)
+                    report.interactions += 1
+                    tasks.append(asyncio.ensure_future(self._dispatch(data, arrival)))
+            if tasks:
+                _, pending = await asyncio.wait(tasks, timeout=self._timeout)
+                for task in pending:
+                    task.cancel()
+            report.duration = time.monotonic() - started_at
+        finally:
+            stub.listener = None
+            set_api_base(api_base)
+            if self._stub is None:
+                await stub.close()
+        return report
@@ -0,0 +1,329 @@
+"""
+Local stand-in of the discord api for offline performance tests.
+Implements the endpoints used by the library and discord.py message sends : interaction callbacks, webhook messages
+(followups and edits of responses), channel messages, global and guild application commands, and discord.py login.
+Responses are minimal valid objects, without side effects except for application commands, which are kept in memory.
+Latency, rate limit headers and injected 429 responses are configurable, so that the rate limiter, connection pooling
+and request scheduling can be measured end-to-end on one machine. Point the library to it with `set_api_base(stub.url)`.
+"""
+from __future__ import annotations
+
+import asyncio
+import datetime
+import itertools
+import logging
+import random
+import time
+from collections import Counter
+from ssl import SSLContext
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple, Any, Final
+
+from aiohttp import web
+
+from discord_interactions.monitoring.instruments import route_template
+from discord_interactions.utils import codec
+from discord_interactions.utils.cache import LRUCache
+from discord_interactions.utils.type_hints import JSON
+
+__all__ = (
+    'StubRESTServer',
+)
+
+
+testing_logger: logging.Logger = logging.getLogger('discord_interactions.testing')
+
+# (method, path, monotonic time received)
+RequestListener = Callable[[str, str, float], None]
+Handler = Callable[[web.Request], Awaitable[web.StreamResponse]]
+
+API_PREFIX: Final[str] = r'/api/v{version:\d+}'
+
+
+def _jsonResponse(data: Any, status: int = 200, headers: Optional[Dict[str, str]] = None) -> web.Response:
+    return web.Response(body=codec.dumpb(data), status=status, headers=headers, content_type='application/json')
+
+
+class _Bucket:
+    """Fixed window rate limit of a route."""
+    __slots__ = ('reset_at', 'remaining')
+
+    def __init__(self, limit: int, window: float) -> None:
+        self.reset_at: float = time.monotonic() + window
+        self.remaining: int = limit
+
+
+class StubRESTServer:
+    """
+    Serve the discord api endpoints used by the library, on a local port.
+    Every request can be delayed by `latency` (plus random `jitter`). With `rate_limit`, each route (method and path)
+    allows that many requests per `rate_limit_window` seconds, answering `X-RateLimit-*` headers like the api, and 429
+    beyond it. `error_rate` injects 429 responses at random, regardless of limits.
+    """
+
+    def __init__(
+            self,
+            host: str = '127.0.0.1',
+            port: int = 0,
+            *,
+            application_id: int = 775799577604522054,
+            latency: float = 0.0,
+            jitter: float = 0.0,
+            rate_limit: Optional[int] = None,
+            rate_limit_window: float = 1.0,
+            error_rate: float = 0.0,
+            retry_after: float = 0.05,
+            seed: Optional[int] = None,
+            ssl_context: Optional[SSLContext] = None,
+            keepalive_timeout: float = 75.0
+    ) -> None:
+        """
+        Args:
+            host (str): host to listen on.
+            port (int): port to listen on. A free port is picked if 0.
+            application_id (int): id of the application and of its bot user, answered to discord.py login.
+            latency (float): seconds waited before answering each request.
+            jitter (float): maximum random seconds added to `latency`.
+            rate_limit (Optional[int]): requests allowed per route in each window. Unlimited if None.
+            rate_limit_window (float): seconds of rate limit windows.
+            error_rate (float): probability of answering 429 to a request, between 0 and 1.
+            retry_after (float): seconds of `retry_after` in injected 429 responses.
+            seed (Optional[int]): seed of random jitter and injected errors, for reproducible runs.
+            ssl_context (Optional[SSLContext]): serve https with the context. (ex: to measure TLS setup)
+            keepalive_timeout (float): seconds idle connections are kept open.
+        """
+        if not 0 <= error_rate <= 1:
+            raise ValueError('StubRESTServer.error_rate must be between 0 and 1.')
+        if rate_limit is not None and rate_limit <= 0:
+            raise ValueError('StubRESTServer.rate_limit must be positive integer.')
+        self._host: str = host
+        self._port: int = port
+        self._application_id: str = str(application_id)
+        self._latency: float = latency
+        self._jitter: float = jitter
+        self._rate_limit: Optional[int] = rate_limit
+        self._rate_limit_window: float = rate_limit_window
+        self._error_rate: float = error_rate
+        self._retry_after: float = retry_after
+        self._random: random.Random = random.Random(seed)
+        self._ssl_context: Optional[SSLContext] = ssl_context
+        self._keepalive_timeout: float = keepalive_timeout
+        self._buckets: LRUCache = LRUCache(4096)     # Interaction webhooks make a bucket per token.
+        self._application_commands: Dict[Tuple[str, Optional[str]], Dict[str, JSON]] = {}  # (application, guild)
+        self._ids = itertools.count(900000000000000000)
+        self._runner: Optional[web.AppRunner] = None
+        self.listener: Optional[RequestListener] = None
+        self.requests: int = 0
+        self.limited: int = 0       # 429 responses beyond rate limits.
+        self.injected: int = 0      # 429 responses injected by `error_rate`.
+        self.routes: Counter[Tuple[str, str]] = Counter()
+
+    @property
+    def url(self) -> str:
+        """Base url of the api served by the stub. (ex: http://127.0.0.1:8080/api/v9/)"""
+        return '{}://{}:{}/api/v9/'.format('https' if self._ssl_context else 'http', self._host, self._port)
+
+    @property
+    def application_id(self) -> int:
+        return int(self._application_id)
+
+    @property
+    def stats(self) -> Dict[str, Any]:
+        """Count of requests, of 429 responses, and of requests per route."""
+        return {
+            'requests': self.requests,
+            'limited': self.limited,
+            'injected': self.injected,
+            'routes': {'{} {}'.format(method, route): count for (method, route), count in self.routes.most_common()}
+        }
+
+    # Rate limits
+
+    def _rateLimited(self, retry_after: float, bucket: str) -> web.Response:
+        return _jsonResponse(
+            {'message': 'You are being rate limited.', 'retry_after': retry_after, 'global': False},
+            status=429,
+            headers={'Retry-After': '{:.3f}'.format(retry_after), 'X-RateLimit-Bucket': bucket}
+        )
+
+    def _bucketHeaders(self, key: str, bucket: _Bucket, now: float) -> Dict[str, str]:
+        reset_after = max(0.0, bucket.reset_at - now)
+        return {
+            'X-RateLimit-Limit': str(self._rate_limit),
+            'X-RateLimit-Remaining': str(bucket.remaining),
+            'X-RateLimit-Reset': '{:.3f}'.format(time.time() + reset_after),
+            'X-RateLimit-Reset-After': '{:.3f}'.format(reset_after),
+            'X-RateLimit-Bucket': key
+        }
+
+    @web.middleware
+    async def _middleware(self, request: web.Request, handler: Handler) -> web.StreamResponse:
+        received_at = time.monotonic()
+        self.requests += 1
+        self.routes[(request.method, route_template(request.path))] += 1
+        if self.listener is not None:
+            self.listener(request.method, request.path, received_at)
+        delay = self._latency + (self._random.uniform(0, self._jitter) if self._jitter else 0.0)
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+        key = '{} {}'.format(request.method, request.path)
+        if self._error_rate and self._random.random() < self._error_rate:
+            self.injected += 1
+            return self._rateLimited(self._retry_after, key)
+        if self._rate_limit is None:
+            return await handler(request)
+
+        now = time.monotonic()
+        bucket: Optional[_Bucket] = self._buckets.get(key)
+        if bucket is None or bucket.reset_at <= now:
+            bucket = _Bucket(self._rate_limit, self._rate_limit_window)
+            self._buckets.set(key, bucket)
+        if bucket.remaining <= 0:
+            self.limited += 1
+            return self._rateLimited(bucket.reset_at - now, key)
+        bucket.remaining -= 1
+        response = await handler(request)
+        response.headers.update(self._bucketHeaders(key, bucket, now))
+        return response
+
+    # Endpoints
+
+    @staticmethod
+    async def _body(request: web.Request) -> JSON:
+        if request.content_type != 'application/json' or not request.can_read_body:
+            return {}   # ex: multipart bodies of file uploads.
+        body = codec.loads(await request.read())
+        return body if isinstance(body, dict) else {}
+
+    def _message(self, request: web.Request, body: JSON, message_id: Optional[str] = None) -> JSON:
+        application_id = request.match_info.get('application_id', '0')
+        return {
+            'id': message_id if message_id and message_id != '@original' else str(next(self._ids)),
+            'channel_id': request.match_info.get('channel_id', '0'),
+            'type': 0,
+            'author': {'id': application_id, 'username': 'stub', 'discriminator': '0000', 'avatar': None, 'bot': True},
+            'content': '',
+            'timestamp': datetime.datetime.now(datetime.timezone.utc).isoformat(),
+            'edited_timestamp': None,
+            'tts': False,
+            'mention_everyone': False,
+            'mentions': [],
+            'mention_roles': [],
+            'attachments': [],
+            'embeds': [],
+            'components': [],
+            'pinned': False,
+            'flags': 0,
+            **body
+        }
+
+    async def _callback(self, request: web.Request) -> web.Response:
+        return web.Response(status=204)
+
+    async def _createMessage(self, request: web.Request) -> web.Response:
+        return _jsonResponse(self._message(request, await self._body(request)))
+
+    async def _messageByID(self, request: web.Request) -> web.Response:
+        if request.method == 'DELETE':
+            return web.Response(status=204)
+        body = await self._body(request) if request.method == 'PATCH' else {}
+        return _jsonResponse(self._message(request, body, request.match_info['message_id']))
+
+    def _commandStore(self, request: web.Request) -> Dict[str, JSON]:
+        key = (request.match_info['application_id'], request.match_info.get('guild_id'))
+        return self._application_commands.setdefault(key, {})
+
+    def _command(self, request: web.Request, body: JSON, command_id: Optional[str] = None) -> JSON:
+        command = {
+            'id': command_id or str(next(self._ids)),
+            'application_id': request.match_info['application_id'],
+            'version': str(next(self._ids)),
+            'default_permission': True,
+            **body
+        }
+        if 'guild_id' in request.match_info:
+            command['guild_id'] = request.match_info['guild_id']
+        return command
+
+    async def _commandList(self, request: web.Request) -> web.Response:
+        store = self._commandStore(request)
+        if request.method == 'GET':
+            return _jsonResponse(list(store.values()))
+        if request.method == 'PUT':     # Bulk overwrite : commands of the same name keep their id.
+            ids = {command['name']: command_id for command_id, command in store.items()}
+            bodies: List[JSON] = codec.loads(await request.read()) if request.can_read_body else []
+            store.clear()
+            for body in bodies:
+                command = self._command(request, body, ids.get(body.get('name')))
+                store[command['id']] = command
+            return _jsonResponse(list(store.values()))
+        body = await self._body(request)
+        existing = next((command for command in store.values() if command.get('name') == body.get('name')), None)
+        command = self._command(request, body, existing['id'] if existing is not None else None)
+        store[command['id']] = command
+        return _jsonResponse(command, status=200 if existing is not None else 201)
+
+    async def _commandByID(self, request: web.Request) -> web.Response:
+        store = self._commandStore(request)
+        command_id = request.match_info['command_id']
+        command = store.get(command_id)
+        if command is None:
+            return _jsonResponse({'message': 'Unknown application command', 'code': 10063}, status=404)
+        if request.method == 'DELETE':
+            del store[command_id]
+            return web.Response(status=204)
+        if request.method == 'PATCH':
+            command = store[command_id] = {**command, **await self._body(request), 'id': command_id}
+        return _jsonResponse(command)
+
+    def _user(self) -> JSON:
+        return {'id': self._application_id, 'username': 'stub', 'discriminator': '0000', 'avatar': None, 'bot': True}
+
+    async def _currentUser(self, request: web.Request) -> web.Response:
+        return _jsonResponse({**self._user(), 'verified': True, 'mfa_enabled': False, 'flags': 0})
+
+    async def _applicationInfo(self, request: web.Request) -> web.Response:
+        return _jsonResponse({
+            'id': self._application_id, 'name': 'stub', 'description': '', 'icon': None, 'rpc_origins': None,
+            'bot_public': False, 'bot_require_code_grant': False, 'owner': self._user(), 'summary': '',
+            'verify_key': '0' * 64
+        })
+
+    async def _gateway(self, request: web.Request) -> web.Response:
+        return _jsonResponse({'url': 'wss://gateway.discord.gg', 'shards': 1})
+
+    def _addRoutes(self, router: web.UrlDispatcher) -> None:
+        router.add_post(API_PREFIX + '/interactions/{interaction_id}/{token}/callback', self._callback)
+        router.add_post(API_PREFIX + '/webhooks/{application_id}/{token}', self._createMessage)
+        router.add_route('*', API_PREFIX + '/webhooks/{application_id}/{token}/messages/{message_id}', self._messageByID)
+        router.add_post(API_PREFIX + '/channels/{channel_id}/messages', self._createMessage)
+        router.add_route('*', API_PREFIX + '/channels/{channel_id}/messages/{message_id}', self._messageByID)
+        for commands in ('/applications/{application_id}/commands',
+                         '/applications/{application_id}/guilds/{guild_id}/commands'):
+            router.add_route('*', API_PREFIX + commands, self._commandList)
+            router.add_route('*', API_PREFIX + commands + '/{command_id}', self._commandByID)
+        router.add_get(API_PREFIX + '/gateway', self._gateway)
+        router.add_get(API_PREFIX + '/gateway/bot', self._gateway)
+        router.add_get(API_PREFIX + '/users/@me', self._currentUser)
+        router.add_get(API_PREFIX + '/oauth2/applications/@me', self._applicationInfo)
+
+    async def start(self) -> None:
+        app = web.Application(middlewares=[self._middleware])
+        self._addRoutes(app.router)
+        self._runner = web.AppRunner(app, access_log=None, keepalive_timeout=self._keepalive_timeout)
+        await self._runner.setup()
+        await web.TCPSite(self._runner, self._host, self._port, ssl_context=self._ssl_context).start()
+        self._port = self._runner.addresses[0][1]
+        testing_logger.info('Serving stub api on %s', self.url)
+
+    async def close(self) -> None:
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    async def __aenter__(self) -> StubRESTServer:
+        await self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc, traceback) -> None:
+        await self.close()
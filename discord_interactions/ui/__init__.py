@@ -1,8 +1,8 @@
-from discord_interactions.utils.log import get_stream_logger, DEBUG
+from discord_interactions.utils.log import get_stream_logger
 from .errors import *
 
 # Initialize logger first
-logger = get_stream_logger('discord_interactions.ui', DEBUG)
+logger = get_stream_logger('discord_interactions.ui')
 
 from .components import ComponentType, Component, ActionRow, ButtonStyle, Button, SelectOption, SelectMenu
 from .cache import ComponentCache
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import warnings
 from enum import Enum
 from typing import List, Optional, Final, Union
 
@@ -149,7 +150,7 @@ class ButtonStyle(Enum):
 
     @classmethod
     def parse(cls, value: Union[int, str]) -> Optional[ButtonStyle]:
-        logger.debug('ButtonStyle(Enum) : Try parsing value {} into ButtonStyle enumeration object.'.format(value))
+        logger.debug('ButtonStyle(Enum) : Try parsing value %r into ButtonStyle enumeration object.', value)
         return next(filter(
             lambda m: m.value == value or m.name == value,
             cls.__members__.values()
@@ -303,19 +304,28 @@ class SelectOption:
         self.description = description
         self.default = default
 
-    def to_json(self) -> JSON:
+    def to_dict(self) -> JSON:
         data = {
             SelectOptionKeys.LABEL: self.label,
             SelectOptionKeys.VALUE: self.value
         }
         if self.emoji:
-            data[SelectOptionKeys.EMOJI] = self.emoji.to_dict()
+            data[SelectOptionKeys.EMOJI] = self.emoji if isinstance(self.emoji, str) else self.emoji.to_dict()
         if self.description:
             data[SelectOptionKeys.DESCRIPTION] = self.description
         if self.default:
             data[SelectOptionKeys.DEFAULT] = self.default
         return data
 
+    def to_json(self) -> JSON:
+        """Deprecated alias of to_dict(), named like the other components."""
+        warnings.warn(
+            'SelectOption.to_json() is deprecated. Use SelectOption.to_dict() instead.',
+            DeprecationWarning,
+            stacklevel=2
+        )
+        return self.to_dict()
+
     def __repr__(self) -> str:
         params = ['label={}'.format(self.label), 'value={}'.format(self.value)]
         if self.emoji:
@@ -1,18 +1,20 @@
-import json
 from logging import getLogger
 from typing import List, Union, Optional
 
 import discord
+import discord.gateway
 from discord import AllowedMentions, InvalidArgument, File, utils
 from discord.abc import Messageable
 from discord.http import HTTPClient, Route
 
 # Backups
+from discord_interactions.utils import codec
+from discord_interactions.utils.interaction_route import dpy_api_base
 from discord_interactions.utils.type_hints import JSON
 from .components import ComponentType, Component, ActionRow, Button
 from .message import ComponentMessage
 
-btn_logger = getLogger('discord_buttons')
+btn_logger = getLogger('discord_interactions.ui')
 
 Messageable_send = Messageable.send
 HTTTPClient_send_message = HTTPClient.send_message
@@ -23,8 +25,43 @@ def parse_components_from_json(data: JSON) -> List[Component]:
     pass
 
 
-def parse_components_into_json(components: List[Component]) -> List[Component]:
-    pass
+def parse_components_into_json(
+        components: Union[ActionRow, List[Component], List[List[Component]]]
+) -> List[JSON]:
+    """Build `components` array of message payloads.
+
+    Args:
+        components: an ActionRow, components of a single row, ActionRows, or rows of components as python iterables.
+
+    Returns:
+        Array of action row payloads.
+    """
+    if isinstance(components, ActionRow):
+        return [components.to_dict()]
+
+    if isinstance(components, (list, tuple)):
+        if not components:
+            return []
+        if isinstance(components[0], Component):
+            if components[0].type != ComponentType.ActionRow:
+                # Not a nested component array.
+                return [{
+                    'type': ComponentType.ActionRow.value,
+                    'components': [c.to_dict() for c in components]
+                }]
+            # Nested component array using ActionRow objects.
+            return [c.to_dict() for c in components]
+        if isinstance(components[0], (list, tuple)):
+            # Nested component array using python iterables.
+            return [
+                {
+                    'type': ComponentType.ActionRow.value,
+                    'components': [c.to_dict() for c in children]
+                }
+                for children in components
+            ]
+
+    raise TypeError("Elements in Iterable must be Component's subclasses!")
 
 
 # Replace methods
@@ -149,42 +186,10 @@ async def send(
     parsed_components: List[JSON] = []
     if components is not None:
         btn_logger.debug(
-            'discord.abc.Messageable.send#patched > Parsing components : (type: {}) {}'.format(type(components),
-                                                                                               components))
-        if isinstance(components, ActionRow):
-            parsed_components = [components.to_json()]
-
-        elif isinstance(components, (list, tuple)):
-            if isinstance(components[0], Component):
-                if components[0].type != ComponentType.Container:
-                    # Not a nested component array.
-                    parsed_components = [{
-                        'type': ComponentType.Container.value,
-                        'components': list(map(
-                            lambda c: c.to_json(),
-                            components
-                        ))
-                    }]
-                else:
-                    # Nested component array using object Container(Component).
-                    parsed_components = [c.to_json() for c in components]
-            elif isinstance(components[0], (list, tuple)):
-                # Nested component array using python iterables.
-                parsed_components = [
-                    {
-                        'type': ComponentType.Container.value,
-                        'components': list(map(
-                            lambda c: c.to_json(),
-                            children
-                        ))
-                    }
-                    for children in components
-                ]
-
-            else:
-                raise TypeError("Elements in Iterable must be Component's subclasses!")
-        btn_logger.debug(
-            'discord.abc.Messageable.send#patched > Parsed buttons into components : {}'.format(parsed_components))
+            'discord.abc.Messageable.send#patched > Parsing components : (type: %s) %s', type(components), components
+        )
+        parsed_components = parse_components_into_json(components)
+        btn_logger.debug('discord.abc.Messageable.send#patched > Parsed buttons into components : %s', parsed_components)
 
     if file is not None and files is not None:
         raise InvalidArgument('cannot pass both file and files parameter to send()')
@@ -222,8 +227,6 @@ async def send(
     if delete_after is not None:
         await ret.delete(delay=delete_after)
 
-    print('patched send debug : packing with ButtonMessage object...')
-    print(json.dumps(data, ensure_ascii=False, indent=2))
     if 'message_reference' in data:
         # Issue : 'message_reference' object in message response data lacks 'channel_id', so copy it from object 'referenced_message'.
         data['message_reference']['channel_id'] = data['referenced_message']['channel_id']
@@ -309,9 +312,9 @@ def send_message(
   ]
 }
         """
-        btn_logger.debug('components : {}'.format(components))
+        btn_logger.debug('components : %s', components)
         payload['components'] = components
-        btn_logger.debug('payload : {}'.format(json.dumps(payload, ensure_ascii=False, indent=2)))
+        btn_logger.debug('payload : %s', payload)
 
     return self.request(r, json=payload)
 
@@ -347,7 +350,7 @@ def send_files(
     if components:
         payload['components'] = components
 
-    form.append({'name': 'payload_json', 'value': utils.to_json(payload)})
+    form.append({'name': 'payload_json', 'value': codec.dumps(payload)})
     if len(files) == 1:
         file = files[0]
         form.append({
@@ -368,12 +371,41 @@ def send_files(
     return self.request(r, form=form, files=files)
 
 
+# 'json_or_text' function in 'discord.http'
+async def json_or_text(response):
+    body = await response.read()
+    if response.headers.get('content-type') == 'application/json':
+        return codec.loads(body)
+    return body.decode('utf-8')
+
+
+class _CodecJsonModule:
+    """Stand-in of `json` module in 'discord.gateway', decoding gateway events with the codec of the library."""
+
+    @staticmethod
+    def loads(s, **kwargs):
+        return codec.loads(s)
+
+    @staticmethod
+    def dumps(obj, **kwargs):
+        return codec.dumps(obj)
+
+
+def to_json(obj) -> str:
+    return codec.dumps(obj)
+
+
 def patch_dpy():
-    """Replace 'send' method in 'discord.abc.Messageable' to support discord buttons feature."""
+    """Replace 'send' method in 'discord.abc.Messageable' to support discord buttons feature.
+    Json encoding & decoding of discord.py (REST bodies and gateway events) also use the codec of the library.
+    """
     Messageable.send = send
     HTTPClient.send_message = send_message
     HTTPClient.send_files = send_files
-    Route.BASE = 'https://discord.com/api/v8'
+    Route.BASE = dpy_api_base()
+    utils.to_json = to_json
+    discord.http.json_or_text = json_or_text
+    discord.gateway.json = _CodecJsonModule
 
 
 def check():
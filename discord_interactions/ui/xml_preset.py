@@ -6,6 +6,7 @@ from discord import PartialEmoji
 
 from discord_interactions.utils.type_hints import JSON, EMOJI
 from discord_interactions.utils.abstracts import SingletonMeta
+from discord_interactions.utils.log import get_stream_logger
 from .errors import DiscordUIError
 from .components import Component, ActionRow, Button, ButtonStyle, ButtonKeys, SelectOption, SelectMenu, SelectOptionKeys, SelectKeys
 
@@ -28,6 +29,8 @@ __all__ = (
     'XMLComponentParser'
 )
 
+logger = get_stream_logger('discord_interactions.ui')
+
 
 class EmojiKeys:
     NAME = 'name'
@@ -159,7 +162,7 @@ class XMLComponentParser:
         # Example : <SelectOption ref="some_ref_name"/>
         ref = option_tag.get(REFERENCE)
         if ref:
-            print(f'Adding reference for SelectOption with name {ref}')
+            logger.debug('Adding reference for SelectOption with name %s', ref)
             # Postpone to parse after primary parsing.
             self.postponed_queue.append(
                 {
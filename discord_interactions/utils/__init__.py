@@ -6,4 +6,8 @@ utility features for slash-command usage.
 from .abstracts import JsonObject
 from .type_hints import *
 from .interaction_route import InteractionRoute
-from .log import get_stream_logger, DEBUG, INFO
+from .cache import TTLCache, LRUCache, SingleFlight, TimeBucketedSet
+from .http import RequestPriority, RequestScheduler, get_scheduler, set_scheduler
+from . import codec
+from .codec import JsonCodec, get_codec, set_codec, available_codecs
+from .log import get_stream_logger, setup_logging, shutdown_logging, set_level, DEBUG, INFO
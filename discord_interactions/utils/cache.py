@@ -0,0 +1,311 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from collections import OrderedDict, deque
+from typing import Dict, Hashable, Optional, Any, Callable, Awaitable, Tuple, Deque, Set
+
+__all__ = (
+    'TTLCache',
+    'LRUCache',
+    'SingleFlight',
+    'TimeBucketedSet'
+)
+
+
+class TTLCache:
+    """
+    Dictionary-like cache whose entries expire after fixed seconds.
+    Expired entries are evicted lazily on lookup, and in bulk when the cache is full.
+    """
+    __slots__ = ('_ttl', '_maxsize', '_data')
+
+    def __init__(self, ttl: float, maxsize: Optional[int] = None) -> None:
+        """
+        Args:
+            ttl (float): seconds until the entry expires.
+            maxsize (Optional[int]): maximum count of entries. If None, cache size is not limited.
+        """
+        if ttl <= 0:
+            raise ValueError('TTLCache.ttl must be positive number.')
+        self._ttl: float = ttl
+        self._maxsize: Optional[int] = maxsize
+        self._data: Dict[Hashable, Tuple[float, Any]] = {}
+
+    @property
+    def ttl(self) -> float:
+        return self._ttl
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        entry = self._data.get(key)
+        if entry is None:
+            return default
+        if entry[0] < time.monotonic():
+            del self._data[key]
+            return default
+        return entry[1]
+
+    def set(self, key: Hashable, value: Any) -> None:
+        data = self._data
+        data.pop(key, None)     # Re-insert to keep dictionary ordered by expiration.
+        if self._maxsize is not None and len(data) >= self._maxsize:
+            if self.purge() == 0:
+                # Nothing expired yet. Drop the oldest entry.
+                del data[next(iter(data))]
+        data[key] = (time.monotonic() + self._ttl, value)
+
+    def pop(self, key: Hashable, default: Any = None) -> Any:
+        entry = self._data.pop(key, None)
+        return entry[1] if entry is not None else default
+
+    def purge(self) -> int:
+        """Remove every expired entry.
+
+        Returns:
+            Count of removed entries.
+        """
+        now = time.monotonic()
+        data = self._data
+        expired = []
+        for key, (expires_at, _) in data.items():
+            if expires_at >= now:
+                break   # Entries are ordered by expiration.
+            expired.append(key)
+        for key in expired:
+            del data[key]
+        return len(expired)
+
+    def clear(self) -> None:
+        self._data.clear()
+
+    def __contains__(self, key: Hashable) -> bool:
+        return self.get(key, _MISSING) is not _MISSING
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+_MISSING = object()
+
+
+class LRUCache:
+    """
+    Dictionary-like cache which evicts the least recently used entry when it is full.
+    If `ttl` is given, entries also expire after `ttl` seconds, and expired entries are evicted lazily on lookup.
+    Counts hits & misses of lookups, to monitor efficiency of the cache.
+    """
+    __slots__ = ('_maxsize', '_ttl', '_data', 'hits', 'misses')
+
+    def __init__(self, maxsize: int, ttl: Optional[float] = None) -> None:
+        """
+        Args:
+            maxsize (int): maximum count of entries.
+            ttl (Optional[float]): seconds until the entry expires. If None, entries only leave by eviction.
+        """
+        if maxsize <= 0:
+            raise ValueError('LRUCache.maxsize must be positive integer.')
+        if ttl is not None and ttl <= 0:
+            raise ValueError('LRUCache.ttl must be positive number.')
+        self._maxsize: int = maxsize
+        self._ttl: Optional[float] = ttl
+        self._data: OrderedDict = OrderedDict()     # key -> value, or (expiration time, value) if ttl is set.
+        self.hits: int = 0
+        self.misses: int = 0
+
+    @property
+    def maxsize(self) -> int:
+        return self._maxsize
+
+    @property
+    def ttl(self) -> Optional[float]:
+        return self._ttl
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        try:
+            value = self._data[key]
+        except KeyError:
+            self.misses += 1
+            return default
+        if self._ttl is not None:
+            expires_at, value = value
+            if expires_at < time.monotonic():
+                del self._data[key]
+                self.misses += 1
+                return default
+        self._data.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        data = self._data
+        data[key] = (time.monotonic() + self._ttl, value) if self._ttl is not None else value
+        data.move_to_end(key)
+        if len(data) > self._maxsize:
+            data.popitem(last=False)
+
+    def pop(self, key: Hashable, default: Any = None) -> Any:
+        value = self._data.pop(key, _MISSING)
+        if value is _MISSING:
+            return default
+        return value[1] if self._ttl is not None else value
+
+    def clear(self) -> None:
+        self._data.clear()
+        self.hits = self.misses = 0
+
+    def __contains__(self, key: Hashable) -> bool:
+        if self._ttl is None:
+            return key in self._data
+        entry = self._data.get(key)
+        return entry is not None and entry[0] >= time.monotonic()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+def _cancelling() -> bool:
+    """Tell cancellation of the current task is requested. Always False before python 3.11."""
+    task = asyncio.current_task()
+    return task is not None and getattr(task, 'cancelling', lambda: 0)() > 0
+
+
+class SingleFlight:
+    """
+    Collapse concurrent calls with the same key into a single call.
+    While a call is in flight, other callers with the same key wait for its result instead of calling again.
+    If the caller making the call is cancelled, waiting callers are not : one of them makes the call again.
+    """
+    __slots__ = ('_flights',)
+
+    def __init__(self) -> None:
+        self._flights: Dict[Hashable, asyncio.Future] = {}
+
+    @property
+    def inflight(self) -> int:
+        return len(self._flights)
+
+    async def do(self, key: Hashable, func: Callable[..., Awaitable[Any]], *args: Any) -> Any:
+        """Call coroutine function, or join the call already in flight with the same key.
+
+        Args:
+            key (Hashable): key identifying the call.
+            func (Callable[..., Awaitable[Any]]): coroutine function to call.
+            *args (Any): arguments of the coroutine function.
+
+        Returns:
+            Result of the call.
+        """
+        while True:
+            future = self._flights.get(key)
+            if future is None:
+                break
+            try:
+                return await asyncio.shield(future)
+            except asyncio.CancelledError:
+                if not future.cancelled() or _cancelling():
+                    raise   # This caller is cancelled.
+                # Only the caller making the call is cancelled. Retry, making the call if nobody else does.
+
+        future = self._flights[key] = asyncio.get_event_loop().create_future()
+        try:
+            result = await func(*args)
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as e:
+            future.set_exception(e)
+            future.exception()  # Mark as retrieved, since there may be no waiters.
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            del self._flights[key]
+
+
+class TimeBucketedSet:
+    """
+    Set of recently added keys, forgetting keys after `window` seconds.
+    Keys are grouped into fixed-width time buckets kept in a ring, so that expiration drops a whole bucket at once
+    instead of tracking expiration of each key. If `maxsize` is given, the oldest buckets are dropped early when the set
+    is full, so memory stays bounded during bursts.
+    """
+    __slots__ = ('_width', '_buckets', '_maxsize', '_size', '_ring', 'evicted')
+
+    def __init__(self, window: float, buckets: int = 15, maxsize: Optional[int] = None) -> None:
+        """
+        Args:
+            window (float): seconds to remember keys. Keys are forgotten in between `window` and
+                `window + window / buckets` seconds after they are added.
+            buckets (int): count of buckets spanning the window. One more bucket is kept for the current time.
+            maxsize (Optional[int]): maximum count of keys. If None, size is only bounded by the rate of additions.
+        """
+        if window <= 0 or buckets <= 0:
+            raise ValueError('TimeBucketedSet.window and TimeBucketedSet.buckets must be positive numbers.')
+        if maxsize is not None and maxsize <= 0:
+            raise ValueError('TimeBucketedSet.maxsize must be positive integer.')
+        self._width: float = window / buckets
+        self._buckets: int = buckets
+        self._maxsize: Optional[int] = maxsize
+        self._size: int = 0
+        # (index of the bucket, keys added in the bucket), oldest first.
+        self._ring: Deque[Tuple[int, Set[Hashable]]] = deque()
+        self.evicted: int = 0     # Keys forgotten before the end of the window, since the set was full.
+
+    @property
+    def maxsize(self) -> Optional[int]:
+        return self._maxsize
+
+    def _current(self) -> Set[Hashable]:
+        index = int(time.monotonic() // self._width)
+        ring = self._ring
+        if not ring or ring[-1][0] != index:
+            ring.append((index, set()))
+            # Keep `buckets` full buckets behind the current one, so that keys of the oldest bucket live `window`.
+            while ring[0][0] < index - self._buckets:
+                self._size -= len(ring.popleft()[1])
+        return ring[-1][1]
+
+    def _evict(self) -> None:
+        ring = self._ring
+        while ring and self._size >= self._maxsize:
+            keys = ring.popleft()[1]
+            self._size -= len(keys)
+            self.evicted += len(keys)
+
+    def add(self, key: Hashable) -> bool:
+        """Add key to the set.
+
+        Args:
+            key (Hashable): key to add.
+
+        Returns:
+            True if the key is newly added. False if the key is already in the set.
+        """
+        current = self._current()
+        for _, keys in self._ring:
+            if key in keys:
+                return False
+        if self._maxsize is not None and self._size >= self._maxsize:
+            self._evict()
+            current = self._current()   # The current bucket is dropped too, if it holds every key.
+        current.add(key)
+        self._size += 1
+        return True
+
+    def __contains__(self, key: Hashable) -> bool:
+        self._current()     # Drop expired buckets.
+        return any(key in keys for _, keys in self._ring)
+
+    def __len__(self) -> int:
+        self._current()
+        return self._size
+
+    def clear(self) -> None:
+        self._ring.clear()
+        self._size = 0
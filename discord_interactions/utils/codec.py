@@ -0,0 +1,139 @@
+"""
+Json codec used by every encode & decode site of the library.
+The fastest installed backend is selected on import : orjson, then ujson, then python's json module.
+Set `DISCORD_INTERACTIONS_JSON` environment variable or call set_codec() to choose a backend explicitly.
+Access functions through the module (`codec.loads(...)`), so that set_codec() takes effect everywhere.
+"""
+from __future__ import annotations
+
+import json
+import os
+from typing import Any, Union, Dict, List, Callable, Final
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import ujson
+except ImportError:
+    ujson = None
+
+__all__ = (
+    'JsonCodec',
+    'available_codecs',
+    'get_codec',
+    'set_codec',
+    'dumps',
+    'dumpb',
+    'loads',
+    'JSON_HEADERS'
+)
+
+
+# Headers of requests whose body is pre-encoded json.
+JSON_HEADERS: Final[Dict[str, str]] = {'Content-Type': 'application/json'}
+
+
+class JsonCodec:
+    """Json backend. `dumpb` is preferred on hot paths, since bytes can be sent without re-encoding."""
+    __slots__ = ('name', 'dumps', 'dumpb', 'loads')
+
+    def __init__(
+            self,
+            name: str,
+            dumps: Callable[[Any], str],
+            dumpb: Callable[[Any], bytes],
+            loads: Callable[[Union[str, bytes]], Any]
+    ) -> None:
+        """
+        Args:
+            name (str): name of the backend.
+            dumps (Callable[[Any], str]): function encoding objects into json string.
+            dumpb (Callable[[Any], bytes]): function encoding objects into utf-8 json bytes.
+            loads (Callable[[Union[str, bytes]], Any]): function decoding json string or bytes.
+        """
+        self.name: str = name
+        self.dumps: Callable[[Any], str] = dumps
+        self.dumpb: Callable[[Any], bytes] = dumpb
+        self.loads: Callable[[Union[str, bytes]], Any] = loads
+
+    def __repr__(self) -> str:
+        return 'JsonCodec(name={})'.format(self.name)
+
+
+def _stdlibCodec() -> JsonCodec:
+    encoder = json.JSONEncoder(separators=(',', ':'), ensure_ascii=False)
+    return JsonCodec(
+        'json',
+        encoder.encode,
+        lambda obj: encoder.encode(obj).encode(),
+        json.loads
+    )
+
+
+def _orjsonCodec() -> JsonCodec:
+    option = orjson.OPT_NON_STR_KEYS    # Snowflake-keyed dictionaries are common.
+    return JsonCodec(
+        'orjson',
+        lambda obj: orjson.dumps(obj, option=option).decode(),
+        lambda obj: orjson.dumps(obj, option=option),
+        orjson.loads
+    )
+
+
+def _ujsonCodec() -> JsonCodec:
+    return JsonCodec(
+        'ujson',
+        lambda obj: ujson.dumps(obj, ensure_ascii=False, escape_forward_slashes=False),
+        lambda obj: ujson.dumps(obj, ensure_ascii=False, escape_forward_slashes=False).encode(),
+        ujson.loads
+    )
+
+
+_factories: Dict[str, Callable[[], JsonCodec]] = {'json': _stdlibCodec}
+if ujson is not None:
+    _factories['ujson'] = _ujsonCodec
+if orjson is not None:
+    _factories['orjson'] = _orjsonCodec
+
+
+def available_codecs() -> List[str]:
+    """Names of installed backends, fastest first."""
+    return [name for name in ('orjson', 'ujson', 'json') if name in _factories]
+
+
+_codec: JsonCodec
+dumps: Callable[[Any], str]
+dumpb: Callable[[Any], bytes]
+loads: Callable[[Union[str, bytes]], Any]
+
+
+def get_codec() -> JsonCodec:
+    return _codec
+
+
+def set_codec(codec: Union[str, JsonCodec]) -> JsonCodec:
+    """Select json backend used by the library.
+
+    Args:
+        codec (Union[str, JsonCodec]): name of installed backend (orjson, ujson, json), or custom JsonCodec object.
+
+    Returns:
+        Selected JsonCodec object.
+    """
+    global _codec, dumps, dumpb, loads
+    if isinstance(codec, str):
+        factory = _factories.get(codec)
+        if factory is None:
+            raise ValueError('Json backend `{}` is not installed. Available : {}'.format(codec, available_codecs()))
+        codec = factory()
+    elif not isinstance(codec, JsonCodec):
+        raise TypeError('set_codec() receives name of the backend or JsonCodec object.')
+    _codec = codec
+    dumps, dumpb, loads = codec.dumps, codec.dumpb, codec.loads
+    return codec
+
+
+set_codec(os.environ.get('DISCORD_INTERACTIONS_JSON') or available_codecs()[0])
@@ -0,0 +1,417 @@
+"""
+Shared http layer used to call the discord api.
+Requests are scheduled by priority class : interaction callbacks must be sent within 3 seconds, so they jump ahead of
+queued followups and background requests (command sync, bulk edits) on shared connections and rate limit buckets.
+Connections to the api host can be opened ahead and kept warm, so responses after idle periods don't pay for
+DNS, TCP and TLS setup.
+"""
+from __future__ import annotations
+
+import asyncio
+import heapq
+import itertools
+import logging
+from ssl import SSLContext
+import time
+from enum import IntEnum
+from typing import Optional, Dict, List, Tuple, Any, Mapping, Union, Final
+from urllib.parse import urlsplit
+
+import aiohttp
+
+from . import codec
+from .cache import LRUCache
+from .type_hints import JSON
+from discord_interactions.monitoring.tracing import get_tracer
+from discord_interactions.monitoring.capture import TrafficRecorder
+from discord_interactions.monitoring.instruments import REST_REQUESTS, RATELIMIT_WAITS, RATELIMIT_WAIT_SECONDS, \
+    route_template
+
+__all__ = (
+    'RequestPriority',
+    'PriorityGate',
+    'RequestScheduler',
+    'get_scheduler',
+    'set_scheduler'
+)
+
+
+http_logger: logging.Logger = logging.getLogger('discord_interactions.http')
+
+# Maximum retries of rate limited (429) requests.
+MAX_RETRIES: Final[int] = 3
+
+# Seconds between keep-alive requests on idle connections.
+KEEPALIVE_INTERVAL: Final[float] = 15.0
+
+
+class RequestPriority(IntEnum):
+    """Priority classes of api requests. Lower value is sent first."""
+    INTERACTION = 0     # Initial response of interactions. (3 seconds deadline)
+    FOLLOWUP = 1        # Followup messages, edits of responses.
+    BACKGROUND = 2      # Command sync, bulk edits.
+
+
+class PriorityGate:
+    """Semaphore which hands free slots to the waiter of the highest priority first. (FIFO in the same priority)"""
+
+    def __init__(self, slots: int) -> None:
+        if slots <= 0:
+            raise ValueError('PriorityGate.slots must be positive integer.')
+        self._free: int = slots
+        self._waiters: List[Tuple[int, int, asyncio.Future]] = []
+        self._sequence = itertools.count()
+
+    @property
+    def waiting(self) -> int:
+        return sum(1 for _, _, future in self._waiters if not future.done())
+
+    async def acquire(self, priority: int) -> None:
+        if self._free > 0 and not self._waiters:
+            self._free -= 1
+            return
+        future = asyncio.get_event_loop().create_future()
+        heapq.heappush(self._waiters, (priority, next(self._sequence), future))
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                self.release()  # Slot was handed over right before cancellation.
+            raise
+
+    def release(self) -> None:
+        while self._waiters:
+            _, _, future = heapq.heappop(self._waiters)
+            if not future.done():
+                future.set_result(None)     # Hand the slot over directly.
+                return
+        self._free += 1
+
+
+class _Bucket:
+    """Rate limit state of a route, updated from `X-RateLimit-*` response headers."""
+    __slots__ = ('gate', 'remaining', 'reset_at')
+
+    def __init__(self) -> None:
+        self.gate: PriorityGate = PriorityGate(1)
+        self.remaining: Optional[int] = None
+        self.reset_at: float = 0.0
+
+    def delay(self) -> float:
+        if self.remaining is None or self.remaining > 0:
+            return 0.0
+        return max(0.0, self.reset_at - time.monotonic())
+
+    def update(self, headers: Mapping[str, str]) -> None:
+        remaining = headers.get('X-RateLimit-Remaining')
+        reset_after = headers.get('X-RateLimit-Reset-After')
+        if remaining is not None:
+            self.remaining = int(remaining)
+        if reset_after is not None:
+            self.reset_at = time.monotonic() + float(reset_after)
+
+
+class _Latency:
+    __slots__ = ('count', 'total', 'max')
+
+    def __init__(self) -> None:
+        self.count: int = 0
+        self.total: float = 0.0
+        self.max: float = 0.0
+
+    def add(self, value: float) -> None:
+        self.count += 1
+        self.total += value
+        if value > self.max:
+            self.max = value
+
+
+class _ConnectionStats:
+    """Connection events of a client session, collected with aiohttp tracing."""
+    __slots__ = ('created', 'reused', 'setup_total', 'setup_max', 'keepalive_sent', 'keepalive_failed')
+
+    def __init__(self) -> None:
+        self.created: int = 0
+        self.reused: int = 0
+        self.setup_total: float = 0.0
+        self.setup_max: float = 0.0
+        self.keepalive_sent: int = 0
+        self.keepalive_failed: int = 0
+
+    def traceConfig(self) -> aiohttp.TraceConfig:
+        trace = aiohttp.TraceConfig()
+
+        async def on_create_start(session, context, params) -> None:
+            context.connect_started_at = time.monotonic()
+
+        async def on_create_end(session, context, params) -> None:
+            elapsed = time.monotonic() - getattr(context, 'connect_started_at', time.monotonic())
+            self.created += 1
+            self.setup_total += elapsed
+            if elapsed > self.setup_max:
+                self.setup_max = elapsed
+
+        async def on_reuse(session, context, params) -> None:
+            self.reused += 1
+
+        trace.on_connection_create_start.append(on_create_start)
+        trace.on_connection_create_end.append(on_create_end)
+        trace.on_connection_reuseconn.append(on_reuse)
+        return trace
+
+
+class RequestScheduler:
+    """
+    Send api requests through a shared connection pool, scheduled by RequestPriority.
+    When connections or a rate limit bucket are exhausted, queued requests are released in priority order.
+    """
+
+    def __init__(
+            self,
+            max_connections: int = 32,
+            *,
+            max_retries: int = MAX_RETRIES,
+            warm_connections: int = 0,
+            keepalive_interval: float = KEEPALIVE_INTERVAL,
+            warm_url: Optional[str] = None,
+            ssl: Union[None, bool, SSLContext] = None
+    ) -> None:
+        """
+        Args:
+            max_connections (int): maximum concurrent requests. (size of the connection pool)
+            max_retries (int): maximum retries of rate limited requests.
+            warm_connections (int): connections to open at start(), and keep warm while idle.
+            keepalive_interval (float): seconds of idle time after which warm connections are refreshed.
+            warm_url (Optional[str]): url of lightweight requests opening connections. Defaults to `gateway` endpoint.
+            ssl (Union[None, bool, SSLContext]): ssl validation mode of connections. (ex: context of custom CA)
+        """
+        if not 0 <= warm_connections <= max_connections:
+            raise ValueError('RequestScheduler.warm_connections must be between 0 and max_connections.')
+        self._max_connections: int = max_connections
+        self._max_retries: int = max_retries
+        self._warm_connections: int = warm_connections
+        self._keepalive_interval: float = keepalive_interval
+        self._warm_url: Optional[str] = warm_url
+        self._ssl: Union[None, bool, SSLContext] = ssl
+        self._slots: PriorityGate = PriorityGate(max_connections)
+        self._buckets: LRUCache = LRUCache(4096)     # Interaction webhooks make a bucket per token.
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._session_loop: Optional[asyncio.AbstractEventLoop] = None
+        self._latency: Dict[RequestPriority, _Latency] = {priority: _Latency() for priority in RequestPriority}
+        self._connections: _ConnectionStats = _ConnectionStats()
+        self._keepalive_task: Optional[asyncio.Task] = None
+        self._last_activity: float = 0.0
+        self.recorder: Optional[TrafficRecorder] = None     # Opt-in : assign TrafficRecorder to capture api calls.
+
+    @property
+    def session(self) -> aiohttp.ClientSession:
+        """Shared client session. Created on first use, in the running event loop."""
+        loop = asyncio.get_event_loop()
+        if self._session is None or self._session.closed or self._session_loop is not loop:
+            self._session_loop = loop
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(
+                    limit=self._max_connections,
+                    ssl=self._ssl,
+                    # Idle connections must outlive the interval between keep-alive requests.
+                    keepalive_timeout=max(30.0, self._keepalive_interval * 2)
+                ),
+                json_serialize=codec.dumps,
+                trace_configs=[self._connections.traceConfig()]
+            )
+        return self._session
+
+    @property
+    def warmURL(self) -> str:
+        if self._warm_url is None:
+            from .interaction_route import InteractionRoute
+            return InteractionRoute.APIBase + 'gateway'
+        return self._warm_url
+
+    @property
+    def connection_stats(self) -> Dict[str, Union[int, float]]:
+        """Count of created & reused connections, and average seconds of connection setup (DNS, TCP and TLS)."""
+        stats = self._connections
+        acquired = stats.created + stats.reused
+        return {
+            'created': stats.created,
+            'reused': stats.reused,
+            'reuse_ratio': stats.reused / acquired if acquired else 0.0,
+            'setup_avg': stats.setup_total / stats.created if stats.created else 0.0,
+            'setup_max': stats.setup_max,
+            'keepalive_sent': stats.keepalive_sent,
+            'keepalive_failed': stats.keepalive_failed
+        }
+
+    async def prewarm(self, connections: Optional[int] = None) -> int:
+        """Open connections to the api host ahead, with concurrent lightweight requests.
+        Dead connections are dropped by the pool and replaced by new ones.
+
+        Args:
+            connections (Optional[int]): count of connections. Defaults to `warm_connections`.
+
+        Returns:
+            Count of successful requests.
+        """
+        count = self._warm_connections if connections is None else connections
+        results = await asyncio.gather(*(self._ping() for _ in range(count)))
+        return sum(results)
+
+    async def _ping(self) -> bool:
+        # Background priority : warm-up never delays deadline-bound requests.
+        await self._slots.acquire(RequestPriority.BACKGROUND)
+        try:
+            for attempt in range(2):
+                try:
+                    async with self.session.get(self.warmURL) as response:
+                        await response.read()
+                    self._connections.keepalive_sent += 1
+                    return True
+                except (aiohttp.ClientError, asyncio.TimeoutError, OSError) as e:
+                    # The first failure is usually a connection closed by the server. Retry on a new connection.
+                    self._connections.keepalive_failed += 1
+                    if attempt:
+                        http_logger.warning('Keep-alive request to %s failed : %r', self.warmURL, e)
+            return False
+        finally:
+            self._slots.release()
+
+    async def _keepAlive(self) -> None:
+        while True:
+            await asyncio.sleep(self._keepalive_interval)
+            # Connections used by requests in this interval are already warm.
+            if time.monotonic() - self._last_activity >= self._keepalive_interval:
+                await self.prewarm()
+
+    async def start(self) -> None:
+        """Open `warm_connections` connections, and keep them warm while idle."""
+        if self._warm_connections <= 0:
+            return
+        await self.prewarm()
+        if self._keepalive_task is None or self._keepalive_task.done():
+            self._keepalive_task = asyncio.ensure_future(self._keepAlive())
+
+    @property
+    def stats(self) -> Dict[str, Dict[str, Union[int, float]]]:
+        """Queue latency (seconds from submit to send) of each priority class."""
+        return {
+            priority.name.lower(): {
+                'requests': latency.count,
+                'queue_latency_avg': latency.total / latency.count if latency.count else 0.0,
+                'queue_latency_max': latency.max
+            } for priority, latency in self._latency.items()
+        }
+
+    @staticmethod
+    def bucketOf(method: str, url: str) -> str:
+        return '{} {}'.format(method, url.split('?', 1)[0])
+
+    async def request(
+            self,
+            method: str,
+            url: str,
+            *,
+            priority: RequestPriority = RequestPriority.BACKGROUND,
+            json: Any = None,
+            data: Any = None,
+            params: Optional[Mapping[str, str]] = None,
+            headers: Optional[Mapping[str, str]] = None,
+            bucket: Optional[str] = None
+    ) -> Optional[JSON]:
+        """Send api request, waiting for its turn by priority.
+
+        Args:
+            method (str): http method.
+            url (str): url of the request.
+            priority (RequestPriority): priority class of the request.
+            json (Any): json body of the request. Encoded with the json codec of the library.
+            data (Any): raw body of the request.
+            params (Optional[Mapping[str, str]]): query string parameters.
+            headers (Optional[Mapping[str, str]]): http headers.
+            bucket (Optional[str]): rate limit bucket key. Defaults to method and path of the url.
+
+        Returns:
+            Decoded json of the response. None if the response has no json body.
+
+        Raises:
+            aiohttp.ClientResponseError: the response has error status.
+        """
+        if json is not None:
+            data = codec.dumpb(json)
+            headers = {**codec.JSON_HEADERS, **(headers or {})}
+        bucket = bucket or self.bucketOf(method, url)
+        rate_bucket: Optional[_Bucket] = self._buckets.get(bucket)
+        if rate_bucket is None:
+            rate_bucket = _Bucket()
+            self._buckets.set(bucket, rate_bucket)
+
+        route = route_template(urlsplit(url).path)
+        with get_tracer().span('rest', method=method, route=route, priority=priority.name) as span:
+            submitted_at = time.monotonic()
+            for attempt in range(self._max_retries + 1):
+                await rate_bucket.gate.acquire(priority)
+                try:
+                    delay = rate_bucket.delay()
+                    if delay > 0:
+                        RATELIMIT_WAITS.labels(route).inc()
+                        RATELIMIT_WAIT_SECONDS.labels(route).inc(delay)
+                        await asyncio.sleep(delay)
+                    if rate_bucket.remaining:
+                        rate_bucket.remaining -= 1
+                finally:
+                    rate_bucket.gate.release()
+
+                await self._slots.acquire(priority)
+                sent_at = self._last_activity = time.monotonic()
+                try:
+                    if attempt == 0:
+                        self._latency[priority].add(sent_at - submitted_at)
+                    async with self.session.request(method, url, data=data, params=params, headers=headers) as response:
+                        span.set('status', response.status)
+                        span.set('attempts', attempt + 1)
+                        rate_bucket.update(response.headers)
+                        body: bytes = await response.read()
+                        REST_REQUESTS.labels(method, route, response.status).inc()
+                        if self.recorder is not None:
+                            self.recorder.request(method, route, response.status, time.monotonic() - sent_at)
+                        if response.status == 429 and attempt < self._max_retries:
+                            retry_after = float(codec.loads(body).get('retry_after', 1.0)) if body else 1.0
+                            http_logger.warning(
+                                'Rate limited on %s %s. Retrying after %.2fs.',
+                                method, url.split('?', 1)[0], retry_after
+                            )
+                            rate_bucket.remaining, rate_bucket.reset_at = 0, time.monotonic() + retry_after
+                            RATELIMIT_WAITS.labels(route).inc()
+                            RATELIMIT_WAIT_SECONDS.labels(route).inc(retry_after)
+                            continue
+                        response.raise_for_status()
+                        if body and response.content_type == 'application/json':
+                            return codec.loads(body)
+                        return None
+                finally:
+                    self._slots.release()
+
+    async def close(self) -> None:
+        if self._keepalive_task is not None:
+            self._keepalive_task.cancel()
+            self._keepalive_task = None
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+
+_scheduler: Optional[RequestScheduler] = None
+
+
+def get_scheduler() -> RequestScheduler:
+    """Shared RequestScheduler used by the library."""
+    global _scheduler
+    if _scheduler is None:
+        _scheduler = RequestScheduler()
+    return _scheduler
+
+
+def set_scheduler(scheduler: RequestScheduler) -> None:
+    """Replace shared RequestScheduler. (ex: to configure connection pool size)"""
+    global _scheduler
+    _scheduler = scheduler
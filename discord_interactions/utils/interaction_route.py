@@ -1,7 +1,11 @@
 from __future__ import annotations
+import os
+import warnings
 from typing import ClassVar, Tuple, Final, Literal, Optional, Mapping, Iterable, Any, Union
+from urllib.parse import urlsplit
 
 import aiohttp
+from discord.http import Route
 from aiohttp import BasicAuth, ClientTimeout, HttpVersion, BaseConnector
 from aiohttp.typedefs import LooseHeaders, LooseCookies
 from aiohttp.client import _SessionRequestContextManager
@@ -10,8 +14,12 @@ from aiohttp.helpers import sentinel
 
 # Constants
 # Applications constants
+from . import codec
+from .http import RequestPriority, get_scheduler
 from .type_hints import JSON
-from .log import get_stream_logger, DEBUG
+from discord_interactions.monitoring.instruments import route_template
+from discord_interactions.monitoring.tracing import Span, get_tracer
+from .log import get_stream_logger
 
 Applications: Final[str] = 'applications/'
 ApplicationID: Final[str] = 'application_id'
@@ -39,12 +47,43 @@ MessageID: Final[str] = 'message_id'
 
 Endpoints: Final[Tuple[str, ...]] = (Applications, Guilds, Commands, Interactions, Webhooks, Messages)
 
+# Base url of the discord api. Set `DISCORD_INTERACTIONS_API_BASE` environment variable or call set_api_base() to send
+# requests elsewhere. (ex: a local stub server, see discord_interactions.testing.StubRESTServer)
+DEFAULT_API_BASE: Final[str] = 'https://discord.com/api/v9/'
+# Requests of discord.py are sent to v8 of the api.
+DPY_API_BASE: Final[str] = 'https://discord.com/api/v8'
 
-logger = get_stream_logger('discord_interactions.utils', DEBUG)
+
+logger = get_stream_logger('discord_interactions.utils')
+
+
+class _TracedRequestContextManager:
+    """Trace aiohttp request from its start to the exit of its context."""
+    __slots__ = ('_manager', '_span')
+
+    def __init__(self, manager: _SessionRequestContextManager, span: Span) -> None:
+        self._manager: _SessionRequestContextManager = manager
+        self._span: Span = span
+
+    async def __aenter__(self) -> aiohttp.ClientResponse:
+        self._span.__enter__()
+        try:
+            response = await self._manager.__aenter__()
+        except BaseException as e:
+            self._span.__exit__(type(e), e, e.__traceback__)
+            raise
+        self._span.set('status', response.status)
+        return response
+
+    async def __aexit__(self, exc_type, exc, traceback) -> None:
+        try:
+            await self._manager.__aexit__(exc_type, exc, traceback)
+        finally:
+            self._span.__exit__(exc_type, exc, traceback)
 
 
 class InteractionRoute:
-    APIBase: ClassVar[str] = 'https://discord.com/api/v9/'
+    APIBase: ClassVar[str] = DEFAULT_API_BASE     # Set with set_api_base().
 
     # Supported combinations
     # Global commands:
@@ -62,10 +101,9 @@ class InteractionRoute:
         self._url = self.APIBase
 
     def _appendEndpointURL(self, endpoint: str, *params: Any) -> None:
-        logger.debug('DEBUG: url appended with [endpoint: {}, params: {}]'.format(endpoint, params))
-        url: str = (self.url if self.url.endswith('/') else self.url + '/') + '{}/'.format(endpoint)
+        url: str = (self.url if self.url.endswith('/') else self.url + '/') + '{}/'.format(endpoint.rstrip('/'))
         url += '/'.join(map(str, params))
-        logger.debug('DEBUG: result > {}'.format(url))
+        logger.debug('url appended with [endpoint: %s, params: %s] > %s', endpoint, params, url)
         self._url = url
 
     @property
@@ -205,7 +243,7 @@ class InteractionRoute:
 
     def guilds(self, guild_id: int) -> InteractionRoute:
         """Route for`/application/guilds` endpoint."""
-        if not getattr(self, ApplicationID, False) or getattr(self, GuildID, True):
+        if not getattr(self, ApplicationID, False) or getattr(self, GuildID, None) is not None:
             # application_id 가 지정되지 않았거나 guild_id 가 이미 지정되었을 경우 뒤에 guilds/ 엔드포인트를 붙일 수 없다.
             raise ValueError('Invalid position of guilds/ endpoint')
         self.guildID = guild_id
@@ -241,6 +279,30 @@ class InteractionRoute:
 
     # HTTP request (using aiohttp)
 
+    async def send(
+            self,
+            method: Literal['GET', 'POST', 'PATCH', 'PUT', 'DELETE'],
+            *,
+            priority: RequestPriority = RequestPriority.BACKGROUND,
+            json: Any = None,
+            params: Optional[Mapping[str, str]] = None,
+            headers: Optional[Mapping[str, str]] = None
+    ) -> Optional[JSON]:
+        """Send a http request through the shared RequestScheduler, by priority class.
+        Args:
+            method : HTTP method.
+            priority : Priority class of the request. Interaction responses are sent ahead of background requests.
+            json : Any json compatible python object.
+            params : Dictionary to be sent in the query string of the new request.
+            headers : Dictionary of HTTP Headers to send with the request.
+
+        Returns:
+            Decoded json of the response. None if the response has no json body.
+        """
+        return await get_scheduler().request(
+            method, self.url, priority=priority, json=json, params=params, headers=headers
+        )
+
     def request(
             self,
             method: Literal['GET', 'POST', 'PATCH', 'DELETE'],
@@ -267,11 +329,13 @@ class InteractionRoute:
             read_bufsize: Optional[int] = None,
     ) -> _SessionRequestContextManager:
         """Send a http requestConstructs and sends a request. Returns response object.
+        Deprecated : the request bypasses the shared RequestScheduler (priority, rate limits, pooled connections).
+        Use InteractionRoute.send() instead.
         Args:
             method : HTTP method.
             params : Dictionary or bytes to be sent in the query string of the new request.
             data : Dictionary, bytes, or file-like object to send in the body of the request.
-            json : Any json compatible python object.
+            json : Any json compatible python object. Encoded with the json codec of the library.
             headers : Dictionary of HTTP Headers to send with the request.
             skip_auto_headers : Missing Docstring. Originated from aiohttp.request().
             auth : BasicAuth named tuple represent HTTP Basic Auth.
@@ -293,12 +357,22 @@ class InteractionRoute:
         Returns:
             aiohttp.ClientResponse object containing response of the request.
         """
-        return aiohttp.request(
+        warnings.warn(
+            'InteractionRoute.request() bypasses the shared RequestScheduler and is deprecated. '
+            'Use InteractionRoute.send() instead.',
+            DeprecationWarning,
+            stacklevel=2
+        )
+        if json is not None:
+            if data is not None:
+                raise ValueError('data and json parameters can not be used at the same time')
+            data = codec.dumpb(json)
+            headers = {**codec.JSON_HEADERS, **(headers or {})}
+        manager = aiohttp.request(
             method=method,
             url=self.url,
             params=params,
             data=data,
-            json=json,
             headers=headers,
             skip_auto_headers=skip_auto_headers,
             auth=auth,
@@ -317,7 +391,13 @@ class InteractionRoute:
             connector=connector,
             read_bufsize=read_bufsize
         )
+        tracer = get_tracer()
+        if not tracer.enabled:
+            return manager
+        span = tracer.span('rest', method=method, route=route_template(urlsplit(self.url).path))
+        return _TracedRequestContextManager(manager, span)
 
+    # Shortcuts of InteractionRoute.request(), deprecated as well.
     def get(self, *args, **kwargs) -> _SessionRequestContextManager:
         return self.request('GET', *args, **kwargs)
 
@@ -329,3 +409,30 @@ class InteractionRoute:
 
     def delete(self, *args, **kwargs) -> _SessionRequestContextManager:
         return self.request('DELETE', *args, **kwargs)
+
+
+def get_api_base() -> str:
+    """Base url of api requests of the library, ending with '/'."""
+    return InteractionRoute.APIBase
+
+
+def dpy_api_base() -> str:
+    """Base url of api requests of discord.py. (`discord.http.Route.BASE`, without trailing '/')"""
+    base = InteractionRoute.APIBase
+    return DPY_API_BASE if base == DEFAULT_API_BASE else base.rstrip('/')
+
+
+def set_api_base(url: Optional[str] = None) -> None:
+    """Send api requests of the library and of discord.py to another base url.
+
+    Args:
+        url (Optional[str]): base url including the api version. (ex: http://127.0.0.1:8080/api/v9/)
+            Resets to the discord api if None.
+    """
+    url = url or DEFAULT_API_BASE
+    InteractionRoute.APIBase = url if url.endswith('/') else url + '/'
+    Route.BASE = dpy_api_base()
+
+
+if os.environ.get('DISCORD_INTERACTIONS_API_BASE'):
+    set_api_base(os.environ['DISCORD_INTERACTIONS_API_BASE'])
@@ -1,7 +1,23 @@
+"""
+Logging pipeline of the library.
+The library only adds a NullHandler at import : records propagate to handlers of the application as usual.
+setup_logging() is opt-in. It puts records on a bounded queue from the logging thread (usually the event loop), and a
+listener thread formats and writes them, so the loop never blocks on output. Message arguments are formatted lazily on
+the listener thread : log with arguments (`logger.debug('received %s', data)`) instead of pre-formatted strings, and
+don't mutate arguments after logging them.
+Each subsystem logs to its own child of the `discord_interactions` logger, so levels can be set per subsystem.
+"""
 from logging import CRITICAL, FATAL, ERROR, WARN, WARNING, INFO, DEBUG, NOTSET
+import atexit
 import logging
-from sys import stdout
+import logging.handlers
+import queue
+import threading
+import sys
+import traceback
+from typing import Optional, Mapping, Union, IO, Any, Dict, List, Final
 
+from . import codec
 
 __all__ = (
     'CRITICAL',
@@ -12,19 +28,174 @@ __all__ = (
     'INFO',
     'DEBUG',
     'NOTSET',
+    'LIBRARY_LOGGER',
+    'JsonLinesFormatter',
+    'setup_logging',
+    'shutdown_logging',
+    'set_level',
+    'dropped_records',
     'get_stream_logger'
 )
 
 
-def get_stream_logger(name: str, level: int = logging.INFO) -> logging.Logger:
+# Parent logger of every subsystem logger. (ex: discord_interactions.http, discord_interactions.commands)
+LIBRARY_LOGGER: Final[str] = 'discord_interactions'
+
+TEXT_FORMAT: Final[str] = '[{asctime}] [{levelname}] {name}: {message}'
+
+# Attributes of every LogRecord. Other attributes are `extra` fields, written by JsonLinesFormatter.
+_RECORD_ATTRIBUTES: Final[frozenset] = frozenset(logging.makeLogRecord({}).__dict__) | {'message', 'asctime'}
+
+
+class JsonLinesFormatter(logging.Formatter):
+    """Format records as json objects, one per line. Fields passed with `extra` are included."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        data: Dict[str, Any] = {
+            'time': record.created,
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage()
+        }
+        if record.exc_info:
+            data['exc_info'] = ''.join(traceback.format_exception(*record.exc_info))
+        for key, value in record.__dict__.items():
+            if key not in _RECORD_ATTRIBUTES:
+                data[key] = value if isinstance(value, (str, int, float, bool, type(None))) else repr(value)
+        return codec.dumps(data)
+
+
+class _QueueHandler(logging.handlers.QueueHandler):
+    """
+    Non-blocking handler putting records on a bounded queue.
+    Records are not formatted here, unlike logging.handlers.QueueHandler : the listener thread merges arguments and
+    formats them. Records over the capacity of the queue are dropped and counted, instead of blocking the loop.
+    """
+
+    def __init__(self, records: queue.Queue) -> None:
+        super().__init__(records)
+        self.dropped: int = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+class _Pipeline:
+    def __init__(self, handler: _QueueHandler, listener: logging.handlers.QueueListener, output: logging.Handler):
+        self.handler: _QueueHandler = handler
+        self.listener: logging.handlers.QueueListener = listener
+        self.output: logging.Handler = output
+
+
+_pipeline: Optional[_Pipeline] = None
+_lock: threading.Lock = threading.Lock()
+_attached: List[str] = []   # Loggers outside of the library logger, writing through the pipeline.
+
+
+def setup_logging(
+        level: int = INFO,
+        *,
+        stream: Optional[IO[str]] = None,
+        json_lines: bool = False,
+        levels: Optional[Mapping[str, int]] = None,
+        queue_size: int = 10000,
+        handler: Optional[logging.Handler] = None,
+        propagate: bool = False
+) -> logging.Logger:
+    """Install the logging pipeline on the library logger. Calling again replaces the previous pipeline.
+    Not called by the library : without it, records propagate to handlers of the application.
+
+    Args:
+        level (int): level of the library logger.
+        stream (Optional[IO[str]]): stream to write records to. Defaults to stdout.
+        json_lines (bool): write records as json objects, one per line.
+        levels (Optional[Mapping[str, int]]): levels per subsystem. (ex: {'http': DEBUG, 'commands': WARNING})
+        queue_size (int): maximum records waiting to be written. Records over it are dropped.
+        handler (Optional[logging.Handler]): handler writing records in the listener thread, instead of a stream.
+        propagate (bool): also pass records to handlers of the root logger.
+
+    Returns:
+        The library logger.
+    """
+    global _pipeline
+    with _lock:
+        _shutdown()
+        if handler is None:
+            handler = logging.StreamHandler(stream if stream is not None else sys.stdout)
+            handler.setFormatter(JsonLinesFormatter() if json_lines else logging.Formatter(style='{', fmt=TEXT_FORMAT))
+        queue_handler = _QueueHandler(queue.Queue(queue_size))
+        listener = logging.handlers.QueueListener(queue_handler.queue, handler, respect_handler_level=True)
+        listener.start()
+        _pipeline = _Pipeline(queue_handler, listener, handler)
+
+        logger = logging.getLogger(LIBRARY_LOGGER)
+        logger.setLevel(level)
+        logger.addHandler(queue_handler)
+        logger.propagate = propagate
+        for name in _attached:
+            logging.getLogger(name).addHandler(queue_handler)
+        for subsystem, subsystem_level in (levels or {}).items():
+            set_level(subsystem, subsystem_level)
+        return logger
+
+
+def _shutdown() -> None:
+    global _pipeline
+    if _pipeline is not None:
+        for name in (LIBRARY_LOGGER, *_attached):
+            logging.getLogger(name).removeHandler(_pipeline.handler)
+        _pipeline.listener.stop()     # Writes queued records before returning.
+        _pipeline.output.close()
+        _pipeline = None
+        logging.getLogger(LIBRARY_LOGGER).propagate = True
+
+
+def shutdown_logging() -> None:
+    """Write queued records and stop the listener thread. Called at exit."""
+    with _lock:
+        _shutdown()
+
+
+atexit.register(shutdown_logging)
+
+
+def dropped_records() -> int:
+    """Count of records dropped because the queue was full."""
+    return _pipeline.handler.dropped if _pipeline is not None else 0
+
+
+def set_level(subsystem: str, level: Union[int, str]) -> None:
+    """Set level of a subsystem logger. (ex: set_level('http', DEBUG) sets discord_interactions.http)"""
+    name = subsystem if subsystem.startswith(LIBRARY_LOGGER) else '{}.{}'.format(LIBRARY_LOGGER, subsystem)
+    logging.getLogger(name).setLevel(level)
+
+
+def get_stream_logger(name: str, level: Optional[int] = None) -> logging.Logger:
+    """Get logger writing through the logging pipeline once setup_logging() is called. Handlers are never duplicated.
+
+    Args:
+        name (str): name of the logger.
+        level (Optional[int]): level of the logger. Unchanged if None.
+
+    Returns:
+        Logger of the name.
+    """
     logger: logging.Logger = logging.getLogger(name)
-    logger.setLevel(level)
-    handler = logging.StreamHandler(stdout)
-    handler.setFormatter(
-        logging.Formatter(
-            style='{',
-            fmt='[{asctime}] [{levelname}] {name}: {message}'
-        )
-    )
-    logger.addHandler(handler)
+    if level is not None:
+        logger.setLevel(level)
+    if name != LIBRARY_LOGGER and not name.startswith(LIBRARY_LOGGER + '.') and name not in _attached:
+        # Not a child of the library logger : records don't propagate to the pipeline.
+        _attached.append(name)
+        if _pipeline is not None:
+            logger.addHandler(_pipeline.handler)
     return logger
+
+
+# Libraries don't configure output : records go to handlers of the application, without 'No handlers' warnings.
+logging.getLogger(LIBRARY_LOGGER).addHandler(logging.NullHandler())
@@ -0,0 +1,17 @@
+from discord_interactions.client import InteractionClient
+from discord_interactions.application_commands.models import SlashContext
+
+# Set interactions endpoint url of your application to http://<your host>:8080/interactions in developer portal.
+client = InteractionClient(
+    application_id=0,               # YOUR_APPLICATION_ID
+    public_key='YOUR_PUBLIC_KEY'    # hex encoded public key in developer portal
+)
+
+
+@client.globalSlash(name='ping', description='Check the bot is alive.')
+async def ping(ctx: SlashContext):
+    # Initial response is sent as the reply of the http request.
+    await ctx.send('Pong!')
+
+
+client.run(port=8080)
@@ -90,5 +90,28 @@ async def sampleSlashCommand(
     print(role)
 
 
+@client.globalSlash(
+    name='admin',
+    description='Administration commands. Sample of subcommand groups & subcommands.'
+)
+async def admin(ctx: SlashContext):
+    pass    # Commands with subcommands are never invoked directly.
+
+
+config = admin.subCommandGroup(name='config', description='Manage bot configurations.')
+
+
+@config.subCommand(
+    name='set',
+    description='Set configuration value.',
+    options=[
+        ApplicationCommandOption(name='key', option_type=ApplicationCommandOptionType.STRING, description='Configuration key.', required=True),
+        ApplicationCommandOption(name='value', option_type=ApplicationCommandOptionType.STRING, description='Configuration value.', required=True)
+    ]
+)
+async def config_set(ctx: SlashContext, key: str, value: str):    # Invoked with `/admin config set`
+    await ctx.send('{} = {}'.format(key, value))
+
+
 print(type(alarm))
 # client.run(token)
@@ -32,6 +32,11 @@ setup(
     packages=find_packages(),
     # Dependencies
     install_requires=["wheel>=0.36.2", "aiohttp>=3.6.3", "discord.py>=1.6.0"],
+    # Optional dependencies
+    extras_require={
+        'http': ["PyNaCl>=1.4.0"],
+        'speed': ["orjson>=3.5.0"]
+    },
     # Module`s python requirement
     python_requires=">=3.5.3",
     # Keywords about the module
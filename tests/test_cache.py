@@ -0,0 +1,107 @@
+import asyncio
+
+import pytest
+
+from discord_interactions.utils import cache
+from discord_interactions.utils.cache import LRUCache, SingleFlight, TimeBucketedSet
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(cache.time, 'monotonic', lambda: now[0])
+    return now
+
+
+@pytest.mark.parametrize('added_at', [0.0, 59.9, 60.0, 899.9])
+def test_keys_live_for_the_full_window(clock, added_at):
+    start = clock[0]
+    seen = TimeBucketedSet(900, 15)
+    clock[0] = start + added_at
+    assert seen.add('interaction')
+    clock[0] = start + added_at + 900
+    assert 'interaction' in seen
+    assert not seen.add('interaction')
+
+
+def test_keys_are_forgotten_within_a_bucket_after_the_window(clock):
+    start = clock[0]
+    seen = TimeBucketedSet(900, 15)
+    seen.add('interaction')
+    clock[0] = start + 900 + 60
+    assert 'interaction' not in seen
+    assert len(seen) == 0
+
+
+def test_single_flight_survives_cancelled_leader():
+    async def main():
+        calls = []
+
+        async def fetch(key):
+            calls.append(key)
+            if len(calls) == 1:
+                await asyncio.sleep(10)
+            return 'channel'
+
+        flights = SingleFlight()
+        leader = asyncio.ensure_future(flights.do(1, fetch, 1))
+        await asyncio.sleep(0)
+        follower = asyncio.ensure_future(flights.do(1, fetch, 1))
+        await asyncio.sleep(0)
+        leader.cancel()
+        assert await follower == 'channel'
+        assert leader.cancelled()
+        assert calls == [1, 1]
+        assert flights.inflight == 0
+    asyncio.run(main())
+
+
+def test_single_flight_cancelled_follower():
+    async def main():
+        async def fetch():
+            await asyncio.sleep(0.01)
+            return 'channel'
+
+        flights = SingleFlight()
+        leader = asyncio.ensure_future(flights.do(1, fetch))
+        await asyncio.sleep(0)
+        follower = asyncio.ensure_future(flights.do(1, fetch))
+        await asyncio.sleep(0)
+        follower.cancel()
+        assert await leader == 'channel'
+        assert follower.cancelled()
+    asyncio.run(main())
+
+
+def test_oldest_buckets_are_evicted_when_full(clock):
+    start = clock[0]
+    seen = TimeBucketedSet(900, 15, maxsize=3)
+    seen.add('a')
+    clock[0] = start + 60
+    seen.add('b')
+    seen.add('c')
+    assert seen.add('d')
+    assert len(seen) == 3
+    assert seen.evicted == 1
+    assert 'a' not in seen
+    assert 'd' in seen
+
+
+def test_full_current_bucket_is_evicted(clock):
+    seen = TimeBucketedSet(900, 15, maxsize=2)
+    seen.add('a')
+    seen.add('b')
+    assert seen.add('c')
+    assert len(seen) == 1
+    assert seen.evicted == 2
+
+
+def test_lru_entries_expire_after_ttl(clock):
+    entries = LRUCache(10, ttl=60)
+    entries.set('member', 'nick')
+    clock[0] += 59
+    assert entries.get('member') == 'nick'
+    clock[0] += 2
+    assert 'member' not in entries
+    assert entries.get('member') is None
+    assert (entries.hits, entries.misses) == (1, 1)
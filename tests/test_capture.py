@@ -0,0 +1,76 @@
+import asyncio
+import gzip
+import math
+
+import pytest
+
+from discord_interactions.application_commands.client.application_command_client import BaseSlashApplication
+from discord_interactions.monitoring.capture import TrafficRecorder, read_capture
+from discord_interactions.testing import TrafficReplayer
+from discord_interactions.utils.http import RequestScheduler, get_scheduler, set_scheduler
+
+CALLBACK = ('POST', '/api/v9/interactions/:id/:token/callback')
+
+
+def interaction(interaction_id):
+    return {
+        'type': 2, 'id': str(interaction_id), 'application_id': '775799577604522054', 'token': 'secret', 'version': 1,
+        'channel_id': '645027906669510667', 'data': {'id': '771825006014889984', 'name': 'ping', 'type': 1},
+        'user': {'id': '53908232506183680', 'username': 'Mason', 'discriminator': '1337', 'avatar': None}
+    }
+
+
+def ping_application():
+    app = BaseSlashApplication(low_memory=True)
+
+    @app.globalSlash(name='ping', description='Ping.')
+    async def ping(ctx):
+        await ctx.send('pong')
+
+    return app
+
+
+def test_recorder_redacts_tokens(tmp_path):
+    path = str(tmp_path / 'capture.jsonl.gz')
+    app = ping_application()
+    with TrafficRecorder(path, flush_every=1) as recorder:
+        app.recorder = recorder
+        app.parse_interaction(interaction(786008729715212338))
+        recorder.request(*CALLBACK, 204, 0.01)
+    assert (recorder.interactions, recorder.requests) == (1, 1)
+    gzip.open(path).read()  # Compressed.
+    first, second = read_capture(path)
+    assert first['i']['token'] == 'redacted' and first['i']['id'] == '786008729715212338'
+    assert (second['m'], second['r'], second['s']) == (*CALLBACK, 204)
+    assert 0 <= first['t'] <= second['t']
+
+
+def test_capture_version_is_checked(tmp_path):
+    path = tmp_path / 'capture.jsonl'
+    path.write_bytes(b'{"capture": 0, "started": 0}\n')
+    with pytest.raises(ValueError):
+        list(read_capture(str(path)))
+
+
+def test_replay(tmp_path):
+    path = str(tmp_path / 'capture.jsonl')
+    with TrafficRecorder(path) as recorder:
+        for interaction_id in range(786008729715212338, 786008729715212341):
+            recorder.interaction(interaction(interaction_id))
+            recorder.request(*CALLBACK, 204, 0.01)
+
+    async def main():
+        try:
+            return await TrafficReplayer(ping_application(), path, rate=math.inf, repeat=2).run()
+        finally:
+            await get_scheduler().close()
+
+    previous = get_scheduler()
+    set_scheduler(RequestScheduler())
+    try:
+        report = asyncio.run(main())
+    finally:
+        set_scheduler(previous)
+    assert (report.interactions, report.completed, report.errors, report.unanswered) == (6, 6, 0, 0)
+    assert report.captured_requests[CALLBACK] == report.replayed_requests[CALLBACK] == 6
+    assert report.toJson()['requests'] == [{'method': 'POST', 'route': CALLBACK[1], 'captured': 6, 'replayed': 6}]
@@ -0,0 +1,149 @@
+import asyncio
+import logging
+
+import pytest
+from aiohttp import web
+from nacl.signing import SigningKey
+
+from discord_interactions.application_commands.client.application_command_client import BaseSlashApplication
+from discord_interactions.cluster import (
+    InteractionRouter, LocalTransport, WorkerNode, RoutedInteractionServer, StreamTransport, serve_stream
+)
+from discord_interactions.utils.http import RequestScheduler, get_scheduler, set_scheduler
+
+PAYLOAD = {'id': '786008729715212338', 'guild_id': '290926798626357999', 'channel_id': '645027906669510667'}
+
+
+def router_of(transport, **kwargs):
+    return InteractionRouter(transport, ['a', 'b'], **kwargs)
+
+
+def test_unreachable_node_is_readmitted_after_backoff():
+    async def main():
+        transport = LocalTransport()
+        router = router_of(transport, readmit_after=0.05)
+        owner = router.nodeOf(PAYLOAD)
+        other = 'b' if owner == 'a' else 'a'
+
+        async def handler(frame):
+            return b'{"type":5}'
+        transport.register(other, handler)
+
+        assert await router.route(PAYLOAD) == {'type': 5}     # Retried on the next owner.
+        assert owner in router.ejected
+        assert router.ring.nodes == [other]
+
+        transport.register(owner, handler)
+        await asyncio.sleep(0.06)
+        await router.route(PAYLOAD)
+        assert sorted(router.ring.nodes) == ['a', 'b']
+        assert not router.ejected
+        assert router.stats[owner] == 1
+    asyncio.run(main())
+
+
+def test_backoff_doubles_on_consecutive_failures():
+    async def main():
+        transport = LocalTransport()
+        router = router_of(transport, readmit_after=0.05)
+        owner = router.nodeOf(PAYLOAD)
+        other = 'b' if owner == 'a' else 'a'
+
+        async def handler(frame):
+            return b'null'
+        transport.register(other, handler)
+
+        await router.route(PAYLOAD)
+        await asyncio.sleep(0.06)
+        await router.route(PAYLOAD)     # Re-admitted, then ejected again.
+        assert router.ejected[owner] > 0.05
+    asyncio.run(main())
+
+
+def test_hung_node_times_out_and_is_ejected():
+    async def main():
+        transport = LocalTransport()
+        router = router_of(transport, request_timeout=0.05)
+        owner = router.nodeOf(PAYLOAD)
+
+        async def hung(frame):
+            await asyncio.sleep(10)
+        transport.register(owner, hung)
+
+        with pytest.raises(asyncio.TimeoutError):
+            await router.route(PAYLOAD)
+        assert owner in router.ejected
+    asyncio.run(main())
+
+
+def test_removed_node_is_not_readmitted():
+    async def main():
+        transport = LocalTransport()
+        router = router_of(transport, readmit_after=0.0)
+        owner = router.nodeOf(PAYLOAD)
+        other = 'b' if owner == 'a' else 'a'
+
+        async def handler(frame):
+            return b'null'
+        transport.register(other, handler)
+
+        await router.route(PAYLOAD)
+        router.removeNode(owner)
+        await router.route(PAYLOAD)
+        assert router.ring.nodes == [other]
+    asyncio.run(main())
+
+
+def test_failures_of_forwarded_interactions_are_logged(caplog):
+    class FailingApplication(BaseSlashApplication):
+        async def process_slash(self, data):
+            raise RuntimeError('callback failed')
+
+    async def main():
+        node = WorkerNode(FailingApplication(low_memory=True))
+        assert await node.handle(b'{"reply":false,"d":' + b'{"id":"786008729715212338"}' + b'}') == b'null'
+        await asyncio.sleep(0)
+        await asyncio.sleep(0)
+
+    with caplog.at_level(logging.ERROR, logger='discord_interactions.cluster'):
+        asyncio.run(main())
+    assert any('786008729715212338' in record.getMessage() for record in caplog.records)
+
+
+def test_routed_server_starts_and_closes():
+    async def main():
+        server = RoutedInteractionServer(
+            router_of(LocalTransport()), SigningKey.generate().verify_key.encode().hex()
+        )
+        await server.start('127.0.0.1', 0)
+        await server.close()
+        # Entry point of web.run_app() and worker processes.
+        runner = web.AppRunner(server.makeApp())
+        await runner.setup()
+        await runner.cleanup()
+
+    previous = get_scheduler()
+    set_scheduler(RequestScheduler())
+    try:
+        asyncio.run(main())
+    finally:
+        set_scheduler(previous)
+
+
+def test_timed_out_stream_request_is_forgotten(tmp_path):
+    async def main():
+        address = 'unix:{}'.format(tmp_path / 'node.sock')
+
+        async def hung(frame):
+            await asyncio.sleep(10)
+        server = await serve_stream(address, hung)
+        transport = StreamTransport()
+        try:
+            with pytest.raises(asyncio.TimeoutError):
+                await asyncio.wait_for(transport.request(address, b'{}'), 0.05)
+            assert transport._connections[address].pending == {}
+        finally:
+            await transport.close()
+            server.close()
+            await server.wait_closed()
+    asyncio.run(main())
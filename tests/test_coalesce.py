@@ -0,0 +1,51 @@
+import asyncio
+
+from discord_interactions.application_commands.models.coalesce import EditCoalescer
+
+
+def coalescer(sent, window, send_time):
+    async def send(message_id, data):
+        await asyncio.sleep(send_time)
+        sent.append(data['content'])
+        return {'id': message_id, **data}
+    return EditCoalescer(send, window)
+
+
+def test_burst_is_merged():
+    async def main():
+        sent = []
+        edits = coalescer(sent, 0.1, 0.004)
+        futures = [edits.edit('@original', {'content': str(i)}) for i in range(20)]
+        results = await asyncio.gather(*futures)
+        assert sent == ['19']
+        assert all(result['content'] == '19' for result in results)
+    asyncio.run(main())
+
+
+def test_spaced_edits_are_merged():
+    async def main():
+        sent = []
+        edits = coalescer(sent, 0.1, 0.004)
+        # 20 progress edits at 50/s, with a 0.1s window : about 2 edits per second of the window.
+        for i in range(20):
+            edits.edit('@original', {'content': str(i)})
+            await asyncio.sleep(0.02)
+        await edits.flush()
+        assert sent[-1] == '19'
+        assert len(sent) <= 6
+        assert edits.stats['merged'] >= 14
+    asyncio.run(main())
+
+
+def test_state_is_dropped_after_the_window():
+    async def main():
+        sent = []
+        edits = coalescer(sent, 0.05, 0.0)
+        await edits.edit('@original', {'content': 'first'})
+        assert edits._messages
+        await asyncio.sleep(0.1)
+        assert not edits._messages
+        # A new edit after the window is sent at once.
+        await asyncio.wait_for(edits.edit('@original', {'content': 'second'}), 0.02)
+        assert sent == ['first', 'second']
+    asyncio.run(main())
@@ -0,0 +1,43 @@
+import json
+
+import pytest
+
+from discord_interactions.utils import codec
+
+PAYLOAD = {'id': '786008729715212338', 'content': 'héllo / wörld', 'embeds': [], 'tts': False, 'flags': 64}
+
+
+@pytest.fixture
+def restore_codec():
+    previous = codec.get_codec()
+    yield
+    codec.set_codec(previous)
+
+
+@pytest.mark.parametrize('name', codec.available_codecs())
+def test_backends_round_trip(restore_codec, name):
+    assert codec.set_codec(name).name == name
+    assert json.loads(codec.dumps(PAYLOAD)) == PAYLOAD
+    assert codec.dumpb(PAYLOAD) == codec.dumps(PAYLOAD).encode()
+    assert codec.loads(codec.dumpb(PAYLOAD)) == PAYLOAD
+    assert codec.loads(codec.dumps(PAYLOAD)) == PAYLOAD
+
+
+def test_custom_codec_takes_effect_through_module(restore_codec):
+    decoded = []
+
+    def loads(data):
+        decoded.append(data)
+        return json.loads(data)
+
+    codec.set_codec(codec.JsonCodec('custom', json.dumps, lambda obj: json.dumps(obj).encode(), loads))
+    assert codec.get_codec().name == 'custom'
+    assert codec.loads(b'{"type":1}') == {'type': 1}
+    assert decoded == [b'{"type":1}']
+
+
+def test_unknown_backend_is_rejected(restore_codec):
+    with pytest.raises(ValueError):
+        codec.set_codec('simdjson')
+    with pytest.raises(TypeError):
+        codec.set_codec(json)
@@ -0,0 +1,61 @@
+import pytest
+
+from discord_interactions.application_commands.client.application_command_client import BaseSlashApplication
+from discord_interactions.application_commands.models import Interaction
+
+GUILD_ID = 290926798626357999
+
+
+def interaction(name, guild_id=None):
+    data = {
+        'type': 2, 'id': '786008729715212338', 'application_id': '775799577604522054', 'token': 'token',
+        'version': 1, 'channel_id': '645027906669510667',
+        'data': {'id': '771825006014889984', 'name': name, 'type': 1}
+    }
+    user = {'id': '53908232506183680', 'username': 'Mason', 'discriminator': '1337', 'avatar': None}
+    if guild_id is not None:
+        data['guild_id'] = str(guild_id)
+        data['member'] = {'user': user, 'roles': [], 'permissions': '2147483647', 'deaf': False, 'mute': False,
+                          'joined_at': '2017-03-13T19:19:14.040000+00:00'}
+    else:
+        data['user'] = user
+    return Interaction.fromJson(data)
+
+
+def application():
+    app = BaseSlashApplication(application_id=775799577604522054, low_memory=True)
+
+    @app.globalSlash(name='ping', description='Global ping.')
+    async def global_ping(ctx):
+        pass
+
+    @app.guildSlashCommand(GUILD_ID, name='ping', description='Guild ping.')
+    async def guild_ping(ctx):
+        pass
+
+    return app, global_ping, guild_ping
+
+
+def test_guild_command_preferred_in_its_guild():
+    app, global_ping, guild_ping = application()
+    assert interaction('ping', GUILD_ID).getCommand(app) is guild_ping
+    assert app.get_command_by_name('ping', GUILD_ID) is guild_ping
+
+
+def test_global_command_elsewhere():
+    app, global_ping, guild_ping = application()
+    assert interaction('ping').getCommand(app) is global_ping
+    assert interaction('ping', 81384788765712384).getCommand(app) is global_ping
+
+
+def test_unknown_command():
+    app, _, _ = application()
+    assert interaction('pong', GUILD_ID).getCommand(app) is None
+
+
+def test_duplicated_name_in_same_scope():
+    app, _, _ = application()
+    with pytest.raises(ValueError):
+        @app.guildSlashCommand(GUILD_ID, name='ping', description='Duplicate.')
+        async def duplicate(ctx):
+            pass
@@ -0,0 +1,33 @@
+import pytest
+
+from discord_interactions.ui import ActionRow, Button, ButtonStyle, SelectMenu, SelectOption
+from discord_interactions.ui.patch_dpy import parse_components_into_json
+
+
+def button(custom_id):
+    return Button(ButtonStyle.Primary, label=custom_id, custom_id=custom_id)
+
+
+def row(*custom_ids):
+    return {'type': 1, 'components': [button(custom_id).to_dict() for custom_id in custom_ids]}
+
+
+def test_parse_components_into_json():
+    assert parse_components_into_json(ActionRow([button('a'), button('b')])) == [row('a', 'b')]
+    assert parse_components_into_json([button('a'), button('b')]) == [row('a', 'b')]
+    assert parse_components_into_json([ActionRow([button('a')]), ActionRow([button('b')])]) == [row('a'), row('b')]
+    assert parse_components_into_json([[button('a')], (button('b'),)]) == [row('a'), row('b')]
+    assert parse_components_into_json([]) == []
+    with pytest.raises(TypeError):
+        parse_components_into_json([{'type': 2}])
+
+
+def test_select_option_to_dict():
+    option = SelectOption('Rogue', 'rogue', emoji='🗡', description='Sneak n stab', default=True)
+    assert option.to_dict() == {
+        'label': 'Rogue', 'value': 'rogue', 'emoji': '🗡', 'description': 'Sneak n stab', 'default': True
+    }
+    menu = SelectMenu([option], custom_id='class')
+    assert menu.to_dict()['options'] == [option.to_dict()]
+    with pytest.deprecated_call():
+        assert option.to_json() == option.to_dict()
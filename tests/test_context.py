@@ -0,0 +1,109 @@
+import asyncio
+
+from discord import Intents, MemberCacheFlags
+
+from discord_interactions.application_commands.models import ApplicationCommand, Interaction, SlashContextBuilder
+from discord_interactions.application_commands.client import low_memory_options
+from discord_interactions.application_commands.client.application_command_client import BaseSlashApplication
+from discord_interactions.application_commands.models.partial import PartialChannel, PartialMember
+
+COMMAND = ApplicationCommand(775799577604522054, 'hello', 'Hello.', command_id=771825006014889984)
+CHANNEL_ID = 645027906669510667
+GUILD_ID = 290926798626357999
+MEMBER = {
+    'user': {'id': '53908232506183680', 'username': 'Mason', 'discriminator': '1337', 'avatar': None},
+    'nick': 'Mase', 'roles': ['41771983423143936'], 'permissions': '2147483647',
+    'joined_at': '2017-03-13T19:19:14.040000+00:00', 'deaf': False, 'mute': False
+}
+
+
+def interaction(channel_id=CHANNEL_ID, resolved=None):
+    data = {'id': '771825006014889984', 'name': 'hello', 'type': 1}
+    if resolved is not None:
+        data['resolved'] = resolved
+    return Interaction.fromJson({
+        'type': 2, 'id': '786008729715212338', 'application_id': '775799577604522054', 'token': 'token',
+        'version': 1, 'guild_id': str(GUILD_ID), 'channel_id': str(channel_id), 'member': MEMBER, 'data': data
+    })
+
+
+class Client:
+    """Client without gateway caches, counting channel fetches."""
+    def __init__(self, fail=False):
+        self.fetches = 0
+        self.fail = fail
+
+    def get_guild(self, guild_id):
+        return None
+
+    async def fetch_channel(self, channel_id):
+        self.fetches += 1
+        await asyncio.sleep(0.01)
+        if self.fail:
+            raise ConnectionError('api is unreachable')
+        return ('channel', channel_id)
+
+
+def test_missing_channel_is_fetched_once():
+    async def main():
+        client = Client()
+        builder = SlashContextBuilder(client)
+        contexts = await asyncio.gather(*(builder.build(interaction(), command=COMMAND) for _ in range(10)))
+        assert client.fetches == 1
+        assert {context.channel for context in contexts} == {('channel', CHANNEL_ID)}
+        await builder.build(interaction(), command=COMMAND)
+        assert client.fetches == 1     # Cached.
+    asyncio.run(main())
+
+
+def test_author_is_built_from_payload():
+    async def main():
+        context = await SlashContextBuilder(Client()).build(interaction(), command=COMMAND)
+        assert context.author.id == 53908232506183680
+        assert context.author.name == 'Mason'
+        assert context.guild is None
+    asyncio.run(main())
+
+
+def test_resolved_channel_is_not_fetched():
+    async def main():
+        client = Client()
+        resolved = {'channels': {str(CHANNEL_ID): {'id': str(CHANNEL_ID), 'name': 'general', 'type': 0}}}
+        context = await SlashContextBuilder(client).build(interaction(resolved=resolved), command=COMMAND)
+        assert isinstance(context.channel, PartialChannel)
+        assert context.channel.name == 'general'
+        assert client.fetches == 0
+    asyncio.run(main())
+
+
+def test_failed_fetch_falls_back_to_partial_channel():
+    async def main():
+        client = Client(fail=True)
+        builder = SlashContextBuilder(client)
+        context = await builder.build(interaction(), command=COMMAND)
+        assert isinstance(context.channel, PartialChannel)
+        assert context.channel.id == CHANNEL_ID
+        await builder.build(interaction(), command=COMMAND)
+        assert client.fetches == 2     # Failures are not cached.
+    asyncio.run(main())
+
+
+def test_low_memory_options_keep_explicit_options():
+    options = low_memory_options({'max_messages': 100})
+    assert options['intents'] == Intents.none()
+    assert options['member_cache_flags'].value == MemberCacheFlags.none().value
+    assert options['chunk_guilds_at_startup'] is False
+    assert options['max_messages'] == 100
+
+
+def test_low_memory_contexts_are_built_from_payload_only():
+    async def main():
+        assert BaseSlashApplication(low_memory=True).context_builder.payload_only
+        client = Client()
+        context = await SlashContextBuilder(client, payload_only=True).build(interaction(), command=COMMAND)
+        assert isinstance(context.author, PartialMember)
+        assert context.author.display_name == 'Mase'
+        assert context.author.guild_id == GUILD_ID
+        assert isinstance(context.channel, PartialChannel)
+        assert client.fetches == 0
+    asyncio.run(main())
@@ -0,0 +1,76 @@
+import asyncio
+import multiprocessing
+import threading
+
+import pytest
+
+from discord_interactions.application_commands.client.application_command_client import BaseSlashApplication
+from discord_interactions.application_commands.models import CommandExecutor, Interaction
+
+INTERACTION = {
+    'type': 2, 'id': '786008729715212338', 'application_id': '775799577604522054', 'token': 'token', 'version': 1,
+    'channel_id': '645027906669510667',
+    'user': {'id': '53908232506183680', 'username': 'Mason', 'discriminator': '1337', 'avatar': None}
+}
+
+app = BaseSlashApplication(low_memory=True)
+app.command_executor = CommandExecutor(defer_after=0.05, mp_context=multiprocessing.get_context('fork'))
+
+
+@app.globalSlash(name='square', description='Square in a process pool.', execution='process')
+def square(ctx, number: int):
+    return {'content': '{} squared by {}'.format(number * number, ctx.author_name)}
+
+
+@app.globalSlash(name='thread', description='Name of the worker thread.', execution='thread')
+def thread(ctx):
+    return threading.current_thread().name
+
+
+@app.globalSlash(name='slow', description='Slow, without result.', execution='thread')
+def slow(ctx):
+    threading.Event().wait(0.2)
+
+
+def invoke(name, options=None):
+    async def main():
+        data = {'id': '771825006014889984', 'name': name, 'type': 1}
+        if options is not None:
+            data['options'] = options
+        interaction = Interaction.fromJson(dict(INTERACTION, data=data))
+        response = asyncio.get_running_loop().create_future()
+        interaction.setResponseFuture(response)
+        await app.process_interaction(interaction)
+        return response.result()
+    return asyncio.run(main())
+
+
+def teardown_module():
+    app.command_executor.shutdown()
+
+
+def test_thread_policy():
+    response = invoke('thread')
+    assert response['type'] == 4
+    assert response['data']['content'].startswith('discord_interactions')
+
+
+def test_process_policy():
+    response = invoke('square', [{'type': 4, 'name': 'number', 'value': 12}])
+    assert response['data'] == {'content': '144 squared by Mason'}
+
+
+def test_late_result_is_deferred():
+    assert invoke('slow')['type'] == 5
+
+
+def test_callbacks_are_checked_for_their_policy():
+    with pytest.raises(TypeError):
+        @app.globalSlash(name='coroutine', description='Coroutine in a thread.', execution='thread')
+        async def coroutine(ctx):
+            pass
+
+    with pytest.raises(ValueError):
+        @app.globalSlash(name='local', description='Local function in a process.', execution='process')
+        def local(ctx):
+            pass
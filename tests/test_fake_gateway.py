@@ -0,0 +1,88 @@
+import asyncio
+
+import pytest
+
+from discord_interactions.application_commands.client import SlashClient
+from discord_interactions.application_commands.client.application_command_client import BaseSlashApplication
+from discord_interactions.application_commands.models import ApplicationCommandOption, ApplicationCommandOptionType
+from discord_interactions.testing import FakeGateway, PayloadFactory
+from discord_interactions.utils.http import RequestScheduler, get_scheduler, set_scheduler
+
+
+def register(app):
+    @app.globalSlash(name='ping', description='Ping.')
+    async def ping(ctx):
+        await ctx.send('pong')
+
+    @app.globalSlash(name='hello', description='Greet a user.', options=[
+        ApplicationCommandOption(name='user', option_type=ApplicationCommandOptionType.USER,
+                                 description='User to greet.', required=True),
+        ApplicationCommandOption(name='text', option_type=ApplicationCommandOptionType.STRING,
+                                 description='Greeting.', required=False)
+    ])
+    async def hello(ctx, user, text='Hello!'):
+        await ctx.send(text)
+
+    return app
+
+
+def with_scheduler(main):
+    previous = get_scheduler()
+    set_scheduler(RequestScheduler())
+    try:
+        return asyncio.run(main())
+    finally:
+        set_scheduler(previous)
+
+
+def test_payloads_are_reproducible():
+    app = register(BaseSlashApplication(low_memory=True))
+    first = [PayloadFactory(app, guilds=10, seed=1).payload() for _ in range(20)]
+    assert first == [PayloadFactory(app, guilds=10, seed=1).payload() for _ in range(20)]
+    factory = PayloadFactory(app, weights={'hello': 1.0}, dm_ratio=1.0, optional_ratio=0.0, seed=2)
+    payload = factory.payload()
+    assert 'user' in payload and 'guild_id' not in payload
+    user_id = payload['data']['options'][0]['value']
+    assert payload['data']['name'] == 'hello' and len(payload['data']['options']) == 1
+    assert user_id in payload['data']['resolved']['users']
+    with pytest.raises(ValueError):
+        PayloadFactory(BaseSlashApplication(low_memory=True))
+
+
+def test_arrivals_include_bursts():
+    gateway = FakeGateway(BaseSlashApplication(), rate=100.0, duration=1.0, burst_size=10, burst_interval=0.5, seed=3)
+    arrivals = gateway.arrivals()
+    assert arrivals == sorted(arrivals) and all(0 <= at < 1.0 for at in arrivals)
+    assert arrivals.count(0.0) == arrivals.count(0.5) == 10
+
+
+def test_application_answers_every_frame():
+    async def main():
+        try:
+            return await FakeGateway(
+                register(BaseSlashApplication(low_memory=True)), rate=200.0, duration=0.2, burst_size=5, seed=4
+            ).run()
+        finally:
+            await get_scheduler().close()
+
+    report = with_scheduler(main)
+    assert report.frames > 5
+    assert (report.answered, report.errors) == (report.frames, 0)
+    assert sum(report.commands.values()) == report.frames
+
+
+def test_discord_py_client_is_logged_in_to_stub():
+    async def main():
+        client = register(SlashClient(low_memory=True))
+        for task in asyncio.all_tasks():
+            if task.get_name() == 'SlashClient.get_application_id':
+                task.cancel()   # Not logged in yet.
+        try:
+            report = await FakeGateway(client, rate=100.0, duration=0.1, seed=5).run()
+        finally:
+            await client.close()
+        assert client.application_id
+        return report
+
+    report = with_scheduler(main)
+    assert report.frames and report.answered == report.frames
@@ -0,0 +1,59 @@
+import asyncio
+
+import pytest
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from discord_interactions.utils.http import RequestScheduler
+
+
+def serve(main):
+    """Run main(server, requests) against a local api counting requests per path."""
+    async def wrapper():
+        requests = []
+
+        async def handle(request):
+            requests.append(request.path)
+            return web.json_response({'url': 'wss://gateway.discord.gg'})
+
+        app = web.Application()
+        app.router.add_get('/api/v9/gateway', handle)
+        server = TestServer(app)
+        await server.start_server()
+        try:
+            await main(server, requests)
+        finally:
+            await server.close()
+    asyncio.run(wrapper())
+
+
+def test_connections_are_warmed_and_kept_alive():
+    async def main(server, requests):
+        scheduler = RequestScheduler(
+            4, warm_connections=2, keepalive_interval=0.05, warm_url=str(server.make_url('/api/v9/gateway'))
+        )
+        try:
+            await scheduler.start()
+            assert scheduler.connection_stats['created'] == 2
+            assert len(requests) == 2
+            await asyncio.sleep(0.12)
+        finally:
+            await scheduler.close()
+        stats = scheduler.connection_stats
+        assert stats['keepalive_sent'] >= 4 and stats['keepalive_failed'] == 0
+        assert stats['reused'] >= 2 and stats['created'] <= 4
+    serve(main)
+
+
+def test_no_warm_connections_by_default():
+    async def main(server, requests):
+        scheduler = RequestScheduler(warm_url=str(server.make_url('/api/v9/gateway')))
+        await scheduler.start()
+        await scheduler.close()
+        assert requests == []
+    serve(main)
+
+
+def test_warm_connections_are_bounded():
+    with pytest.raises(ValueError):
+        RequestScheduler(2, warm_connections=3)
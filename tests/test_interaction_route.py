@@ -0,0 +1,93 @@
+import asyncio
+
+import pytest
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from discord_interactions import InteractionRoute
+from discord_interactions.application_commands.models import ApplicationCommand
+from discord_interactions.utils.http import RequestPriority, RequestScheduler, get_scheduler, set_scheduler
+
+APPLICATION_ID = 775799577604522054
+GUILD_ID = 290926798626357999
+
+
+def run(main, monkeypatch):
+    """Run main(requests) against a local api, with a fresh scheduler."""
+    async def wrapper():
+        requests = []
+
+        async def handle(request):
+            body = await request.json() if request.can_read_body else None
+            requests.append((request.method, request.path, body))
+            return web.json_response(dict(body or {}, id='771825006014889984'))
+
+        app = web.Application()
+        app.router.add_route('*', '/{path:.*}', handle)
+        server = TestServer(app)
+        await server.start_server()
+        monkeypatch.setattr(InteractionRoute, 'APIBase', str(server.make_url('/api/v9/')))
+        try:
+            await main(requests)
+        finally:
+            await get_scheduler().close()
+            await server.close()
+
+    previous = get_scheduler()
+    set_scheduler(RequestScheduler())
+    try:
+        asyncio.run(wrapper())
+    finally:
+        set_scheduler(previous)
+
+
+def test_urls():
+    base = InteractionRoute.APIBase
+    assert InteractionRoute().application(APPLICATION_ID).commands().url \
+        == base + 'applications/775799577604522054/commands'
+    assert InteractionRoute().application(APPLICATION_ID).guilds(GUILD_ID).commands(1).url \
+        == base + 'applications/775799577604522054/guilds/290926798626357999/commands/1'
+
+
+def test_send_goes_through_the_scheduler(monkeypatch):
+    async def main(requests):
+        created = await InteractionRoute().application(APPLICATION_ID).commands().send(
+            'POST', json={'name': 'ping', 'description': 'Ping.'}, priority=RequestPriority.BACKGROUND
+        )
+        assert created['name'] == 'ping'
+        assert requests == [('POST', '/api/v9/applications/775799577604522054/commands',
+                             {'name': 'ping', 'description': 'Ping.'})]
+        assert get_scheduler().stats['background']['requests'] == 1
+    run(main, monkeypatch)
+
+
+def test_request_is_deprecated(monkeypatch):
+    async def main(requests):
+        with pytest.deprecated_call():
+            manager = InteractionRoute().application(APPLICATION_ID).commands().request('GET')
+        async with manager as response:
+            assert response.status == 200
+    run(main, monkeypatch)
+
+
+@pytest.mark.parametrize('guild_id, path', [
+    (None, '/api/v9/applications/775799577604522054/commands'),
+    (GUILD_ID, '/api/v9/applications/775799577604522054/guilds/290926798626357999/commands')
+])
+def test_register_command(monkeypatch, guild_id, path):
+    async def main(requests):
+        command = ApplicationCommand(APPLICATION_ID, 'ping', 'Ping.', guild_id=guild_id)
+        command._patch(await command._register_command())
+        assert requests == [('POST', path, {'name': 'ping', 'description': 'Ping.', 'options': []})]
+        assert command.id == 771825006014889984
+    run(main, monkeypatch)
+
+
+def test_edit_guild_command(monkeypatch):
+    async def main(requests):
+        command = ApplicationCommand(APPLICATION_ID, 'ping', 'Ping.', command_id=1, guild_id=GUILD_ID)
+        await command.edit()
+        assert [(method, path) for method, path, _ in requests] == [
+            ('PATCH', '/api/v9/applications/775799577604522054/guilds/290926798626357999/commands/1')
+        ]
+    run(main, monkeypatch)
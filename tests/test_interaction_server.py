@@ -0,0 +1,172 @@
+import asyncio
+import json
+import time
+
+from aiohttp import web
+from aiohttp.test_utils import TestClient, TestServer
+from nacl.signing import SigningKey
+
+from discord_interactions import InteractionClient, SlashClient
+from discord_interactions.application_commands.client import DedupeStore
+from discord_interactions.utils.http import RequestScheduler, get_scheduler, set_scheduler
+
+SIGNING_KEY = SigningKey.generate()
+PUBLIC_KEY = SIGNING_KEY.verify_key.encode().hex()
+INTERACTION = {
+    'type': 2, 'id': '786008729715212338', 'application_id': '775799577604522054', 'token': 'token', 'version': 1,
+    'channel_id': '645027906669510667', 'data': {'id': '771825006014889984', 'name': 'ping', 'type': 1},
+    'user': {'id': '53908232506183680', 'username': 'Mason', 'discriminator': '1337', 'avatar': None}
+}
+
+
+def signed(payload):
+    body = json.dumps(payload).encode()
+    timestamp = str(int(time.time()))
+    headers = {
+        'X-Signature-Ed25519': SIGNING_KEY.sign(timestamp.encode() + body).signature.hex(),
+        'X-Signature-Timestamp': timestamp,
+        'Content-Type': 'application/json'
+    }
+    return body, headers
+
+
+def ping_client(**kwargs):
+    client = InteractionClient(775799577604522054, PUBLIC_KEY, **kwargs)
+
+    @client.globalSlash(name='ping', description='Ping.')
+    async def ping(ctx):
+        await ctx.send('pong')
+
+    return client
+
+
+class MemoryDedupeStore(DedupeStore):
+    def __init__(self):
+        self.seen = set()
+
+    async def add(self, interaction_id, ttl):
+        if interaction_id in self.seen:
+            return False
+        self.seen.add(interaction_id)
+        return True
+
+
+def with_scheduler(main):
+    previous = get_scheduler()
+    set_scheduler(RequestScheduler())
+    try:
+        asyncio.run(main())
+    finally:
+        set_scheduler(previous)
+
+
+def serve(client, main):
+    """Run main(http) against the interactions endpoint of the client."""
+    async def wrapper():
+        http = TestClient(TestServer(client.server.makeApp()))
+        await http.start_server()
+        try:
+            await main(http)
+        finally:
+            await http.close()
+    with_scheduler(wrapper)
+
+
+def test_requests_are_verified_and_pings_answered():
+    async def main(http):
+        body, headers = signed({'type': 1})
+        assert (await http.post('/interactions', data=body)).status == 401
+        forged = dict(headers, **{'X-Signature-Ed25519': '00' * 64})
+        assert (await http.post('/interactions', data=body, headers=forged)).status == 401
+        response = await http.post('/interactions', data=body, headers=headers)
+        assert response.status == 200
+        assert await response.json() == {'type': 1}
+    serve(ping_client(), main)
+
+
+def test_initial_response_is_the_http_reply():
+    async def main(http):
+        body, headers = signed(INTERACTION)
+        response = await http.post('/interactions', data=body, headers=headers)
+        assert response.status == 200
+        assert await response.json() == {'type': 4, 'data': {'content': 'pong'}}
+    serve(ping_client(), main)
+
+
+def test_slow_command_is_deferred():
+    client = InteractionClient(775799577604522054, PUBLIC_KEY, response_timeout=0.05)
+    finished = []
+
+    @client.globalSlash(name='slow', description='Slow.')
+    async def slow(ctx):
+        await asyncio.sleep(0.2)
+        finished.append(ctx.interaction.responded)
+
+    async def main(http):
+        payload = dict(INTERACTION, data={'id': '771825006014889985', 'name': 'slow', 'type': 1})
+        body, headers = signed(payload)
+        response = await http.post('/interactions', data=body, headers=headers)
+        assert response.status == 200
+        assert (await response.json())['type'] == 5
+        await asyncio.sleep(0.3)
+        assert finished == [True]
+    serve(client, main)
+
+
+def test_app_starts_and_stops_scheduler_and_monitor():
+    async def main():
+        client = InteractionClient(775799577604522054, PUBLIC_KEY)
+        # The runner of web.run_app(), as used by InteractionServer.run().
+        runner = web.AppRunner(client.server.makeApp())
+        await runner.setup()
+        assert client.loop_monitor.running
+        session = get_scheduler().session
+        await runner.cleanup()
+        assert not client.loop_monitor.running
+        assert session.closed
+    with_scheduler(main)
+
+
+def test_start_and_close():
+    async def main():
+        client = InteractionClient(775799577604522054, PUBLIC_KEY)
+        await client.server.start('127.0.0.1', 0)
+        assert client.loop_monitor.running
+        session = get_scheduler().session
+        await client.server.close()
+        assert not client.loop_monitor.running
+        assert session.closed
+    with_scheduler(main)
+
+
+def test_slash_client_close():
+    async def main():
+        client = SlashClient(low_memory=True)
+        for task in asyncio.all_tasks():
+            if task.get_name() == 'SlashClient.get_application_id':
+                task.cancel()   # Not logged in.
+        client.loop_monitor.start()
+        session = get_scheduler().session
+        await client.close()
+        assert not client.loop_monitor.running
+        assert session.closed
+    with_scheduler(main)
+
+
+def test_deliveries_to_other_workers_are_dropped_through_dedupe_store():
+    async def main():
+        store = MemoryDedupeStore()
+        workers = [TestClient(TestServer(ping_client(dedupe_store=store).server.makeApp())) for _ in range(2)]
+        for worker in workers:
+            await worker.start_server()
+        try:
+            body, headers = signed(INTERACTION)
+            first = await workers[0].post('/interactions', data=body, headers=headers)
+            assert first.status == 200
+            assert (await first.json())['data']['content'] == 'pong'
+            redelivered = await workers[1].post('/interactions', data=body, headers=headers)
+            assert redelivered.status == 409
+        finally:
+            for worker in workers:
+                await worker.close()
+    with_scheduler(main)
@@ -0,0 +1,82 @@
+import asyncio
+import random
+
+import pytest
+
+from discord_interactions.application_commands.client.application_command_client import BaseSlashApplication
+from discord_interactions.monitoring import latency
+from discord_interactions.monitoring.histogram import Histogram
+
+INTERACTION = {
+    'type': 2, 'id': '786008729715212338', 'application_id': '775799577604522054', 'token': 'token', 'version': 1,
+    'channel_id': '645027906669510667',
+    'user': {'id': '53908232506183680', 'username': 'Mason', 'discriminator': '1337', 'avatar': None}
+}
+
+
+def test_percentiles_are_within_relative_error():
+    rng = random.Random(41)
+    values = [rng.uniform(0.0001, 2.0) for _ in range(10000)]
+    histogram = Histogram(precision=7)
+    for value in values:
+        histogram.record(value)
+    values.sort()
+    assert histogram.count == 10000
+    assert histogram.min == int(values[0] * 1_000_000) / 1_000_000
+    assert histogram.max == int(values[-1] * 1_000_000) / 1_000_000
+    for percent in (50, 95, 99):
+        exact = values[round(len(values) * percent / 100) - 1]
+        assert histogram.percentile(percent) == pytest.approx(exact, rel=1 / 64)
+    assert histogram.percentiles(50, 99) == {50: histogram.percentile(50), 99: histogram.percentile(99)}
+
+
+def test_merge_reset_and_clamp():
+    first, second = Histogram(), Histogram()
+    first.record(0.001)
+    second.record(1000.0)   # Clamped to about 67 seconds.
+    second.record(-1.0)     # Clamped to 0.
+    first.merge(second)
+    assert first.count == 3
+    assert first.min == 0.0
+    assert 67 < first.max < 68
+    with pytest.raises(ValueError):
+        first.merge(Histogram(precision=5))
+    first.reset()
+    assert first.count == 0 and first.percentile(99) == 0.0
+    with pytest.raises(ValueError):
+        Histogram(precision=1)
+
+
+def test_tracker_resets_on_interval(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(latency.time, 'monotonic', lambda: now[0])
+    tracker = latency.LatencyTracker(reset_interval=60.0)
+    tracker.record('ping', latency.INVOKE, 0.01)
+    tracker.record('pong', latency.INVOKE, 0.03)
+    assert tracker.phase(latency.INVOKE).count == 2
+    assert set(tracker.snapshot()['ping'][latency.INVOKE]) == {'count', 'mean', 'p50', 'p95', 'p99', 'max'}
+    now[0] += 61.0
+    tracker.record('ping', latency.INVOKE, 0.02)
+    assert tracker.histogram('pong', latency.INVOKE) is None
+    assert tracker.histogram('ping', latency.INVOKE).count == 1
+
+
+def test_lifecycle_phases_are_recorded():
+    app = BaseSlashApplication(low_memory=True)
+
+    @app.globalSlash(name='ping', description='Ping.')
+    async def ping(ctx):
+        await ctx.send('pong')
+
+    async def main():
+        for name in ('ping', 'missing'):
+            interaction = app.parse_interaction(dict(INTERACTION, data={'id': '771825006014889984', 'name': name}))
+            interaction.setResponseFuture(asyncio.get_running_loop().create_future())
+            await app.process_interaction(interaction)
+
+    asyncio.run(main())
+    snapshot = app.latency_tracker.snapshot()
+    assert set(snapshot['ping']) == {
+        latency.PARSE, latency.LOOKUP, latency.CONTEXT, latency.INVOKE, latency.FIRST_RESPONSE, latency.TOTAL
+    }
+    assert snapshot[latency.UNKNOWN_COMMAND][latency.LOOKUP]['count'] == 1
@@ -0,0 +1,52 @@
+import logging
+import subprocess
+import sys
+import threading
+from pathlib import Path
+
+from discord_interactions.utils import log
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+def test_import_does_not_configure_logging():
+    script = (
+        'import logging, threading, discord_interactions\n'
+        'from discord_interactions.utils import log\n'
+        'logger = logging.getLogger("discord_interactions")\n'
+        'assert log._pipeline is None\n'
+        'assert threading.active_count() == 1\n'
+        'assert logger.propagate\n'
+        'assert [type(handler) for handler in logger.handlers] == [logging.NullHandler]\n'
+    )
+    subprocess.run([sys.executable, '-c', script], cwd=str(ROOT), check=True)
+
+
+def test_records_propagate_without_setup(caplog):
+    with caplog.at_level(logging.INFO, logger='discord_interactions.http'):
+        logging.getLogger('discord_interactions.http').info('sent %s', 'request')
+    assert [record.getMessage() for record in caplog.records] == ['sent request']
+
+
+def test_arguments_are_formatted_on_listener_thread():
+    class Capture(logging.Handler):
+        def __init__(self):
+            super().__init__()
+            self.messages = []
+
+        def emit(self, record):
+            self.messages.append(record.getMessage())
+
+    class Argument:
+        def __str__(self):
+            return threading.current_thread().name
+
+    capture = Capture()
+    log.setup_logging(handler=capture)
+    try:
+        logging.getLogger('discord_interactions.http').info('formatted on %s', Argument())
+    finally:
+        log.shutdown_logging()
+    assert len(capture.messages) == 1
+    assert capture.messages[0] != 'formatted on {}'.format(threading.current_thread().name)
+    assert logging.getLogger('discord_interactions').propagate
@@ -0,0 +1,39 @@
+import asyncio
+import time
+
+import pytest
+
+from discord_interactions.monitoring import LoopLagMonitor
+
+
+def test_blocking_command_is_blamed_for_lag_spike():
+    async def main():
+        monitor = LoopLagMonitor(interval=0.01, spike_threshold=0.05, shed_threshold=0.02, smoothing=0.1)
+        monitor.start()
+        try:
+            await asyncio.sleep(0.05)
+            assert not monitor.overloaded()
+            monitor.enter('fast')
+            monitor.exit('fast')
+            await asyncio.sleep(0.05)
+            monitor.enter('slow')
+            time.sleep(0.15)
+            monitor.exit('slow')
+            await asyncio.sleep(0.005)
+            assert monitor.overloaded()
+            await asyncio.sleep(0.05)
+        finally:
+            monitor.stop()
+        assert not monitor.running
+        assert list(monitor.blame()) == ['slow']
+        assert monitor.blame()['slow']['lag_max'] >= 0.14
+        assert [spike['commands'] for spike in monitor.spikes()] == [['slow']]
+        snapshot = monitor.snapshot()
+        assert snapshot['distribution']['max'] >= 0.14
+        assert snapshot['distribution']['count'] > 5
+    asyncio.run(main())
+
+
+def test_interval_must_be_positive():
+    with pytest.raises(ValueError):
+        LoopLagMonitor(interval=0)
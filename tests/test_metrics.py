@@ -0,0 +1,101 @@
+import asyncio
+import gc
+
+from aiohttp import web
+from aiohttp.test_utils import TestClient, TestServer
+
+from discord_interactions.application_commands.client.application_command_client import BaseSlashApplication
+from discord_interactions.application_commands.models import Interaction
+from discord_interactions.monitoring import REGISTRY, MetricsRegistry, add_metrics_route
+from discord_interactions.monitoring.instruments import INTERACTIONS_TIMED_OUT, route_template
+
+INTERACTION = {
+    'type': 2, 'id': '786008729715212338', 'application_id': '775799577604522054', 'token': 'token', 'version': 1,
+    'channel_id': '645027906669510667',
+    'user': {'id': '53908232506183680', 'username': 'Mason', 'discriminator': '1337', 'avatar': None}
+}
+
+
+def interaction(name):
+    return Interaction.fromJson(dict(INTERACTION, data={'id': '771825006014889984', 'name': name, 'type': 1}))
+
+
+def test_render_text_format():
+    registry = MetricsRegistry()
+    registry.counter('requests_total', 'Requests.', ('route',)).labels('/a"b').inc(2)
+    registry.gauge('depth', 'Depth.').set(1.5)
+    registry.gaugeFunction('entries', 'Entries.', ('cache',), lambda: [(('channels',), 3)])
+    assert registry.render() == '\n'.join([
+        '# HELP requests_total Requests.',
+        '# TYPE requests_total counter',
+        'requests_total{route="/a\\"b"} 2',
+        '# HELP depth Depth.',
+        '# TYPE depth gauge',
+        'depth 1.5',
+        '# HELP entries Entries.',
+        '# TYPE entries gauge',
+        'entries{cache="channels"} 3',
+        ''
+    ])
+
+
+def test_route_template():
+    assert route_template('/api/v9/webhooks/775799577604522054/aW50ZXJhY3Rpb24/messages/@original') \
+        == '/api/v9/webhooks/:id/:token/messages/@original'
+    assert route_template('/api/v9/interactions/786008729715212338/aW50ZXJhY3Rpb24/callback') \
+        == '/api/v9/interactions/:id/:token/callback'
+
+
+def test_gauges_of_every_client():
+    def clients():
+        return {labels[0] for labels, _ in REGISTRY.get('discord_interactions_cache_entries').samples()}
+
+    first, second = BaseSlashApplication(low_memory=True), BaseSlashApplication(low_memory=True)
+    second_label = second.metrics_label
+    assert {first.metrics_label, second_label} <= clients()
+    del second
+    gc.collect()
+    assert first.metrics_label in clients()
+    assert second_label not in clients()
+
+
+def test_interaction_never_responded_is_timed_out():
+    app = BaseSlashApplication(low_memory=True)
+
+    @app.globalSlash(name='silent', description='Never responds.')
+    async def silent(ctx):
+        pass
+
+    @app.globalSlash(name='answer', description='Responds.')
+    async def answer(ctx):
+        await ctx.send('answer')
+
+    async def main():
+        await app.process_interaction(interaction('silent'))
+        responded = interaction('answer')
+        responded.setResponseFuture(asyncio.get_running_loop().create_future())
+        await app.process_interaction(responded)
+
+    silent_before = INTERACTIONS_TIMED_OUT.labels('silent').value
+    answer_before = INTERACTIONS_TIMED_OUT.labels('answer').value
+    asyncio.run(main())
+    assert INTERACTIONS_TIMED_OUT.labels('silent').value == silent_before + 1
+    assert INTERACTIONS_TIMED_OUT.labels('answer').value == answer_before
+
+
+def test_metrics_route():
+    async def main():
+        registry = MetricsRegistry()
+        registry.counter('requests_total', 'Requests.').inc()
+        app = web.Application()
+        add_metrics_route(app, '/metrics', registry)
+        client = TestClient(TestServer(app))
+        await client.start_server()
+        try:
+            response = await client.get('/metrics')
+            assert response.status == 200
+            assert response.headers['Content-Type'].startswith('text/plain')
+            assert 'requests_total 1' in await response.text()
+        finally:
+            await client.close()
+    asyncio.run(main())
@@ -0,0 +1,85 @@
+import asyncio
+
+from discord_interactions.application_commands.client.application_command_client import BaseSlashApplication
+from discord_interactions.application_commands.models import Interaction
+from discord_interactions.utils import cache
+
+GUILD_A = 290926798626357999
+GUILD_B = 81384788765712384
+USER = {'id': '53908232506183680', 'username': 'Mason', 'discriminator': '1337', 'avatar': None}
+OPTIONS = [{'type': 6, 'name': 'user', 'value': USER['id']}]
+
+
+def interaction(guild_id, nick=None):
+    data = {
+        'type': 2, 'id': '786008729715212338', 'application_id': '775799577604522054', 'token': 'token',
+        'version': 1, 'channel_id': '645027906669510667',
+        'data': {'id': '771825006014889984', 'name': 'hello', 'type': 1, 'options': OPTIONS}
+    }
+    invoker = {'id': '96008815106887111', 'username': 'invoker', 'discriminator': '0001', 'avatar': None}
+    if guild_id is None:
+        data['user'] = invoker
+    else:
+        data['guild_id'] = str(guild_id)
+        data['member'] = {'user': invoker, 'roles': [], 'permissions': '2147483647', 'deaf': False, 'mute': False,
+                          'joined_at': '2017-03-13T19:19:14.040000+00:00'}
+    if nick is not None:
+        data['data']['resolved'] = {
+            'users': {USER['id']: USER},
+            'members': {USER['id']: {'nick': nick, 'roles': [], 'permissions': '2147483647',
+                                     'joined_at': '2017-03-13T19:19:14.040000+00:00'}}
+        }
+    return Interaction.fromJson(data)
+
+
+def resolve(resolver, guild_id, nick=None):
+    return asyncio.run(resolver.resolve(interaction(guild_id, nick), OPTIONS))['user']
+
+
+def test_members_are_cached_per_guild():
+    resolver = BaseSlashApplication(low_memory=True).option_resolver
+    assert resolve(resolver, GUILD_A, 'nick in A').nick == 'nick in A'
+    assert resolve(resolver, GUILD_B, 'nick in B').nick == 'nick in B'
+    # Cached entries of each guild are kept apart.
+    assert resolve(resolver, GUILD_A).nick == 'nick in A'
+    assert resolve(resolver, GUILD_B).nick == 'nick in B'
+
+
+def test_member_is_not_reused_in_other_scopes():
+    resolver = BaseSlashApplication(low_memory=True).option_resolver
+    resolve(resolver, GUILD_A, 'nick in A')
+    # Payload-only resolver leaves entities missing in both payload and cache as snowflakes.
+    assert resolve(resolver, GUILD_B) == int(USER['id'])
+    assert resolve(resolver, None) == int(USER['id'])
+    assert resolver.stats['cache'] == 0
+
+
+def test_cached_members_expire(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(cache.time, 'monotonic', lambda: now[0])
+    resolver = BaseSlashApplication(low_memory=True).option_resolver
+    resolve(resolver, GUILD_A, 'old nick')
+    now[0] += resolver.cache.ttl - 1
+    assert resolve(resolver, GUILD_A).nick == 'old nick'
+    now[0] += 2
+    assert resolve(resolver, GUILD_A) == int(USER['id'])
+
+
+def test_failed_channel_fetch_is_unresolved_and_not_cached():
+    calls = []
+
+    async def fetch_channel(channel_id):
+        calls.append(channel_id)
+        raise ConnectionError('api is down')
+
+    application = BaseSlashApplication()
+    application.fetch_channel = fetch_channel
+    resolver = application.option_resolver
+    channel = interaction(None)
+    options = [{'type': 7, 'name': 'channel', 'value': '645027906669510667'}]
+    for _ in range(2):
+        assert asyncio.run(resolver.resolve(channel, options)) == {'channel': 645027906669510667}
+    assert calls == [645027906669510667, 645027906669510667]
+    assert resolver.stats['unresolved'] == 2
+    assert resolver.stats['fetched'] == 0
+    assert len(resolver.cache) == 0
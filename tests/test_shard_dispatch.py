@@ -0,0 +1,103 @@
+import asyncio
+
+from discord_interactions.application_commands.client.shard_dispatch import ShardDispatcher, shard_id_of
+
+SHARD_COUNT = 2
+
+
+def guild_of(shard_id):
+    guild_id = shard_id << 22
+    assert shard_id_of(guild_id, SHARD_COUNT) == shard_id
+    return str(guild_id)
+
+
+def dispatcher(processed, **kwargs):
+    async def process(data):
+        processed.append(data['id'])
+    return ShardDispatcher(process, lambda: SHARD_COUNT, concurrency=1, **kwargs)
+
+
+def test_disconnected_shard_is_held_until_connected():
+    async def main():
+        processed = []
+        shards = dispatcher(processed)
+        shards.setConnected(1, False)
+        shards.submit({'id': 'held', 'guild_id': guild_of(1)})
+        shards.submit({'id': 'other', 'guild_id': guild_of(0)})
+        await asyncio.sleep(0.01)
+        assert processed == ['other']
+        assert shards.metrics[1]['processed'] == 0
+
+        shards.setConnected(1, True)
+        await shards.join()
+        assert processed == ['other', 'held']
+        shards.close()
+    asyncio.run(main())
+
+
+def test_held_backlog_is_bounded():
+    async def main():
+        processed = []
+        shards = dispatcher(processed, held_maxsize=2)
+        shards.setConnected(1, False)
+        accepted = [shards.submit({'id': str(i), 'guild_id': guild_of(1)}) for i in range(5)]
+        assert accepted == [True, True, False, False, False]
+        assert shards.metrics[1]['rejected'] == 3
+        shards.close()
+    asyncio.run(main())
+
+
+def test_held_backlog_is_bounded_while_workers_run():
+    async def main():
+        processed = []
+        shards = dispatcher(processed, held_maxsize=2)
+        shards.submit({'id': 'started', 'guild_id': guild_of(1)})
+        await shards.join()
+        shards.setConnected(1, False)
+        accepted = []
+        for i in range(5):
+            accepted.append(shards.submit({'id': str(i), 'guild_id': guild_of(1)}))
+            await asyncio.sleep(0.001)  # Workers get a turn.
+        assert accepted == [True, True, False, False, False]
+        assert shards.metrics[1]['backlog'] == 2
+
+        shards.setConnected(1, True)
+        await shards.join()
+        assert processed == ['started', '0', '1']
+        assert shards.metrics[1]['backlog'] == 0
+        shards.close()
+    asyncio.run(main())
+
+
+def test_held_interactions_expire_after_deadline():
+    async def main():
+        processed = []
+        shards = dispatcher(processed, deadline=0.02)
+        shards.setConnected(1, False)
+        shards.submit({'id': 'late', 'guild_id': guild_of(1)})
+        await asyncio.sleep(0.05)
+        shards.setConnected(1, True)
+        await shards.join()
+        assert processed == []
+        assert shards.metrics[1]['expired'] == 1
+        shards.close()
+    asyncio.run(main())
+
+
+def test_shard_with_backlog_sheds_while_loop_is_overloaded():
+    async def main():
+        processed = []
+        overloaded = [True]
+        shards = dispatcher(processed, overloaded=lambda: overloaded[0])
+        shards.setConnected(1, False)
+        assert shards.submit({'id': 'first', 'guild_id': guild_of(1)})
+        assert not shards.submit({'id': 'shed', 'guild_id': guild_of(1)})
+        assert shards.submit({'id': 'other', 'guild_id': guild_of(0)})     # No backlog on this shard.
+        overloaded[0] = False
+        assert shards.submit({'id': 'second', 'guild_id': guild_of(1)})
+        shards.setConnected(1, True)
+        await shards.join()
+        assert sorted(processed) == ['first', 'other', 'second']
+        assert shards.metrics[1]['shed'] == 1
+        shards.close()
+    asyncio.run(main())
@@ -0,0 +1,99 @@
+import asyncio
+
+import aiohttp
+import discord
+import pytest
+
+from discord_interactions.application_commands.models import ApplicationCommand
+from discord_interactions.testing import StubRESTServer
+from discord_interactions.utils.http import RequestScheduler, get_scheduler, set_scheduler
+from discord_interactions.utils.interaction_route import DEFAULT_API_BASE, DPY_API_BASE, InteractionRoute, \
+    get_api_base, set_api_base
+
+APPLICATION_ID = 775799577604522054
+GUILD_ID = 290926798626357999
+
+
+def run(main, **options):
+    """Run main(stub) with the library pointed to a running stub, and a fresh scheduler."""
+    async def wrapper():
+        async with StubRESTServer(**options) as stub:
+            set_api_base(stub.url)
+            try:
+                await main(stub)
+            finally:
+                set_api_base()
+                await get_scheduler().close()
+
+    previous = get_scheduler()
+    set_scheduler(RequestScheduler())
+    try:
+        asyncio.run(wrapper())
+    finally:
+        set_scheduler(previous)
+
+
+def test_api_base():
+    set_api_base('http://127.0.0.1:8080/api/v9')
+    try:
+        assert get_api_base() == 'http://127.0.0.1:8080/api/v9/'
+        assert discord.http.Route.BASE == 'http://127.0.0.1:8080/api/v9'
+    finally:
+        set_api_base()
+    assert get_api_base() == DEFAULT_API_BASE
+    assert discord.http.Route.BASE == DPY_API_BASE
+
+
+def test_application_commands_are_kept():
+    async def main(stub):
+        command = ApplicationCommand(APPLICATION_ID, 'ping', 'Ping.', guild_id=GUILD_ID)
+        command._patch(await command._register_command())
+        await command.edit()
+        def guild_commands(*command_id):
+            return InteractionRoute().application(APPLICATION_ID).guilds(GUILD_ID).commands(*command_id)
+
+        assert [(c['id'], c['name']) for c in await guild_commands().send('GET')] == [(str(command.id), 'ping')]
+        assert await InteractionRoute().application(APPLICATION_ID).commands().send('GET') == []
+        await guild_commands(command.id).send('DELETE')
+        assert await guild_commands().send('GET') == []
+        assert stub.stats['routes']['PATCH /api/v9/applications/:id/guilds/:id/commands/:id'] == 1
+    run(main)
+
+
+def test_discord_py_login():
+    async def main(stub):
+        http = discord.http.HTTPClient()
+        try:
+            user = await http.static_login('token', bot=True)
+        finally:
+            await http.close()
+        assert int(user['id']) == stub.application_id
+    run(main)
+
+
+def test_rate_limits_and_injected_errors():
+    async def main(stub):
+        async with aiohttp.ClientSession() as session:
+            statuses = []
+            for _ in range(3):
+                async with session.post(stub.url + 'channels/645027906669510667/messages', json={}) as response:
+                    statuses.append(response.status)
+                    remaining = response.headers.get('X-RateLimit-Remaining')
+            assert statuses == [200, 200, 429]
+            assert remaining is None and response.headers['X-RateLimit-Bucket']
+        assert stub.limited == 1
+    run(main, rate_limit=2, rate_limit_window=10.0)
+
+    async def injected(stub):
+        async with aiohttp.ClientSession() as session:
+            async with session.get(stub.url + 'users/@me') as response:
+                assert response.status == 429
+        assert stub.injected == 1
+    run(injected, error_rate=1.0)
+
+
+def test_options_are_validated():
+    with pytest.raises(ValueError):
+        StubRESTServer(error_rate=2.0)
+    with pytest.raises(ValueError):
+        StubRESTServer(rate_limit=0)
@@ -0,0 +1,79 @@
+import asyncio
+import json
+
+import pytest
+
+from discord_interactions.application_commands.client.application_command_client import BaseSlashApplication
+from discord_interactions.monitoring.tracing import InMemoryExporter, JsonLinesExporter, Tracer, current_span, \
+    get_tracer, set_tracer
+
+INTERACTION = {
+    'type': 2, 'id': '786008729715212338', 'application_id': '775799577604522054', 'token': 'token', 'version': 1,
+    'channel_id': '645027906669510667', 'data': {'id': '771825006014889984', 'name': 'work', 'type': 1},
+    'user': {'id': '53908232506183680', 'username': 'Mason', 'discriminator': '1337', 'avatar': None}
+}
+
+
+@pytest.fixture
+def exporter():
+    previous = get_tracer()
+    exporter = InMemoryExporter()
+    set_tracer(Tracer([exporter]))
+    yield exporter
+    set_tracer(previous)
+
+
+def test_disabled_tracer_hands_out_noop_span():
+    tracer = Tracer()
+    assert not tracer.enabled
+    with tracer.span('interaction') as first, tracer.span('callback') as second:
+        assert first is second
+        assert current_span() is None
+
+
+def test_spans_are_nested_and_record_errors():
+    exporter = InMemoryExporter()
+    tracer = Tracer([exporter])
+    with pytest.raises(KeyError):
+        with tracer.span('interaction', id='1') as parent:
+            with tracer.span('callback') as child:
+                assert current_span() is child
+            raise KeyError('missing')
+    assert current_span() is None
+    assert [span.name for span in exporter.spans] == ['callback', 'interaction']
+    assert child.trace_id == parent.trace_id and child.parent_id == parent.span_id
+    assert parent.error == "KeyError: 'missing'"
+    assert parent.attributes == {'id': '1'} and parent.duration >= child.duration
+
+
+def test_interaction_trace_follows_spawned_tasks(exporter):
+    app = BaseSlashApplication(low_memory=True)
+
+    async def background():
+        with get_tracer().span('background'):
+            await asyncio.sleep(0)
+
+    @app.globalSlash(name='work', description='Spawn a task.')
+    async def work(ctx):
+        await asyncio.ensure_future(background())
+
+    asyncio.run(app.process_slash(INTERACTION))
+    interaction = exporter.find('interaction')[0]
+    assert interaction.attributes['command'] == 'work'
+    trace = exporter.trace(interaction.trace_id)
+    assert {span.name for span in trace} >= {'interaction', 'bind', 'callback', 'background'}
+    callback = exporter.find('callback')[0]
+    assert exporter.find('background')[0].parent_id == callback.span_id
+
+
+def test_json_lines_exporter(tmp_path):
+    path = tmp_path / 'spans.jsonl'
+    exporter = JsonLinesExporter(str(path), flush_every=2)
+    tracer = Tracer([exporter])
+    for name in ('first', 'second', 'third'):
+        with tracer.span(name):
+            pass
+    assert len(path.read_bytes().splitlines()) == 2
+    tracer.close()
+    assert [json.loads(line)['name'] for line in path.read_bytes().splitlines()] == ['first', 'second', 'third']
+    assert not tracer.enabled
@@ -0,0 +1,47 @@
+import asyncio
+import time
+
+from nacl.signing import SigningKey
+
+from discord_interactions.client.verifier import SignatureVerifier, verify_signature
+
+SIGNING_KEY = SigningKey.generate()
+PUBLIC_KEY = SIGNING_KEY.verify_key.encode().hex()
+BODY = b'{"type":1}'
+
+
+def sign(body, timestamp):
+    return SIGNING_KEY.sign(timestamp.encode() + body).signature.hex()
+
+
+def test_verify():
+    verifier = SignatureVerifier(PUBLIC_KEY, max_skew=60)
+    timestamp = str(int(time.time()))
+    assert verifier.verify(sign(BODY, timestamp), timestamp, BODY)
+    assert not verifier.verify(sign(BODY, timestamp), timestamp, b'{"type":2}')
+    assert not verifier.verify('not hex', timestamp, BODY)
+    stale = str(int(time.time()) - 61)
+    assert not verifier.verify(sign(BODY, stale), stale, BODY)
+    assert not verifier.verify(sign(BODY, 'now'), 'now', BODY)
+    assert verifier.stats == {'verified': 1, 'invalid': 2, 'stale': 2, 'replayed': 0, 'offloaded': 0}
+    assert verify_signature(PUBLIC_KEY, sign(BODY, timestamp), timestamp, BODY)
+
+
+def test_replayed_interactions():
+    verifier = SignatureVerifier(PUBLIC_KEY)
+    assert verifier.firstSeen('786008729715212338')
+    assert not verifier.firstSeen(786008729715212338)
+    assert verifier.stats['replayed'] == 1
+
+
+def test_offloaded_verification_is_counted_on_the_loop():
+    async def main():
+        verifier = SignatureVerifier(PUBLIC_KEY, offload_lag=-1.0)   # Always saturated.
+        timestamp = str(int(time.time()))
+        results = await asyncio.gather(*(
+            verifier.verifyAsync(sign(BODY, timestamp) if i % 2 else '00', timestamp, BODY) for i in range(100)
+        ))
+        verifier.close()
+        assert results.count(True) == 50
+        assert verifier.stats == {'verified': 50, 'invalid': 50, 'stale': 0, 'replayed': 0, 'offloaded': 100}
+    asyncio.run(main())
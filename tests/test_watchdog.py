@@ -0,0 +1,37 @@
+import asyncio
+import time
+
+from discord_interactions.monitoring import SlowCallbackWatchdog
+
+
+def test_blocking_command_is_reported_then_profiled_on_the_loop():
+    async def main():
+        watchdog = SlowCallbackWatchdog(threshold=0.05, profile_invocations=1, sample_interval=0.005)
+
+        async def invoke(command, blocked):
+            watchdog.enter(command)
+            try:
+                time.sleep(blocked)
+                # Samples taken while the loop is blocked are only handed over, not written to the report.
+                return dict(watchdog._reports[command].profile) if command in watchdog._reports else None
+            finally:
+                watchdog.exit()
+
+        try:
+            await invoke('fast', 0.0)
+            await asyncio.sleep(0.1)
+            assert await invoke('slow', 0.3) is None
+            await asyncio.sleep(0.1)
+            report = watchdog.report('slow')
+            assert report.count == 1 and report.max_blocked >= 0.05
+            assert 'test_watchdog.py' in next(iter(report.stacks))
+            assert await invoke('slow', 0.1) == {}
+            await asyncio.sleep(0.1)
+            report = watchdog.report('slow')
+            assert report.profiled_invocations == 1
+            assert sum(report.profile.values()) > 0
+            assert all('invoke' in stack for stack in report.profile)
+            assert set(watchdog.reports()) == {'slow'}
+        finally:
+            watchdog.stop()
+    asyncio.run(main())
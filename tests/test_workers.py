@@ -0,0 +1,54 @@
+import gc
+import json
+import socket
+import time
+import urllib.request
+
+import pytest
+from nacl.signing import SigningKey
+
+from discord_interactions import InteractionClient
+from discord_interactions.client import WorkerPool
+
+SIGNING_KEY = SigningKey.generate()
+PUBLIC_KEY = SIGNING_KEY.verify_key.encode().hex()
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+def ping(port):
+    body = b'{"type":1}'
+    timestamp = str(int(time.time()))
+    request = urllib.request.Request('http://127.0.0.1:{}/interactions'.format(port), data=body, headers={
+        'X-Signature-Ed25519': SIGNING_KEY.sign(timestamp.encode() + body).signature.hex(),
+        'X-Signature-Timestamp': timestamp,
+        'Content-Type': 'application/json'
+    })
+    with urllib.request.urlopen(request, timeout=5) as response:
+        return json.loads(response.read())
+
+
+def test_workers_serve_and_restart():
+    port = free_port()
+    pool = WorkerPool(InteractionClient(775799577604522054, PUBLIC_KEY).server, '127.0.0.1', port, workers=2)
+    try:
+        pool.start()
+        started = pool.pids
+        assert len(set(started)) == 2
+        assert [ping(port) for _ in range(4)] == [{'type': 1}] * 4
+        pool.restart()
+        assert not set(pool.pids) & set(started)
+        assert ping(port) == {'type': 1}
+    finally:
+        pool.stop()
+        gc.unfreeze()
+    assert pool.pids == []
+
+
+def test_worker_count_must_be_positive():
+    with pytest.raises(ValueError):
+        WorkerPool(InteractionClient(775799577604522054, PUBLIC_KEY).server, workers=0)